@@ -3,12 +3,14 @@ ATS MAFIA Analytics Module
 Provides technique tracking, coverage analysis, and ATT&CK Navigator integration
 """
 
-from .technique_tracker import TechniqueTracker, VoiceTechniqueTracker, TechniqueExecution
-from .attack_navigator import ATTACKNavigatorExporter
+from .technique_tracker import TechniqueTracker, VoiceTechniqueTracker, TechniqueExecution, ExecutionAggregate
+from .attack_navigator import ATTACKNavigatorExporter, LiveCoverageLayer
 
 __all__ = [
     'TechniqueTracker',
     'VoiceTechniqueTracker', 
     'TechniqueExecution',
-    'ATTACKNavigatorExporter'
+    'ExecutionAggregate',
+    'ATTACKNavigatorExporter',
+    'LiveCoverageLayer'
 ]
\ No newline at end of file
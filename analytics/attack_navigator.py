@@ -1,43 +1,303 @@
 """
 MITRE ATT&CK Navigator Layer Generation
 Exports scenario and profile coverage as Navigator layers for visualization
+
+Generated layers are cached by a caller-supplied source version. Live
+execution layers follow a TechniqueTracker and are updated per recorded
+execution, exposing per-technique diffs between versions so clients can
+poll or be pushed small updates instead of whole layers. Live layers nobody
+has read for a while, or beyond a count bound, are released.
 """
 
+import copy
 import json
-from typing import Dict, List, Any, Optional
+import time
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from datetime import datetime
 import logging
 
 
+class LiveCoverageLayer:
+    """
+    Execution coverage layer updated incrementally from tracker executions
+    
+    Each recorded execution in the layer's scope replaces the entry of its
+    technique and bumps the layer version. The techniques changed by recent
+    versions are remembered so a diff since any of them can be produced.
+    """
+    
+    def __init__(self,
+                 exporter: 'ATTACKNavigatorExporter',
+                 tracker,
+                 session_id: Optional[str] = None,
+                 agent_id: Optional[str] = None,
+                 history_size: int = 1000):
+        """
+        Initialize live layer from the tracker's current aggregates
+        
+        Must be created while the tracker lock is held, so no execution is
+        recorded between building the layer and receiving updates.
+        
+        Args:
+            exporter: Exporter used to format layer entries
+            tracker: TechniqueTracker the layer follows
+            session_id: Only executions of this session
+            agent_id: Only executions of this agent (ignored with session_id)
+            history_size: Changes remembered for diffs
+        """
+        self.exporter = exporter
+        self.tracker = tracker
+        self.session_id = session_id
+        self.agent_id = None if session_id is not None else agent_id
+        self.layer_id = self.make_id(session_id, agent_id)
+        
+        self.version = 0
+        self.layer = exporter.create_execution_layer(tracker, session_id=session_id, agent_id=agent_id)
+        self._positions = {t['techniqueID']: i for i, t in enumerate(self.layer['techniques'])}
+        self._changes: deque = deque(maxlen=history_size)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+    
+    @property
+    def has_listeners(self) -> bool:
+        """Whether diff callbacks are registered"""
+        return bool(self._listeners)
+    
+    @staticmethod
+    def make_id(session_id: Optional[str] = None, agent_id: Optional[str] = None) -> str:
+        """Get the identifier of a live layer scope"""
+        if session_id is not None:
+            return f"session:{session_id}"
+        if agent_id is not None:
+            return f"agent:{agent_id}"
+        return "all"
+    
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a callback invoked with the diff of each new version
+        
+        Args:
+            callback: Callable taking a diff dictionary (see ``diff``)
+        """
+        with self.lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Unregister a diff callback
+        
+        Args:
+            callback: Previously registered callable
+        """
+        with self.lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    def apply(self, execution) -> None:
+        """
+        Update the layer with a newly recorded execution
+        
+        Args:
+            execution: TechniqueExecution in this layer's scope
+        """
+        aggregate = self.tracker.get_aggregate(session_id=self.session_id, agent_id=self.agent_id)
+        entry = self.exporter._execution_technique(aggregate.technique_summary(execution.technique_id))
+        
+        with self.lock:
+            techniques = self.layer['techniques']
+            position = self._positions.get(execution.technique_id)
+            if position is None:
+                self._positions[execution.technique_id] = len(techniques)
+                techniques.append(entry)
+            else:
+                techniques[position] = entry
+            
+            # Replaced rather than mutated, so snapshots can share it
+            self.layer['metadata'] = self.exporter._execution_metadata(aggregate.executions, len(techniques))
+            
+            self.version += 1
+            self._changes.append((self.version, execution.technique_id))
+            
+            diff = self._make_diff(self.version - 1, [entry])
+            listeners = list(self._listeners)
+        
+        for callback in listeners:
+            try:
+                callback(diff)
+            except Exception as e:
+                self.exporter.logger.error(f"Layer diff listener failed: {e}")
+    
+    def _make_diff(self, since: int, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a diff dictionary from changed entries"""
+        return {
+            'layer_id': self.layer_id,
+            'base_version': since,
+            'version': self.version,
+            'techniques': entries,
+            'metadata': self.layer['metadata']
+        }
+    
+    def snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        Get the current version and a copy of the layer
+        
+        Returns:
+            Tuple of (version, Navigator layer JSON)
+        """
+        with self.lock:
+            layer = dict(self.layer)
+            layer['techniques'] = list(self.layer['techniques'])
+            return self.version, layer
+    
+    def diff(self, since: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the technique entries changed after a version
+        
+        Args:
+            since: Version the client holds
+            
+        Returns:
+            Diff with ``base_version``, ``version``, changed ``techniques``
+            and current ``metadata``, or None when ``since`` is unknown or
+            too old and the full layer must be fetched
+        """
+        with self.lock:
+            if since < 0 or since > self.version:
+                return None
+            if since < self.version and self._changes[0][0] > since + 1:
+                return None
+            
+            changed = OrderedDict()
+            for version, technique_id in reversed(self._changes):
+                if version <= since:
+                    break
+                changed[technique_id] = None
+            
+            techniques = self.layer['techniques']
+            entries = [techniques[self._positions[technique_id]] for technique_id in reversed(changed)]
+            return self._make_diff(since, entries)
+
+
 class ATTACKNavigatorExporter:
     """
     Generate ATT&CK Navigator layers for visualization
     
     Creates JSON layer files compatible with MITRE ATT&CK Navigator:
     https://mitre-attack.github.io/attack-navigator/
+    
+    Profile, scenario and heatmap layers built with a source ``version`` are
+    cached per source and version; callers get their own copy.
     """
     
-    def __init__(self, attack_framework):
+    def __init__(self,
+                 attack_framework,
+                 cache_size: int = 128,
+                 max_live_layers: int = 256,
+                 live_layer_ttl: Optional[float] = 3600.0):
         """
         Initialize Navigator exporter
         
         Args:
             attack_framework: ATTACKFramework instance
+            cache_size: Number of generated layers cached by source version
+            max_live_layers: Live layers kept before the least recently read
+                are released
+            live_layer_ttl: Seconds a live layer is kept without being read
+                (None keeps it until released)
         """
         self.attack = attack_framework
         self.logger = logging.getLogger("attack_navigator")
+        
+        # Generated layers by (layer type, source ID, version, name)
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Live execution layers by layer ID, least recently read first.
+        # Layers with diff listeners are never released automatically.
+        self.tracker = None
+        self.max_live_layers = max_live_layers
+        self.live_layer_ttl = live_layer_ttl
+        self._live: OrderedDict = OrderedDict()
+        self.live_layers_expired = 0
+    
+    @staticmethod
+    def _cache_key(kind: str, source_id: Any, version: Optional[str], name: Optional[str]) -> Optional[tuple]:
+        """Get the cache key of a layer, or None when no source version is given"""
+        if version is None:
+            return None
+        return (kind, source_id, str(version), name)
     
-    def create_profile_layer(self, profile: Dict, name: Optional[str] = None) -> Dict[str, Any]:
+    def _get_cached(self, key: Optional[tuple]) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached layer, refreshing its recency"""
+        if key is None:
+            return None
+        with self._cache_lock:
+            layer = self._cache.get(key)
+            if layer is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+        return copy.deepcopy(layer)
+    
+    def _store_cached(self, key: Optional[tuple], layer: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache a copy of a generated layer and return the layer"""
+        if key is None:
+            return layer
+        cached = copy.deepcopy(layer)
+        with self._cache_lock:
+            self._cache[key] = cached
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return layer
+    
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """
+        Get layer cache statistics
+        
+        Returns:
+            Dictionary with cache size, hits, misses and live layers
+        """
+        with self._cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                'cached_layers': len(self._cache),
+                'cache_size': self.cache_size,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / lookups if lookups else 0,
+                'live_layers': len(self._live),
+                'live_layers_expired': self.live_layers_expired
+            }
+    
+    def create_profile_layer(self,
+                             profile: Dict,
+                             name: Optional[str] = None,
+                             version: Optional[str] = None) -> Dict[str, Any]:
         """
         Create Navigator layer for profile technique coverage
         
         Args:
             profile: Profile dictionary with attack_knowledge
             name: Optional custom layer name
+            version: Version of the profile data; the layer is cached per
+                profile ID and version when given
             
         Returns:
             Navigator layer JSON
         """
+        key = self._cache_key('profile', profile.get('metadata', {}).get('id'), version, name)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
         profile_name = profile.get('metadata', {}).get('name', 'Unknown Profile')
         layer_name = name or f"Profile: {profile_name}"
         
@@ -58,7 +318,7 @@ class ATTACKNavigatorExporter:
                 ]
             })
         
-        return {
+        return self._store_cached(key, {
             'name': layer_name,
             'versions': {
                 'attack': '15',
@@ -91,19 +351,29 @@ class ATTACKNavigatorExporter:
                 {'name': 'Generated', 'value': datetime.now().isoformat()},
                 {'name': 'Source', 'value': 'ATS MAFIA Framework'}
             ]
-        }
+        })
     
-    def create_scenario_layer(self, scenario: Dict, name: Optional[str] = None) -> Dict[str, Any]:
+    def create_scenario_layer(self,
+                              scenario: Dict,
+                              name: Optional[str] = None,
+                              version: Optional[str] = None) -> Dict[str, Any]:
         """
         Create Navigator layer for scenario technique requirements
         
         Args:
             scenario: Scenario dictionary with phases and objectives
             name: Optional custom layer name
+            version: Version of the scenario data; the layer is cached per
+                scenario ID and version when given
             
         Returns:
             Navigator layer JSON
         """
+        key = self._cache_key('scenario', scenario.get('id'), version, name)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
         scenario_name = scenario.get('name', 'Unknown Scenario')
         layer_name = name or f"Scenario: {scenario_name}"
         
@@ -126,7 +396,7 @@ class ATTACKNavigatorExporter:
                         ]
                     })
         
-        return {
+        return self._store_cached(key, {
             'name': layer_name,
             'versions': {
                 'attack': '15',
@@ -156,19 +426,32 @@ class ATTACKNavigatorExporter:
                 {'name': 'Generated', 'value': datetime.now().isoformat()},
                 {'name': 'Source', 'value': 'ATS MAFIA Framework'}
             ]
-        }
+        })
     
-    def create_coverage_heatmap(self, sessions: List[Dict], name: Optional[str] = None) -> Dict[str, Any]:
+    def create_coverage_heatmap(self,
+                                sessions: List[Dict],
+                                name: Optional[str] = None,
+                                version: Optional[str] = None) -> Dict[str, Any]:
         """
         Create heatmap showing technique usage across multiple training sessions
         
+        For a heatmap that follows executions as they are recorded, use
+        get_live_layer instead.
+        
         Args:
             sessions: List of session dictionaries with techniques_used
             name: Optional custom layer name
+            version: Version identifying this set of sessions; the layer is
+                cached per version when given
             
         Returns:
             Navigator heatmap layer JSON
         """
+        key = self._cache_key('heatmap', None, version, name)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
         layer_name = name or 'Training Coverage Heatmap'
         
         # Count technique usage across sessions
@@ -197,7 +480,7 @@ class ATTACKNavigatorExporter:
             for tid, count in technique_counts.items()
         ]
         
-        return {
+        return self._store_cached(key, {
             'name': layer_name,
             'versions': {
                 'attack': '15',
@@ -226,8 +509,184 @@ class ATTACKNavigatorExporter:
                 {'name': 'Generated', 'value': datetime.now().isoformat()},
                 {'name': 'Source', 'value': 'ATS MAFIA Training Analytics'}
             ]
+        })
+    
+    def create_execution_layer(self,
+                               tracker,
+                               session_id: Optional[str] = None,
+                               agent_id: Optional[str] = None,
+                               name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create coverage layer from recorded technique executions
+        
+        Reads the tracker's precomputed aggregates, so the cost depends on the
+        number of distinct techniques rather than the number of executions.
+        
+        Args:
+            tracker: TechniqueTracker with recorded executions
+            session_id: Only executions of this session
+            agent_id: Only executions of this agent (ignored with session_id)
+            name: Optional custom layer name
+            
+        Returns:
+            Navigator layer JSON scored by success rate
+        """
+        if session_id is not None:
+            scope = f"session {session_id}"
+        elif agent_id is not None:
+            scope = f"agent {agent_id}"
+        else:
+            scope = "all sessions"
+        layer_name = name or f"Execution Coverage: {scope}"
+        
+        with tracker.lock:
+            aggregate = tracker.get_aggregate(session_id=session_id, agent_id=agent_id)
+            summaries = [aggregate.technique_summary(tid) for tid in sorted(aggregate.techniques)]
+            total_executions = aggregate.executions
+        
+        techniques = [self._execution_technique(summary) for summary in summaries]
+        
+        return {
+            'name': layer_name,
+            'versions': {
+                'attack': '15',
+                'navigator': '4.9.1',
+                'layer': '4.5'
+            },
+            'domain': 'enterprise-attack',
+            'description': f"ATT&CK techniques executed in training across {scope}",
+            'techniques': techniques,
+            'gradient': {
+                'colors': ['#ff6666', '#ffe766', '#8ec843'],
+                'minValue': 0,
+                'maxValue': 100
+            },
+            'legendItems': [
+                {'label': 'Rarely Successful', 'color': '#ff6666'},
+                {'label': 'Sometimes Successful', 'color': '#ffe766'},
+                {'label': 'Consistently Successful', 'color': '#8ec843'}
+            ],
+            'showTacticRowBackground': True,
+            'tacticRowBackground': '#1e1e1e',
+            'selectTechniquesAcrossTactics': True,
+            'metadata': self._execution_metadata(total_executions, len(techniques))
+        }
+    
+    @staticmethod
+    def _execution_technique(summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a technique summary from an ExecutionAggregate as a layer entry"""
+        return {
+            'techniqueID': summary['technique_id'],
+            'score': round(summary['success_rate'] * 100, 1),
+            'color': '',  # Use gradient
+            'comment': (
+                f"Executions: {summary['executions']}\n"
+                f"Success Rate: {summary['success_rate'] * 100:.1f}%\n"
+                f"Detection Rate: {summary['detection_rate'] * 100:.1f}%"
+            ),
+            'enabled': True,
+            'metadata': [
+                {'name': 'Executions', 'value': str(summary['executions'])},
+                {'name': 'Success Rate', 'value': f"{summary['success_rate'] * 100:.1f}%"},
+                {'name': 'Detection Rate', 'value': f"{summary['detection_rate'] * 100:.1f}%"}
+            ]
         }
     
+    @staticmethod
+    def _execution_metadata(total_executions: int, unique_techniques: int) -> List[Dict[str, str]]:
+        """Build the metadata of an execution layer"""
+        return [
+            {'name': 'Total Executions', 'value': str(total_executions)},
+            {'name': 'Unique Techniques', 'value': str(unique_techniques)},
+            {'name': 'Generated', 'value': datetime.now().isoformat()},
+            {'name': 'Source', 'value': 'ATS MAFIA Training Analytics'}
+        ]
+    
+    def track(self, tracker) -> None:
+        """
+        Follow a TechniqueTracker to keep live execution layers up to date
+        
+        Args:
+            tracker: TechniqueTracker recording executions
+        """
+        with tracker.lock:
+            if self.tracker is not None and self.tracker is not tracker:
+                self.tracker.remove_listener(self._on_execution)
+                self._live.clear()
+            self.tracker = tracker
+            tracker.add_listener(self._on_execution)
+    
+    def _on_execution(self, execution) -> None:
+        """Apply a recorded execution to the live layers of its scopes"""
+        for layer_id in ('all',
+                         LiveCoverageLayer.make_id(session_id=execution.session_id),
+                         LiveCoverageLayer.make_id(agent_id=execution.agent_id)):
+            layer = self._live.get(layer_id)
+            if layer is not None:
+                layer.apply(execution)
+    
+    def get_live_layer(self,
+                       session_id: Optional[str] = None,
+                       agent_id: Optional[str] = None) -> LiveCoverageLayer:
+        """
+        Get the live execution layer of a session, an agent or all executions
+        
+        The layer is built from the tracker's aggregates on first use and then
+        updated as executions are recorded. Each call marks the layer as used;
+        idle layers past the TTL and the least recently used layers beyond
+        ``max_live_layers`` are released.
+        
+        Args:
+            session_id: Session identifier
+            agent_id: Agent identifier (ignored when session_id is given)
+            
+        Returns:
+            LiveCoverageLayer for the scope
+        """
+        if self.tracker is None:
+            raise RuntimeError("No technique tracker is being tracked")
+        
+        layer_id = LiveCoverageLayer.make_id(session_id, agent_id)
+        with self.tracker.lock:
+            layer = self._live.get(layer_id)
+            if layer is None:
+                layer = self._live[layer_id] = LiveCoverageLayer(
+                    self, self.tracker, session_id=session_id, agent_id=agent_id
+                )
+            else:
+                self._live.move_to_end(layer_id)
+            layer.last_used = time.monotonic()
+            self._expire_live_layers(keep=layer_id)
+            return layer
+    
+    def _expire_live_layers(self, keep: Optional[str] = None) -> None:
+        """Release idle and excess live layers (called with the tracker lock held)"""
+        now = time.monotonic()
+        excess = len(self._live) - self.max_live_layers
+        
+        for layer_id, layer in list(self._live.items()):
+            if layer_id == keep or layer.has_listeners:
+                continue
+            idle = self.live_layer_ttl is not None and now - layer.last_used > self.live_layer_ttl
+            if idle or excess > 0:
+                del self._live[layer_id]
+                excess -= 1
+                self.live_layers_expired += 1
+    
+    def release_live_layer(self, layer_id: str) -> bool:
+        """
+        Stop maintaining a live execution layer
+        
+        Args:
+            layer_id: Live layer identifier
+            
+        Returns:
+            True if the layer existed
+        """
+        lock = self.tracker.lock if self.tracker is not None else threading.RLock()
+        with lock:
+            return self._live.pop(layer_id, None) is not None
+    
     def create_custom_layer(self,
                            technique_ids: List[str],
                            name: str = "Custom Layer",
@@ -1,13 +1,21 @@
 """
 Real-time ATT&CK Technique Usage Tracker
 Monitors and logs techniques used during training sessions
+
+Executions are appended to a JSON-lines journal and periodically compacted
+into a snapshot file. Per-session, per-agent and per-technique aggregates are
+updated as executions are recorded, so statistics and coverage queries do not
+rescan the execution history.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Callable
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
+from collections import Counter
 import logging
 import json
+import os
+import threading
 from pathlib import Path
 
 
@@ -46,6 +54,99 @@ class VoiceTechniqueExecution(TechniqueExecution):
     transcript_path: Optional[str] = None
 
 
+def execution_from_dict(data: Dict[str, Any]) -> TechniqueExecution:
+    """
+    Reconstruct an execution record from its dictionary form
+    
+    Args:
+        data: Dictionary produced by ``TechniqueExecution.to_dict``
+        
+    Returns:
+        TechniqueExecution, or VoiceTechniqueExecution for voice records
+    """
+    data = dict(data)
+    data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+    execution_class = VoiceTechniqueExecution if 'call_id' in data else TechniqueExecution
+    return execution_class(**data)
+
+
+@dataclass
+class ExecutionAggregate:
+    """Running totals over a group of technique executions"""
+    executions: int = 0
+    successes: int = 0
+    detections: int = 0
+    total_execution_time: float = 0.0
+    first_used: Optional[datetime] = None
+    last_used: Optional[datetime] = None
+    techniques: Counter = field(default_factory=Counter)
+    technique_successes: Counter = field(default_factory=Counter)
+    technique_detections: Counter = field(default_factory=Counter)
+    agents: Counter = field(default_factory=Counter)
+    sessions: Counter = field(default_factory=Counter)
+    
+    # Coverage analysis of the current technique set, recomputed when it grows
+    coverage: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    coverage_size: int = field(default=-1, repr=False, compare=False)
+    
+    def add(self, execution: TechniqueExecution) -> None:
+        """Add an execution to the totals"""
+        self.executions += 1
+        self.total_execution_time += execution.execution_time_seconds
+        self.techniques[execution.technique_id] += 1
+        self.agents[execution.agent_id] += 1
+        self.sessions[execution.session_id] += 1
+        
+        if execution.success:
+            self.successes += 1
+            self.technique_successes[execution.technique_id] += 1
+        if execution.detection_triggered:
+            self.detections += 1
+            self.technique_detections[execution.technique_id] += 1
+        
+        if self.first_used is None or execution.timestamp < self.first_used:
+            self.first_used = execution.timestamp
+        if self.last_used is None or execution.timestamp > self.last_used:
+            self.last_used = execution.timestamp
+    
+    @property
+    def success_rate(self) -> float:
+        """Fraction of executions that succeeded"""
+        return self.successes / self.executions if self.executions else 0
+    
+    @property
+    def detection_rate(self) -> float:
+        """Fraction of executions that were detected"""
+        return self.detections / self.executions if self.executions else 0
+    
+    @property
+    def average_execution_time(self) -> float:
+        """Mean execution time in seconds"""
+        return self.total_execution_time / self.executions if self.executions else 0
+    
+    def technique_summary(self, technique_id: str) -> Dict[str, Any]:
+        """
+        Get the totals of one technique within this group
+        
+        Args:
+            technique_id: ATT&CK technique ID
+            
+        Returns:
+            Dictionary with execution, success and detection counts and rates
+        """
+        count = self.techniques.get(technique_id, 0)
+        successes = self.technique_successes.get(technique_id, 0)
+        detections = self.technique_detections.get(technique_id, 0)
+        return {
+            'technique_id': technique_id,
+            'executions': count,
+            'success_count': successes,
+            'success_rate': successes / count if count else 0,
+            'detection_count': detections,
+            'detection_rate': detections / count if count else 0
+        }
+
+
 class TechniqueTracker:
     """
     Track ATT&CK technique usage in real-time during training sessions
@@ -55,31 +156,111 @@ class TechniqueTracker:
     - Session-level and agent-level statistics
     - Success/detection rate tracking
     - Integration with audit logging
-    - Persistent storage of execution history
+    - Persistent storage of execution history in an append-only journal
+      compacted into periodic snapshots
+    - Aggregates maintained on write for constant-time statistics
     """
     
-    def __init__(self, attack_framework, audit_logger=None, storage_path: Optional[str] = None):
+    def __init__(self,
+                 attack_framework,
+                 audit_logger=None,
+                 storage_path: Optional[str] = None,
+                 snapshot_interval: int = 1000):
         """
         Initialize technique tracker
         
         Args:
             attack_framework: ATTACKFramework instance
             audit_logger: Optional audit logger for compliance
-            storage_path: Optional path for persistent storage
+            storage_path: Optional path for the snapshot file; the journal is
+                kept next to it with a ``.jsonl`` suffix
+            snapshot_interval: Journaled executions after which a snapshot is
+                written and the journal truncated
         """
         self.attack = attack_framework
         self.audit_logger = audit_logger
         self.logger = logging.getLogger("technique_tracker")
         self.storage_path = storage_path or "ats_mafia_framework/analytics/data/technique_executions.json"
+        self.journal_path = str(Path(self.storage_path).with_suffix('.jsonl'))
+        self.snapshot_interval = snapshot_interval
         
         # In-memory storage
         self.executions: List[TechniqueExecution] = []
-        self.session_techniques: Dict[str, List[str]] = {}
-        self.agent_techniques: Dict[str, List[str]] = {}
+        self.session_executions: Dict[str, List[TechniqueExecution]] = {}
+        
+        # Aggregates maintained on write
+        self.totals = ExecutionAggregate()
+        self.session_stats: Dict[str, ExecutionAggregate] = {}
+        self.agent_stats: Dict[str, ExecutionAggregate] = {}
+        self.technique_stats: Dict[str, ExecutionAggregate] = {}
+        
+        # Journal state
+        self.sequence = 0
+        self.snapshot_sequence = 0
+        self._journal = None
+        self.lock = threading.RLock()
+        
+        # Callbacks notified of each newly recorded execution
+        self._listeners: List[Callable[[TechniqueExecution], None]] = []
         
         # Load existing executions if storage exists
         self._load_executions()
     
+    def add_listener(self, callback: Callable[[TechniqueExecution], None]) -> None:
+        """
+        Register a callback invoked after each execution is recorded
+        
+        Callbacks run while the tracker lock is held, so they see aggregates
+        that include the execution and must not block.
+        
+        Args:
+            callback: Callable taking the recorded TechniqueExecution
+        """
+        with self.lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[TechniqueExecution], None]) -> None:
+        """
+        Unregister an execution callback
+        
+        Args:
+            callback: Previously registered callable
+        """
+        with self.lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    def _index_execution(self, execution: TechniqueExecution) -> None:
+        """Add an execution to the in-memory history and aggregates"""
+        self.executions.append(execution)
+        self.session_executions.setdefault(execution.session_id, []).append(execution)
+        
+        self.totals.add(execution)
+        for stats, key in ((self.session_stats, execution.session_id),
+                           (self.agent_stats, execution.agent_id),
+                           (self.technique_stats, execution.technique_id)):
+            aggregate = stats.get(key)
+            if aggregate is None:
+                aggregate = stats[key] = ExecutionAggregate()
+            aggregate.add(execution)
+    
+    def _store_execution(self, execution: TechniqueExecution) -> None:
+        """Index, journal and publish a new execution"""
+        with self.lock:
+            self._index_execution(execution)
+            self.sequence += 1
+            self._append_journal(execution)
+            
+            if self.sequence - self.snapshot_sequence >= self.snapshot_interval:
+                self._save_executions()
+            
+            for callback in self._listeners:
+                try:
+                    callback(execution)
+                except Exception as e:
+                    self.logger.error(f"Execution listener failed: {e}")
+    
     def record_technique(self,
                         technique_id: str,
                         agent_id: str,
@@ -121,18 +302,8 @@ class TechniqueTracker:
             metadata=metadata or {}
         )
         
-        # Store execution
-        self.executions.append(execution)
-        
-        # Update session tracking
-        if session_id not in self.session_techniques:
-            self.session_techniques[session_id] = []
-        self.session_techniques[session_id].append(technique_id)
-        
-        # Update agent tracking
-        if agent_id not in self.agent_techniques:
-            self.agent_techniques[agent_id] = []
-        self.agent_techniques[agent_id].append(technique_id)
+        # Store, journal and aggregate execution
+        self._store_execution(execution)
         
         # Audit log
         if self.audit_logger:
@@ -159,9 +330,32 @@ class TechniqueTracker:
             f"{'SUCCESS' if success else 'FAILED'}"
             f"{' [DETECTED]' if detection_triggered else ''}"
         )
+    
+    def _coverage(self, aggregate: ExecutionAggregate) -> Dict[str, Any]:
+        """Get the coverage analysis of an aggregate's techniques, cached until the set grows"""
+        if aggregate.coverage is None or aggregate.coverage_size != len(aggregate.techniques):
+            aggregate.coverage = self.attack.validate_technique_coverage(list(aggregate.techniques))
+            aggregate.coverage_size = len(aggregate.techniques)
+        return dict(aggregate.coverage)
+    
+    def get_aggregate(self,
+                      session_id: Optional[str] = None,
+                      agent_id: Optional[str] = None) -> ExecutionAggregate:
+        """
+        Get the running totals of a session, an agent or all executions
         
-        # Persist to storage
-        self._save_executions()
+        Args:
+            session_id: Session identifier
+            agent_id: Agent identifier (ignored when session_id is given)
+            
+        Returns:
+            ExecutionAggregate, empty if nothing was recorded for the scope
+        """
+        if session_id is not None:
+            return self.session_stats.get(session_id) or ExecutionAggregate()
+        if agent_id is not None:
+            return self.agent_stats.get(agent_id) or ExecutionAggregate()
+        return self.totals
     
     def get_session_coverage(self, session_id: str) -> Dict[str, Any]:
         """
@@ -173,13 +367,13 @@ class TechniqueTracker:
         Returns:
             Coverage analysis dictionary
         """
-        technique_ids = self.session_techniques.get(session_id, [])
-        unique_techniques = list(set(technique_ids))
+        with self.lock:
+            aggregate = self.get_aggregate(session_id=session_id)
+            coverage = self._coverage(aggregate)
         
-        coverage = self.attack.validate_technique_coverage(unique_techniques)
         coverage['session_id'] = session_id
-        coverage['total_executions'] = len(technique_ids)
-        coverage['unique_techniques'] = len(unique_techniques)
+        coverage['total_executions'] = aggregate.executions
+        coverage['unique_techniques'] = len(aggregate.techniques)
         
         return coverage
     
@@ -193,13 +387,13 @@ class TechniqueTracker:
         Returns:
             Coverage analysis dictionary
         """
-        technique_ids = self.agent_techniques.get(agent_id, [])
-        unique_techniques = list(set(technique_ids))
+        with self.lock:
+            aggregate = self.get_aggregate(agent_id=agent_id)
+            coverage = self._coverage(aggregate)
         
-        coverage = self.attack.validate_technique_coverage(unique_techniques)
         coverage['agent_id'] = agent_id
-        coverage['total_executions'] = len(technique_ids)
-        coverage['unique_techniques'] = len(unique_techniques)
+        coverage['total_executions'] = aggregate.executions
+        coverage['unique_techniques'] = len(aggregate.techniques)
         
         return coverage
     
@@ -213,32 +407,31 @@ class TechniqueTracker:
         Returns:
             Technique statistics dictionary
         """
-        executions = [e for e in self.executions if e.technique_id == technique_id]
-        
-        if not executions:
+        with self.lock:
+            aggregate = self.technique_stats.get(technique_id)
+            
+            if aggregate is None:
+                return {
+                    'technique_id': technique_id,
+                    'total_executions': 0
+                }
+            
+            technique = self.attack.get_technique(technique_id)
+            
             return {
                 'technique_id': technique_id,
-                'total_executions': 0
+                'technique_name': technique['name'] if technique else technique_id,
+                'total_executions': aggregate.executions,
+                'success_count': aggregate.successes,
+                'success_rate': aggregate.success_rate,
+                'detection_count': aggregate.detections,
+                'detection_rate': aggregate.detection_rate,
+                'average_execution_time': aggregate.average_execution_time,
+                'unique_agents': len(aggregate.agents),
+                'unique_sessions': len(aggregate.sessions),
+                'first_used': aggregate.first_used.isoformat(),
+                'last_used': aggregate.last_used.isoformat()
             }
-        
-        successes = sum(1 for e in executions if e.success)
-        detections = sum(1 for e in executions if e.detection_triggered)
-        avg_time = sum(e.execution_time_seconds for e in executions) / len(executions)
-        
-        return {
-            'technique_id': technique_id,
-            'technique_name': executions[0].technique_name,
-            'total_executions': len(executions),
-            'success_count': successes,
-            'success_rate': successes / len(executions) if executions else 0,
-            'detection_count': detections,
-            'detection_rate': detections / len(executions) if executions else 0,
-            'average_execution_time': avg_time,
-            'unique_agents': len(set(e.agent_id for e in executions)),
-            'unique_sessions': len(set(e.session_id for e in executions)),
-            'first_used': min(e.timestamp for e in executions).isoformat(),
-            'last_used': max(e.timestamp for e in executions).isoformat()
-        }
     
     def get_session_timeline(self, session_id: str) -> List[Dict[str, Any]]:
         """
@@ -250,10 +443,8 @@ class TechniqueTracker:
         Returns:
             List of technique executions in chronological order
         """
-        session_executions = [
-            e for e in self.executions 
-            if e.session_id == session_id
-        ]
+        with self.lock:
+            session_executions = list(self.session_executions.get(session_id, []))
         
         # Sort by timestamp
         session_executions.sort(key=lambda e: e.timestamp)
@@ -267,78 +458,136 @@ class TechniqueTracker:
         Returns:
             Dictionary with comprehensive statistics
         """
-        if not self.executions:
+        with self.lock:
+            totals = self.totals
+            
+            if not totals.executions:
+                return {
+                    'total_executions': 0,
+                    'unique_techniques': 0,
+                    'unique_agents': 0,
+                    'unique_sessions': 0
+                }
+            
             return {
-                'total_executions': 0,
-                'unique_techniques': 0,
-                'unique_agents': 0,
-                'unique_sessions': 0
+                'total_executions': totals.executions,
+                'unique_techniques': len(self.technique_stats),
+                'unique_agents': len(self.agent_stats),
+                'unique_sessions': len(self.session_stats),
+                'overall_success_rate': totals.success_rate,
+                'overall_detection_rate': totals.detection_rate,
+                'average_execution_time': totals.average_execution_time,
+                'first_execution': totals.first_used.isoformat(),
+                'last_execution': totals.last_used.isoformat()
             }
-        
-        unique_techniques = set(e.technique_id for e in self.executions)
-        unique_agents = set(e.agent_id for e in self.executions)
-        unique_sessions = set(e.session_id for e in self.executions)
-        
-        total_successes = sum(1 for e in self.executions if e.success)
-        total_detections = sum(1 for e in self.executions if e.detection_triggered)
-        
-        return {
-            'total_executions': len(self.executions),
-            'unique_techniques': len(unique_techniques),
-            'unique_agents': len(unique_agents),
-            'unique_sessions': len(unique_sessions),
-            'overall_success_rate': total_successes / len(self.executions) if self.executions else 0,
-            'overall_detection_rate': total_detections / len(self.executions) if self.executions else 0,
-            'average_execution_time': sum(e.execution_time_seconds for e in self.executions) / len(self.executions) if self.executions else 0,
-            'first_execution': min(e.timestamp for e in self.executions).isoformat() if self.executions else None,
-            'last_execution': max(e.timestamp for e in self.executions).isoformat() if self.executions else None
-        }
     
     def _load_executions(self) -> None:
-        """Load executions from persistent storage"""
+        """Load the snapshot and replay journaled executions recorded after it"""
         try:
             if Path(self.storage_path).exists():
                 with open(self.storage_path, 'r') as f:
                     data = json.load(f)
-                    
-                # Reconstruct execution objects
-                for exec_data in data.get('executions', []):
-                    exec_data['timestamp'] = datetime.fromisoformat(exec_data['timestamp'])
-                    execution = TechniqueExecution(**exec_data)
-                    self.executions.append(execution)
                 
-                # Rebuild indices
-                for execution in self.executions:
-                    # Session index
-                    if execution.session_id not in self.session_techniques:
-                        self.session_techniques[execution.session_id] = []
-                    self.session_techniques[execution.session_id].append(execution.technique_id)
-                    
-                    # Agent index
-                    if execution.agent_id not in self.agent_techniques:
-                        self.agent_techniques[execution.agent_id] = []
-                    self.agent_techniques[execution.agent_id].append(execution.technique_id)
+                for exec_data in data.get('executions', []):
+                    self._index_execution(execution_from_dict(exec_data))
                 
-                self.logger.info(f"Loaded {len(self.executions)} technique executions from storage")
+                # Snapshots written before journaling hold every execution
+                self.snapshot_sequence = data.get('sequence', len(self.executions))
+                self.sequence = self.snapshot_sequence
         
         except Exception as e:
             self.logger.error(f"Error loading executions: {e}")
+        
+        replayed = 0
+        for entry in self._read_journal():
+            # Entries up to the snapshot sequence survived an interrupted compaction
+            if entry.get('sequence', 0) <= self.snapshot_sequence:
+                continue
+            try:
+                self._index_execution(execution_from_dict(entry['execution']))
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.warning(f"Skipping unreadable journal entry: {e}")
+                continue
+            self.sequence = entry['sequence']
+            replayed += 1
+        
+        if self.executions:
+            self.logger.info(
+                f"Loaded {len(self.executions)} technique executions from storage "
+                f"({replayed} from journal)"
+            )
+    
+    def _read_journal(self) -> Iterable[Dict[str, Any]]:
+        """Read journal entries, skipping a torn final line"""
+        if not Path(self.journal_path).exists():
+            return
+        
+        try:
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        self.logger.warning(f"Skipping unreadable journal line in {self.journal_path}")
+        except OSError as e:
+            self.logger.error(f"Error reading execution journal: {e}")
+    
+    def _append_journal(self, execution: TechniqueExecution) -> None:
+        """Append an execution to the journal"""
+        try:
+            if self._journal is None:
+                Path(self.journal_path).parent.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.journal_path, 'a')
+            
+            entry = {'sequence': self.sequence, 'execution': execution.to_dict()}
+            self._journal.write(json.dumps(entry, default=str) + '\n')
+            self._journal.flush()
+        
+        except Exception as e:
+            self.logger.error(f"Error journaling execution: {e}")
     
     def _save_executions(self) -> None:
-        """Save executions to persistent storage"""
+        """Write a snapshot of all executions and truncate the journal"""
         try:
             Path(self.storage_path).parent.mkdir(parents=True, exist_ok=True)
             
             data = {
                 'executions': [e.to_dict() for e in self.executions],
+                'sequence': self.sequence,
                 'last_updated': datetime.now().isoformat()
             }
             
-            with open(self.storage_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Replace atomically so a crash leaves the previous snapshot intact
+            temp_path = f"{self.storage_path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, default=str)
+            os.replace(temp_path, self.storage_path)
+            self.snapshot_sequence = self.sequence
+            
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            open(self.journal_path, 'w').close()
         
         except Exception as e:
             self.logger.error(f"Error saving executions: {e}")
+    
+    def flush(self) -> None:
+        """Compact journaled executions into a new snapshot"""
+        with self.lock:
+            if self.sequence != self.snapshot_sequence:
+                self._save_executions()
+    
+    def close(self) -> None:
+        """Write a final snapshot and close the journal"""
+        with self.lock:
+            self.flush()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
 
 
 class VoiceTechniqueTracker(TechniqueTracker):
@@ -406,17 +655,8 @@ class VoiceTechniqueTracker(TechniqueTracker):
             metadata=metadata
         )
         
-        # Store execution
-        self.executions.append(voice_execution)
-        
-        # Update tracking indices
-        if session_id not in self.session_techniques:
-            self.session_techniques[session_id] = []
-        self.session_techniques[session_id].append(technique_id)
-        
-        if agent_id not in self.agent_techniques:
-            self.agent_techniques[agent_id] = []
-        self.agent_techniques[agent_id].append(technique_id)
+        # Store, journal and aggregate execution
+        self._store_execution(voice_execution)
         
         # Audit log with voice-specific context
         if self.audit_logger:
@@ -447,9 +687,6 @@ class VoiceTechniqueTracker(TechniqueTracker):
             f"{' [CREDENTIAL OBTAINED]' if metadata.get('credential_obtained') else ''}"
             f"{' [DETECTED]' if detection_triggered else ''}"
         )
-        
-        # Persist to storage
-        self._save_executions()
     
     def get_voice_statistics(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -522,7 +759,8 @@ class VoiceTechniqueTracker(TechniqueTracker):
             Complete session report with timeline and statistics
         """
         # Get session executions
-        session_executions = [e for e in self.executions if e.session_id == session_id]
+        with self.lock:
+            session_executions = list(self.session_executions.get(session_id, []))
         
         if not session_executions:
             return {
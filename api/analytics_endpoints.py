@@ -8,7 +8,7 @@ including performance metrics, cost analysis, progress tracking, and reporting.
 import logging
 from typing import Dict, Any, Optional
 from datetime import timedelta
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, stream_with_context
 from functools import wraps
 
 from ..core.performance_metrics import PerformanceMetricsEngine, MetricType
@@ -17,6 +17,7 @@ from ..core.advanced_cost_analytics import AdvancedCostAnalytics, CostCategory
 from ..core.progress_tracker import ProgressTracker
 from ..core.reporting_engine import ReportingEngine, ReportType, ReportFormat
 from ..core.analytics_aggregator import AnalyticsAggregator
+from ..core.export_streams import gzip_chunks
 
 
 # Initialize logger
@@ -340,24 +341,32 @@ def create_analytics_api(
         except ValueError:
             return jsonify({'error': f'Invalid format: {format_str}'}), 400
         
-        content = reporting_engine.export_report(report_id, report_format)
+        # Chunks are generated lazily so large reports stream with flat memory
+        chunks = reporting_engine.stream_report(report_id, report_format)
         
         # Set appropriate content type
         content_types = {
             ReportFormat.JSON: 'application/json',
+            ReportFormat.JSONL: 'application/x-ndjson',
             ReportFormat.CSV: 'text/csv',
             ReportFormat.HTML: 'text/html',
             ReportFormat.MARKDOWN: 'text/markdown'
         }
         
         content_type = content_types.get(report_format, 'text/plain')
+        headers = {
+            'Content-Disposition': f'attachment; filename=report_{report_id}.{format_str}'
+        }
+        
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            chunks = gzip_chunks(chunks)
+            headers['Content-Encoding'] = 'gzip'
+            headers['Vary'] = 'Accept-Encoding'
         
         return Response(
-            content,
+            stream_with_context(chunks),
             mimetype=content_type,
-            headers={
-                'Content-Disposition': f'attachment; filename=report_{report_id}.{format_str}'
-            }
+            headers=headers
         )
     
     @app.route('/api/analytics/reports', methods=['GET'])
@@ -8,7 +8,7 @@ from typing import Dict, Any, List
 import logging
 
 from ats_mafia_framework.knowledge import ATTACKFramework
-from ats_mafia_framework.analytics import ATTACKNavigatorExporter
+from ats_mafia_framework.analytics import ATTACKNavigatorExporter, LiveCoverageLayer
 
 
 # Create Blueprint
@@ -164,9 +164,10 @@ def search_techniques():
         q: Search query (required)
         tactic: Filter by tactic (optional)
         include_subtechniques: Include sub-techniques (default: true)
+        limit: Maximum number of results (optional)
     
     Returns:
-        JSON with matching techniques
+        JSON with matching techniques, most relevant first
     """
     try:
         attack = get_attack_framework()
@@ -175,6 +176,7 @@ def search_techniques():
         query = request.args.get('q', '').strip()
         tactic = request.args.get('tactic')
         include_subtechniques = request.args.get('include_subtechniques', 'true').lower() == 'true'
+        limit = request.args.get('limit', type=int)
         
         if not query:
             return jsonify({
@@ -182,15 +184,13 @@ def search_techniques():
                 'error': 'Search query (q) is required'
             }), 400
         
-        # Search techniques
-        results = attack.search_techniques(query, include_subtechniques=include_subtechniques)
-        
-        # Filter by tactic if specified
-        if tactic:
-            results = [
-                t for t in results
-                if tactic.lower() in [tac.lower() for tac in t.get('tactics', [])]
-            ]
+        # Ranked index search, filtered by tactic through the tactic index
+        results = attack.search_techniques(
+            query,
+            include_subtechniques=include_subtechniques,
+            tactic=tactic,
+            limit=limit
+        )
         
         return jsonify({
             'success': True,
@@ -199,7 +199,8 @@ def search_techniques():
             'query': query,
             'filter': {
                 'tactic': tactic,
-                'include_subtechniques': include_subtechniques
+                'include_subtechniques': include_subtechniques,
+                'limit': limit
             }
         })
     
@@ -349,12 +350,15 @@ def export_navigator_layer():
     
     Request body:
         {
-            "type": "profile|scenario|custom",
+            "type": "profile|scenario|custom|execution",
             "name": "Layer Name",
             "description": "Layer description",
             "technique_ids": ["T1055", ...],  // For custom
             "profile": {...},  // For profile
-            "scenario": {...}  // For scenario
+            "scenario": {...},  // For scenario
+            "version": "...",  // Optional source version, for profile and scenario
+            "session_id": "...",  // Optional, for execution
+            "agent_id": "..."  // Optional, for execution
         }
     
     Returns:
@@ -381,7 +385,8 @@ def export_navigator_layer():
             
             layer = exporter.create_profile_layer(
                 profile=data['profile'],
-                name=data.get('name')
+                name=data.get('name'),
+                version=data.get('version')
             )
         
         elif layer_type == 'scenario':
@@ -393,7 +398,8 @@ def export_navigator_layer():
             
             layer = exporter.create_scenario_layer(
                 scenario=data['scenario'],
-                name=data.get('name')
+                name=data.get('name'),
+                version=data.get('version')
             )
         
         elif layer_type == 'custom':
@@ -411,6 +417,21 @@ def export_navigator_layer():
                 colors=data.get('colors')
             )
         
+        elif layer_type == 'execution':
+            if exporter.tracker is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Technique tracking is not enabled'
+                }), 503
+            
+            live_layer = exporter.get_live_layer(
+                session_id=data.get('session_id'),
+                agent_id=data.get('agent_id')
+            )
+            _, layer = live_layer.snapshot()
+            if data.get('name'):
+                layer['name'] = data['name']
+        
         else:
             return jsonify({
                 'success': False,
@@ -436,14 +457,110 @@ def export_navigator_layer():
             'error': str(e)
         }), 500
 
+@attack_api.route('/navigator/live', methods=['GET'])
+def get_live_navigator_layer():
+    """
+    Get the live execution coverage layer, or its changes since a version
+    
+    Query params:
+        session_id: Only executions of this session (optional)
+        agent_id: Only executions of this agent (optional)
+        since: Layer version the client already holds (optional)
+    
+    Returns:
+        JSON with the layer version and either the changed techniques
+        (when since is given and still known) or the full layer
+    """
+    try:
+        exporter = get_navigator_exporter()
+        
+        if exporter.tracker is None:
+            return jsonify({
+                'success': False,
+                'error': 'Technique tracking is not enabled'
+            }), 503
+        
+        live_layer = exporter.get_live_layer(
+            session_id=request.args.get('session_id'),
+            agent_id=request.args.get('agent_id')
+        )
+        since = request.args.get('since', type=int)
+        
+        if since is not None:
+            diff = live_layer.diff(since)
+            if diff is not None:
+                return jsonify({
+                    'success': True,
+                    'layer_id': live_layer.layer_id,
+                    'version': diff['version'],
+                    'diff': diff
+                })
+        
+        version, layer = live_layer.snapshot()
+        return jsonify({
+            'success': True,
+            'layer_id': live_layer.layer_id,
+            'version': version,
+            'layer': layer
+        })
+    
+    except Exception as e:
+        logging.error(f"Error getting live Navigator layer: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@attack_api.route('/navigator/live', methods=['DELETE'])
+def release_live_navigator_layer():
+    """
+    Stop maintaining a live execution coverage layer
+    
+    Query params:
+        session_id: Layer of this session (optional)
+        agent_id: Layer of this agent (optional)
+    
+    Returns:
+        JSON with the layer ID and whether it was live
+    """
+    try:
+        exporter = get_navigator_exporter()
+        layer_id = LiveCoverageLayer.make_id(
+            session_id=request.args.get('session_id'),
+            agent_id=request.args.get('agent_id')
+        )
+        
+        if not exporter.release_live_layer(layer_id):
+            return jsonify({
+                'success': False,
+                'error': f'Live layer {layer_id} not found'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'layer_id': layer_id
+        })
+    
+    except Exception as e:
+        logging.error(f"Error releasing live Navigator layer: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
 
-def register_attack_api(app):
+def register_attack_api(app, technique_tracker=None):
     """
     Register ATT&CK API blueprint with Flask app
     
     Args:
         app: Flask application instance
+        technique_tracker: Optional TechniqueTracker whose executions feed
+            the live Navigator layers
     """
+    if technique_tracker is not None:
+        get_navigator_exporter().track(technique_tracker)
+    
     app.register_blueprint(attack_api)
     logging.info("Registered ATT&CK API endpoints at /api/v1/attack")
\ No newline at end of file
@@ -87,6 +87,7 @@ class PoolStatusResponse(BaseModel):
     total_count: int
     health_check_interval: int
     ttl_seconds: Optional[int] = None
+    metrics: Optional[Dict[str, Dict[str, Any]]] = None
 
 class OrchestratorMetricsResponse(BaseModel):
     """Orchestrator performance metrics."""
@@ -197,7 +198,7 @@ async def get_profile_container_status(
                     healthy=state.is_healthy(),
                     uptime_seconds=(datetime.utcnow() - state.start_time).total_seconds() if state.start_time else None,
                     last_used=state.last_used,
-                    metrics=None  # Can be extended
+                    metrics=orchestrator.container_manager.get_container_metrics(container_name)
                 )
             else:
                 # Determine pool from orchestrator
@@ -341,6 +342,13 @@ async def get_pool_status(
             if state and state.status == "running":
                 active_count += 1
         
+        # Latest background samples; no Docker stats calls per request
+        metrics = {}
+        for name in container_names:
+            sample = orchestrator.container_manager.get_container_metrics(name)
+            if sample is not None:
+                metrics[name] = sample
+        
         return PoolStatusResponse(
             pool_type=pool_type,
             description=pool.description,
@@ -348,7 +356,8 @@ async def get_pool_status(
             active_count=active_count,
             total_count=len(container_names),
             health_check_interval=pool.health_check_interval,
-            ttl_seconds=pool.ttl_seconds
+            ttl_seconds=pool.ttl_seconds,
+            metrics=metrics
         )
         
     except HTTPException:
@@ -388,6 +397,44 @@ async def get_orchestrator_metrics(
         raise HTTPException(status_code=500, detail=f"Metrics query failed: {str(e)}")
 
 
+@router.get("/metrics/{container_name}/history")
+async def get_container_metrics_history(
+    container_name: str,
+    metric: Optional[str] = None,
+    limit: int = 60,
+    orchestrator: HybridContainerOrchestrator = Depends(get_orchestrator)
+):
+    """
+    Get recent sampled metrics of a container.
+    
+    With a metric (cpu_percent, memory_usage_mb, memory_percent, network_rx_mb,
+    network_tx_mb or pids) returns its values for sparklines, otherwise the
+    full samples.
+    """
+    try:
+        history = orchestrator.container_manager.get_container_history(
+            container_name, metric=metric, limit=limit
+        )
+        
+        if history is None:
+            raise HTTPException(status_code=404, detail=f"No metrics for container {container_name}")
+        
+        return {
+            "container_name": container_name,
+            "metric": metric,
+            "history": history,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get metrics history for {container_name}: {e}")
+        raise HTTPException(status_code=500, detail=f"Metrics history query failed: {str(e)}")
+
+
 @router.get("/health")
 async def health_check(
     orchestrator: HybridContainerOrchestrator = Depends(get_orchestrator)
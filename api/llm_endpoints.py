@@ -7,7 +7,7 @@ cost tracking, and budget control.
 
 import logging
 from typing import Dict, Any, Optional
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from datetime import timedelta
 
 from ..core.llm_models import ModelRegistry, ModelSelector, ModelTier, ModelCapability
@@ -509,11 +509,11 @@ def export_usage_data():
     Query Parameters:
         session_id (str, optional): Filter by session
         profile_id (str, optional): Filter by profile
-        format (str, optional): Export format ('json' or 'csv', default: 'json')
+        format (str, optional): Export format ('json', 'csv' or 'jsonl', default: 'json')
         days (int, optional): Number of days to look back
     
     Returns:
-        JSON or CSV response with usage data
+        JSON response, or streamed CSV / JSON Lines response with usage data
     """
     if not _check_initialized():
         return jsonify({'error': 'LLM API not initialized'}), 500
@@ -528,6 +528,22 @@ def export_usage_data():
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days) if days else None
         
+        # CSV and JSON Lines are streamed so large histories stay off the heap
+        if format_type in ('csv', 'jsonl'):
+            chunks = _cost_tracker.stream_usage_data(
+                session_id=session_id,
+                profile_id=profile_id,
+                start_date=start_date,
+                end_date=end_date,
+                format=format_type
+            )
+            mimetypes = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+            return Response(
+                stream_with_context(chunks),
+                mimetype=mimetypes[format_type],
+                headers={'Content-Disposition': f'attachment; filename=llm_usage.{format_type}'}
+            )
+        
         # Export data
         data = _cost_tracker.export_usage_data(
             session_id=session_id,
@@ -537,19 +553,11 @@ def export_usage_data():
             format=format_type
         )
         
-        if format_type == 'csv':
-            from flask import Response
-            return Response(
-                data,
-                mimetype='text/csv',
-                headers={'Content-Disposition': 'attachment; filename=llm_usage.csv'}
-            )
-        else:
-            return jsonify({
-                'success': True,
-                'count': len(data),
-                'data': data
-            })
+        return jsonify({
+            'success': True,
+            'count': len(data),
+            'data': data
+        })
         
     except ValueError as e:
         return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
@@ -9,6 +9,7 @@ Notes:
 - This module does NOT mount the router; integration is a separate task.
 - Storage is independent and thread-safe with atomic writes.
 - Existing complex profile JSONs (with "metadata") are normalized for UI compatibility.
+- Profiles are served from an in-memory catalog kept coherent with disk via mtime checks.
 """
 
 from __future__ import annotations
@@ -16,11 +17,13 @@ from __future__ import annotations
 import json
 import logging
 import os
+import re
 import threading
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field, validator
@@ -42,6 +45,17 @@ def utc_now_iso() -> str:
     return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Fields covered by the search index
+SEARCH_FIELDS = ("name", "description", "specialization")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split lowercase text into alphanumeric search tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
 def _safe_int(val: Any, default: int = 0) -> int:
     try:
         return int(val)
@@ -164,12 +178,41 @@ class FileProfileStorage:
     - Directory: profiles/
     - Filename: profiles/{id}.json
     - Schema persisted matches ProfileOut; existing complex profiles will be normalized.
+
+    Normalized profiles are held in an in-memory catalog with id, name and
+    type indexes plus an inverted token index for search. The catalog is
+    loaded once and kept coherent with disk by comparing file mtimes: the
+    directory is re-stat'ed when its own mtime changes or at most every
+    ``refresh_interval`` seconds, and only changed files are re-parsed.
+    Writes made through this storage update the catalog in place.
     """
 
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, refresh_interval: float = 2.0):
         self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.lock = threading.RLock()
+        self.refresh_interval = refresh_interval
+
+        # Catalog: normalized profiles and the file each was read from
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._path_by_id: Dict[str, Path] = {}
+
+        # File state: path -> ((mtime_ns, size), profile id or None if unusable)
+        self._files: Dict[Path, Tuple[Tuple[int, int], Optional[str]]] = {}
+
+        # Secondary indexes
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_type: Dict[str, Set[str]] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []  # Sorted distinct tokens, scanned for infix matches
+        self._vocabulary_dirty = False
+
+        # Listing order (by filename), rebuilt lazily after changes
+        self._ordered_ids: Optional[List[str]] = None
+
+        self._dir_mtime_ns: Optional[int] = None
+        self._last_scan = 0.0
+        self._loaded = False
 
     # ---------- helpers ----------
 
@@ -181,6 +224,153 @@ class FileProfileStorage:
         with open(temp_path, "w", encoding="utf-8") as f:
             json.dump(content, f, indent=2)
         os.replace(temp_path, path)
+        # Keep the catalog coherent without re-reading the file
+        self._index_file(path, self._stat_key(path), self._normalize_loaded(content, path.name))
+        self._dir_mtime_ns = self._stat_dir()
+
+    # ---------- catalog ----------
+
+    @staticmethod
+    def _stat_key(path: Path) -> Tuple[int, int]:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+
+    def _stat_dir(self) -> Optional[int]:
+        try:
+            return self.base_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _ensure_fresh(self) -> None:
+        """Synchronize the catalog with disk if the directory may have changed."""
+        now = time.monotonic()
+        dir_mtime = self._stat_dir()
+        if (
+            self._loaded
+            and dir_mtime == self._dir_mtime_ns
+            and now - self._last_scan < self.refresh_interval
+        ):
+            return
+        self._scan()
+        self._dir_mtime_ns = dir_mtime
+        self._last_scan = now
+        self._loaded = True
+
+    def _scan(self) -> None:
+        """Stat every profile file and re-parse only new or modified ones."""
+        seen: Set[Path] = set()
+        for path in self.base_dir.glob("*.json"):
+            seen.add(path)
+            try:
+                key = self._stat_key(path)
+            except OSError:
+                continue
+            known = self._files.get(path)
+            if known is not None and known[0] == key:
+                continue
+            self._index_file(path, key, self._load_one(path))
+
+        for path in [p for p in self._files if p not in seen]:
+            self._unindex_file(path)
+
+    def _index_file(self, path: Path, key: Tuple[int, int], prof: Optional[Dict[str, Any]]) -> None:
+        """Add or replace the catalog entry for a file."""
+        self._unindex_file(path)
+        profile_id = prof["id"] if prof else None
+        self._files[path] = (key, profile_id)
+        if not prof:
+            return
+
+        current = self._path_by_id.get(profile_id)
+        # Prefer the canonical {id}.json file when several files share an id
+        if current is not None and current != path and current == self._path_for(profile_id):
+            return
+        if current is not None:
+            self._remove_from_indexes(profile_id)
+        self._add_to_indexes(prof, path)
+
+    def _unindex_file(self, path: Path) -> None:
+        """Remove the catalog entry for a file, promoting any duplicate."""
+        entry = self._files.pop(path, None)
+        if not entry or entry[1] is None:
+            return
+        profile_id = entry[1]
+        if self._path_by_id.get(profile_id) != path:
+            return
+        self._remove_from_indexes(profile_id)
+        # Another file may carry the same id (rare); fall back to it
+        for other, (_, other_id) in sorted(self._files.items()):
+            if other_id == profile_id:
+                prof = self._load_one(other)
+                if prof:
+                    self._add_to_indexes(prof, other)
+                break
+
+    @staticmethod
+    def _search_tokens(prof: Dict[str, Any]) -> Set[str]:
+        tokens: Set[str] = set()
+        for field in SEARCH_FIELDS:
+            tokens.update(_tokenize(prof.get(field) or ""))
+        return tokens
+
+    def _add_to_indexes(self, prof: Dict[str, Any], path: Path) -> None:
+        profile_id = prof["id"]
+        self._profiles[profile_id] = prof
+        self._path_by_id[profile_id] = path
+        self._by_name.setdefault((prof.get("name") or "").lower(), set()).add(profile_id)
+        self._by_type.setdefault(prof.get("type") or "", set()).add(profile_id)
+        for token in self._search_tokens(prof):
+            ids = self._tokens.get(token)
+            if ids is None:
+                self._tokens[token] = ids = set()
+                self._vocabulary_dirty = True
+            ids.add(profile_id)
+        self._ordered_ids = None
+
+    def _remove_from_indexes(self, profile_id: str) -> None:
+        prof = self._profiles.pop(profile_id, None)
+        self._path_by_id.pop(profile_id, None)
+        if prof is None:
+            return
+        self._discard(self._by_name, (prof.get("name") or "").lower(), profile_id)
+        self._discard(self._by_type, prof.get("type") or "", profile_id)
+        for token in self._search_tokens(prof):
+            if self._discard(self._tokens, token, profile_id):
+                self._vocabulary_dirty = True
+        self._ordered_ids = None
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, profile_id: str) -> bool:
+        """Remove an id from an index bucket; returns True if the bucket emptied."""
+        ids = index.get(key)
+        if ids is None:
+            return False
+        ids.discard(profile_id)
+        if not ids:
+            del index[key]
+            return True
+        return False
+
+    def _ordered(self, ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Return copies of profiles in filename order."""
+        if self._ordered_ids is None:
+            self._ordered_ids = sorted(self._profiles, key=lambda i: self._path_by_id[i])
+        if ids is None:
+            selected = self._ordered_ids
+        else:
+            selected = sorted(ids, key=lambda i: self._path_by_id[i])
+        return [dict(self._profiles[i]) for i in selected]
+
+    def _ids_containing(self, fragment: str) -> Set[str]:
+        """Collect ids for every indexed token containing ``fragment``."""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._tokens)
+            self._vocabulary_dirty = False
+        ids: Set[str] = set()
+        for token in self._vocabulary:
+            if fragment in token:
+                ids.update(self._tokens[token])
+        return ids
 
     def _normalize_loaded(self, data: Dict[str, Any], fallback_filename: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
@@ -265,28 +455,25 @@ class FileProfileStorage:
 
     # ---------- public API ----------
 
-    def list_profiles(self) -> List[Dict[str, Any]]:
+    def list_profiles(self, profile_type: Optional[str] = None) -> List[Dict[str, Any]]:
         with self.lock:
-            results: List[Dict[str, Any]] = []
-            for p in sorted(self.base_dir.glob("*.json")):
-                prof = self._load_one(p)
-                if prof:
-                    results.append(prof)
-            return results
+            self._ensure_fresh()
+            if profile_type is None:
+                return self._ordered()
+            return self._ordered(self._by_type.get(profile_type, ()))
+
+    def find_by_name(self, name: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            self._ensure_fresh()
+            return self._ordered(self._by_name.get((name or "").lower(), ()))
 
     def get_profile(self, profile_id: str) -> Dict[str, Any]:
         with self.lock:
-            path = self._path_for(profile_id)
-            if path.exists():
-                prof = self._load_one(path)
-                if prof:
-                    return prof
-            # As a fallback, scan directory in case file uses non-canonical schema name
-            for p in self.base_dir.glob("*.json"):
-                prof = self._load_one(p)
-                if prof and prof.get("id") == profile_id:
-                    return prof
-            raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+            self._ensure_fresh()
+            prof = self._profiles.get(profile_id)
+            if prof is None:
+                raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+            return dict(prof)
 
     def create_profile(self, payload: ProfileCreate) -> Dict[str, Any]:
         with self.lock:
@@ -327,25 +514,18 @@ class FileProfileStorage:
 
     def delete_profile(self, profile_id: str) -> Dict[str, Any]:
         with self.lock:
-            path = self._path_for(profile_id)
-            if path.exists():
-                try:
-                    os.remove(path)
-                    return {"id": profile_id, "deleted": True}
-                except Exception as e:
-                    logger.error(f"Failed to delete profile '{profile_id}': {e}")
-                    raise HTTPException(status_code=500, detail="Failed to delete profile")
-            # If not found, still confirm existence by scanning normalized profiles
-            for p in self.base_dir.glob("*.json"):
-                prof = self._load_one(p)
-                if prof and prof.get("id") == profile_id:
-                    try:
-                        os.remove(p)
-                        return {"id": profile_id, "deleted": True}
-                    except Exception as e:
-                        logger.error(f"Failed to delete profile '{profile_id}': {e}")
-                        raise HTTPException(status_code=500, detail="Failed to delete profile")
-            raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+            self._ensure_fresh()
+            path = self._path_by_id.get(profile_id)
+            if path is None:
+                raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+            try:
+                os.remove(path)
+            except Exception as e:
+                logger.error(f"Failed to delete profile '{profile_id}': {e}")
+                raise HTTPException(status_code=500, detail="Failed to delete profile")
+            self._unindex_file(path)
+            self._dir_mtime_ns = self._stat_dir()
+            return {"id": profile_id, "deleted": True}
 
     def set_status(self, profile_id: str, status: str) -> Dict[str, Any]:
         if status not in ALLOWED_STATUS:
@@ -381,16 +561,27 @@ class FileProfileStorage:
         q = (query or "").strip().lower()
         if not q:
             return []
-        results: List[Dict[str, Any]] = []
-        for prof in self.list_profiles():
-            haystacks = [
-                (prof.get("name") or "").lower(),
-                (prof.get("description") or "").lower(),
-                (prof.get("specialization") or "").lower(),
+        with self.lock:
+            self._ensure_fresh()
+            query_tokens = _tokenize(q)
+            if query_tokens:
+                # Every query token lies inside some indexed token of a matching
+                # field, so narrow candidates by infix lookups over the vocabulary
+                # (a distinct-token scan, not a profile scan), then confirm the
+                # full substring match
+                candidates: Optional[Set[str]] = None
+                for token in query_tokens:
+                    ids = self._ids_containing(token)
+                    candidates = ids if candidates is None else candidates & ids
+                    if not candidates:
+                        return []
+            else:
+                candidates = set(self._profiles)
+            matches = [
+                i for i in candidates
+                if any(q in (self._profiles[i].get(f) or "").lower() for f in SEARCH_FIELDS)
             ]
-            if any(q in h for h in haystacks):
-                results.append(prof)
-        return results
+            return self._ordered(matches)
 
 
 # -----------------------------------------------------------------------------
@@ -402,15 +593,18 @@ _storage = FileProfileStorage(Path("profiles"))
 
 
 @router.get("/", response_model=List[ProfileOut])
-async def list_profiles():
+async def list_profiles(type: Optional[str] = Query(None, description="Optional profile type filter")):
     """
     List profiles.
 
+    Parameters:
+        type (str, optional): Only return profiles of this type.
+
     Returns:
         List[ProfileOut]: All known profiles, normalized for UI consumption.
     """
     try:
-        return _storage.list_profiles()
+        return _storage.list_profiles(type)
     except Exception as e:
         logger.error(f"Error listing profiles: {e}")
         raise HTTPException(status_code=500, detail="Failed to list profiles")
@@ -4,8 +4,11 @@ REST API for Kali sandbox management and tool execution.
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Any
+from datetime import datetime
+import json
 import logging
 
 from ..sandbox.kali_connector import KaliConnector, KaliConnectorError
@@ -21,9 +24,10 @@ router = APIRouter(prefix="/api/sandbox", tags=["sandbox"])
 # Initialize sandbox components
 try:
     kali_connector = KaliConnector()
-    sandbox_manager = SandboxManager()
-    security_monitor = SecurityMonitor()
+    sandbox_manager = SandboxManager(state_file='data/sandbox/pool_state.json')
+    security_monitor = SecurityMonitor(audit_dir='data/sandbox/audit')
     network_isolation = NetworkIsolation()
+    sandbox_manager.start_metrics_collection()
     logger.info("Sandbox API components initialized")
 except Exception as e:
     logger.error(f"Failed to initialize sandbox components: {e}")
@@ -45,6 +49,22 @@ class SessionCreateRequest(BaseModel):
     session_id: str
     cpu_limit: Optional[str] = '2.0'
     memory_limit: Optional[str] = '4g'
+    template: Optional[str] = None
+
+
+class TemplateRegisterRequest(BaseModel):
+    name: str
+    snapshot_id: Optional[str] = None
+    container_id: Optional[str] = None
+    cpu_limit: Optional[str] = '2.0'
+    memory_limit: Optional[str] = '4g'
+    min_size: Optional[int] = 0
+    max_size: Optional[int] = 30
+
+
+class DemandScheduleRequest(BaseModel):
+    count: int
+    start_time: Optional[datetime] = None
 
 
 class ToolExecutionRequest(BaseModel):
@@ -105,13 +125,15 @@ async def create_session_sandbox(session_id: str, request: SessionCreateRequest)
         container_id = sandbox_manager.create_ephemeral_sandbox(
             session_id=session_id,
             cpu_limit=request.cpu_limit,
-            memory_limit=request.memory_limit
+            memory_limit=request.memory_limit,
+            template=request.template
         )
         
         return {
             "success": True,
             "session_id": session_id,
             "container_id": container_id,
+            "template": request.template,
             "message": "Ephemeral sandbox created successfully"
         }
         
@@ -155,33 +177,40 @@ async def destroy_session_sandbox(session_id: str):
 
 
 # Command execution endpoints
+def _check_command(request: CommandRequest) -> Dict[str, Any]:
+    """Run security monitoring and validation for a command request."""
+    if not kali_connector or not security_monitor:
+        raise HTTPException(status_code=503, detail="Sandbox system not available")
+    
+    # Security monitoring
+    monitor_result = security_monitor.monitor_command(
+        user_id=request.user_id,
+        command=request.command,
+        container_id=request.container_id or 'default'
+    )
+    
+    if not monitor_result['allowed']:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Command blocked: {monitor_result['reason']}"
+        )
+    
+    # Validate command
+    is_valid, reason = validate_command(request.command)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=f"Invalid command: {reason}")
+    
+    return monitor_result
+
+
 @router.post("/execute")
 async def execute_command(request: CommandRequest):
     """Execute validated command in sandbox."""
     try:
-        if not kali_connector or not security_monitor:
-            raise HTTPException(status_code=503, detail="Sandbox system not available")
+        monitor_result = _check_command(request)
         
-        # Security monitoring
-        monitor_result = security_monitor.monitor_command(
-            user_id=request.user_id,
-            command=request.command,
-            container_id=request.container_id or 'default'
-        )
-        
-        if not monitor_result['allowed']:
-            raise HTTPException(
-                status_code=403,
-                detail=f"Command blocked: {monitor_result['reason']}"
-            )
-        
-        # Validate command
-        is_valid, reason = validate_command(request.command)
-        if not is_valid:
-            raise HTTPException(status_code=400, detail=f"Invalid command: {reason}")
-        
-        # Execute command
-        result = kali_connector.execute_command(
+        # Execute command without blocking the event loop
+        result = await kali_connector.execute_command_async(
             command=request.command,
             timeout=request.timeout
         )
@@ -192,6 +221,8 @@ async def execute_command(request: CommandRequest):
             "stderr": result['stderr'],
             "exit_code": result['exit_code'],
             "execution_time": result['execution_time'],
+            "truncated": result['truncated'],
+            "timed_out": result['timed_out'],
             "warnings": monitor_result.get('warnings', []),
             "threat_level": monitor_result.get('threat_level', 'LOW')
         }
@@ -205,6 +236,29 @@ async def execute_command(request: CommandRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/execute/stream")
+async def execute_command_stream(request: CommandRequest):
+    """Execute validated command in sandbox, streaming output as JSON lines."""
+    monitor_result = _check_command(request)
+    
+    async def events():
+        yield json.dumps({
+            "type": "start",
+            "warnings": monitor_result.get('warnings', []),
+            "threat_level": monitor_result.get('threat_level', 'LOW')
+        }) + "\n"
+        try:
+            async for event in kali_connector.stream_command(
+                command=request.command,
+                timeout=request.timeout
+            ):
+                yield json.dumps(event) + "\n"
+        except KaliConnectorError as e:
+            yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 # Tool listing endpoints
 @router.get("/tools")
 async def list_available_tools():
@@ -261,6 +315,32 @@ async def get_container_metrics(container_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/metrics/{container_id}/history")
+async def get_container_metrics_history(container_id: str, metric: Optional[str] = None, limit: int = 60):
+    """Get recent sampled metrics for container (metric values for sparklines when a metric is given)."""
+    try:
+        if not sandbox_manager:
+            raise HTTPException(status_code=503, detail="Sandbox manager not available")
+        
+        history = sandbox_manager.get_sandbox_history(container_id, metric=metric, limit=limit)
+        if history is None:
+            raise HTTPException(status_code=404, detail="No metrics sampled for container")
+        
+        return {
+            "container_id": container_id,
+            "metric": metric,
+            "history": history
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get metrics history: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/list")
 async def list_sandboxes():
     """List all sandbox containers."""
@@ -322,20 +402,99 @@ async def restore_from_snapshot(snapshot_id: str, session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Template pool endpoints
+@router.post("/pool/templates")
+async def register_template(request: TemplateRegisterRequest):
+    """Register a template snapshot and keep a pool of paused sandboxes for it."""
+    try:
+        if not sandbox_manager:
+            raise HTTPException(status_code=503, detail="Sandbox manager not available")
+        
+        options = {
+            'cpu_limit': request.cpu_limit,
+            'memory_limit': request.memory_limit,
+            'min_size': request.min_size,
+            'max_size': request.max_size
+        }
+        
+        if request.snapshot_id:
+            template = sandbox_manager.register_template(request.name, request.snapshot_id, **options)
+        elif request.container_id:
+            template = sandbox_manager.create_template(request.name, request.container_id, **options)
+        else:
+            raise HTTPException(status_code=400, detail="snapshot_id or container_id required")
+        
+        sandbox_manager.start_pool_maintenance()
+        
+        return {
+            "success": True,
+            "template": template.to_dict()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to register template: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/pool/{template}/schedule")
+async def schedule_template_demand(template: str, request: DemandScheduleRequest):
+    """Announce sessions starting from a template so its pool is filled ahead of time."""
+    try:
+        if not sandbox_manager:
+            raise HTTPException(status_code=503, detail="Sandbox manager not available")
+        
+        start_time = request.start_time.timestamp() if request.start_time else None
+        sandbox_manager.schedule_demand(template, request.count, at=start_time)
+        
+        return {
+            "success": True,
+            "template": template,
+            "count": request.count,
+            "target_size": sandbox_manager.templates[template].target_size
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to schedule template demand: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/pool/status")
+async def get_pool_status():
+    """Get template pool sizes, demand forecasts and warm/cold start counts."""
+    try:
+        if not sandbox_manager:
+            raise HTTPException(status_code=503, detail="Sandbox manager not available")
+        
+        return sandbox_manager.get_pool_status()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get pool status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Security endpoints
 @router.get("/security/audit-log")
-async def get_audit_log(user_id: Optional[str] = None, limit: int = 100):
+async def get_audit_log(user_id: Optional[str] = None, limit: int = 100, container_id: Optional[str] = None):
     """Get security audit log."""
     try:
         if not security_monitor:
             raise HTTPException(status_code=503, detail="Security monitor not available")
         
-        logs = security_monitor.get_audit_log(user_id=user_id, limit=limit)
+        logs = security_monitor.get_audit_log(user_id=user_id, limit=limit, container_id=container_id)
         
         return {
             "logs": logs,
             "total": len(logs),
-            "user_filter": user_id
+            "user_filter": user_id,
+            "container_filter": container_id
         }
         
     except Exception as e:
@@ -6,8 +6,8 @@ Handles real-time communication for training sessions, system updates, and notif
 import asyncio
 import json
 import logging
-import uvicorn
-from typing import Dict, Set, Optional
+from collections import deque
+from typing import Dict, Set, Optional, Callable, Deque
 from datetime import datetime
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query
 from fastapi.websockets import WebSocketState
@@ -16,20 +16,165 @@ from fastapi.responses import HTMLResponse
 logger = logging.getLogger(__name__)
 
 
+# Delivery policies for messages waiting in a client's outbound queue
+DELIVERY_QUEUE = "queue"  # Always delivered, in order
+DELIVERY_DROP = "drop"    # Discarded while the client is backlogged
+DELIVERY_MERGE = "merge"  # A newer message replaces a pending one with the same key
+
+# Policies of high-rate topics; other topics and sessions are queued
+DEFAULT_TOPIC_POLICIES = {
+    "system_status": DELIVERY_MERGE,
+    "tools": DELIVERY_DROP
+}
+
+
+class ClientChannel:
+    """
+    Outbound queue and sender task of one WebSocket client
+    
+    Messages arrive already serialized. Each client is drained by its own
+    task, so a slow client delays only itself.
+    """
+    
+    def __init__(self, client_id: str, websocket: WebSocket, max_queue: int = 256, drop_threshold: Optional[int] = None):
+        """
+        Initialize the channel
+        
+        Args:
+            client_id: Client identifier
+            websocket: Client WebSocket
+            max_queue: Pending messages before the client is treated as stalled
+            drop_threshold: Pending messages above which droppable messages
+                are discarded (defaults to half of max_queue)
+        """
+        self.client_id = client_id
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.drop_threshold = drop_threshold if drop_threshold is not None else max_queue // 2
+        
+        # Entries are [policy, merge key, payload] so merges replace in place
+        self.queue: Deque[list] = deque()
+        self.pending: Dict[str, list] = {}
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        
+        self.sent = 0
+        self.dropped = 0
+        self.merged = 0
+        
+    def offer(self, payload: str, policy: str = DELIVERY_QUEUE, merge_key: Optional[str] = None) -> bool:
+        """
+        Queue a serialized message according to its delivery policy
+        
+        Args:
+            payload: Serialized JSON message
+            policy: DELIVERY_QUEUE, DELIVERY_DROP or DELIVERY_MERGE
+            merge_key: Key of mergeable messages
+            
+        Returns:
+            False if the queue is full of messages that cannot be dropped
+        """
+        if policy == DELIVERY_MERGE:
+            entry = self.pending.get(merge_key)
+            if entry is not None:
+                entry[2] = payload
+                self.merged += 1
+                return True
+        elif policy == DELIVERY_DROP and len(self.queue) >= self.drop_threshold:
+            self.dropped += 1
+            return True
+        
+        if len(self.queue) >= self.max_queue and not self._evict():
+            return False
+        
+        entry = [policy, merge_key, payload]
+        self.queue.append(entry)
+        if policy == DELIVERY_MERGE:
+            self.pending[merge_key] = entry
+        self.ready.set()
+        return True
+        
+    def _evict(self) -> bool:
+        """Discard the oldest pending message that is not always delivered"""
+        for entry in self.queue:
+            if entry[0] != DELIVERY_QUEUE:
+                self.queue.remove(entry)
+                if entry[0] == DELIVERY_MERGE:
+                    self.pending.pop(entry[1], None)
+                self.dropped += 1
+                return True
+        return False
+        
+    async def run(self, on_error: Callable[[str], None]) -> None:
+        """Send queued messages until cancelled or the connection fails"""
+        try:
+            while True:
+                await self.ready.wait()
+                while self.queue:
+                    policy, merge_key, _ = entry = self.queue.popleft()
+                    if policy == DELIVERY_MERGE and self.pending.get(merge_key) is entry:
+                        del self.pending[merge_key]
+                    if self.websocket.client_state == WebSocketState.CONNECTED:
+                        await self.websocket.send_text(entry[2])
+                        self.sent += 1
+                self.ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending message to {self.client_id}: {e}")
+            on_error(self.client_id)
+
+
 class ConnectionManager:
-    """Manages WebSocket connections and message broadcasting"""
+    """
+    Manages WebSocket connections and message broadcasting
+    
+    Subscriptions are indexed both by topic or session and by client, so a
+    disconnect only touches the client's own subscriptions. Broadcasts
+    serialize a message once and enqueue it on each recipient's channel;
+    sends to different clients proceed concurrently.
+    """
     
-    def __init__(self):
+    def __init__(self, max_queue: int = 256, topic_policies: Optional[Dict[str, str]] = None):
+        """
+        Initialize the connection manager
+        
+        Args:
+            max_queue: Pending messages per client before it is disconnected
+            topic_policies: Delivery policy by topic (defaults to
+                DEFAULT_TOPIC_POLICIES)
+        """
+        self.max_queue = max_queue
+        self.topic_policies: Dict[str, str] = dict(
+            DEFAULT_TOPIC_POLICIES if topic_policies is None else topic_policies
+        )
+        
         # Store active connections by client ID
         self.active_connections: Dict[str, WebSocket] = {}
+        self.channels: Dict[str, ClientChannel] = {}
         # Store subscriptions by topic
         self.subscriptions: Dict[str, Set[str]] = {}
         # Store session subscribers
         self.session_subscribers: Dict[str, Set[str]] = {}
+        # Reverse indexes from client to its topics and sessions
+        self.client_topics: Dict[str, Set[str]] = {}
+        self.client_sessions: Dict[str, Set[str]] = {}
+        
+        # Counters of clients that have disconnected
+        self.closed_sent = 0
+        self.closed_dropped = 0
+        self.closed_merged = 0
+        self.stalled_disconnects = 0
         
     async def connect(self, websocket: WebSocket, client_id: str) -> None:
         """Accept and register a new WebSocket connection"""
         await websocket.accept()
+        if client_id in self.channels:
+            self.disconnect(client_id)
+        
+        channel = ClientChannel(client_id, websocket, max_queue=self.max_queue)
+        channel.task = asyncio.create_task(channel.run(self.disconnect))
+        self.channels[client_id] = channel
         self.active_connections[client_id] = websocket
         logger.info(f"Client {client_id} connected. Total connections: {len(self.active_connections)}")
         
@@ -40,89 +185,172 @@ class ConnectionManager:
             "timestamp": datetime.utcnow().isoformat()
         })
         
-    def disconnect(self, client_id: str) -> None:
-        """Remove a WebSocket connection"""
+    def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None) -> None:
+        """
+        Remove a WebSocket connection
+        
+        Args:
+            client_id: Client identifier
+            websocket: Only remove the client if this is still its connection,
+                so a stale handler does not drop a reconnected client
+        """
+        if websocket is not None and self.active_connections.get(client_id) is not websocket:
+            return
+        
         if client_id in self.active_connections:
             del self.active_connections[client_id]
+        
+        channel = self.channels.pop(client_id, None)
+        if channel is not None:
+            if channel.task is not None and channel.task is not asyncio.current_task():
+                channel.task.cancel()
+            self.closed_sent += channel.sent
+            self.closed_dropped += channel.dropped
+            self.closed_merged += channel.merged
             
-        # Remove from all subscriptions
-        for topic_subscribers in self.subscriptions.values():
-            topic_subscribers.discard(client_id)
+        # Remove from the client's own subscriptions
+        for topic in self.client_topics.pop(client_id, ()):
+            self._discard(self.subscriptions, topic, client_id)
             
-        # Remove from session subscriptions
-        for session_subscribers in self.session_subscribers.values():
-            session_subscribers.discard(client_id)
+        # Remove from the client's own session subscriptions
+        for session_id in self.client_sessions.pop(client_id, ()):
+            self._discard(self.session_subscribers, session_id, client_id)
             
         logger.info(f"Client {client_id} disconnected. Total connections: {len(self.active_connections)}")
         
+    @staticmethod
+    async def _close(websocket: WebSocket, client_id: str) -> None:
+        """Close a stalled client's socket (1013: try again later)"""
+        try:
+            await websocket.close(code=1013)
+        except Exception as e:
+            logger.debug(f"Error closing stalled client {client_id}: {e}")
+            
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, client_id: str) -> None:
+        """Remove a client from an index entry, dropping the entry when empty"""
+        clients = index.get(key)
+        if clients is not None:
+            clients.discard(client_id)
+            if not clients:
+                del index[key]
+                
+    @staticmethod
+    def _serialize(message: dict) -> str:
+        """Serialize a message once for all recipients"""
+        return json.dumps(message, default=str)
+        
+    async def _deliver(self, client_ids, payload: str, policy: str = DELIVERY_QUEUE, merge_key: Optional[str] = None) -> int:
+        """Enqueue a serialized message for clients and return the number reached"""
+        stalled = []
+        delivered = 0
+        
+        for client_id in client_ids:
+            channel = self.channels.get(client_id)
+            if channel is None:
+                continue
+            if channel.offer(payload, policy, merge_key):
+                delivered += 1
+            else:
+                stalled.append(client_id)
+                
+        # Clients too slow to take messages that must be delivered
+        for client_id in stalled:
+            logger.warning(f"Disconnecting stalled client {client_id}: outbound queue full")
+            self.stalled_disconnects += 1
+            websocket = self.active_connections.get(client_id)
+            self.disconnect(client_id)
+            if websocket is not None:
+                # Close so the client notices and reconnects instead of
+                # staying subscribed to nothing
+                asyncio.ensure_future(self._close(websocket, client_id))
+            
+        # Let sender tasks start draining before the next broadcast
+        await asyncio.sleep(0)
+        return delivered
+        
+    def set_topic_policy(self, topic: str, policy: str) -> None:
+        """Set the delivery policy of a topic"""
+        if policy not in (DELIVERY_QUEUE, DELIVERY_DROP, DELIVERY_MERGE):
+            raise ValueError(f"Unknown delivery policy: {policy}")
+        self.topic_policies[topic] = policy
+        
     async def send_personal_message(self, client_id: str, message: dict) -> None:
         """Send a message to a specific client"""
-        if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
-            try:
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending message to {client_id}: {e}")
-                self.disconnect(client_id)
+        await self._deliver((client_id,), self._serialize(message))
                 
     async def broadcast(self, message: dict, exclude: Optional[Set[str]] = None) -> None:
         """Broadcast a message to all connected clients"""
         exclude = exclude or set()
-        disconnected = []
-        
-        for client_id, websocket in self.active_connections.items():
-            if client_id not in exclude:
-                try:
-                    if websocket.client_state == WebSocketState.CONNECTED:
-                        await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {client_id}: {e}")
-                    disconnected.append(client_id)
-                    
-        # Clean up disconnected clients
-        for client_id in disconnected:
-            self.disconnect(client_id)
+        recipients = [client_id for client_id in self.channels if client_id not in exclude]
+        await self._deliver(recipients, self._serialize(message))
             
-    async def broadcast_to_topic(self, topic: str, message: dict) -> None:
-        """Broadcast a message to all subscribers of a topic"""
-        if topic in self.subscriptions:
-            subscribers = self.subscriptions[topic].copy()
-            for client_id in subscribers:
-                await self.send_personal_message(client_id, message)
+    async def broadcast_to_topic(self, topic: str, message: dict, merge_key: Optional[str] = None) -> None:
+        """
+        Broadcast a message to all subscribers of a topic
+        
+        Args:
+            topic: Topic name
+            message: Message to send
+            merge_key: Key identifying messages that replace each other on
+                merge-policy topics (defaults to the topic)
+        """
+        subscribers = self.subscriptions.get(topic)
+        if subscribers:
+            policy = self.topic_policies.get(topic, DELIVERY_QUEUE)
+            await self._deliver(list(subscribers), self._serialize(message), policy, merge_key or topic)
                 
     async def broadcast_to_session(self, session_id: str, message: dict) -> None:
         """Broadcast a message to all subscribers of a training session"""
-        if session_id in self.session_subscribers:
-            subscribers = self.session_subscribers[session_id].copy()
-            for client_id in subscribers:
-                await self.send_personal_message(client_id, message)
+        subscribers = self.session_subscribers.get(session_id)
+        if subscribers:
+            await self._deliver(list(subscribers), self._serialize(message))
                 
     def subscribe(self, client_id: str, topic: str) -> None:
         """Subscribe a client to a topic"""
-        if topic not in self.subscriptions:
-            self.subscriptions[topic] = set()
-        self.subscriptions[topic].add(client_id)
+        if client_id not in self.channels:
+            logger.warning(f"Ignoring subscription of disconnected client {client_id} to topic: {topic}")
+            return
+        self.subscriptions.setdefault(topic, set()).add(client_id)
+        self.client_topics.setdefault(client_id, set()).add(topic)
         logger.info(f"Client {client_id} subscribed to topic: {topic}")
         
     def unsubscribe(self, client_id: str, topic: str) -> None:
         """Unsubscribe a client from a topic"""
         if topic in self.subscriptions:
-            self.subscriptions[topic].discard(client_id)
+            self._discard(self.subscriptions, topic, client_id)
+            self._discard(self.client_topics, client_id, topic)
             logger.info(f"Client {client_id} unsubscribed from topic: {topic}")
             
     def subscribe_to_session(self, client_id: str, session_id: str) -> None:
         """Subscribe a client to a training session"""
-        if session_id not in self.session_subscribers:
-            self.session_subscribers[session_id] = set()
-        self.session_subscribers[session_id].add(client_id)
+        if client_id not in self.channels:
+            logger.warning(f"Ignoring subscription of disconnected client {client_id} to session: {session_id}")
+            return
+        self.session_subscribers.setdefault(session_id, set()).add(client_id)
+        self.client_sessions.setdefault(client_id, set()).add(session_id)
         logger.info(f"Client {client_id} subscribed to session: {session_id}")
         
     def unsubscribe_from_session(self, client_id: str, session_id: str) -> None:
         """Unsubscribe a client from a training session"""
         if session_id in self.session_subscribers:
-            self.session_subscribers[session_id].discard(client_id)
+            self._discard(self.session_subscribers, session_id, client_id)
+            self._discard(self.client_sessions, client_id, session_id)
             logger.info(f"Client {client_id} unsubscribed from session: {session_id}")
+            
+    def get_statistics(self) -> dict:
+        """Get connection, subscription and delivery statistics"""
+        channels = list(self.channels.values())
+        return {
+            "connections": len(self.active_connections),
+            "topics": len(self.subscriptions),
+            "sessions": len(self.session_subscribers),
+            "queued_messages": sum(len(channel.queue) for channel in channels),
+            "sent_messages": self.closed_sent + sum(channel.sent for channel in channels),
+            "dropped_messages": self.closed_dropped + sum(channel.dropped for channel in channels),
+            "merged_messages": self.closed_merged + sum(channel.merged for channel in channels),
+            "stalled_disconnects": self.stalled_disconnects
+        }
 
 
 # Global connection manager instance
@@ -228,10 +456,10 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str) -> None:
                 })
                 
     except WebSocketDisconnect:
-        manager.disconnect(client_id)
+        manager.disconnect(client_id, websocket)
     except Exception as e:
         logger.error(f"WebSocket error for {client_id}: {e}")
-        manager.disconnect(client_id)
+        manager.disconnect(client_id, websocket)
 
 
 # Helper functions for broadcasting events
@@ -293,7 +521,7 @@ async def broadcast_tool_execution(tool_name: str, execution_data: dict) -> None
         "data": execution_data,
         "timestamp": datetime.utcnow().isoformat()
     }
-    await manager.broadcast_to_topic("tools", message)
+    await manager.broadcast_to_topic("tools", message, merge_key=tool_name)
 
 
 async def broadcast_cost_alert(alert_data: dict, target: Optional[str] = None) -> None:
@@ -349,7 +577,11 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "connections": len(manager.active_connections)}
+    return {
+        "status": "healthy",
+        "connections": len(manager.active_connections),
+        "delivery": manager.get_statistics()
+    }
 
 
 @app.websocket("/ws")
@@ -393,6 +625,8 @@ __all__ = [
 
 
 if __name__ == "__main__":
+    import uvicorn
+    
     # Configure logging
     logging.basicConfig(
         level=logging.INFO,
@@ -10,7 +10,6 @@ import json
 from typing import Optional
 from datetime import timedelta
 from tabulate import tabulate
-from pathlib import Path
 
 from ..core.performance_metrics import PerformanceMetricsEngine
 from ..core.training_effectiveness import TrainingEffectivenessTracker
@@ -384,16 +383,31 @@ def benchmark(ctx, operator_id: str):
     click.echo(f"Your XP: {operator_xp} (Avg: {sum(xp_values)/len(xp_values):.0f})")
     click.echo(f"Your Sessions: {profile.total_sessions} (Avg: {sum(session_counts)/len(session_counts):.0f})")
     click.echo(f"Your Hours: {profile.total_hours:.1f} (Avg: {sum(hours_values)/len(hours_values):.1f})")
+    
+    # Averages are ranked against other operators' averages, not single sessions
+    average_scores = {}
+    for op in all_operators:
+        sessions = performance_engine.get_operator_sessions(op.operator_id)
+        if sessions:
+            average_scores[op.operator_id] = sum(s.score for s in sessions) / len(sessions)
+    
+    if operator_id in average_scores:
+        average_score = average_scores[operator_id]
+        percentile = performance_engine.benchmark_engine.calculate_percentile_rank(
+            average_score, list(average_scores.values())
+        )
+        click.echo(f"Your Average Score: {average_score:.2f} ({percentile:.0f}th percentile of operators)")
 
 
 @analytics_cli.command(name='export-report')
 @click.argument('report_type', type=click.Choice(['operator', 'team', 'cost', 'trends']))
 @click.argument('output_path', type=click.Path())
-@click.option('--format', '-f', type=click.Choice(['json', 'csv', 'html', 'markdown']), default='json')
+@click.option('--format', '-f', type=click.Choice(['json', 'jsonl', 'csv', 'html', 'markdown']), default='json')
 @click.option('--operator-id', '-o', help='Operator ID (for operator report)')
 @click.option('--days', '-d', type=int, default=30, help='Time range in days')
+@click.option('--gzip', 'compress', is_flag=True, help='Gzip-compress the output file')
 @click.pass_context
-def export_report(ctx, report_type: str, output_path: str, format: str, operator_id: Optional[str], days: int):
+def export_report(ctx, report_type: str, output_path: str, format: str, operator_id: Optional[str], days: int, compress: bool):
     """Export reports."""
     reporting_engine = ctx.obj.get('reporting_engine')
     performance_engine = ctx.obj.get('performance_engine')
@@ -412,6 +426,7 @@ def export_report(ctx, report_type: str, output_path: str, format: str, operator
     
     format_map = {
         'json': ReportFormat.JSON,
+        'jsonl': ReportFormat.JSONL,
         'csv': ReportFormat.CSV,
         'html': ReportFormat.HTML,
         'markdown': ReportFormat.MARKDOWN
@@ -440,13 +455,13 @@ def export_report(ctx, report_type: str, output_path: str, format: str, operator
                 time_range=timedelta(days=days)
             )
         
-        # Export
-        content = reporting_engine.export_report(report.id, format_map[format])
-        
-        # Write to file
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        output_file.write_text(content, encoding='utf-8')
+        # Stream export to file
+        reporting_engine.export_report_to_file(
+            report.id,
+            format_map[format],
+            output_path,
+            compress=compress
+        )
         
         click.echo(f"Report exported to: {output_path}")
         click.echo(f"Report ID: {report.id}")
@@ -35,6 +35,7 @@ class FrameworkConfig:
     session_timeout: int = 3600
     checkpoint_interval: int = 300
     recovery_enabled: bool = True
+    data_dir: str = "data/"
     
     # Logging configuration
     log_level: str = "INFO"
@@ -49,8 +50,12 @@ class FrameworkConfig:
     default_profile_path: str = "profiles/"
     cache_enabled: bool = True
     cache_size: int = 100
+    cache_max_bytes: int = 0  # 0 = no size-based bound
     validation_enabled: bool = True
     auto_reload: bool = False
+    lazy_loading: bool = False
+    load_workers: int = 4
+    manifest_dir: str = "cache/"  # relative to data_dir; empty = no load manifest
     
     # Tool system
     enabled_tools: list = field(default_factory=list)
@@ -207,7 +212,8 @@ class FrameworkConfig:
                 'max_concurrent_agents': 'max_concurrent_agents',
                 'session_timeout': 'session_timeout',
                 'checkpoint_interval': 'checkpoint_interval',
-                'recovery_enabled': 'recovery_enabled'
+                'recovery_enabled': 'recovery_enabled',
+                'data_dir': 'data_dir'
             },
             'logging': {
                 'level': 'log_level',
@@ -222,8 +228,12 @@ class FrameworkConfig:
                 'default_profile_path': 'default_profile_path',
                 'cache_enabled': 'cache_enabled',
                 'cache_size': 'cache_size',
+                'cache_max_bytes': 'cache_max_bytes',
                 'validation_enabled': 'validation_enabled',
-                'auto_reload': 'auto_reload'
+                'auto_reload': 'auto_reload',
+                'lazy_loading': 'lazy_loading',
+                'load_workers': 'load_workers',
+                'manifest_dir': 'manifest_dir'
             },
             'tools': {
                 'enabled_tools': 'enabled_tools',
@@ -331,7 +341,8 @@ class FrameworkConfig:
                 'max_concurrent_agents': self.max_concurrent_agents,
                 'session_timeout': self.session_timeout,
                 'checkpoint_interval': self.checkpoint_interval,
-                'recovery_enabled': self.recovery_enabled
+                'recovery_enabled': self.recovery_enabled,
+                'data_dir': self.data_dir
             },
             'logging': {
                 'level': self.log_level,
@@ -346,8 +357,12 @@ class FrameworkConfig:
                 'default_profile_path': self.default_profile_path,
                 'cache_enabled': self.cache_enabled,
                 'cache_size': self.cache_size,
+                'cache_max_bytes': self.cache_max_bytes,
                 'validation_enabled': self.validation_enabled,
-                'auto_reload': self.auto_reload
+                'auto_reload': self.auto_reload,
+                'lazy_loading': self.lazy_loading,
+                'load_workers': self.load_workers,
+                'manifest_dir': self.manifest_dir
             },
             'tools': {
                 'enabled_tools': self.enabled_tools,
@@ -494,6 +509,24 @@ class FrameworkConfig:
         # Update the corresponding attribute if possible
         self._update_from_dict(self._config_data)
     
+    def resolve_data_path(self, path: Union[str, Path]) -> Optional[Path]:
+        """
+        Resolve a configured path against the framework data directory.
+        
+        Args:
+            path: Absolute path, or path relative to ``data_dir``
+            
+        Returns:
+            Resolved path, or None if the path is empty (feature disabled)
+        """
+        if not path:
+            return None
+        
+        path = Path(path).expanduser()
+        if path.is_absolute():
+            return path
+        return Path(self.data_dir).expanduser() / path
+    
     def reload(self) -> None:
         """
         Reload configuration from the original file.
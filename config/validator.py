@@ -129,6 +129,11 @@ class ConfigValidator:
         if 'recovery_enabled' in core:
             if not isinstance(core['recovery_enabled'], bool):
                 self.errors.append(ValidationError("recovery_enabled must be a boolean", "core.recovery_enabled"))
+        
+        # Validate data_dir
+        if 'data_dir' in core:
+            if not isinstance(core['data_dir'], str) or not core['data_dir']:
+                self.errors.append(ValidationError("data_dir must be a non-empty string", "core.data_dir"))
     
     def _validate_logging(self, logging: Dict[str, Any]) -> None:
         """Validate logging section."""
@@ -172,6 +177,26 @@ class ConfigValidator:
         if 'cache_size' in profiles:
             if not isinstance(profiles['cache_size'], int) or profiles['cache_size'] <= 0:
                 self.errors.append(ValidationError("cache_size must be a positive integer", "profiles.cache_size"))
+        
+        # Validate cache_max_bytes
+        if 'cache_max_bytes' in profiles:
+            if not isinstance(profiles['cache_max_bytes'], int) or profiles['cache_max_bytes'] < 0:
+                self.errors.append(ValidationError("cache_max_bytes must be a non-negative integer", "profiles.cache_max_bytes"))
+        
+        # Validate lazy_loading
+        if 'lazy_loading' in profiles:
+            if not isinstance(profiles['lazy_loading'], bool):
+                self.errors.append(ValidationError("lazy_loading must be a boolean", "profiles.lazy_loading"))
+        
+        # Validate load_workers
+        if 'load_workers' in profiles:
+            if not isinstance(profiles['load_workers'], int) or profiles['load_workers'] <= 0:
+                self.errors.append(ValidationError("load_workers must be a positive integer", "profiles.load_workers"))
+        
+        # Validate manifest_dir
+        if 'manifest_dir' in profiles:
+            if not isinstance(profiles['manifest_dir'], str):
+                self.errors.append(ValidationError("manifest_dir must be a string", "profiles.manifest_dir"))
     
     def _validate_tools(self, tools: Dict[str, Any]) -> None:
         """Validate tools section."""
@@ -438,7 +463,8 @@ class ConfigValidator:
                     'max_concurrent_agents': int,
                     'session_timeout': int,
                     'checkpoint_interval': int,
-                    'recovery_enabled': bool
+                    'recovery_enabled': bool,
+                    'data_dir': str
                 },
                 'ranges': {
                     'max_concurrent_agents': (1, 1000),
@@ -10,7 +10,7 @@ This module contains the core components of the ATS MAFIA framework:
 """
 
 from .orchestrator import TrainingOrchestrator
-from .profile_manager import ProfileManager
+from .profile_manager import ProfileManager, ProfileLoadError
 from .tool_system import ToolRegistry
 from .communication import CommunicationProtocol
 from .logging import AuditLogger
@@ -18,6 +18,7 @@ from .logging import AuditLogger
 __all__ = [
     "TrainingOrchestrator",
     "ProfileManager",
+    "ProfileLoadError",
     "ToolRegistry",
     "CommunicationProtocol",
     "AuditLogger"
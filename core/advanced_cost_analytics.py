@@ -6,14 +6,18 @@ cost forecasting beyond the basic cost tracking capabilities.
 """
 
 import logging
+import math
 import statistics
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+import weakref
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import Enum
 
 from .cost_tracker import CostTracker, UsageMetrics
+from .analytics_aggregator import AlertManager, AlertType, AlertPriority
 
 
 class CostCategory(Enum):
@@ -578,106 +582,351 @@ class BudgetPlanner:
         }
 
 
+class RunningStats:
+    """Welford running mean and variance."""
+    
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def update(self, value: float) -> None:
+        """Add an observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (0.0 with fewer than two observations)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to dictionary."""
+        return {'count': self.count, 'mean': self.mean, 'stdev': self.stdev}
+
+
 class CostAnomalyDetector:
     """
     Identify unusual spending patterns and potential issues.
+    
+    The detector subscribes to the cost tracker and updates streaming
+    estimators on every recorded usage: Welford cost baselines (global, per
+    model and per profile), an EWMA of daily totals and a rolling error
+    window. Anomalies are raised as they happen (through an attached
+    AlertManager, if any) and kept in a snapshot that can be read without
+    touching the tracker lock.
+    
+    The tracker only holds a weak reference to the detector: the
+    subscription ends on ``close()``, when a ``with`` block exits, or when the
+    detector is garbage collected.
     """
     
-    def __init__(self, cost_tracker: CostTracker):
+    def __init__(self,
+                 cost_tracker: CostTracker,
+                 alert_manager: Optional[AlertManager] = None,
+                 z_threshold: float = 2.0,
+                 min_samples: int = 10,
+                 daily_alpha: float = 0.3,
+                 spike_factor: float = 2.0,
+                 error_window: int = 100,
+                 error_rate_threshold: float = 0.1,
+                 anomaly_ttl: timedelta = timedelta(days=7)):
         """
         Initialize anomaly detector.
         
         Args:
             cost_tracker: Cost tracker instance
+            alert_manager: Alert manager that receives new anomalies
+            z_threshold: Standard deviations above the mean for an expensive request
+            min_samples: Observations needed before a baseline is trusted
+            daily_alpha: EWMA weight of the latest completed day
+            spike_factor: Multiple of the daily EWMA that counts as a spike
+            error_window: Number of recent requests in the error rate window
+            error_rate_threshold: Error rate above which spending is flagged
+            anomaly_ttl: How long an anomaly stays current after it was last seen
         """
         self.cost_tracker = cost_tracker
+        self.alert_manager = alert_manager
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.daily_alpha = daily_alpha
+        self.spike_factor = spike_factor
+        self.error_rate_threshold = error_rate_threshold
+        self.anomaly_ttl = anomaly_ttl
         self.logger = logging.getLogger("cost_anomaly_detector")
+        self.lock = threading.RLock()
+        
+        # Streaming estimators
+        self.cost_stats = RunningStats()
+        self.model_stats: Dict[str, RunningStats] = defaultdict(RunningStats)
+        self.profile_stats: Dict[str, RunningStats] = defaultdict(RunningStats)
+        self.current_day = None
+        self.current_day_total = 0.0
+        self.daily_ewma: Optional[float] = None
+        self.error_window: deque = deque(maxlen=error_window)
+        self.error_count = 0
+        self.wasted_cost = 0.0
+        
+        # Current anomalies by (type, subject), published as an immutable snapshot
+        self._anomalies: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        self._last_seen: Dict[Tuple[str, Optional[str]], datetime] = {}
+        self._snapshot: Tuple[Dict[str, Any], ...] = ()
+        
+        # Build baselines from history without alerting, then follow live usage
+        listener = self._make_listener(weakref.ref(self))
+        with self.cost_tracker.lock:
+            history = list(self.cost_tracker.usage_records)
+            self.cost_tracker.add_usage_listener(listener)
+        self._unsubscribe = weakref.finalize(self, cost_tracker.remove_usage_listener, listener)
+        
+        for record in history:
+            self._observe(record, raise_alerts=False)
+    
+    @staticmethod
+    def _make_listener(detector_ref: 'weakref.ref') -> Callable[[UsageMetrics], None]:
+        """Build a usage listener that does not keep the detector alive."""
+        def listener(record: UsageMetrics) -> None:
+            detector = detector_ref()
+            if detector is not None:
+                detector.observe(record)
+        return listener
+    
+    def __enter__(self) -> 'CostAnomalyDetector':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def attach_alert_manager(self, alert_manager: Optional[AlertManager]) -> None:
+        """Send newly detected anomalies to an alert manager."""
+        self.alert_manager = alert_manager
+    
+    def close(self) -> None:
+        """Stop following the cost tracker (safe to call more than once)."""
+        self._unsubscribe()
+    
+    def observe(self, record: UsageMetrics) -> None:
+        """
+        Update the estimators with a recorded usage.
+        
+        Args:
+            record: Usage record
+        """
+        self._observe(record, raise_alerts=True)
+    
+    def _observe(self, record: UsageMetrics, raise_alerts: bool) -> None:
+        """Update estimators and anomalies for one record."""
+        with self.lock:
+            opened = []
+            
+            # Cache hits cost nothing and would drag the baselines down
+            if not record.cache_hit:
+                baselines = [
+                    ('expensive_requests', None, self.cost_stats),
+                    ('model_cost_deviation', record.model, self.model_stats[record.model]),
+                    ('profile_cost_deviation', record.profile_id, self.profile_stats[record.profile_id])
+                ]
+                
+                for anomaly_type, subject, stats in baselines:
+                    if stats.count >= self.min_samples:
+                        threshold = stats.mean + self.z_threshold * stats.stdev
+                        if record.cost > threshold:
+                            opened.append(self._flag_expensive(anomaly_type, subject, record, threshold))
+                    stats.update(record.cost)
+                
+                opened.append(self._update_daily(record))
+            
+            opened.append(self._update_errors(record))
+            self._expire(record.timestamp)
+            self._snapshot = tuple(dict(a) for a in self._anomalies.values())
+        
+        if raise_alerts:
+            for anomaly in opened:
+                if anomaly is not None:
+                    self._raise_alert(anomaly)
+    
+    def _set_anomaly(self,
+                     key: Tuple[str, Optional[str]],
+                     anomaly: Dict[str, Any],
+                     timestamp: datetime) -> Optional[Dict[str, Any]]:
+        """Store an anomaly, returning it if it was newly opened."""
+        is_new = key not in self._anomalies
+        
+        anomaly['last_seen'] = timestamp.isoformat()
+        anomaly.setdefault('detected_at', anomaly['last_seen'])
+        self._anomalies[key] = anomaly
+        self._last_seen[key] = timestamp
+        
+        return anomaly if is_new else None
+    
+    def _resolve(self, key: Tuple[str, Optional[str]]) -> None:
+        """Drop an anomaly that no longer holds."""
+        self._anomalies.pop(key, None)
+        self._last_seen.pop(key, None)
+    
+    def _flag_expensive(self,
+                        anomaly_type: str,
+                        subject: Optional[str],
+                        record: UsageMetrics,
+                        threshold: float) -> Optional[Dict[str, Any]]:
+        """Count an expensive request against a baseline."""
+        key = (anomaly_type, subject)
+        anomaly = dict(self._anomalies.get(key) or {
+            'type': anomaly_type,
+            'severity': 'medium',
+            'count': 0,
+            'examples': []
+        })
+        
+        if subject is not None:
+            anomaly['subject'] = subject
+        
+        anomaly['count'] += 1
+        anomaly['threshold'] = threshold
+        if len(anomaly['examples']) < 3:
+            anomaly['examples'] = anomaly['examples'] + [{
+                'id': record.id,
+                'cost': record.cost,
+                'model': record.model,
+                'timestamp': record.timestamp.isoformat()
+            }]
+        
+        scope = f" for {subject}" if subject is not None else ""
+        anomaly['description'] = (
+            f"Found {anomaly['count']} requests{scope} exceeding ${threshold:.4f}"
+        )
+        
+        return self._set_anomaly(key, anomaly, record.timestamp)
+    
+    def _update_daily(self, record: UsageMetrics) -> Optional[Dict[str, Any]]:
+        """Fold a record into the daily totals and check for a spike."""
+        date = record.timestamp.date()
+        
+        if self.current_day is None:
+            self.current_day = date
+        elif date > self.current_day:
+            # Day rolled over: fold the completed day into the EWMA
+            if self.daily_ewma is None:
+                self.daily_ewma = self.current_day_total
+            else:
+                self.daily_ewma += self.daily_alpha * (self.current_day_total - self.daily_ewma)
+            self.current_day = date
+            self.current_day_total = 0.0
+        elif date < self.current_day:
+            return None  # Late record for a day already folded
+        
+        self.current_day_total += record.cost
+        
+        if not self.daily_ewma or self.current_day_total <= self.spike_factor * self.daily_ewma:
+            return None
+        
+        return self._set_anomaly(('cost_spike', None), {
+            'type': 'cost_spike',
+            'severity': 'high',
+            'description': (
+                f"Daily cost spike detected: ${self.current_day_total:.2f} "
+                f"vs avg ${self.daily_ewma:.2f}"
+            ),
+            'max_daily_cost': self.current_day_total,
+            'average_daily_cost': self.daily_ewma,
+            'date': date.isoformat()
+        }, record.timestamp)
+    
+    def _update_errors(self, record: UsageMetrics) -> Optional[Dict[str, Any]]:
+        """Update the rolling error window and check the error rate."""
+        if len(self.error_window) == self.error_window.maxlen:
+            old_success, old_cost = self.error_window[0]
+            if not old_success:
+                self.error_count -= 1
+                self.wasted_cost -= old_cost
+        
+        self.error_window.append((record.success, record.cost))
+        if not record.success:
+            self.error_count += 1
+            self.wasted_cost += record.cost
+        
+        key = ('high_error_rate', None)
+        if len(self.error_window) < self.min_samples:
+            return None
+        
+        error_rate = self.error_count / len(self.error_window)
+        if error_rate <= self.error_rate_threshold:
+            self._resolve(key)
+            return None
+        
+        wasted_cost = max(0.0, self.wasted_cost)
+        return self._set_anomaly(key, {
+            'type': 'high_error_rate',
+            'severity': 'high',
+            'error_rate': error_rate,
+            'wasted_cost': wasted_cost,
+            'description': f"High error rate: {error_rate*100:.1f}% (${wasted_cost:.2f} wasted)"
+        }, record.timestamp)
+    
+    def _expire(self, now: datetime) -> None:
+        """Drop anomalies not seen within the TTL."""
+        cutoff = now - self.anomaly_ttl
+        for key in [k for k, seen in self._last_seen.items() if seen < cutoff]:
+            self._resolve(key)
+    
+    def _raise_alert(self, anomaly: Dict[str, Any]) -> None:
+        """Report a newly opened anomaly."""
+        self.logger.warning(f"Cost anomaly: {anomaly['description']}")
+        
+        if self.alert_manager is None:
+            return
+        
+        priority = AlertPriority.HIGH if anomaly['severity'] == 'high' else AlertPriority.MEDIUM
+        self.alert_manager.create_alert(
+            alert_type=AlertType.ANOMALY_DETECTED,
+            priority=priority,
+            title=f"Cost anomaly: {anomaly['type']}",
+            message=anomaly['description'],
+            details=anomaly
+        )
+    
+    def get_current_anomalies(self) -> Tuple[Dict[str, Any], ...]:
+        """
+        Get the current anomaly set.
+        
+        Returns:
+            Immutable snapshot of current anomalies (no locks taken)
+        """
+        return self._snapshot
     
     def detect_anomalies(self,
                         time_window: timedelta = timedelta(days=7)) -> List[Dict[str, Any]]:
         """
-        Detect cost anomalies in recent usage.
+        Get cost anomalies seen in recent usage.
         
         Args:
-            time_window: Time window to analyze
+            time_window: Only include anomalies last seen within this window
             
         Returns:
             List of detected anomalies
         """
-        anomalies = []
-        cutoff = datetime.now(timezone.utc) - time_window
-        
-        with self.cost_tracker.lock:
-            recent_records = [
-                r for r in self.cost_tracker.usage_records
-                if r.timestamp >= cutoff
-            ]
-        
-        if len(recent_records) < 10:
-            return anomalies  # Not enough data
-        
-        # Analyze cost per request
-        costs = [r.cost for r in recent_records]
-        mean_cost = statistics.mean(costs)
-        stdev_cost = statistics.stdev(costs) if len(costs) > 1 else 0
-        
-        # Detect unusually expensive requests
-        threshold = mean_cost + (2 * stdev_cost)
-        expensive_requests = [
-            r for r in recent_records
-            if r.cost > threshold
-        ]
-        
-        if expensive_requests:
-            anomalies.append({
-                'type': 'expensive_requests',
-                'severity': 'medium',
-                'count': len(expensive_requests),
-                'description': f"Found {len(expensive_requests)} requests exceeding ${threshold:.4f}",
-                'examples': [
-                    {
-                        'id': r.id,
-                        'cost': r.cost,
-                        'model': r.model,
-                        'timestamp': r.timestamp.isoformat()
-                    }
-                    for r in expensive_requests[:3]
-                ]
-            })
-        
-        # Detect sudden cost spikes
-        daily_costs = defaultdict(float)
-        for record in recent_records:
-            date = record.timestamp.date()
-            daily_costs[date] += record.cost
-        
-        if len(daily_costs) > 1:
-            daily_values = list(daily_costs.values())
-            mean_daily = statistics.mean(daily_values)
-            max_daily = max(daily_values)
-            
-            if max_daily > mean_daily * 2:
-                anomalies.append({
-                    'type': 'cost_spike',
-                    'severity': 'high',
-                    'description': f"Daily cost spike detected: ${max_daily:.2f} vs avg ${mean_daily:.2f}",
-                    'max_daily_cost': max_daily,
-                    'average_daily_cost': mean_daily
-                })
-        
-        # Detect high error rates (wasteful spending)
-        error_rate = sum(1 for r in recent_records if not r.success) / len(recent_records)
-        if error_rate > 0.1:  # More than 10% errors
-            wasted_cost = sum(r.cost for r in recent_records if not r.success)
-            anomalies.append({
-                'type': 'high_error_rate',
-                'severity': 'high',
-                'error_rate': error_rate,
-                'wasted_cost': wasted_cost,
-                'description': f"High error rate: {error_rate*100:.1f}% (${wasted_cost:.2f} wasted)"
-            })
+        cutoff = (datetime.now(timezone.utc) - time_window).isoformat()
+        return [a for a in self._snapshot if a['last_seen'] >= cutoff]
+    
+    def get_baselines(self) -> Dict[str, Any]:
+        """
+        Get the current streaming baselines.
         
-        return anomalies
+        Returns:
+            Dictionary with cost, daily and error-rate baselines
+        """
+        with self.lock:
+            return {
+                'cost': self.cost_stats.to_dict(),
+                'models': {m: s.to_dict() for m, s in self.model_stats.items()},
+                'profiles': {p: s.to_dict() for p, s in self.profile_stats.items()},
+                'daily_ewma': self.daily_ewma,
+                'current_day_total': self.current_day_total,
+                'error_rate': self.error_count / len(self.error_window) if self.error_window else 0.0
+            }
 
 
 class AdvancedCostAnalytics:
@@ -704,6 +953,10 @@ class AdvancedCostAnalytics:
         self.budget_planner = BudgetPlanner(cost_tracker)
         self.anomaly_detector = CostAnomalyDetector(cost_tracker)
     
+    def close(self) -> None:
+        """Stop following the cost tracker."""
+        self.anomaly_detector.close()
+    
     def get_detailed_breakdown(self,
                               category: CostCategory,
                               time_range: Optional[timedelta] = None) -> CostBreakdown:
@@ -717,55 +970,88 @@ class AdvancedCostAnalytics:
         Returns:
             Cost breakdown
         """
-        cutoff = None
-        if time_range:
-            cutoff = datetime.now(timezone.utc) - time_range
+        rollups = self.cost_tracker.rollups
         
-        with self.cost_tracker.lock:
-            records = self.cost_tracker.usage_records
-            
-            if cutoff:
-                records = [r for r in records if r.timestamp >= cutoff]
-            
-            total_cost = sum(r.cost for r in records)
-            items = defaultdict(float)
-            
-            # Group by category
-            if category == CostCategory.MODEL_USAGE:
-                for r in records:
-                    items[r.model] += r.cost
-            elif category == CostCategory.PROFILE:
-                for r in records:
-                    items[r.profile_id] += r.cost
-            elif category == CostCategory.SCENARIO:
-                for r in records:
-                    scenario = r.session_id  # Simplified
-                    items[scenario] += r.cost
-            elif category == CostCategory.PHASE:
-                for r in records:
-                    items[r.task_type] += r.cost
-            elif category == CostCategory.TIME_PERIOD:
-                for r in records:
-                    date = r.timestamp.date().isoformat()
-                    items[date] += r.cost
-            
-            category_total = sum(items.values())
-            percentage = (category_total / total_cost * 100) if total_cost > 0 else 0
-            
-            time_range_tuple = None
-            if records:
-                time_range_tuple = (
-                    min(r.timestamp for r in records),
-                    max(r.timestamp for r in records)
-                )
-            
-            return CostBreakdown(
-                category=category,
-                items=dict(items),
-                total_cost=category_total,
-                percentage_of_total=percentage,
-                time_range=time_range_tuple
+        # Answered from the cost rollups at a resolution chosen from the window
+        overall = rollups.query(time_range).get(())
+        total_cost = overall.values.get('cost', 0.0) if overall else 0.0
+        
+        if category == CostCategory.TIME_PERIOD:
+            items = {
+                day.date().isoformat(): cell.values.get('cost', 0.0)
+                for day, cell in rollups.series(time_range)
+            }
+        else:
+            dimension = {
+                CostCategory.MODEL_USAGE: 'model',
+                CostCategory.PROFILE: 'profile_id',
+                CostCategory.SCENARIO: 'session_id',  # Simplified
+                CostCategory.PHASE: 'task_type'
+            }[category]
+            items = {
+                key[0]: cell.values.get('cost', 0.0)
+                for key, cell in rollups.query(time_range, group_by=(dimension,)).items()
+            }
+        
+        category_total = sum(items.values())
+        percentage = (category_total / total_cost * 100) if total_cost > 0 else 0
+        
+        time_range_tuple = None
+        if overall and overall.first is not None:
+            time_range_tuple = (
+                datetime.fromtimestamp(overall.first, timezone.utc),
+                datetime.fromtimestamp(overall.last, timezone.utc)
             )
+        
+        return CostBreakdown(
+            category=category,
+            items=items,
+            total_cost=category_total,
+            percentage_of_total=percentage,
+            time_range=time_range_tuple
+        )
+    
+    def get_cache_savings(self,
+                          session_id: Optional[str] = None,
+                          time_range: Optional[timedelta] = None) -> Dict[str, Any]:
+        """
+        Summarize spend avoided by the LLM response cache.
+        
+        Args:
+            session_id: Optional session filter
+            time_range: Optional time range filter
+            
+        Returns:
+            Cache hit counts and saved cost, overall and per model
+        """
+        # Answered from the cost rollups, like get_detailed_breakdown
+        filters = {'session_id': session_id} if session_id else None
+        cells = self.cost_tracker.rollups.query(time_range, group_by=('model',), filters=filters)
+        
+        by_model = {
+            model: {
+                'cache_hits': int(cell.values.get('cache_hits', 0)),
+                'saved_cost': cell.values.get('saved_cost', 0.0),
+                'saved_tokens': int(cell.values.get('saved_tokens', 0))
+            }
+            for (model,), cell in cells.items()
+            if cell.values.get('cache_hits', 0)
+        }
+        
+        total_requests = int(sum(cell.values.get('requests', 0) for cell in cells.values()))
+        cache_hits = sum(m['cache_hits'] for m in by_model.values())
+        saved_cost = sum(m['saved_cost'] for m in by_model.values())
+        spent = sum(cell.values.get('cost', 0.0) for cell in cells.values())
+        
+        return {
+            'total_requests': total_requests,
+            'cache_hits': cache_hits,
+            'hit_rate': cache_hits / total_requests if total_requests else 0.0,
+            'saved_cost': saved_cost,
+            'saved_tokens': sum(m['saved_tokens'] for m in by_model.values()),
+            'savings_percentage': saved_cost / (spent + saved_cost) * 100 if spent + saved_cost > 0 else 0.0,
+            'by_model': by_model
+        }
     
     def generate_comprehensive_report(self,
                                      session_id: Optional[str] = None,
@@ -800,6 +1086,9 @@ class AdvancedCostAnalytics:
             breakdown = self.get_detailed_breakdown(category, time_range)
             report['breakdowns'][category.value] = breakdown.to_dict()
         
+        # Response cache savings
+        report['cache_savings'] = self.get_cache_savings(session_id, time_range)
+        
         # Optimization opportunities
         report['optimization_opportunities'] = [
             o.to_dict() for o in self.optimizer.identify_opportunities(session_id, time_range)
@@ -10,7 +10,6 @@ import threading
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
 from enum import Enum
 
 from .performance_metrics import PerformanceMetricsEngine, MetricType
@@ -186,24 +185,18 @@ class MetricAggregator:
     
     def _calculate_today_training_hours(self) -> float:
         """Calculate total training hours for today."""
-        today = datetime.now(timezone.utc).date()
-        total_hours = 0.0
+        now = datetime.now(timezone.utc)
+        since_midnight = now - now.replace(hour=0, minute=0, second=0, microsecond=0)
         
-        for session in self.performance_engine.session_performances.values():
-            if session.start_time.date() == today:
-                total_hours += session.duration_seconds / 3600
+        total = self.performance_engine.session_rollups.query(since_midnight).get(())
+        total_seconds = total.values.get('duration_seconds', 0.0) if total else 0.0
         
-        return round(total_hours, 2)
+        return round(total_seconds / 3600, 2)
     
     def _calculate_week_cost(self) -> float:
         """Calculate total cost for the current week."""
-        week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        
-        with self.cost_tracker.lock:
-            week_cost = sum(
-                r.cost for r in self.cost_tracker.usage_records
-                if r.timestamp >= week_ago
-            )
+        total = self.cost_tracker.rollups.query(timedelta(days=7)).get(())
+        week_cost = total.values.get('cost', 0.0) if total else 0.0
         
         return round(week_cost, 2)
     
@@ -222,18 +215,12 @@ class MetricAggregator:
     
     def _calculate_success_rate(self, days: int) -> float:
         """Calculate success rate over specified days."""
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        total = self.performance_engine.session_rollups.query(timedelta(days=days)).get(())
         
-        total_sessions = 0
-        successful_sessions = 0
+        total_sessions = total.values.get('sessions', 0.0) if total else 0.0
+        successful_sessions = total.values.get('successes', 0.0) if total else 0.0
         
-        for session in self.performance_engine.session_performances.values():
-            if session.start_time >= cutoff:
-                total_sessions += 1
-                if session.success:
-                    successful_sessions += 1
-        
-        if total_sessions == 0:
+        if total_sessions <= 0:
             return 0.0
         
         return round((successful_sessions / total_sessions) * 100, 1)
@@ -317,43 +304,29 @@ class TrendCalculator:
         Returns:
             Trend data
         """
-        cutoff = datetime.now(timezone.utc) - timedelta(days=period_days)
+        # Daily averages from the session rollups
+        filters = {'operator_id': operator_id} if operator_id else None
+        days = self.performance_engine.session_rollups.series(
+            timedelta(days=period_days), filters=filters
+        )
         
-        # Get sessions in period
-        if operator_id:
-            sessions = [
-                s for s in self.performance_engine.session_performances.values()
-                if s.operator_id == operator_id and s.start_time >= cutoff
-            ]
-        else:
-            sessions = [
-                s for s in self.performance_engine.session_performances.values()
-                if s.start_time >= cutoff
-            ]
+        data_points = []
+        for day, totals in days:
+            session_count = int(round(totals.values.get('sessions', 0.0)))
+            if session_count <= 0:
+                continue
+            data_points.append({
+                'date': day.date().isoformat(),
+                'average_score': round(totals.values['score'] / session_count, 3),
+                'session_count': session_count
+            })
         
-        if not sessions:
+        if not data_points:
             return {
                 'trend': 'insufficient_data',
                 'data_points': []
             }
         
-        # Group by day
-        daily_scores = defaultdict(list)
-        for session in sessions:
-            date_key = session.start_time.date().isoformat()
-            daily_scores[date_key].append(session.score)
-        
-        # Calculate daily averages
-        data_points = []
-        for date_key in sorted(daily_scores.keys()):
-            scores = daily_scores[date_key]
-            avg_score = sum(scores) / len(scores)
-            data_points.append({
-                'date': date_key,
-                'average_score': round(avg_score, 3),
-                'session_count': len(scores)
-            })
-        
         # Determine trend direction
         if len(data_points) >= 2:
             first_half_avg = sum(dp['average_score'] for dp in data_points[:len(data_points)//2]) / (len(data_points)//2)
@@ -384,25 +357,19 @@ class TrendCalculator:
         Returns:
             Cost trend data
         """
-        cutoff = datetime.now(timezone.utc) - timedelta(days=period_days)
+        # Daily totals from the cost rollups
+        days = self.cost_tracker.rollups.series(timedelta(days=period_days))
         
-        with self.cost_tracker.lock:
-            records = [
-                r for r in self.cost_tracker.usage_records
-                if r.timestamp >= cutoff
-            ]
-        
-        if not records:
+        if not days:
             return {
                 'trend': 'insufficient_data',
                 'data_points': []
             }
         
-        # Group by day
-        daily_costs = defaultdict(float)
-        for record in records:
-            date_key = record.timestamp.date().isoformat()
-            daily_costs[date_key] += record.cost
+        daily_costs = {
+            day.date().isoformat(): totals.values.get('cost', 0.0)
+            for day, totals in days
+        }
         
         # Create data points
         data_points = [
@@ -410,7 +377,7 @@ class TrendCalculator:
                 'date': date_key,
                 'cost': round(cost, 2)
             }
-            for date_key, cost in sorted(daily_costs.items())
+            for date_key, cost in daily_costs.items()
         ]
         
         # Determine trend
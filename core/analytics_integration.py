@@ -83,6 +83,11 @@ class AnalyticsSystem:
             self.progress_tracker
         )
         
+        # Raise streaming cost anomalies as dashboard alerts
+        self.cost_analytics.anomaly_detector.attach_alert_manager(
+            self.analytics_aggregator.alert_manager
+        )
+        
         self.logger.info("✓ Analytics system initialized successfully")
     
     def get_all_components(self) -> dict:
@@ -0,0 +1,198 @@
+"""
+ATS MAFIA Framework Batched Analytics Kernel
+
+This module provides vectorized NumPy routines for the trend, learning-curve
+and plateau analytics used by the performance and training effectiveness
+modules. Score series for many operators (or operator/metric pairs) are packed
+into one NaN-padded 2D array so least-squares slopes, half and rolling means,
+plateau detection and mastery predictions are computed in a single pass
+instead of one Python loop per series.
+
+Series are right-aligned: row ``i`` holds its ``lengths[i]`` values in the last
+columns of the array, so "most recent N values" windows line up across rows.
+"""
+
+from typing import Optional, List, Sequence, Tuple
+
+import numpy as np
+
+
+def pack_series(series: Sequence[Sequence[float]],
+                max_length: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack score series into a right-aligned, NaN-padded array.
+
+    Args:
+        series: Score series in chronological order
+        max_length: Keep only the most recent ``max_length`` values of each series
+
+    Returns:
+        Tuple of (values array of shape (n, width), lengths array of shape (n,))
+    """
+    if max_length is not None:
+        series = [s[-max_length:] if max_length > 0 else [] for s in series]
+
+    lengths = np.fromiter((len(s) for s in series), dtype=np.int64, count=len(series))
+    width = int(lengths.max()) if len(lengths) else 0
+    values = np.full((len(series), width), np.nan)
+
+    for row, s in enumerate(series):
+        if len(s):
+            values[row, width - len(s):] = s
+
+    return values, lengths
+
+
+def _positions(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Get each cell's index within its own series (negative for padding)."""
+    width = values.shape[1]
+    return np.arange(width)[None, :] - (width - lengths)[:, None]
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Mean of the masked cells of each row (NaN for empty rows)."""
+    counts = mask.sum(axis=1)
+    totals = np.where(mask, values, 0.0).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+
+
+def slopes(values: np.ndarray,
+           lengths: np.ndarray,
+           window: Optional[int] = None) -> np.ndarray:
+    """
+    Least-squares slope of each series against its session index.
+
+    Args:
+        values: Packed series
+        lengths: Series lengths
+        window: Fit only the most recent ``window`` values
+
+    Returns:
+        Slope per series (0.0 for series with fewer than two values)
+    """
+    if window is not None:
+        lengths = np.minimum(lengths, window)
+
+    x = _positions(values, lengths).astype(float)
+    mask = x >= 0
+    n = lengths.astype(float)
+
+    x_mean = (n - 1) / 2
+    y_mean = _masked_mean(values, mask)
+
+    dx = x - x_mean[:, None]
+    dy = np.where(mask, values - y_mean[:, None], 0.0)
+    numerator = np.where(mask, dx * dy, 0.0).sum(axis=1)
+
+    # Sum of squared deviations of 0..n-1 from their mean
+    denominator = n * (n * n - 1) / 12
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1.0), 0.0)
+
+
+def half_means(values: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean of the first and second half of each series.
+
+    The first half holds ``length // 2`` values, the second half the rest.
+
+    Args:
+        values: Packed series
+        lengths: Series lengths
+
+    Returns:
+        Tuple of (first half means, second half means); NaN for empty halves
+    """
+    positions = _positions(values, lengths)
+    split = (lengths // 2)[:, None]
+
+    first = _masked_mean(values, (positions >= 0) & (positions < split))
+    second = _masked_mean(values, positions >= split)
+
+    return first, second
+
+
+def rolling_stats(values: np.ndarray,
+                  lengths: np.ndarray,
+                  window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and sample variance of the most recent ``window`` values of each series.
+
+    Args:
+        values: Packed series
+        lengths: Series lengths
+        window: Number of recent values
+
+    Returns:
+        Tuple of (means, variances); variance is NaN with fewer than two values
+    """
+    positions = _positions(values, lengths)
+    mask = (positions >= 0) & (positions >= (lengths - window)[:, None])
+    counts = mask.sum(axis=1)
+
+    means = _masked_mean(values, mask)
+    squares = np.where(mask, (values - means[:, None]) ** 2, 0.0).sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variances = np.where(counts > 1, squares / np.maximum(counts - 1, 1), np.nan)
+
+    return means, variances
+
+
+def plateau_mask(values: np.ndarray,
+                 lengths: np.ndarray,
+                 window: int = 5,
+                 variance_threshold: float = 0.01,
+                 max_mean: Optional[float] = None) -> np.ndarray:
+    """
+    Detect series whose recent values have flattened out.
+
+    Args:
+        values: Packed series
+        lengths: Series lengths
+        window: Number of recent values to check
+        variance_threshold: Variance below which a series is flat
+        max_mean: Only flag series whose recent mean is below this score
+
+    Returns:
+        Boolean array, True where a plateau is detected
+    """
+    means, variances = rolling_stats(values, lengths, window)
+
+    with np.errstate(invalid='ignore'):
+        plateaued = (lengths >= max(window, 2)) & (variances < variance_threshold)
+        if max_mean is not None:
+            plateaued &= means < max_mean
+
+    return plateaued
+
+
+def sessions_to_mastery(current_scores: np.ndarray,
+                        learning_rates: np.ndarray,
+                        mastery_score: float = 0.9) -> List[Optional[int]]:
+    """
+    Predict the number of sessions each series needs to reach mastery.
+
+    Args:
+        current_scores: Latest score per series
+        learning_rates: Slope per series
+        mastery_score: Score considered as mastery
+
+    Returns:
+        Sessions needed per series, or None where not predictable
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        needed = (mastery_score - current_scores) / learning_rates
+
+    predictions = []
+    for current, rate, sessions in zip(current_scores, learning_rates, needed):
+        if not rate > 0:
+            predictions.append(None)
+        elif current >= mastery_score:
+            predictions.append(0)
+        else:
+            predictions.append(int(sessions) if sessions > 0 else None)
+
+    return predictions
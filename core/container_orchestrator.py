@@ -15,7 +15,7 @@ import logging
 import subprocess
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 
@@ -185,6 +185,9 @@ class HybridContainerOrchestrator:
         
         # State tracking
         self._container_states: Dict[str, ContainerState] = {}
+        # Names read by the metrics collector thread; replaced, never mutated,
+        # whenever containers are added or removed
+        self._sampled_names: Tuple[str, ...] = ()
         self._initialize_states()
         
         # Async task management
@@ -293,6 +296,7 @@ class HybridContainerOrchestrator:
                 tier=PoolTier.COLD
             )
         
+        self._sampled_names = tuple(self._container_states)
         logger.debug(f"Initialized state tracking for {len(self._container_states)} containers")
     
     async def initialize(self) -> Dict[str, bool]:
@@ -345,6 +349,11 @@ class HybridContainerOrchestrator:
             self._cleanup_task = asyncio.create_task(self._cleanup_loop())
             logger.info("Started background cleanup task")
         
+        # Sample resource metrics of all managed containers in the background
+        self.container_manager.start_metrics_collection(
+            names=lambda: self._sampled_names
+        )
+        
         elapsed = time.time() - start_time
         success_count = sum(1 for s in results.values() if s)
         logger.info(
@@ -771,6 +780,7 @@ class HybridContainerOrchestrator:
             "failed_health_checks": state.failed_health_checks,
             "restart_count": state.restart_count,
             "is_healthy": state.is_healthy(),
+            "metrics": self.container_manager.get_container_metrics(container_name),
         }
     
     async def shutdown(self) -> None:
@@ -789,6 +799,8 @@ class HybridContainerOrchestrator:
             except asyncio.CancelledError:
                 pass
         
+        self.container_manager.stop_metrics_collection()
+        
         # Stop all running containers (except hot pool)
         stop_tasks = []
         for container_name, state in self._container_states.items():
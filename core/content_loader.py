@@ -0,0 +1,344 @@
+"""
+ATS MAFIA Framework Content Loading Pipeline
+
+This module provides a parallel loader for file-backed content (agent profiles,
+scenarios). Files are read, hashed, parsed and validated in a worker pool, and
+validated results are remembered in a local manifest keyed by file hash so
+unchanged files skip re-validation and checksumming on the next start.
+"""
+
+import os
+import json
+import yaml
+import hashlib
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable, Iterable, Union
+
+
+# Bump when validation rules change so cached "valid" verdicts are discarded
+MANIFEST_VERSION = 1
+
+
+def parse_content(raw: bytes, file_path: str) -> Any:
+    """
+    Parse raw file content based on the file extension.
+
+    Args:
+        raw: File content
+        file_path: Path the content was read from
+
+    Returns:
+        Parsed data
+
+    Raises:
+        ValueError: If the file format is not supported
+    """
+    suffix = Path(file_path).suffix.lower()
+
+    if suffix == '.json':
+        return json.loads(raw)
+    if suffix in ['.yaml', '.yml']:
+        return yaml.safe_load(raw)
+
+    raise ValueError(f"Unsupported file format: {suffix}")
+
+
+@dataclass
+class LoadResult:
+    """Outcome of loading a single content file."""
+    file_path: str
+    item: Any = None
+    errors: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    checksum: Optional[str] = None
+    validated: bool = False
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file produced a usable, valid item."""
+        return self.item is not None and self.error is None and not self.errors
+
+
+class ContentManifest:
+    """
+    Persistent record of previously validated content files.
+
+    Entries are keyed by absolute file path and store the file's size, mtime,
+    content hash, object checksum and a small metadata summary. Only files that
+    loaded successfully are recorded.
+    """
+
+    def __init__(self, manifest_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the manifest.
+
+        Args:
+            manifest_path: Where the manifest is persisted (None keeps it in memory)
+        """
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.RLock()
+        self.logger = logging.getLogger("content_manifest")
+        self._dirty = False
+
+        self.load()
+
+    @staticmethod
+    def key(file_path: Union[str, Path]) -> str:
+        """Get the manifest key for a file path."""
+        return os.path.abspath(str(file_path))
+
+    def load(self) -> None:
+        """Load the manifest from disk, ignoring unreadable or stale files."""
+        if not self.manifest_path or not self.manifest_path.exists():
+            return
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable manifest {self.manifest_path}: {e}")
+            return
+
+        if data.get('version') != MANIFEST_VERSION:
+            return
+
+        with self.lock:
+            self.entries = data.get('entries', {})
+
+    def save(self) -> None:
+        """Persist the manifest if it changed since the last save."""
+        if not self.manifest_path:
+            return
+
+        with self.lock:
+            if not self._dirty:
+                return
+
+            data = {'version': MANIFEST_VERSION, 'entries': self.entries}
+            tmp_path = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+
+            try:
+                self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.manifest_path)
+                self._dirty = False
+            except OSError as e:
+                self.logger.warning(f"Failed to save manifest {self.manifest_path}: {e}")
+
+    def get(self, file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """Get the entry for a file, if any."""
+        with self.lock:
+            return self.entries.get(self.key(file_path))
+
+    def get_unchanged(self, file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """
+        Get the entry for a file if its size and mtime still match.
+
+        This is a stat-only check; the content hash is not recomputed.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Manifest entry or None if missing or the file changed
+        """
+        entry = self.get(file_path)
+        if entry is None:
+            return None
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        if entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            return None
+
+        return entry
+
+    def record(self,
+               file_path: Union[str, Path],
+               stat: os.stat_result,
+               digest: str,
+               validated: bool,
+               checksum: Optional[str] = None,
+               summary: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a successfully loaded file.
+
+        Args:
+            file_path: Path to the file
+            stat: Stat result taken before the file was read
+            digest: SHA-256 of the file content
+            validated: Whether the content passed validation
+            checksum: Object checksum of the loaded item
+            summary: Metadata summary for lazy registration
+        """
+        entry = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest,
+            'validated': validated,
+            'checksum': checksum,
+            'summary': summary
+        }
+
+        with self.lock:
+            key = self.key(file_path)
+            if self.entries.get(key) != entry:
+                self.entries[key] = entry
+                self._dirty = True
+
+    def discard(self, file_path: Union[str, Path]) -> None:
+        """Remove the entry for a file."""
+        with self.lock:
+            if self.entries.pop(self.key(file_path), None) is not None:
+                self._dirty = True
+
+    def prune(self, directory: Union[str, Path], keep: Iterable[Union[str, Path]]) -> int:
+        """
+        Drop entries under a directory whose files are no longer present.
+
+        Args:
+            directory: Directory that was scanned
+            keep: Files found in the directory
+
+        Returns:
+            Number of entries removed
+        """
+        prefix = os.path.join(self.key(directory), '')
+        keep_keys = {self.key(path) for path in keep}
+
+        with self.lock:
+            stale = [key for key in self.entries
+                     if key.startswith(prefix) and key not in keep_keys]
+            for key in stale:
+                del self.entries[key]
+
+            if stale:
+                self._dirty = True
+
+            return len(stale)
+
+
+class ContentLoader:
+    """
+    Parallel, manifest-aware loader for file-backed content.
+
+    The loader is parameterised with callables so it can be shared between
+    content types: ``build`` turns parsed data into an item, ``validate``
+    returns a list of errors, ``checksum`` computes the item checksum and
+    ``summarize`` extracts the metadata kept in the manifest.
+    """
+
+    def __init__(self,
+                 build: Callable[[Any, str], Any],
+                 validate: Optional[Callable[[Any], List[str]]] = None,
+                 checksum: Optional[Callable[[Any], str]] = None,
+                 summarize: Optional[Callable[[Any], Dict[str, Any]]] = None,
+                 manifest: Optional[ContentManifest] = None,
+                 parse: Callable[[bytes, str], Any] = parse_content,
+                 max_workers: int = 4):
+        """
+        Initialize the content loader.
+
+        Args:
+            build: Creates an item from parsed data and its file path
+            validate: Returns validation errors for an item (None disables validation)
+            checksum: Computes the checksum of an item
+            summarize: Extracts a JSON-serializable metadata summary from an item
+            manifest: Manifest of previously validated files
+            parse: Parses raw file content
+            max_workers: Size of the worker pool
+        """
+        self.build = build
+        self.validate = validate
+        self.checksum = checksum
+        self.summarize = summarize
+        self.manifest = manifest
+        self.parse = parse
+        self.max_workers = max(1, max_workers)
+
+    def load_file(self, file_path: str) -> LoadResult:
+        """
+        Load a single file.
+
+        Validation and checksumming are skipped when the file content hash
+        matches a manifest entry that was recorded with validation.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Load result (never raises)
+        """
+        result = LoadResult(file_path=file_path)
+
+        try:
+            stat = os.stat(file_path)
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+
+            digest = hashlib.sha256(raw).hexdigest()
+            entry = self.manifest.get(file_path) if self.manifest else None
+            cached = (entry is not None and entry['sha256'] == digest and
+                      (entry['validated'] or self.validate is None))
+
+            result.item = self.build(self.parse(raw, file_path), file_path)
+
+            if cached:
+                result.cached = True
+                result.checksum = entry['checksum']
+            else:
+                if self.validate:
+                    result.errors = self.validate(result.item)
+                    result.validated = True
+                if self.checksum:
+                    result.checksum = self.checksum(result.item)
+
+            if self.manifest:
+                if result.errors:
+                    self.manifest.discard(file_path)
+                else:
+                    self.manifest.record(
+                        file_path,
+                        stat,
+                        digest,
+                        validated=entry['validated'] if result.cached else result.validated,
+                        checksum=result.checksum,
+                        summary=self.summarize(result.item) if self.summarize else None
+                    )
+
+        except Exception as e:
+            result.error = str(e)
+
+        return result
+
+    def load_files(self, file_paths: List[str]) -> List[LoadResult]:
+        """
+        Load files in the worker pool.
+
+        Args:
+            file_paths: Paths to load
+
+        Returns:
+            Load results in the same order as ``file_paths``
+        """
+        if self.max_workers == 1 or len(file_paths) <= 1:
+            return [self.load_file(path) for path in file_paths]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="content_loader") as executor:
+            return list(executor.map(self.load_file, file_paths))
+
+    def save_manifest(self) -> None:
+        """Persist the manifest, if one is configured."""
+        if self.manifest:
+            self.manifest.save()
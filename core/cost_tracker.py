@@ -8,13 +8,28 @@ optimization recommendations for LLM usage.
 import logging
 import threading
 import json
-from typing import Dict, Any, Optional, List, Callable, Union
+import csv
+import math
+import time
+import uuid
+from io import StringIO
+from typing import Dict, Any, Optional, List, Callable, Union, Iterator
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from collections import defaultdict
 
-from .llm_models import ModelRegistry, LLMModel
+from .llm_models import ModelRegistry, LLMModel, ESTIMATED_OUTPUT_TOKENS
+from .export_streams import DEFAULT_CHUNK_SIZE, iter_chunks, write_chunks
+from .rollups import RollupTable
+
+
+# Column order for CSV usage exports
+USAGE_EXPORT_FIELDS = [
+    'id', 'timestamp', 'model', 'profile_id', 'session_id', 'task_type',
+    'input_tokens', 'output_tokens', 'cost', 'latency_ms', 'success',
+    'error_message', 'cache_hit', 'saved_cost'
+]
 
 
 @dataclass
@@ -35,6 +50,8 @@ class UsageMetrics:
         latency_ms: Response latency in milliseconds
         success: Whether the request was successful
         error_message: Error message if request failed
+        cache_hit: Whether the response was served from the response cache
+        saved_cost: Cost avoided by a cache hit in USD
     """
     id: str
     timestamp: datetime
@@ -48,6 +65,8 @@ class UsageMetrics:
     latency_ms: float
     success: bool = True
     error_message: Optional[str] = None
+    cache_hit: bool = False
+    saved_cost: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert metrics to dictionary."""
@@ -82,6 +101,106 @@ class BudgetAlert:
             raise ValueError("threshold must be between 0.0 and 1.0")
 
 
+@dataclass
+class BudgetReservation:
+    """
+    Budget held for an in-flight request.
+    
+    Attributes:
+        id: Reservation identifier
+        model: Model identifier (provider/name)
+        session_id: Training session ID
+        profile_id: Profile making the request
+        task_type: Type of task
+        input_tokens: Prompt tokens of the request
+        estimated_output_tokens: Predicted completion tokens
+        estimated_cost: Cost held against the budgets in USD
+        created_at: Monotonic time the reservation was made
+    """
+    id: str
+    model: str
+    session_id: str
+    profile_id: str
+    task_type: str
+    input_tokens: int
+    estimated_output_tokens: int
+    estimated_cost: float
+    created_at: float = field(default_factory=time.monotonic)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert reservation to dictionary."""
+        return asdict(self)
+
+
+class OutputTokenPredictor:
+    """
+    Predicts completion length per model (and task type) from history.
+    
+    Keeps an exponentially weighted mean and variance of observed output
+    tokens and predicts ``mean + k * stddev`` so reservations err on the
+    high side.
+    """
+    
+    def __init__(self, alpha: float = 0.1, k: float = 1.0, min_samples: int = 3):
+        """
+        Initialize the predictor.
+        
+        Args:
+            alpha: Weight of the newest observation
+            k: Standard deviations added to the mean
+            min_samples: Observations needed before a key's estimate is used
+        """
+        self.alpha = alpha
+        self.k = k
+        self.min_samples = min_samples
+        self.estimates: Dict[tuple, Dict[str, float]] = {}
+    
+    def update(self, model: str, task_type: str, output_tokens: int) -> None:
+        """Add an observed completion length."""
+        for key in ((model, task_type), (model, None)):
+            est = self.estimates.get(key)
+            if est is None:
+                self.estimates[key] = {'mean': float(output_tokens), 'var': 0.0, 'count': 1}
+                continue
+            
+            delta = output_tokens - est['mean']
+            est['mean'] += self.alpha * delta
+            est['var'] = (1 - self.alpha) * (est['var'] + self.alpha * delta * delta)
+            est['count'] += 1
+    
+    def predict(self,
+                model: str,
+                task_type: Optional[str] = None,
+                max_output_tokens: Optional[int] = None) -> int:
+        """
+        Predict the completion length of a request.
+        
+        Args:
+            model: Model identifier
+            task_type: Optional task type
+            max_output_tokens: Hard cap on the completion length
+            
+        Returns:
+            Predicted output tokens
+        """
+        for key in ((model, task_type), (model, None)):
+            est = self.estimates.get(key)
+            if est is not None and est['count'] >= self.min_samples:
+                predicted = math.ceil(est['mean'] + self.k * math.sqrt(est['var']))
+                break
+        else:
+            predicted = max_output_tokens or ESTIMATED_OUTPUT_TOKENS
+        
+        if max_output_tokens is not None:
+            predicted = min(predicted, max_output_tokens)
+        
+        return max(0, predicted)
+    
+    def clear(self) -> None:
+        """Forget all observations."""
+        self.estimates.clear()
+
+
 class CostTracker:
     """
     Comprehensive cost tracking and budget management system.
@@ -92,16 +211,19 @@ class CostTracker:
     
     def __init__(self, 
                  registry: ModelRegistry,
-                 storage_path: Optional[str] = None):
+                 storage_path: Optional[str] = None,
+                 reservation_ttl: float = 300.0):
         """
         Initialize the cost tracker.
         
         Args:
             registry: Model registry for cost calculations
             storage_path: Path to store usage data (optional)
+            reservation_ttl: Seconds before an unsettled reservation is released
         """
         self.registry = registry
         self.storage_path = storage_path
+        self.reservation_ttl = reservation_ttl
         self.logger = logging.getLogger("cost_tracker")
         
         # Usage storage
@@ -131,6 +253,19 @@ class CostTracker:
         self.global_budget: Optional[float] = None
         self.budget_alerts: Dict[str, List[BudgetAlert]] = {}
         
+        # Admission control: budget held by in-flight requests
+        self.reservations: Dict[str, BudgetReservation] = {}
+        self.session_reserved: Dict[str, float] = defaultdict(float)
+        self.profile_reserved: Dict[str, float] = defaultdict(float)
+        self.global_reserved = 0.0
+        self.output_predictor = OutputTokenPredictor()
+        
+        # Minute/hour/day rollups for dashboards
+        self.rollups = RollupTable(('model', 'profile_id', 'session_id', 'task_type'))
+        
+        # Live usage feed (e.g. ModelLoadBalancer health tracking)
+        self.usage_listeners: List[Callable[[UsageMetrics], None]] = []
+        
         # Statistics
         self.stats = {
             'total_requests': 0,
@@ -138,7 +273,11 @@ class CostTracker:
             'total_input_tokens': 0,
             'total_output_tokens': 0,
             'successful_requests': 0,
-            'failed_requests': 0
+            'failed_requests': 0,
+            'cache_hits': 0,
+            'cache_savings': 0.0,
+            'admissions_granted': 0,
+            'admissions_denied': 0
         }
         
         # Load existing usage data if available
@@ -199,6 +338,8 @@ class CostTracker:
             self.session_token_counts.clear()
             self.profile_totals.clear()
             self.model_usage.clear()
+            self.output_predictor.clear()
+            self.rollups.clear()
             
             # Rebuild from records
             for record in self.usage_records:
@@ -241,9 +382,32 @@ class CostTracker:
         
         if metrics.success:
             model_stats['success_count'] += 1
+            if not metrics.cache_hit:
+                self.output_predictor.update(metrics.model, metrics.task_type, metrics.output_tokens)
         else:
             model_stats['error_count'] += 1
         
+        self.rollups.add(
+            metrics.timestamp,
+            {
+                'model': metrics.model,
+                'profile_id': metrics.profile_id,
+                'session_id': metrics.session_id,
+                'task_type': metrics.task_type
+            },
+            {
+                'requests': 1,
+                'cost': metrics.cost,
+                'errors': 0 if metrics.success else 1,
+                'input_tokens': metrics.input_tokens,
+                'output_tokens': metrics.output_tokens,
+                'latency_ms': metrics.latency_ms,
+                'cache_hits': 1 if metrics.cache_hit else 0,
+                'saved_cost': metrics.saved_cost,
+                'saved_tokens': metrics.input_tokens + metrics.output_tokens if metrics.cache_hit else 0
+            }
+        )
+        
         # Update global stats
         self.stats['total_requests'] += 1
         self.stats['total_cost'] += metrics.cost
@@ -254,6 +418,10 @@ class CostTracker:
             self.stats['successful_requests'] += 1
         else:
             self.stats['failed_requests'] += 1
+        
+        if metrics.cache_hit:
+            self.stats['cache_hits'] += 1
+            self.stats['cache_savings'] += metrics.saved_cost
     
     def record_usage(self,
                     usage_id: str,
@@ -265,10 +433,14 @@ class CostTracker:
                     output_tokens: int,
                     latency_ms: float,
                     success: bool = True,
-                    error_message: Optional[str] = None) -> float:
+                    error_message: Optional[str] = None,
+                    cache_hit: bool = False) -> float:
         """
         Record LLM usage and calculate cost.
         
+        Cache hits are recorded at zero cost, with the cost the request would
+        have incurred kept as ``saved_cost``.
+        
         Args:
             usage_id: Unique identifier for this usage
             model: Model identifier (provider/name)
@@ -280,59 +452,132 @@ class CostTracker:
             latency_ms: Response latency in milliseconds
             success: Whether the request was successful
             error_message: Error message if request failed
+            cache_hit: Whether the response was served from the response cache
             
         Returns:
             Total cost in USD
         """
         with self.lock:
-            # Get model for cost calculation
-            parts = model.split('/')
-            if len(parts) == 2:
-                provider, model_name = parts
-                model_obj = self.registry.get_model(provider, model_name)
-            else:
-                model_obj = None
-            
-            if not model_obj:
-                self.logger.warning(f"Model not found in registry: {model}")
-                cost = 0.0
-            else:
-                cost = model_obj.calculate_cost(input_tokens, output_tokens)
-            
-            # Create usage record
-            metrics = UsageMetrics(
-                id=usage_id,
-                timestamp=datetime.now(timezone.utc),
-                model=model,
-                profile_id=profile_id,
-                session_id=session_id,
-                task_type=task_type,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cost=cost,
-                latency_ms=latency_ms,
-                success=success,
-                error_message=error_message
-            )
-            
-            # Store record
-            self.usage_records.append(metrics)
-            
-            # Update aggregates
-            self._update_aggregates(metrics)
-            
-            # Check budget alerts
-            self._check_budget_alerts(session_id, profile_id)
-            
-            # Persist to storage
-            self._save_usage_data()
-            
-            self.logger.debug(
-                f"Recorded usage: {model} - "
-                f"{input_tokens}+{output_tokens} tokens - ${cost:.4f}"
+            metrics = self._apply_usage(
+                usage_id, model, profile_id, session_id, task_type,
+                input_tokens, output_tokens, latency_ms,
+                success, error_message, cache_hit
             )
+        
+        self._notify_usage(metrics)
+        return metrics.cost
+    
+    def _apply_usage(self,
+                     usage_id: str,
+                     model: str,
+                     profile_id: str,
+                     session_id: str,
+                     task_type: str,
+                     input_tokens: int,
+                     output_tokens: int,
+                     latency_ms: float,
+                     success: bool = True,
+                     error_message: Optional[str] = None,
+                     cache_hit: bool = False) -> UsageMetrics:
+        """
+        Store a usage record and update totals; the caller holds the lock.
+        
+        Returns:
+            The stored usage record
+        """
+        # Get model for cost calculation
+        parts = model.split('/')
+        if len(parts) == 2:
+            provider, model_name = parts
+            model_obj = self.registry.get_model(provider, model_name)
+        else:
+            model_obj = None
+        
+        if not model_obj:
+            self.logger.warning(f"Model not found in registry: {model}")
+            cost = 0.0
+        else:
+            cost = model_obj.calculate_cost(input_tokens, output_tokens)
+        
+        saved_cost = 0.0
+        if cache_hit:
+            saved_cost, cost = cost, 0.0
+        
+        # Create usage record
+        metrics = UsageMetrics(
+            id=usage_id,
+            timestamp=datetime.now(timezone.utc),
+            model=model,
+            profile_id=profile_id,
+            session_id=session_id,
+            task_type=task_type,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost=cost,
+            latency_ms=latency_ms,
+            success=success,
+            error_message=error_message,
+            cache_hit=cache_hit,
+            saved_cost=saved_cost
+        )
+        
+        # Store record
+        self.usage_records.append(metrics)
+        
+        # Update aggregates
+        self._update_aggregates(metrics)
+        
+        # Check budget alerts
+        self._check_budget_alerts(session_id, profile_id)
+        
+        # Persist to storage
+        self._save_usage_data()
+        
+        self.logger.debug(
+            f"Recorded usage: {model} - "
+            f"{input_tokens}+{output_tokens} tokens - ${cost:.4f}"
+        )
+        
+        return metrics
+    
+    def _notify_usage(self, metrics: UsageMetrics) -> None:
+        """Notify usage listeners; must be called without holding the lock."""
+        with self.lock:
+            listeners = list(self.usage_listeners)
+        
+        # Notify outside the lock so listeners can take their own locks
+        for listener in listeners:
+            try:
+                listener(metrics)
+            except Exception as e:
+                self.logger.error(f"Error in usage listener: {e}")
+    
+    def add_usage_listener(self, listener: Callable[[UsageMetrics], None]) -> None:
+        """
+        Subscribe to every recorded usage.
+        
+        Args:
+            listener: Callback invoked with each new UsageMetrics record
+        """
+        with self.lock:
+            if listener not in self.usage_listeners:
+                self.usage_listeners.append(listener)
+    
+    def remove_usage_listener(self, listener: Callable[[UsageMetrics], None]) -> bool:
+        """
+        Unsubscribe a usage listener.
+        
+        Args:
+            listener: Previously added callback
             
-            return cost
+        Returns:
+            True if the listener was removed, False if not found
+        """
+        with self.lock:
+            if listener in self.usage_listeners:
+                self.usage_listeners.remove(listener)
+                return True
+            return False
     
     def get_session_cost(self, session_id: str) -> float:
         """
@@ -546,10 +791,193 @@ class CostTracker:
                         except Exception as e:
                             self.logger.error(f"Error in budget alert callback: {e}")
     
+    def _get_model(self, model: str) -> Optional[LLMModel]:
+        """Resolve a provider/name identifier in the registry."""
+        parts = model.split('/')
+        if len(parts) != 2:
+            return None
+        return self.registry.get_model(parts[0], parts[1])
+    
+    def estimate_request_cost(self,
+                              model: str,
+                              input_tokens: int,
+                              task_type: Optional[str] = None,
+                              max_output_tokens: Optional[int] = None) -> float:
+        """
+        Estimate the cost of a request before it is sent.
+        
+        Args:
+            model: Model identifier (provider/name)
+            input_tokens: Prompt tokens
+            task_type: Optional task type for the output predictor
+            max_output_tokens: Hard cap on completion tokens
+            
+        Returns:
+            Estimated cost in USD (0.0 for unknown models)
+        """
+        with self.lock:
+            model_obj = self._get_model(model)
+            if not model_obj:
+                return 0.0
+            
+            output_tokens = self.output_predictor.predict(model, task_type, max_output_tokens)
+            return model_obj.calculate_cost(input_tokens, output_tokens)
+    
+    def _release_expired_reservations(self) -> None:
+        """Release reservations whose requests never settled."""
+        cutoff = time.monotonic() - self.reservation_ttl
+        for reservation_id in [r.id for r in self.reservations.values() if r.created_at < cutoff]:
+            self.logger.warning(f"Releasing expired budget reservation: {reservation_id}")
+            self.release_reservation(reservation_id)
+    
+    def reserve_budget(self,
+                       model: str,
+                       session_id: str,
+                       profile_id: str,
+                       input_tokens: int,
+                       task_type: str = "general",
+                       max_output_tokens: Optional[int] = None) -> Optional[BudgetReservation]:
+        """
+        Admit a request by reserving its estimated cost against all budgets.
+        
+        The session, profile and global budgets are checked and charged
+        atomically, counting both recorded spend and outstanding
+        reservations, so concurrent agents cannot overshoot a budget.
+        Settle the reservation with ``settle_reservation`` when the request
+        completes, or ``release_reservation`` if it is abandoned.
+        
+        Args:
+            model: Model identifier (provider/name)
+            session_id: Training session ID
+            profile_id: Profile making the request
+            input_tokens: Prompt tokens
+            task_type: Type of task
+            max_output_tokens: Hard cap on completion tokens
+            
+        Returns:
+            Reservation, or None if the request would exceed a budget
+        """
+        with self.lock:
+            self._release_expired_reservations()
+            
+            output_tokens = self.output_predictor.predict(model, task_type, max_output_tokens)
+            model_obj = self._get_model(model)
+            estimate = model_obj.calculate_cost(input_tokens, output_tokens) if model_obj else 0.0
+            
+            checks = [
+                (f"session {session_id}", self.session_budgets.get(session_id),
+                 self.session_totals.get(session_id, 0.0) + self.session_reserved.get(session_id, 0.0)),
+                (f"profile {profile_id}", self.profile_budgets.get(profile_id),
+                 self.profile_totals.get(profile_id, 0.0) + self.profile_reserved.get(profile_id, 0.0)),
+                ("global", self.global_budget,
+                 self.stats['total_cost'] + self.global_reserved)
+            ]
+            
+            for entity, budget, committed in checks:
+                if budget is not None and committed + estimate > budget:
+                    self.stats['admissions_denied'] += 1
+                    self.logger.warning(
+                        f"Budget admission denied for {entity}: "
+                        f"${committed:.4f} committed + ${estimate:.4f} estimated > ${budget:.2f}"
+                    )
+                    return None
+            
+            reservation = BudgetReservation(
+                id=str(uuid.uuid4()),
+                model=model,
+                session_id=session_id,
+                profile_id=profile_id,
+                task_type=task_type,
+                input_tokens=input_tokens,
+                estimated_output_tokens=output_tokens,
+                estimated_cost=estimate
+            )
+            
+            self.reservations[reservation.id] = reservation
+            self.session_reserved[session_id] += estimate
+            self.profile_reserved[profile_id] += estimate
+            self.global_reserved += estimate
+            self.stats['admissions_granted'] += 1
+            
+            return reservation
+    
+    def release_reservation(self, reservation_id: str) -> Optional[BudgetReservation]:
+        """
+        Release a reservation without recording usage.
+        
+        Args:
+            reservation_id: Reservation identifier
+            
+        Returns:
+            The released reservation, or None if not found
+        """
+        with self.lock:
+            reservation = self.reservations.pop(reservation_id, None)
+            if reservation is None:
+                return None
+            
+            for reserved, key in ((self.session_reserved, reservation.session_id),
+                                  (self.profile_reserved, reservation.profile_id)):
+                reserved[key] -= reservation.estimated_cost
+                if reserved[key] <= 1e-12:
+                    del reserved[key]
+            
+            self.global_reserved = max(0.0, self.global_reserved - reservation.estimated_cost)
+            return reservation
+    
+    def settle_reservation(self,
+                           reservation_id: str,
+                           usage_id: str,
+                           input_tokens: int,
+                           output_tokens: int,
+                           latency_ms: float,
+                           success: bool = True,
+                           error_message: Optional[str] = None) -> Optional[float]:
+        """
+        Reconcile a reservation with the actual usage of its request.
+        
+        Args:
+            reservation_id: Reservation identifier
+            usage_id: Unique identifier for the usage record
+            input_tokens: Actual prompt tokens
+            output_tokens: Actual completion tokens
+            latency_ms: Response latency in milliseconds
+            success: Whether the request was successful
+            error_message: Error message if request failed
+            
+        Returns:
+            Actual cost in USD, or None if the reservation was not found
+        """
+        # Swap the hold for the actual spend in one lock hold so a concurrent
+        # admission never sees neither; listeners run after the lock is released
+        with self.lock:
+            reservation = self.release_reservation(reservation_id)
+            if reservation is None:
+                self.logger.warning(f"Unknown budget reservation: {reservation_id}")
+                return None
+            
+            metrics = self._apply_usage(
+                usage_id=usage_id,
+                model=reservation.model,
+                profile_id=reservation.profile_id,
+                session_id=reservation.session_id,
+                task_type=reservation.task_type,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                latency_ms=latency_ms,
+                success=success,
+                error_message=error_message
+            )
+        
+        self._notify_usage(metrics)
+        return metrics.cost
+    
     def is_within_budget(self, session_id: str) -> bool:
         """
         Check if a session is within its budget.
         
+        Outstanding reservations count as spent.
+        
         Args:
             session_id: Session identifier
             
@@ -561,7 +989,7 @@ class CostTracker:
             if budget is None:
                 return True
             
-            spent = self.session_totals.get(session_id, 0.0)
+            spent = self.session_totals.get(session_id, 0.0) + self.session_reserved.get(session_id, 0.0)
             return spent < budget
     
     def get_remaining_budget(self, session_id: str) -> Optional[float]:
@@ -579,7 +1007,7 @@ class CostTracker:
             if budget is None:
                 return None
             
-            spent = self.session_totals.get(session_id, 0.0)
+            spent = self.session_totals.get(session_id, 0.0) + self.session_reserved.get(session_id, 0.0)
             return max(0.0, budget - spent)
     
     def get_optimization_recommendations(self, session_id: str) -> List[Dict[str, Any]]:
@@ -649,6 +1077,35 @@ class CostTracker:
             
             return recommendations
     
+    def _filter_usage_records(self,
+                              session_id: Optional[str] = None,
+                              profile_id: Optional[str] = None,
+                              start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None) -> List[UsageMetrics]:
+        """
+        Snapshot usage records matching the given filters.
+        
+        Only record references are copied, so the lock is held briefly
+        and exports can be serialized without blocking record_usage.
+        
+        Args:
+            session_id: Optional session filter
+            profile_id: Optional profile filter
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            
+        Returns:
+            List of matching usage records
+        """
+        with self.lock:
+            return [
+                r for r in self.usage_records
+                if (not session_id or r.session_id == session_id)
+                and (not profile_id or r.profile_id == profile_id)
+                and (not start_date or r.timestamp >= start_date)
+                and (not end_date or r.timestamp <= end_date)
+            ]
+    
     def export_usage_data(self,
                          session_id: Optional[str] = None,
                          profile_id: Optional[str] = None,
@@ -663,48 +1120,107 @@ class CostTracker:
             profile_id: Optional profile filter
             start_date: Optional start date filter
             end_date: Optional end date filter
-            format: Export format ('json' or 'csv')
+            format: Export format ('json', 'csv' or 'jsonl')
             
         Returns:
-            List of usage records or CSV string
+            List of usage records, or CSV / JSON Lines string
         """
-        with self.lock:
-            # Filter records
-            filtered = self.usage_records
-            
-            if session_id:
-                filtered = [r for r in filtered if r.session_id == session_id]
-            
-            if profile_id:
-                filtered = [r for r in filtered if r.profile_id == profile_id]
-            
-            if start_date:
-                filtered = [r for r in filtered if r.timestamp >= start_date]
-            
-            if end_date:
-                filtered = [r for r in filtered if r.timestamp <= end_date]
-            
-            # Export
-            if format == 'json':
-                return [record.to_dict() for record in filtered]
+        if format == 'json':
+            filtered = self._filter_usage_records(
+                session_id, profile_id, start_date, end_date
+            )
+            return [record.to_dict() for record in filtered]
+        
+        return ''.join(self.stream_usage_data(
+            session_id=session_id,
+            profile_id=profile_id,
+            start_date=start_date,
+            end_date=end_date,
+            format=format
+        ))
+    
+    def stream_usage_data(self,
+                          session_id: Optional[str] = None,
+                          profile_id: Optional[str] = None,
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None,
+                          format: str = 'csv',
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Stream usage data as bounded chunks.
+        
+        Args:
+            session_id: Optional session filter
+            profile_id: Optional profile filter
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            format: Export format ('csv' or 'jsonl')
+            chunk_size: Target chunk size in characters
             
-            elif format == 'csv':
-                if not filtered:
-                    return ""
-                
-                # Build CSV
-                lines = []
-                header = "id,timestamp,model,profile_id,session_id,task_type,input_tokens,output_tokens,cost,latency_ms,success,error_message"
-                lines.append(header)
-                
-                for record in filtered:
-                    line = f"{record.id},{record.timestamp.isoformat()},{record.model},{record.profile_id},{record.session_id},{record.task_type},{record.input_tokens},{record.output_tokens},{record.cost},{record.latency_ms},{record.success},{record.error_message or ''}"
-                    lines.append(line)
-                
-                return '\n'.join(lines)
+        Returns:
+            Iterator of export content chunks
+        """
+        if format == 'csv':
+            serializer = self._iter_usage_csv
+        elif format == 'jsonl':
+            serializer = self._iter_usage_jsonl
+        else:
+            raise ValueError(f"Unsupported format: {format}")
+        
+        filtered = self._filter_usage_records(
+            session_id, profile_id, start_date, end_date
+        )
+        
+        return iter_chunks(serializer(filtered), chunk_size)
+    
+    def write_usage_data(self,
+                         output_path: Union[str, Path],
+                         format: str = 'csv',
+                         compress: bool = False,
+                         **filters) -> int:
+        """
+        Stream usage data to a file.
+        
+        Args:
+            output_path: Destination file path
+            format: Export format ('csv' or 'jsonl')
+            compress: Whether to gzip the output
+            **filters: Filters accepted by stream_usage_data
             
-            else:
-                raise ValueError(f"Unsupported format: {format}")
+        Returns:
+            Number of characters written (before compression)
+        """
+        return write_chunks(
+            self.stream_usage_data(format=format, **filters),
+            output_path,
+            compress=compress
+        )
+    
+    def _iter_usage_csv(self, records: List[UsageMetrics]) -> Iterator[str]:
+        """Serialize usage records as CSV, one row at a time."""
+        if not records:
+            return
+        
+        output = StringIO()
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(USAGE_EXPORT_FIELDS)
+        
+        for record in records:
+            writer.writerow([
+                record.id, record.timestamp.isoformat(), record.model,
+                record.profile_id, record.session_id, record.task_type,
+                record.input_tokens, record.output_tokens, record.cost,
+                record.latency_ms, record.success, record.error_message or '',
+                record.cache_hit, record.saved_cost
+            ])
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    
+    def _iter_usage_jsonl(self, records: List[UsageMetrics]) -> Iterator[str]:
+        """Serialize usage records as JSON Lines."""
+        for record in records:
+            yield json.dumps(record.to_dict()) + '\n'
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -754,6 +1270,12 @@ class CostTracker:
             self.profile_budgets.clear()
             self.global_budget = None
             self.budget_alerts.clear()
+            self.reservations.clear()
+            self.session_reserved.clear()
+            self.profile_reserved.clear()
+            self.global_reserved = 0.0
+            self.output_predictor.clear()
+            self.rollups.clear()
             
             self.stats = {
                 'total_requests': 0,
@@ -761,7 +1283,11 @@ class CostTracker:
                 'total_input_tokens': 0,
                 'total_output_tokens': 0,
                 'successful_requests': 0,
-                'failed_requests': 0
+                'failed_requests': 0,
+                'cache_hits': 0,
+                'cache_savings': 0.0,
+                'admissions_granted': 0,
+                'admissions_denied': 0
             }
             
             self._save_usage_data()
@@ -0,0 +1,102 @@
+"""
+ATS MAFIA Framework Streaming Export Utilities
+
+This module provides helpers for streaming large exports (reports, usage
+records) as bounded chunks to HTTP responses or files, so memory use stays
+flat regardless of how much data is exported.
+"""
+
+import gzip
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+
+# Default target size (in characters) of each streamed chunk
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(pieces: Iterable[str],
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Coalesce small string pieces into chunks of roughly ``chunk_size``.
+
+    Args:
+        pieces: Iterable of string fragments
+        chunk_size: Target chunk size in characters
+
+    Yields:
+        String chunks
+    """
+    buffer = []
+    buffered = 0
+
+    for piece in pieces:
+        if not piece:
+            continue
+
+        buffer.append(piece)
+        buffered += len(piece)
+
+        if buffered >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def gzip_chunks(chunks: Iterable[str],
+                encoding: str = 'utf-8',
+                compresslevel: int = 6) -> Iterator[bytes]:
+    """
+    Gzip-compress a stream of string chunks incrementally.
+
+    Args:
+        chunks: Iterable of string chunks
+        encoding: Text encoding
+        compresslevel: Compression level (1-9)
+
+    Yields:
+        Compressed byte chunks forming a single gzip member
+    """
+    # wbits=31 selects the gzip container format
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode(encoding))
+        if data:
+            yield data
+
+    yield compressor.flush()
+
+
+def write_chunks(chunks: Iterable[str],
+                 output_path: Union[str, Path],
+                 compress: bool = False,
+                 encoding: str = 'utf-8') -> int:
+    """
+    Write a stream of string chunks to a file.
+
+    Args:
+        chunks: Iterable of string chunks
+        output_path: Destination file path
+        compress: Whether to gzip the output
+        encoding: Text encoding
+
+    Returns:
+        Number of characters written (before compression)
+    """
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    opener = gzip.open if compress else open
+    written = 0
+
+    with opener(output_file, 'wt', encoding=encoding, newline='') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+
+    return written
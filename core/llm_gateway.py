@@ -0,0 +1,808 @@
+"""
+ATS MAFIA Framework LLM Request Gateway
+
+This module provides a shared async client layer for LLM providers. Requests
+are routed by the ``LLMModel`` provider to a registered provider client that
+holds a pooled keep-alive connection, and are subject to per-provider
+concurrency caps, tokens-per-minute limits and optional micro-batching.
+Completed requests are recorded with the CostTracker automatically.
+
+A deterministic ``MockProvider`` with configurable latency distributions
+allows the whole path to be load-tested offline.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import math
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple
+
+from .llm_models import LLMModel
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+# Rough characters-per-token ratio used to estimate prompt size before sending
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class LLMRequest:
+    """
+    A single LLM completion request.
+
+    Attributes:
+        model: Model to call
+        prompt: User prompt
+        system_prompt: Optional system prompt
+        max_tokens: Maximum output tokens
+        temperature: Sampling temperature
+        profile_id: Profile making the request
+        session_id: Training session ID
+        task_type: Type of task
+        request_id: Unique request identifier (used as the usage ID)
+        prefix_cache: Prefix reuse metadata for providers with prompt caching
+    """
+    model: LLMModel
+    prompt: str
+    system_prompt: Optional[str] = None
+    max_tokens: int = 512
+    temperature: float = 0.7
+    profile_id: str = "unknown"
+    session_id: str = "unknown"
+    task_type: str = "general"
+    request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    prefix_cache: Optional[Dict[str, Any]] = None
+
+    def estimate_input_tokens(self) -> int:
+        """Estimate the number of prompt tokens."""
+        chars = len(self.prompt) + len(self.system_prompt or "")
+        return max(1, math.ceil(chars / CHARS_PER_TOKEN))
+
+    def to_messages(self) -> List[Dict[str, str]]:
+        """Convert to chat-completion messages."""
+        messages = []
+        if self.system_prompt:
+            messages.append({'role': 'system', 'content': self.system_prompt})
+        messages.append({'role': 'user', 'content': self.prompt})
+        return messages
+
+
+@dataclass
+class LLMResponse:
+    """
+    Result of an LLM completion request.
+
+    Attributes:
+        request_id: ID of the originating request
+        model: Model identifier (provider/name)
+        text: Completion text
+        input_tokens: Prompt tokens consumed
+        output_tokens: Completion tokens produced
+        latency_ms: End-to-end latency in milliseconds
+        success: Whether the request succeeded
+        error_message: Error message if the request failed
+        batch_size: Number of requests sent in the same provider call
+        cost: Cost recorded with the CostTracker
+        cache_hit: Whether the response was served from the response cache
+    """
+    request_id: str
+    model: str
+    text: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: float = 0.0
+    success: bool = True
+    error_message: Optional[str] = None
+    batch_size: int = 1
+    cost: float = 0.0
+    cache_hit: bool = False
+
+
+@dataclass
+class ProviderLimits:
+    """
+    Per-provider traffic limits.
+
+    Attributes:
+        max_concurrency: Maximum concurrent provider calls
+        tokens_per_minute: Token budget per minute (None for unlimited)
+        max_batch_size: Maximum requests per provider call (1 disables batching)
+        batch_window_ms: How long to wait for a batch to fill
+    """
+    max_concurrency: int = 8
+    tokens_per_minute: Optional[int] = None
+    max_batch_size: int = 1
+    batch_window_ms: float = 5.0
+
+
+class TokenBucket:
+    """Async token bucket enforcing a tokens-per-minute rate."""
+
+    def __init__(self, tokens_per_minute: int):
+        """
+        Initialize the token bucket.
+
+        Args:
+            tokens_per_minute: Refill rate and bucket capacity
+        """
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until ``tokens`` are available and take them.
+
+        Requests larger than the bucket are capped at its capacity.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        needed = min(float(tokens), self.capacity)
+        start = time.monotonic()
+
+        # Waiters queue on the lock, so tokens are granted in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= needed:
+                    self.tokens -= needed
+                    return now - start
+
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+
+
+class LLMProvider(ABC):
+    """Base class for provider clients used by the gateway."""
+
+    # Whether complete_batch sends several requests in one provider call
+    supports_batching = False
+
+    def __init__(self, name: str):
+        """
+        Initialize the provider.
+
+        Args:
+            name: Provider name
+        """
+        self.name = name
+        self.logger = logging.getLogger(f"llm_provider.{name}")
+
+    @abstractmethod
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        """
+        Run a single completion.
+
+        Args:
+            request: Request to complete
+
+        Returns:
+            Provider response
+        """
+        pass
+
+    async def complete_batch(self, requests: List[LLMRequest]) -> List[LLMResponse]:
+        """
+        Run several completions.
+
+        Args:
+            requests: Requests for the same model
+
+        Returns:
+            Responses in request order
+        """
+        return list(await asyncio.gather(*(self.complete(r) for r in requests)))
+
+    async def close(self) -> None:
+        """Release provider resources."""
+        pass
+
+
+class MockProvider(LLMProvider):
+    """
+    Deterministic local stand-in provider for offline load testing.
+
+    Latency and output length are drawn from a random generator seeded by the
+    provider seed, model and prompt, so the same request always produces the
+    same response regardless of scheduling.
+
+    Supported latency distributions (parameters in milliseconds):
+        constant: value
+        uniform: low, high
+        normal: mean, stddev
+        lognormal: median, sigma
+    """
+
+    supports_batching = True
+
+    def __init__(self,
+                 name: str = "mock",
+                 latency_distribution: str = "lognormal",
+                 latency_params: Optional[Dict[str, float]] = None,
+                 error_rate: float = 0.0,
+                 output_tokens_range: Tuple[int, int] = (32, 256),
+                 batch_overhead_ms: float = 2.0,
+                 time_scale: float = 1.0,
+                 seed: int = 0):
+        """
+        Initialize the mock provider.
+
+        Args:
+            name: Provider name
+            latency_distribution: constant, uniform, normal or lognormal
+            latency_params: Distribution parameters
+            error_rate: Probability of a simulated failure
+            output_tokens_range: Inclusive range of generated output tokens
+            batch_overhead_ms: Extra latency per additional request in a batch
+            time_scale: Multiplier applied to simulated sleeps (0 disables sleeping)
+            seed: Seed for deterministic behavior
+        """
+        super().__init__(name)
+
+        defaults = {
+            'constant': {'value': 200.0},
+            'uniform': {'low': 100.0, 'high': 400.0},
+            'normal': {'mean': 250.0, 'stddev': 50.0},
+            'lognormal': {'median': 250.0, 'sigma': 0.5}
+        }
+        if latency_distribution not in defaults:
+            raise ValueError(f"Unsupported latency distribution: {latency_distribution}")
+
+        self.latency_distribution = latency_distribution
+        self.latency_params = {**defaults[latency_distribution], **(latency_params or {})}
+        self.error_rate = error_rate
+        self.output_tokens_range = output_tokens_range
+        self.batch_overhead_ms = batch_overhead_ms
+        self.time_scale = time_scale
+        self.seed = seed
+
+        self.calls = 0
+        self.requests_served = 0
+
+    def _rng(self, request: LLMRequest) -> random.Random:
+        """Create the generator for a request."""
+        key = f"{self.seed}|{request.model.get_full_name()}|{request.system_prompt}|{request.prompt}"
+        return random.Random(hashlib.sha256(key.encode()).hexdigest())
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        """Sample a latency in milliseconds."""
+        params = self.latency_params
+
+        if self.latency_distribution == 'constant':
+            latency = params['value']
+        elif self.latency_distribution == 'uniform':
+            latency = rng.uniform(params['low'], params['high'])
+        elif self.latency_distribution == 'normal':
+            latency = rng.gauss(params['mean'], params['stddev'])
+        else:
+            latency = rng.lognormvariate(math.log(params['median']), params['sigma'])
+
+        return max(0.0, latency)
+
+    def _simulate(self, request: LLMRequest) -> Tuple[float, LLMResponse]:
+        """Produce the simulated latency and response for a request."""
+        rng = self._rng(request)
+        latency = self._sample_latency(rng)
+        full_name = request.model.get_full_name()
+        input_tokens = request.estimate_input_tokens()
+
+        if rng.random() < self.error_rate:
+            return latency, LLMResponse(
+                request_id=request.request_id,
+                model=full_name,
+                input_tokens=input_tokens,
+                success=False,
+                error_message="Simulated provider error"
+            )
+
+        low, high = self.output_tokens_range
+        output_tokens = min(request.max_tokens, rng.randint(low, high))
+
+        return latency, LLMResponse(
+            request_id=request.request_id,
+            model=full_name,
+            text=f"[{full_name}] mock completion {rng.getrandbits(32):08x}",
+            input_tokens=input_tokens,
+            output_tokens=output_tokens
+        )
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        """Simulate a single completion."""
+        latency, response = self._simulate(request)
+
+        if self.time_scale > 0:
+            await asyncio.sleep(latency * self.time_scale / 1000.0)
+
+        self.calls += 1
+        self.requests_served += 1
+        response.latency_ms = latency
+        return response
+
+    async def complete_batch(self, requests: List[LLMRequest]) -> List[LLMResponse]:
+        """Simulate a batched call; it takes as long as its slowest member."""
+        simulated = [self._simulate(request) for request in requests]
+        latency = max(lat for lat, _ in simulated) + self.batch_overhead_ms * (len(requests) - 1)
+
+        if self.time_scale > 0:
+            await asyncio.sleep(latency * self.time_scale / 1000.0)
+
+        self.calls += 1
+        self.requests_served += len(requests)
+
+        responses = []
+        for _, response in simulated:
+            response.latency_ms = latency
+            response.batch_size = len(requests)
+            responses.append(response)
+
+        return responses
+
+
+class HTTPProvider(LLMProvider):
+    """
+    Provider client for OpenAI-compatible chat completion APIs (e.g. OpenRouter).
+
+    A single aiohttp session with a bounded keep-alive connection pool is
+    shared by all requests to the provider.
+    """
+
+    def __init__(self,
+                 name: str,
+                 base_url: str,
+                 api_key: Optional[str] = None,
+                 max_connections: int = 16,
+                 keepalive_timeout: float = 30.0,
+                 request_timeout: float = 60.0,
+                 qualified_model_names: bool = True):
+        """
+        Initialize the HTTP provider.
+
+        Args:
+            name: Provider name
+            base_url: API base URL (without /chat/completions)
+            api_key: Bearer token
+            max_connections: Connection pool size
+            keepalive_timeout: Seconds idle connections are kept open
+            request_timeout: Total timeout per request in seconds
+            qualified_model_names: Send "provider/name" instead of the bare model name
+        """
+        super().__init__(name)
+
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for HTTPProvider. Install with: pip install aiohttp")
+
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self.qualified_model_names = qualified_model_names
+        self._session: Optional['aiohttp.ClientSession'] = None
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """Get the pooled session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            headers = {'Content-Type': 'application/json'}
+            if self.api_key:
+                headers['Authorization'] = f"Bearer {self.api_key}"
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    keepalive_timeout=self.keepalive_timeout
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                headers=headers
+            )
+
+        return self._session
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        """Send a chat completion request."""
+        model_name = (request.model.get_full_name() if self.qualified_model_names
+                      else request.model.name)
+        payload = {
+            'model': model_name,
+            'messages': request.to_messages(),
+            'max_tokens': request.max_tokens,
+            'temperature': request.temperature
+        }
+
+        start = time.perf_counter()
+        async with self._get_session().post(f"{self.base_url}/chat/completions", json=payload) as resp:
+            data = await resp.json(content_type=None)
+        latency = (time.perf_counter() - start) * 1000.0
+
+        if resp.status >= 400:
+            error = data.get('error', {}) if isinstance(data, dict) else {}
+            message = error.get('message') if isinstance(error, dict) else str(error)
+            return LLMResponse(
+                request_id=request.request_id,
+                model=request.model.get_full_name(),
+                input_tokens=request.estimate_input_tokens(),
+                latency_ms=latency,
+                success=False,
+                error_message=f"HTTP {resp.status}: {message or 'request failed'}"
+            )
+
+        usage = data.get('usage', {})
+        choices = data.get('choices') or [{}]
+
+        return LLMResponse(
+            request_id=request.request_id,
+            model=request.model.get_full_name(),
+            text=choices[0].get('message', {}).get('content', ''),
+            input_tokens=usage.get('prompt_tokens', request.estimate_input_tokens()),
+            output_tokens=usage.get('completion_tokens', 0),
+            latency_ms=latency
+        )
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+@dataclass
+class _ProviderSlot:
+    """Runtime state for a registered provider."""
+    provider: LLMProvider
+    limits: ProviderLimits
+    semaphore: Optional[asyncio.Semaphore] = None
+    bucket: Optional[TokenBucket] = None
+    pending: Dict[str, List[Tuple[LLMRequest, asyncio.Future]]] = field(default_factory=dict)
+    timers: Dict[str, asyncio.TimerHandle] = field(default_factory=dict)
+    in_flight: int = 0
+    calls: int = 0
+    requests: int = 0
+    failures: int = 0
+    throttle_wait_s: float = 0.0
+
+
+class LLMGateway:
+    """
+    Shared async gateway for LLM requests.
+
+    Routes each request to the provider registered for its model's provider
+    name, enforcing concurrency and token-rate limits, micro-batching requests
+    for the same model when the provider supports it, and recording usage
+    with the CostTracker. With a ResponseCache attached, cache hits are served
+    without a provider call and recorded as zero-cost usage. With budget
+    enforcement enabled, each request must reserve its estimated cost with
+    the CostTracker before it is sent; denied requests fail without a call.
+    """
+
+    def __init__(self,
+                 cost_tracker: Optional[Any] = None,
+                 response_cache: Optional[Any] = None,
+                 enforce_budgets: bool = False):
+        """
+        Initialize the gateway.
+
+        Args:
+            cost_tracker: CostTracker that receives a usage record per request
+            response_cache: ResponseCache consulted before provider calls
+            enforce_budgets: Reserve budget with the CostTracker before sending requests
+        """
+        self.cost_tracker = cost_tracker
+        self.response_cache = response_cache
+        self.enforce_budgets = enforce_budgets and cost_tracker is not None
+        self.logger = logging.getLogger("llm_gateway")
+        self.cache_hits = 0
+        self.budget_denials = 0
+        self._reservations: Dict[str, Any] = {}  # request_id -> BudgetReservation
+
+        self._slots: Dict[str, _ProviderSlot] = {}
+        self._routes: Dict[str, str] = {}  # LLMModel.provider -> slot name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set = set()
+
+    def register_provider(self,
+                          provider: LLMProvider,
+                          limits: Optional[ProviderLimits] = None,
+                          model_providers: Optional[List[str]] = None) -> None:
+        """
+        Register a provider client.
+
+        Args:
+            provider: Provider client
+            limits: Traffic limits (defaults to ProviderLimits())
+            model_providers: LLMModel provider names served by this client
+                (defaults to the client name; "*" serves unrouted providers)
+        """
+        self._slots[provider.name] = _ProviderSlot(provider=provider, limits=limits or ProviderLimits())
+
+        for model_provider in model_providers or [provider.name]:
+            self._routes[model_provider] = provider.name
+
+        self.logger.info(f"Registered LLM provider: {provider.name}")
+
+    def _slot_for(self, model: LLMModel) -> _ProviderSlot:
+        """Resolve the provider slot for a model."""
+        name = self._routes.get(model.provider, self._routes.get('*'))
+        if name is None:
+            raise ValueError(f"No provider registered for model: {model.get_full_name()}")
+
+        slot = self._slots[name]
+
+        # Async primitives are created on the loop that first uses them
+        if slot.semaphore is None:
+            slot.semaphore = asyncio.Semaphore(slot.limits.max_concurrency)
+            if slot.limits.tokens_per_minute:
+                slot.bucket = TokenBucket(slot.limits.tokens_per_minute)
+
+        return slot
+
+    async def submit(self, request: LLMRequest) -> LLMResponse:
+        """
+        Send a request through the gateway.
+
+        Args:
+            request: Request to send
+
+        Returns:
+            Response (failures are returned, not raised)
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Async primitives cannot be shared across event loops
+            self._loop = loop
+            for slot in self._slots.values():
+                slot.semaphore = None
+                slot.bucket = None
+
+        slot = self._slot_for(request.model)
+
+        if self.response_cache is not None:
+            request.prefix_cache = self.response_cache.record_prefix(request)
+            cached = await self.response_cache.get_async(request)
+            if cached is not None:
+                self.cache_hits += 1
+                response = cached.to_response(request.request_id)
+                if self.cost_tracker is not None:
+                    await self._record_usage([request], [response])
+                return response
+
+        if self.enforce_budgets:
+            reservation = self.cost_tracker.reserve_budget(
+                model=request.model.get_full_name(),
+                session_id=request.session_id,
+                profile_id=request.profile_id,
+                input_tokens=request.estimate_input_tokens(),
+                task_type=request.task_type,
+                max_output_tokens=request.max_tokens
+            )
+            if reservation is None:
+                self.budget_denials += 1
+                return LLMResponse(
+                    request_id=request.request_id,
+                    model=request.model.get_full_name(),
+                    success=False,
+                    error_message="Budget exceeded"
+                )
+            self._reservations[request.request_id] = reservation
+
+        if slot.provider.supports_batching and slot.limits.max_batch_size > 1:
+            future = self._loop.create_future()
+            self._enqueue(slot, request, future)
+            response = await future
+        else:
+            try:
+                response = (await self._execute(slot, [request]))[0]
+            finally:
+                self._release_reservations([request])
+
+        if self.response_cache is not None:
+            await self.response_cache.put_async(request, response)
+
+        return response
+
+    async def submit_many(self, requests: List[LLMRequest]) -> List[LLMResponse]:
+        """
+        Send several requests concurrently.
+
+        Args:
+            requests: Requests to send
+
+        Returns:
+            Responses in request order
+        """
+        return list(await asyncio.gather(*(self.submit(r) for r in requests)))
+
+    def _enqueue(self, slot: _ProviderSlot, request: LLMRequest, future: asyncio.Future) -> None:
+        """Add a request to its model's pending batch."""
+        key = request.model.get_full_name()
+        batch = slot.pending.setdefault(key, [])
+        batch.append((request, future))
+
+        if len(batch) >= slot.limits.max_batch_size:
+            self._flush(slot, key)
+        elif key not in slot.timers:
+            slot.timers[key] = self._loop.call_later(
+                slot.limits.batch_window_ms / 1000.0, self._flush, slot, key
+            )
+
+    def _flush(self, slot: _ProviderSlot, key: str) -> None:
+        """Dispatch a model's pending batch."""
+        timer = slot.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = slot.pending.pop(key, None)
+        if not batch:
+            return
+
+        task = self._loop.create_task(self._run_batch(slot, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, slot: _ProviderSlot, batch: List[Tuple[LLMRequest, asyncio.Future]]) -> None:
+        """Execute a batch and resolve its futures."""
+        requests = [request for request, _ in batch]
+        try:
+            responses = await self._execute(slot, requests)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._release_reservations(requests)
+
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+    def _release_reservations(self, requests: List[LLMRequest]) -> None:
+        """Release budget reservations of requests whose usage was never recorded."""
+        for request in requests:
+            reservation = self._reservations.pop(request.request_id, None)
+            if reservation is not None:
+                self.cost_tracker.release_reservation(reservation.id)
+
+    async def _execute(self, slot: _ProviderSlot, requests: List[LLMRequest]) -> List[LLMResponse]:
+        """Run requests against a provider under its limits and record usage."""
+        if slot.bucket is not None:
+            tokens = sum(r.estimate_input_tokens() + r.max_tokens for r in requests)
+            slot.throttle_wait_s += await slot.bucket.acquire(tokens)
+
+        async with slot.semaphore:
+            slot.in_flight += len(requests)
+            start = time.perf_counter()
+
+            try:
+                if len(requests) == 1:
+                    responses = [await slot.provider.complete(requests[0])]
+                else:
+                    responses = await slot.provider.complete_batch(requests)
+            except Exception as e:
+                latency = (time.perf_counter() - start) * 1000.0
+                self.logger.error(f"Provider {slot.provider.name} call failed: {e}")
+                responses = [
+                    LLMResponse(
+                        request_id=r.request_id,
+                        model=r.model.get_full_name(),
+                        input_tokens=r.estimate_input_tokens(),
+                        latency_ms=latency,
+                        success=False,
+                        error_message=str(e),
+                        batch_size=len(requests)
+                    )
+                    for r in requests
+                ]
+            finally:
+                slot.in_flight -= len(requests)
+
+        slot.calls += 1
+        slot.requests += len(requests)
+        slot.failures += sum(1 for r in responses if not r.success)
+
+        if self.cost_tracker is not None:
+            await self._record_usage(requests, responses)
+
+        return responses
+
+    async def _record_usage(self, requests: List[LLMRequest], responses: List[LLMResponse]) -> None:
+        """Record usage off the event loop (the tracker may persist to disk)."""
+        loop = asyncio.get_running_loop()
+
+        for request, response in zip(requests, responses):
+            reservation = self._reservations.pop(request.request_id, None)
+            try:
+                if reservation is not None:
+                    response.cost = await loop.run_in_executor(None, functools.partial(
+                        self.cost_tracker.settle_reservation,
+                        reservation.id,
+                        usage_id=request.request_id,
+                        input_tokens=response.input_tokens,
+                        output_tokens=response.output_tokens,
+                        latency_ms=response.latency_ms,
+                        success=response.success,
+                        error_message=response.error_message
+                    ))
+                    continue
+
+                response.cost = await loop.run_in_executor(None, functools.partial(
+                    self.cost_tracker.record_usage,
+                    usage_id=request.request_id,
+                    model=response.model,
+                    profile_id=request.profile_id,
+                    session_id=request.session_id,
+                    task_type=request.task_type,
+                    input_tokens=response.input_tokens,
+                    output_tokens=response.output_tokens,
+                    latency_ms=response.latency_ms,
+                    success=response.success,
+                    error_message=response.error_message,
+                    cache_hit=response.cache_hit
+                ))
+            except Exception as e:
+                self.logger.error(f"Failed to record usage for {request.request_id}: {e}")
+
+    async def close(self) -> None:
+        """Flush pending batches and close all providers."""
+        for slot in self._slots.values():
+            for key in list(slot.pending):
+                self._flush(slot, key)
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        for slot in self._slots.values():
+            await slot.provider.close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get gateway statistics.
+
+        Returns:
+            Dictionary with per-provider statistics
+        """
+        providers = {}
+
+        for name, slot in self._slots.items():
+            providers[name] = {
+                'in_flight': slot.in_flight,
+                'pending': sum(len(batch) for batch in slot.pending.values()),
+                'calls': slot.calls,
+                'requests': slot.requests,
+                'failures': slot.failures,
+                'average_batch_size': slot.requests / slot.calls if slot.calls else 0.0,
+                'throttle_wait_seconds': slot.throttle_wait_s,
+                'max_concurrency': slot.limits.max_concurrency,
+                'tokens_per_minute': slot.limits.tokens_per_minute
+            }
+
+        stats = {
+            'providers': providers,
+            'routes': dict(self._routes),
+            'total_requests': sum(p['requests'] for p in providers.values()),
+            'cache_hits': self.cache_hits,
+            'budget_denials': self.budget_denials,
+            'outstanding_reservations': len(self._reservations)
+        }
+
+        if self.response_cache is not None:
+            stats['response_cache'] = self.response_cache.get_statistics()
+
+        return stats
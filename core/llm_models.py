@@ -7,11 +7,13 @@ intelligent selection, load balancing, and task-based optimization.
 
 import logging
 import threading
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Tuple, FrozenSet
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 from datetime import datetime, timezone
 import random
+import time
+from collections import deque
 
 
 class ModelTier(Enum):
@@ -118,12 +120,28 @@ class LLMModel:
         return input_cost + output_cost
 
 
+# Token estimates used to turn a per-request cost cap into a model filter
+ESTIMATED_INPUT_TOKENS = 2000
+ESTIMATED_OUTPUT_TOKENS = 500
+
+# Cheaper tier to fall back to when a tier has no other models
+_FALLBACK_TIERS = {
+    ModelTier.PREMIUM: ModelTier.ADVANCED,
+    ModelTier.ADVANCED: ModelTier.STANDARD,
+    ModelTier.STANDARD: ModelTier.ENTRY
+}
+
+
 class ModelRegistry:
     """
     Centralized registry for all available LLM models.
     
     Maintains a database of models with their capabilities, costs, and
     performance characteristics. Supports filtering and recommendation.
+    
+    Candidate lists per (task_type, tier, capability set) are built on first
+    use and kept until ``register_model``/``unregister_model`` bump
+    ``catalog_version``. Models should be re-registered after being modified.
     """
     
     def __init__(self):
@@ -132,6 +150,13 @@ class ModelRegistry:
         self.lock = threading.RLock()
         self.logger = logging.getLogger("model_registry")
         
+        # Catalog version and derived selection tables
+        self.catalog_version = 0
+        self._candidate_tables: Dict[Tuple[str, Optional[ModelTier], FrozenSet[ModelCapability]],
+                                     List[LLMModel]] = {}
+        self._tier_tables: Dict[ModelTier, List[LLMModel]] = {}
+        self._estimated_costs: Dict[str, float] = {}
+        
         # Load default models
         self._load_default_models()
     
@@ -376,6 +401,7 @@ class ModelRegistry:
         with self.lock:
             full_name = model.get_full_name()
             self.models[full_name] = model
+            self._bump_catalog_version()
             self.logger.debug(f"Registered model: {full_name}")
     
     def unregister_model(self, provider: str, name: str) -> bool:
@@ -393,10 +419,77 @@ class ModelRegistry:
             full_name = f"{provider}/{name}"
             if full_name in self.models:
                 del self.models[full_name]
+                self._bump_catalog_version()
                 self.logger.debug(f"Unregistered model: {full_name}")
                 return True
             return False
     
+    def _bump_catalog_version(self) -> None:
+        """Invalidate derived selection tables after a catalog change."""
+        self.catalog_version += 1
+        self._candidate_tables.clear()
+        self._tier_tables.clear()
+        self._estimated_costs.clear()
+    
+    def estimate_request_cost(self, model: LLMModel) -> float:
+        """Get the estimated per-request cost of a model."""
+        full_name = model.get_full_name()
+        cost = self._estimated_costs.get(full_name)
+        if cost is None:
+            cost = model.calculate_cost(ESTIMATED_INPUT_TOKENS, ESTIMATED_OUTPUT_TOKENS)
+            self._estimated_costs[full_name] = cost
+        return cost
+    
+    def get_candidates(self,
+                       task_type: str,
+                       tier: Optional[ModelTier] = None,
+                       capabilities: Optional[List[ModelCapability]] = None) -> List[LLMModel]:
+        """
+        Get the precomputed candidate list for a task.
+        
+        Args:
+            task_type: Type of task (reconnaissance, exploitation, etc.)
+            tier: Optional tier filter
+            capabilities: Capabilities every candidate must have
+            
+        Returns:
+            Shared list of models sorted by reasoning score (do not mutate)
+        """
+        key = (task_type, tier, frozenset(capabilities or ()))
+        
+        with self.lock:
+            candidates = self._candidate_tables.get(key)
+            if candidates is None:
+                candidates = [
+                    m for m in self.models.values()
+                    if task_type in m.recommended_for
+                    and (tier is None or m.tier == tier)
+                    and key[2].issubset(m.capabilities)
+                ]
+                # Sort by reasoning score (higher is better); stable for ties
+                candidates.sort(key=lambda m: m.reasoning_score, reverse=True)
+                self._candidate_tables[key] = candidates
+            
+            return candidates
+    
+    def get_tier_models(self, tier: ModelTier) -> List[LLMModel]:
+        """
+        Get the precomputed list of models in a tier.
+        
+        Args:
+            tier: Model tier
+            
+        Returns:
+            Shared list of models in registration order (do not mutate)
+        """
+        with self.lock:
+            models = self._tier_tables.get(tier)
+            if models is None:
+                models = [m for m in self.models.values() if m.tier == tier]
+                self._tier_tables[tier] = models
+            
+            return models
+    
     def get_model(self, provider: str, name: str) -> Optional[LLMModel]:
         """
         Get a specific model by provider and name.
@@ -430,14 +523,14 @@ class ModelRegistry:
             List of matching models
         """
         with self.lock:
-            models = list(self.models.values())
+            if tier:
+                models = list(self.get_tier_models(tier))
+            else:
+                models = list(self.models.values())
             
             if provider:
                 models = [m for m in models if m.provider == provider]
             
-            if tier:
-                models = [m for m in models if m.tier == tier]
-            
             if capability:
                 models = [m for m in models if capability in m.capabilities]
             
@@ -462,27 +555,15 @@ class ModelRegistry:
             List of recommended models sorted by suitability
         """
         with self.lock:
-            models = [
-                m for m in self.models.values()
-                if task_type in m.recommended_for
-            ]
-            
-            if tier:
-                models = [m for m in models if m.tier == tier]
+            models = self.get_candidates(task_type, tier=tier)
             
             if max_cost_per_request is not None:
-                # Estimate tokens (rough approximation)
-                est_input_tokens = 2000
-                est_output_tokens = 500
-                models = [
+                return [
                     m for m in models
-                    if m.calculate_cost(est_input_tokens, est_output_tokens) <= max_cost_per_request
+                    if self.estimate_request_cost(m) <= max_cost_per_request
                 ]
             
-            # Sort by reasoning score (higher is better)
-            models.sort(key=lambda m: m.reasoning_score, reverse=True)
-            
-            return models
+            return list(models)
     
     def get_cheapest_model(self, capability: Optional[ModelCapability] = None) -> Optional[LLMModel]:
         """
@@ -549,7 +630,9 @@ class ModelRegistry:
                 'total_models': len(self.models),
                 'models_by_provider': models_by_provider,
                 'models_by_tier': models_by_tier,
-                'providers': list(models_by_provider.keys())
+                'providers': list(models_by_provider.keys()),
+                'catalog_version': self.catalog_version,
+                'cached_candidate_tables': len(self._candidate_tables)
             }
 
 
@@ -558,9 +641,13 @@ class ModelSelector:
     Intelligent model selection based on task requirements.
     
     Selects optimal models based on task type, cost constraints,
-    performance requirements, and profile preferences.
+    performance requirements, and profile preferences. Results are memoized
+    per normalized request until the registry's catalog version changes.
     """
     
+    # Maximum number of memoized selections
+    MAX_MEMO_SIZE = 1024
+    
     def __init__(self, registry: ModelRegistry):
         """
         Initialize the model selector.
@@ -570,6 +657,39 @@ class ModelSelector:
         """
         self.registry = registry
         self.logger = logging.getLogger("model_selector")
+        
+        # Memoized selections, valid for a single catalog version
+        self._memo: Dict[Tuple, Optional[LLMModel]] = {}
+        self._memo_version = registry.catalog_version
+        self.lock = threading.Lock()
+        self.memo_hits = 0
+        self.memo_misses = 0
+    
+    def _memo_get(self, key: Tuple) -> Tuple[bool, Optional[LLMModel]]:
+        """Look up a memoized selection, dropping the memo if the catalog changed."""
+        with self.lock:
+            if self._memo_version != self.registry.catalog_version:
+                self._memo.clear()
+                self._memo_version = self.registry.catalog_version
+            
+            if key in self._memo:
+                self.memo_hits += 1
+                return True, self._memo[key]
+            
+            self.memo_misses += 1
+            return False, None
+    
+    def _memo_put(self, key: Tuple, version: int, model: Optional[LLMModel]) -> None:
+        """Memoize a selection computed against a given catalog version."""
+        with self.lock:
+            if version != self._memo_version:
+                return
+            
+            if len(self._memo) >= self.MAX_MEMO_SIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                del self._memo[next(iter(self._memo))]
+            
+            self._memo[key] = model
     
     def select_model(self,
                     task_type: str,
@@ -602,26 +722,37 @@ class ModelSelector:
                     self.logger.debug(f"Using profile-configured model: {model.get_full_name()}")
                     return model
         
-        # Get recommended models for task
-        candidates = self.registry.get_recommended_models(
-            task_type=task_type,
+        key = ('select', task_type, preferred_tier, max_cost_per_request,
+               frozenset(required_capabilities or ()))
+        found, selected = self._memo_get(key)
+        if found:
+            return selected
+        
+        version = self.registry.catalog_version
+        
+        # Candidates are precomputed per (task, tier, capabilities) and sorted
+        # by reasoning score, so the best match is the first within budget
+        candidates = self.registry.get_candidates(
+            task_type,
             tier=preferred_tier,
-            max_cost_per_request=max_cost_per_request
+            capabilities=required_capabilities
         )
         
-        # Filter by required capabilities
-        if required_capabilities:
-            candidates = [
-                m for m in candidates
-                if all(cap in m.capabilities for cap in required_capabilities)
-            ]
+        if max_cost_per_request is not None:
+            selected = next(
+                (m for m in candidates
+                 if self.registry.estimate_request_cost(m) <= max_cost_per_request),
+                None
+            )
+        else:
+            selected = candidates[0] if candidates else None
         
-        if not candidates:
+        self._memo_put(key, version, selected)
+        
+        if selected is None:
             self.logger.warning(f"No suitable model found for task: {task_type}")
             return None
         
-        # Return best match (already sorted by reasoning score)
-        selected = candidates[0]
         self.logger.info(f"Selected model {selected.get_full_name()} for task {task_type}")
         return selected
     
@@ -638,44 +769,146 @@ class ModelSelector:
         Returns:
             Fallback model or None
         """
-        # Get models of same tier or lower
-        candidates = self.registry.list_models(tier=current_model.tier)
-        
-        # Remove the current model
-        candidates = [m for m in candidates if m.get_full_name() != current_model.get_full_name()]
+        key = ('fallback', current_model.get_full_name(), current_model.tier)
+        found, fallback = self._memo_get(key)
         
-        if not candidates:
-            # Try cheaper tier
-            if current_model.tier == ModelTier.PREMIUM:
-                candidates = self.registry.list_models(tier=ModelTier.ADVANCED)
-            elif current_model.tier == ModelTier.ADVANCED:
-                candidates = self.registry.list_models(tier=ModelTier.STANDARD)
-            elif current_model.tier == ModelTier.STANDARD:
-                candidates = self.registry.list_models(tier=ModelTier.ENTRY)
+        if not found:
+            version = self.registry.catalog_version
+            
+            # Get models of same tier, excluding the current model
+            candidates = [
+                m for m in self.registry.get_tier_models(current_model.tier)
+                if m.get_full_name() != current_model.get_full_name()
+            ]
+            
+            if not candidates and current_model.tier in _FALLBACK_TIERS:
+                # Try cheaper tier
+                candidates = self.registry.get_tier_models(_FALLBACK_TIERS[current_model.tier])
+            
+            # Select cheapest option
+            fallback = min(candidates, key=lambda m: m.cost_per_1k_input_tokens) if candidates else None
+            self._memo_put(key, version, fallback)
         
-        if not candidates:
+        if fallback is None:
             return None
         
-        # Select cheapest option
-        fallback = min(candidates, key=lambda m: m.cost_per_1k_input_tokens)
         self.logger.info(f"Selected fallback model: {fallback.get_full_name()} (reason: {reason})")
         return fallback
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get selector statistics.
+        
+        Returns:
+            Dictionary with memoization statistics
+        """
+        with self.lock:
+            lookups = self.memo_hits + self.memo_misses
+            return {
+                'memoized_selections': len(self._memo),
+                'catalog_version': self._memo_version,
+                'memo_hits': self.memo_hits,
+                'memo_misses': self.memo_misses,
+                'memo_hit_rate': self.memo_hits / lookups if lookups else 0.0
+            }
+
+
+class CircuitState(Enum):
+    """Circuit breaker states for load-balanced models."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class ModelHealth:
+    """
+    Live health of a model behind a load balancer.
+    
+    Attributes:
+        in_flight: Requests handed out and not yet completed
+        ewma_latency_ms: Exponentially weighted moving average latency
+        outcomes: Recent (success, latency_ms) results, newest last
+        circuit_state: Circuit breaker state
+        opened_at: Monotonic time the circuit last opened
+        probe_in_flight: Whether a half-open probe request is outstanding
+        probe_request_id: Request ID the probe was selected with, if any
+        trips: Number of times the circuit has opened
+    """
+    in_flight: int = 0
+    ewma_latency_ms: Optional[float] = None
+    outcomes: deque = field(default_factory=deque)
+    circuit_state: CircuitState = CircuitState.CLOSED
+    opened_at: Optional[float] = None
+    probe_in_flight: bool = False
+    probe_request_id: Optional[str] = None
+    trips: int = 0
+    
+    def error_rate(self) -> float:
+        """Get the error rate over the recent outcome window."""
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for success, _ in self.outcomes if not success) / len(self.outcomes)
+    
+    def p95_latency(self) -> Optional[float]:
+        """Get the 95th percentile latency over the recent outcome window."""
+        if not self.outcomes:
+            return None
+        latencies = sorted(latency for _, latency in self.outcomes)
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert health to dictionary."""
+        return {
+            'in_flight': self.in_flight,
+            'ewma_latency_ms': self.ewma_latency_ms,
+            'error_rate': self.error_rate(),
+            'p95_latency_ms': self.p95_latency(),
+            'window_size': len(self.outcomes),
+            'circuit_state': self.circuit_state.value,
+            'trips': self.trips
+        }
 
 
 class ModelLoadBalancer:
     """
     Load balancer for distributing requests across multiple models.
     
-    Supports round-robin, weighted, and least-cost distribution strategies.
+    Supports round-robin, weighted (inverse cost), least-cost, EWMA-latency
+    weighted and power-of-two-choices distribution strategies. Every strategy
+    skips models whose circuit breaker is open; an open circuit moves to
+    half-open after ``open_timeout`` seconds and lets a single probe through.
+    
+    Callers report outcomes with ``record_result`` (or by attaching a
+    CostTracker) so in-flight counts, latency and breaker state stay current.
+    Passing the same ``request_id`` when selecting and reporting lets a
+    half-open circuit tell its probe apart from requests dispatched before it
+    opened; only the probe's completion closes or reopens the circuit.
     """
     
-    def __init__(self, models: List[LLMModel], strategy: str = "round_robin"):
+    STRATEGIES = ("round_robin", "weighted", "least_cost", "ewma_latency", "power_of_two")
+    
+    def __init__(self,
+                 models: List[LLMModel],
+                 strategy: str = "round_robin",
+                 ewma_alpha: float = 0.3,
+                 window_size: int = 20,
+                 min_requests: int = 5,
+                 error_rate_threshold: float = 0.5,
+                 p95_latency_threshold_ms: Optional[float] = None,
+                 open_timeout: float = 30.0):
         """
         Initialize the load balancer.
         
         Args:
             models: List of models to balance across
-            strategy: Load balancing strategy (round_robin, weighted, least_cost)
+            strategy: Load balancing strategy (see STRATEGIES)
+            ewma_alpha: Weight of the newest latency sample in the EWMA
+            window_size: Number of recent outcomes used by the circuit breaker
+            min_requests: Outcomes required before the breaker can trip
+            error_rate_threshold: Error rate that opens the circuit
+            p95_latency_threshold_ms: p95 latency that opens the circuit (None disables)
+            open_timeout: Seconds an open circuit waits before half-opening
         """
         self.models = models
         self.strategy = strategy
@@ -683,11 +916,59 @@ class ModelLoadBalancer:
         self.request_counts: Dict[str, int] = {m.get_full_name(): 0 for m in models}
         self.lock = threading.Lock()
         self.logger = logging.getLogger("model_load_balancer")
+        
+        # Adaptive routing
+        self.ewma_alpha = ewma_alpha
+        self.min_requests = min_requests
+        self.error_rate_threshold = error_rate_threshold
+        self.p95_latency_threshold_ms = p95_latency_threshold_ms
+        self.open_timeout = open_timeout
+        self.health: Dict[str, ModelHealth] = {
+            m.get_full_name(): ModelHealth(outcomes=deque(maxlen=window_size))
+            for m in models
+        }
+        
+        self._cost_tracker = None
+    
+    def _is_available(self, name: str, now: float) -> bool:
+        """Check the circuit breaker, half-opening expired open circuits."""
+        health = self.health[name]
+        
+        if health.circuit_state == CircuitState.OPEN:
+            if now - health.opened_at < self.open_timeout:
+                return False
+            health.circuit_state = CircuitState.HALF_OPEN
+            health.probe_in_flight = False
+            health.probe_request_id = None
+            self.logger.info(f"Circuit half-open for model: {name}")
+        
+        if health.circuit_state == CircuitState.HALF_OPEN:
+            return not health.probe_in_flight
+        
+        return True
+    
+    def _ewma_weights(self, models: List[LLMModel]) -> List[float]:
+        """Weight models by inverse EWMA latency; unmeasured models get the best weight."""
+        latencies = [self.health[m.get_full_name()].ewma_latency_ms for m in models]
+        known = [lat for lat in latencies if lat is not None]
+        optimistic = min(known) if known else 1.0
+        
+        return [
+            1.0 / max(lat if lat is not None else optimistic, 0.001)
+            for lat in latencies
+        ]
     
-    def select_next_model(self) -> Optional[LLMModel]:
+    def select_next_model(self, request_id: Optional[str] = None) -> Optional[LLMModel]:
         """
         Select the next model based on load balancing strategy.
         
+        The selected model's in-flight count is incremented until its outcome
+        is reported via ``record_result`` or the request is ``release``d.
+        
+        Args:
+            request_id: ID the outcome will be reported with (identifies a
+                half-open probe)
+            
         Returns:
             Next model to use or None if no models available
         """
@@ -695,26 +976,188 @@ class ModelLoadBalancer:
             if not self.models:
                 return None
             
+            now = time.monotonic()
+            available = [m for m in self.models if self._is_available(m.get_full_name(), now)]
+            
+            if not available:
+                self.logger.warning("All models are ejected by their circuit breakers")
+                return None
+            
             if self.strategy == "round_robin":
-                model = self.models[self.current_index]
-                self.current_index = (self.current_index + 1) % len(self.models)
+                # Advance past models whose circuit is open
+                for _ in range(len(self.models)):
+                    model = self.models[self.current_index % len(self.models)]
+                    self.current_index = (self.current_index + 1) % len(self.models)
+                    if model in available:
+                        break
                 
             elif self.strategy == "weighted":
                 # Weight by inverse cost (cheaper models get more requests)
-                weights = [1.0 / (m.cost_per_1k_input_tokens + 0.001) for m in self.models]
-                model = random.choices(self.models, weights=weights)[0]
+                weights = [1.0 / (m.cost_per_1k_input_tokens + 0.001) for m in available]
+                model = random.choices(available, weights=weights)[0]
                 
             elif self.strategy == "least_cost":
-                model = min(self.models, key=lambda m: m.cost_per_1k_input_tokens)
+                model = min(available, key=lambda m: m.cost_per_1k_input_tokens)
+                
+            elif self.strategy == "ewma_latency":
+                model = random.choices(available, weights=self._ewma_weights(available))[0]
+                
+            elif self.strategy == "power_of_two":
+                # Pick two at random and keep the less loaded one
+                if len(available) == 1:
+                    model = available[0]
+                else:
+                    first, second = random.sample(available, 2)
+                    first_health = self.health[first.get_full_name()]
+                    second_health = self.health[second.get_full_name()]
+                    model = first if (
+                        (first_health.in_flight, first_health.ewma_latency_ms or 0.0) <=
+                        (second_health.in_flight, second_health.ewma_latency_ms or 0.0)
+                    ) else second
                 
             else:
-                model = self.models[0]
+                model = available[0]
             
             # Track request
-            self.request_counts[model.get_full_name()] += 1
+            full_name = model.get_full_name()
+            self.request_counts[full_name] += 1
+            
+            health = self.health[full_name]
+            health.in_flight += 1
+            if health.circuit_state == CircuitState.HALF_OPEN:
+                health.probe_in_flight = True
+                health.probe_request_id = request_id
             
             return model
     
+    @staticmethod
+    def _settles_probe(health: ModelHealth, request_id: Optional[str]) -> bool:
+        """Check whether a completion is the outstanding half-open probe."""
+        return (health.circuit_state == CircuitState.HALF_OPEN and
+                health.probe_in_flight and
+                health.probe_request_id == request_id)
+    
+    def release(self, model: str, request_id: Optional[str] = None) -> None:
+        """
+        Release an in-flight request without recording an outcome.
+        
+        Releasing the half-open probe lets another probe through.
+        
+        Args:
+            model: Model identifier (provider/name)
+            request_id: ID the request was selected with
+        """
+        with self.lock:
+            health = self.health.get(model)
+            if health is None:
+                return
+            
+            health.in_flight = max(0, health.in_flight - 1)
+            if self._settles_probe(health, request_id):
+                health.probe_in_flight = False
+                health.probe_request_id = None
+    
+    def record_result(self,
+                      model: str,
+                      latency_ms: float,
+                      success: bool,
+                      request_id: Optional[str] = None) -> None:
+        """
+        Record the outcome of a request and update the model's health.
+        
+        While the circuit is half-open, only the probe's outcome closes or
+        reopens it; other completions update latency and in-flight counts.
+        
+        Args:
+            model: Model identifier (provider/name)
+            latency_ms: Response latency in milliseconds
+            success: Whether the request succeeded
+            request_id: ID the request was selected with
+        """
+        with self.lock:
+            health = self.health.get(model)
+            if health is None:
+                return
+            
+            health.in_flight = max(0, health.in_flight - 1)
+            
+            if health.ewma_latency_ms is None:
+                health.ewma_latency_ms = latency_ms
+            else:
+                health.ewma_latency_ms += self.ewma_alpha * (latency_ms - health.ewma_latency_ms)
+            
+            health.outcomes.append((success, latency_ms))
+            
+            if health.circuit_state == CircuitState.HALF_OPEN:
+                if not self._settles_probe(health, request_id):
+                    return
+                health.probe_in_flight = False
+                health.probe_request_id = None
+                if success:
+                    health.circuit_state = CircuitState.CLOSED
+                    health.outcomes.clear()
+                    self.logger.info(f"Circuit closed for model: {model}")
+                else:
+                    self._open_circuit(model, health)
+                
+            elif health.circuit_state == CircuitState.CLOSED and \
+                    len(health.outcomes) >= self.min_requests:
+                p95 = health.p95_latency()
+                if health.error_rate() >= self.error_rate_threshold or (
+                        self.p95_latency_threshold_ms is not None and
+                        p95 > self.p95_latency_threshold_ms):
+                    self._open_circuit(model, health)
+    
+    def _open_circuit(self, model: str, health: ModelHealth) -> None:
+        """Eject a model until its open timeout expires."""
+        health.circuit_state = CircuitState.OPEN
+        health.opened_at = time.monotonic()
+        health.trips += 1
+        self.logger.warning(
+            f"Circuit opened for model: {model} "
+            f"(error rate {health.error_rate():.2f}, p95 {health.p95_latency()} ms)"
+        )
+    
+    def attach_cost_tracker(self, cost_tracker: Any) -> None:
+        """
+        Feed the balancer from a CostTracker's recorded usage.
+        
+        Latency for models without samples is seeded from the tracker's
+        existing per-model averages.
+        
+        Args:
+            cost_tracker: CostTracker instance
+        """
+        self.detach_cost_tracker()
+        
+        with self.lock:
+            for name, health in self.health.items():
+                if health.ewma_latency_ms is None:
+                    stats = cost_tracker.get_model_statistics(name)
+                    if stats.get('total_requests'):
+                        health.ewma_latency_ms = stats['average_latency_ms']
+            
+            self._cost_tracker = cost_tracker
+        
+        cost_tracker.add_usage_listener(self._on_usage)
+    
+    def detach_cost_tracker(self) -> None:
+        """Stop consuming usage from the attached CostTracker."""
+        with self.lock:
+            cost_tracker, self._cost_tracker = self._cost_tracker, None
+        
+        if cost_tracker is not None:
+            cost_tracker.remove_usage_listener(self._on_usage)
+    
+    def _on_usage(self, metrics: Any) -> None:
+        """Usage listener registered with the CostTracker."""
+        # Cache hits never reached the provider, so they say nothing about its health
+        if metrics.cache_hit:
+            self.release(metrics.model, metrics.id)
+            return
+        
+        self.record_result(metrics.model, metrics.latency_ms, metrics.success, metrics.id)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get load balancer statistics.
@@ -729,5 +1172,8 @@ class ModelLoadBalancer:
                 'strategy': self.strategy,
                 'total_models': len(self.models),
                 'total_requests': total_requests,
-                'requests_per_model': self.request_counts.copy()
-            }
\ No newline at end of file
+                'requests_per_model': self.request_counts.copy(),
+                'model_health': {
+                    name: health.to_dict() for name, health in self.health.items()
+                }
+            }
@@ -9,13 +9,20 @@ import logging
 import threading
 import json
 import uuid
-from typing import Dict, Any, Optional, List, Tuple
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, Optional, List, Tuple, Union, Iterable
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from collections import defaultdict
 from enum import Enum
-import statistics
+
+import numpy as np
+
+from . import analytics_kernel as kernel
+from .rollups import RollupTable
+from .quantile_sketch import QuantileSketch
 
 
 class MetricType(Enum):
@@ -335,53 +342,68 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary with trend analysis
         """
-        if not metrics:
-            return {
-                'trend': 'insufficient_data',
-                'direction': 'unknown',
-                'change_rate': 0.0
-            }
+        return self.calculate_trends({None: metrics}, window_days)[None]
+    
+    def calculate_trends(self,
+                         metrics_by_key: Dict[Any, List[PerformanceMetric]],
+                         window_days: int = 7) -> Dict[Any, Dict[str, Any]]:
+        """
+        Calculate performance trends for many metric series at once.
         
-        # Sort by timestamp
-        sorted_metrics = sorted(metrics, key=lambda m: m.timestamp)
+        The trend compares the mean of the first and second half of each
+        windowed series; all series are evaluated in one vectorized pass.
         
-        # Filter to window
+        Args:
+            metrics_by_key: Metric series keyed by e.g. operator or (operator, metric type)
+            window_days: Number of days to analyze
+            
+        Returns:
+            Trend analysis per key
+        """
         cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
-        windowed = [m for m in sorted_metrics if m.timestamp >= cutoff]
-        
-        if len(windowed) < 2:
-            return {
-                'trend': 'insufficient_data',
-                'direction': 'unknown',
-                'change_rate': 0.0
-            }
-        
-        # Calculate simple linear trend
-        values = [m.value for m in windowed]
-        first_half = statistics.mean(values[:len(values)//2])
-        second_half = statistics.mean(values[len(values)//2:])
+        keys = list(metrics_by_key)
+        series = [
+            [m.value for m in sorted(metrics_by_key[key], key=lambda m: m.timestamp)
+             if m.timestamp >= cutoff]
+            for key in keys
+        ]
         
-        change = second_half - first_half
-        change_rate = change / max(0.01, first_half)
+        values, lengths = kernel.pack_series(series)
+        first, second = kernel.half_means(values, lengths)
+        change_rates = (second - first) / np.maximum(0.01, first)
         
-        if change_rate > 0.1:
-            direction = 'improving'
-            trend = 'positive'
-        elif change_rate < -0.1:
-            direction = 'declining'
-            trend = 'negative'
-        else:
-            direction = 'stable'
-            trend = 'neutral'
+        trends = {}
+        for i, key in enumerate(keys):
+            if lengths[i] < 2:
+                trends[key] = {
+                    'trend': 'insufficient_data',
+                    'direction': 'unknown',
+                    'change_rate': 0.0
+                }
+                continue
+            
+            change_rate = float(change_rates[i])
+            
+            if change_rate > 0.1:
+                direction = 'improving'
+                trend = 'positive'
+            elif change_rate < -0.1:
+                direction = 'declining'
+                trend = 'negative'
+            else:
+                direction = 'stable'
+                trend = 'neutral'
+            
+            trends[key] = {
+                'trend': trend,
+                'direction': direction,
+                'change_rate': change_rate,
+                'current_avg': float(second[i]),
+                'previous_avg': float(first[i]),
+                'sample_size': int(lengths[i])
+            }
         
-        return {
-            'trend': trend,
-            'direction': direction,
-            'change_rate': change_rate,
-            'current_avg': second_half,
-            'previous_avg': first_half,
-            'sample_size': len(windowed)
-        }
+        return trends
     
     def identify_strengths(self,
                           operator_profile: OperatorProfile,
@@ -441,36 +463,32 @@ class PerformanceAnalyzer:
         Returns:
             Learning velocity score (higher is better)
         """
-        if len(sessions) < 3:
-            return 0.0
-        
-        # Sort by start time
-        sorted_sessions = sorted(sessions, key=lambda s: s.start_time)
-        
-        # Calculate score progression
-        scores = [s.score for s in sorted_sessions]
-        
-        # Simple linear regression
-        n = len(scores)
-        if n < 2:
-            return 0.0
-        
-        # Calculate slope
-        x_mean = (n - 1) / 2
-        y_mean = statistics.mean(scores)
-        
-        numerator = sum((i - x_mean) * (scores[i] - y_mean) for i in range(n))
-        denominator = sum((i - x_mean) ** 2 for i in range(n))
-        
-        if denominator == 0:
-            return 0.0
+        return self.calculate_learning_velocities({None: sessions})[None]
+    
+    def calculate_learning_velocities(self,
+                                      sessions_by_key: Dict[Any, List[SessionPerformance]]) -> Dict[Any, float]:
+        """
+        Calculate learning velocity for many session series at once.
         
-        slope = numerator / denominator
+        Velocity is the least-squares slope of session scores, normalized to
+        0-1 assuming a maximum velocity of 0.1 per session.
         
-        # Normalize to 0-1 range (assume max velocity of 0.1 per session)
-        velocity = max(0.0, min(1.0, slope / 0.1))
+        Args:
+            sessions_by_key: Session series keyed by e.g. operator
+            
+        Returns:
+            Learning velocity per key
+        """
+        keys = list(sessions_by_key)
+        values, lengths = kernel.pack_series(
+            [self._session_scores(sessions_by_key[key]) for key in keys]
+        )
+        slopes = kernel.slopes(values, lengths)
         
-        return velocity
+        return {
+            key: float(min(1.0, max(0.0, slopes[i] / 0.1))) if lengths[i] >= 3 else 0.0
+            for i, key in enumerate(keys)
+        }
     
     def detect_plateau(self,
                       sessions: List[SessionPerformance],
@@ -485,25 +503,39 @@ class PerformanceAnalyzer:
         Returns:
             True if plateau detected, False otherwise
         """
-        if len(sessions) < window_size:
-            return False
-        
-        # Get recent sessions
-        recent = sorted(sessions, key=lambda s: s.start_time)[-window_size:]
-        scores = [s.score for s in recent]
-        
-        # Check for low variance
-        if len(scores) < 2:
-            return False
+        return self.detect_plateaus({None: sessions}, window_size)[None]
+    
+    def detect_plateaus(self,
+                        sessions_by_key: Dict[Any, List[SessionPerformance]],
+                        window_size: int = 5) -> Dict[Any, bool]:
+        """
+        Detect performance plateaus for many session series at once.
         
-        variance = statistics.variance(scores)
-        mean_score = statistics.mean(scores)
+        A plateau is low score variance over the most recent sessions while
+        not yet at high performance.
         
-        # Plateau if variance is low and not at high performance
-        if variance < 0.01 and mean_score < 0.9:
-            return True
+        Args:
+            sessions_by_key: Session series keyed by e.g. operator
+            window_size: Number of sessions to analyze
+            
+        Returns:
+            Plateau flag per key
+        """
+        keys = list(sessions_by_key)
+        values, lengths = kernel.pack_series(
+            [self._session_scores(sessions_by_key[key]) for key in keys],
+            max_length=window_size
+        )
+        plateaued = kernel.plateau_mask(
+            values, lengths, window_size, variance_threshold=0.01, max_mean=0.9
+        )
         
-        return False
+        return {key: bool(plateaued[i]) for i, key in enumerate(keys)}
+    
+    @staticmethod
+    def _session_scores(sessions: List[SessionPerformance]) -> List[float]:
+        """Get session scores in chronological order."""
+        return [s.score for s in sorted(sessions, key=lambda s: s.start_time)]
 
 
 class BenchmarkEngine:
@@ -511,13 +543,157 @@ class BenchmarkEngine:
     Compare performance against historical data and peers.
     
     Provides benchmarking capabilities to compare operator performance
-    against historical baselines and peer groups.
+    against historical baselines and peer groups. Session scores and each
+    MetricType are kept as separate streaming quantile sketches per
+    dimension (``skill``, ``scenario``, ``cohort`` and ``global``), so
+    percentile ranks do not need the underlying values.
     """
     
-    def __init__(self):
-        """Initialize benchmark engine."""
+    # Benchmark context keys that select a sketch dimension
+    CONTEXT_DIMENSIONS = {'skill': 'skill', 'scenario_id': 'scenario', 'cohort': 'cohort'}
+    
+    def __init__(self, compression: int = 100):
+        """
+        Initialize benchmark engine.
+        
+        Args:
+            compression: Quantile sketch compression
+        """
         self.logger = logging.getLogger("benchmark_engine")
         self.benchmarks: Dict[str, Dict[str, Any]] = {}
+        self.compression = compression
+        self.sketches: Dict[Tuple[str, str], QuantileSketch] = {}
+        self.metric_sketches: Dict[MetricType, Dict[Tuple[str, str], QuantileSketch]] = {}
+        self.lock = threading.RLock()
+    
+    def _sketches_for(self, metric_type: Optional[MetricType]) -> Dict[Tuple[str, str], QuantileSketch]:
+        """Get the sketches of session scores (None) or of a metric type."""
+        if metric_type is None:
+            return self.sketches
+        return self.metric_sketches.get(metric_type, {})
+    
+    def _add(self,
+             sketches: Dict[Tuple[str, str], QuantileSketch],
+             value: float,
+             skills: Iterable[str],
+             scenario_id: Optional[str],
+             cohorts: Iterable[str]) -> None:
+        """Add a value to the global sketch and each matching dimension sketch."""
+        keys = [('global', 'all')]
+        keys.extend(('skill', skill) for skill in skills)
+        keys.extend(('cohort', cohort) for cohort in cohorts)
+        if scenario_id:
+            keys.append(('scenario', scenario_id))
+        
+        with self.lock:
+            for key in keys:
+                sketch = sketches.get(key)
+                if sketch is None:
+                    sketch = sketches[key] = QuantileSketch(self.compression)
+                sketch.add(value)
+    
+    def record_score(self,
+                     score: float,
+                     skills: Iterable[str] = (),
+                     scenario_id: Optional[str] = None,
+                     cohorts: Iterable[str] = ()) -> None:
+        """
+        Add a session score to the global sketch and each matching dimension sketch.
+        
+        Args:
+            score: Session score
+            skills: Skills practiced
+            scenario_id: Scenario played
+            cohorts: Cohorts the operator belongs to
+        """
+        self._add(self.sketches, score, skills, scenario_id, cohorts)
+    
+    def record_metric(self,
+                      metric_type: MetricType,
+                      value: float,
+                      skills: Iterable[str] = (),
+                      scenario_id: Optional[str] = None,
+                      cohorts: Iterable[str] = ()) -> None:
+        """
+        Add a metric value to the sketches of its metric type.
+        
+        Args:
+            metric_type: Type of metric
+            value: Metric value
+            skills: Skills the metric relates to
+            scenario_id: Scenario played
+            cohorts: Cohorts the operator belongs to
+        """
+        with self.lock:
+            sketches = self.metric_sketches.setdefault(metric_type, {})
+            self._add(sketches, value, skills, scenario_id, cohorts)
+    
+    def get_sketch(self,
+                   dimension: str = 'global',
+                   key: str = 'all',
+                   metric_type: Optional[MetricType] = None) -> Optional[QuantileSketch]:
+        """Get the session score sketch (or a metric type's sketch) for a dimension value."""
+        return self._sketches_for(metric_type).get((dimension, key))
+    
+    def merge_sketches(self,
+                       keys: List[Tuple[str, str]],
+                       metric_type: Optional[MetricType] = None) -> QuantileSketch:
+        """
+        Combine several dimension sketches, e.g. to rank against a group of cohorts.
+        
+        Args:
+            keys: (dimension, key) pairs
+            metric_type: Metric type to combine (None for session scores)
+            
+        Returns:
+            Merged sketch (empty if none exist)
+        """
+        with self.lock:
+            sketches = self._sketches_for(metric_type)
+            return QuantileSketch.merged(
+                [sketches[k] for k in keys if k in sketches],
+                compression=self.compression
+            )
+    
+    def merge_from(self, other: 'BenchmarkEngine') -> None:
+        """
+        Merge another engine's sketches (e.g. from another shard) into this one.
+        
+        Args:
+            other: Benchmark engine to merge
+        """
+        pairs = [(self.sketches, other.sketches)]
+        with self.lock:
+            for metric_type, sketches in other.metric_sketches.items():
+                pairs.append((self.metric_sketches.setdefault(metric_type, {}), sketches))
+            
+            for target, source in pairs:
+                for key, sketch in source.items():
+                    if key in target:
+                        target[key].merge(sketch)
+                    else:
+                        target[key] = QuantileSketch.merged([sketch], self.compression)
+    
+    def get_percentile_rank(self,
+                            value: float,
+                            dimension: str = 'global',
+                            key: str = 'all',
+                            metric_type: Optional[MetricType] = None) -> float:
+        """
+        Percentile rank of a value within a dimension's distribution.
+        
+        Args:
+            value: Session score, or metric value with ``metric_type``
+            dimension: Sketch dimension (global, skill, scenario or cohort)
+            key: Dimension value
+            metric_type: Metric type to rank against (None for session scores)
+            
+        Returns:
+            Percentile rank (0-100); 50.0 without data
+        """
+        with self.lock:
+            sketch = self._sketches_for(metric_type).get((dimension, key))
+            return sketch.percentile_rank(value) if sketch else 50.0
     
     def set_benchmark(self,
                      benchmark_id: str,
@@ -579,37 +755,118 @@ class BenchmarkEngine:
         else:
             comparison = 'at_benchmark'
         
-        return {
+        result = {
             'comparison': comparison,
             'difference': difference,
             'percentage': percentage,
             'metric_value': metric.value,
             'benchmark_value': benchmark_value
         }
+        
+        # Rank against the metric type's values in the benchmark's peer group, if sketched
+        sketches = self._sketches_for(metric.metric_type)
+        for context_key, dimension in self.CONTEXT_DIMENSIONS.items():
+            group = benchmark['context'].get(context_key)
+            if group is not None and (dimension, group) in sketches:
+                result['percentile_rank'] = self.get_percentile_rank(
+                    metric.value, dimension, group, metric.metric_type
+                )
+                break
+        
+        return result
     
     def calculate_percentile_rank(self,
                                   value: float,
-                                  population: List[float]) -> float:
+                                  population: Union[List[float], QuantileSketch]) -> float:
         """
         Calculate percentile rank within population.
         
         Args:
             value: Value to rank
-            population: Population values
+            population: Population values or a quantile sketch of them
             
         Returns:
             Percentile rank (0-100)
         """
+        if isinstance(population, QuantileSketch):
+            return population.percentile_rank(value)
+        
         if not population:
             return 50.0
         
-        sorted_pop = sorted(population)
-        rank = sum(1 for v in sorted_pop if v <= value)
-        percentile = (rank / len(sorted_pop)) * 100
+        rank = sum(1 for v in population if v <= value)
+        percentile = (rank / len(population)) * 100
         
         return percentile
 
 
+class TimeOrderedIndex:
+    """
+    Bisectable time-ordered index.
+    
+    Items are kept sorted by timestamp (insertion order for equal
+    timestamps) in parallel lists, so time-window queries cost
+    O(log n + k).
+    """
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self.timestamps: List[datetime] = []
+        self.items: List[Any] = []
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def insert(self, timestamp: datetime, item: Any) -> None:
+        """Insert an item after any items with the same timestamp."""
+        position = bisect_right(self.timestamps, timestamp)
+        self.timestamps.insert(position, timestamp)
+        self.items.insert(position, item)
+    
+    def remove(self, timestamp: datetime, item: Any) -> bool:
+        """
+        Remove an item by identity.
+        
+        Args:
+            timestamp: Timestamp the item was inserted with
+            item: Item to remove
+            
+        Returns:
+            True if the item was found
+        """
+        start = bisect_left(self.timestamps, timestamp)
+        end = bisect_right(self.timestamps, timestamp)
+        
+        for position in range(start, end):
+            if self.items[position] is item:
+                del self.timestamps[position]
+                del self.items[position]
+                return True
+        
+        return False
+    
+    def range(self,
+              start: Optional[datetime] = None,
+              end: Optional[datetime] = None) -> List[Any]:
+        """
+        Get items with ``start <= timestamp < end`` in time order.
+        
+        Args:
+            start: Inclusive lower bound (None for unbounded)
+            end: Exclusive upper bound (None for unbounded)
+            
+        Returns:
+            Matching items
+        """
+        low = bisect_left(self.timestamps, start) if start is not None else 0
+        high = bisect_left(self.timestamps, end) if end is not None else len(self.items)
+        return self.items[low:high]
+    
+    def latest(self, count: int) -> List[Any]:
+        """Get the ``count`` most recent items in time order."""
+        return self.items[-count:] if count > 0 else []
+
+
 class PerformanceMetricsEngine:
     """
     Main performance metrics engine.
@@ -634,6 +891,15 @@ class PerformanceMetricsEngine:
         self.session_performances: Dict[str, SessionPerformance] = {}
         self.lock = threading.RLock()
         
+        # Time-ordered secondary indexes
+        self.metric_index: Dict[str, Dict[MetricType, TimeOrderedIndex]] = defaultdict(
+            lambda: defaultdict(TimeOrderedIndex)
+        )
+        self.session_index: Dict[str, TimeOrderedIndex] = defaultdict(TimeOrderedIndex)
+        
+        # Minute/hour/day session rollups for dashboards
+        self.session_rollups = RollupTable(('operator_id', 'scenario_id'))
+        
         # Analyzers
         self.analyzer = PerformanceAnalyzer()
         self.benchmark_engine = BenchmarkEngine()
@@ -662,12 +928,13 @@ class PerformanceMetricsEngine:
                 # Load session performances
                 for session_data in data.get('session_performances', []):
                     session = SessionPerformance.from_dict(session_data)
-                    self.session_performances[session.session_id] = session
+                    self._index_session(session)
                 
                 # Load metrics
                 for metric_data in data.get('metrics', []):
                     metric = PerformanceMetric.from_dict(metric_data)
                     self.metrics.append(metric)
+                    self._index_metric(metric)
                 
                 self.logger.info(
                     f"Loaded {len(self.operator_profiles)} profiles, "
@@ -704,6 +971,54 @@ class PerformanceMetricsEngine:
         except Exception as e:
             self.logger.error(f"Error saving performance data: {e}")
     
+    def _index_metric(self, metric: PerformanceMetric) -> None:
+        """Add a metric to the operator/type index and its type's benchmark sketches."""
+        self.metric_index[metric.operator_id][metric.metric_type].insert(metric.timestamp, metric)
+        
+        profile = self.operator_profiles.get(metric.operator_id)
+        cohort = profile.metadata.get('cohort') if profile else None
+        self.benchmark_engine.record_metric(
+            metric.metric_type,
+            metric.value,
+            scenario_id=metric.scenario_id,
+            cohorts=[cohort] if cohort else []
+        )
+    
+    def _index_session(self, session: SessionPerformance) -> None:
+        """Store a session and add it to the operator index, replacing any previous version."""
+        previous = self.session_performances.get(session.session_id)
+        if previous is not None:
+            self.session_index[previous.operator_id].remove(previous.start_time, previous)
+            self._rollup_session(previous, sign=-1)
+        else:
+            # Sketches are append-only, so only a session's first score is ranked
+            profile = self.operator_profiles.get(session.operator_id)
+            cohort = profile.metadata.get('cohort') if profile else None
+            self.benchmark_engine.record_score(
+                session.score,
+                skills=session.skills_practiced,
+                scenario_id=session.scenario_id,
+                cohorts=[cohort] if cohort else []
+            )
+        
+        self.session_performances[session.session_id] = session
+        self.session_index[session.operator_id].insert(session.start_time, session)
+        self._rollup_session(session)
+    
+    def _rollup_session(self, session: SessionPerformance, sign: int = 1) -> None:
+        """Add a session to (or, with ``sign=-1``, retract it from) the rollups."""
+        self.session_rollups.add(
+            session.start_time,
+            {'operator_id': session.operator_id, 'scenario_id': session.scenario_id},
+            {
+                'sessions': sign,
+                'successes': sign if session.success else 0,
+                'score': sign * session.score,
+                'duration_seconds': sign * session.duration_seconds,
+                'cost': sign * session.cost
+            }
+        )
+    
     def create_operator_profile(self,
                                operator_id: str,
                                name: str,
@@ -771,6 +1086,7 @@ class PerformanceMetricsEngine:
             )
             
             self.metrics.append(metric)
+            self._index_metric(metric)
             self._save_data()
             
             return metric
@@ -783,7 +1099,7 @@ class PerformanceMetricsEngine:
             session_perf: Session performance object
         """
         with self.lock:
-            self.session_performances[session_perf.session_id] = session_perf
+            self._index_session(session_perf)
             
             # Update operator profile
             profile = self.operator_profiles.get(session_perf.operator_id)
@@ -818,24 +1134,43 @@ class PerformanceMetricsEngine:
             time_range: Optional time range filter
             
         Returns:
-            List of performance metrics
+            List of performance metrics in time order
+        """
+        if metric_type:
+            with self.lock:
+                index = self.metric_index.get(operator_id, {}).get(metric_type)
+                if index is None:
+                    return []
+                
+                cutoff = datetime.now(timezone.utc) - time_range if time_range else None
+                return index.range(cutoff)
+        
+        by_type = self.get_operator_metrics_by_type(operator_id, time_range)
+        return list(heapq.merge(*by_type.values(), key=lambda m: m.timestamp))
+    
+    def get_operator_metrics_by_type(self,
+                                     operator_id: str,
+                                     time_range: Optional[timedelta] = None) -> Dict[MetricType, List[PerformanceMetric]]:
+        """
+        Get an operator's metrics split by metric type.
+        
+        Args:
+            operator_id: Operator identifier
+            time_range: Optional time range filter
+            
+        Returns:
+            Time-ordered metrics per metric type (types without metrics are omitted)
         """
         with self.lock:
-            cutoff = None
-            if time_range:
-                cutoff = datetime.now(timezone.utc) - time_range
-            
-            filtered = []
-            for metric in self.metrics:
-                if metric.operator_id != operator_id:
-                    continue
-                if metric_type and metric.metric_type != metric_type:
-                    continue
-                if cutoff and metric.timestamp < cutoff:
-                    continue
-                filtered.append(metric)
-            
-            return filtered
+            cutoff = datetime.now(timezone.utc) - time_range if time_range else None
+            
+            by_type = {}
+            for metric_type, index in self.metric_index.get(operator_id, {}).items():
+                metrics = index.range(cutoff)
+                if metrics:
+                    by_type[metric_type] = metrics
+            
+            return by_type
     
     def get_operator_sessions(self,
                             operator_id: str,
@@ -848,19 +1183,15 @@ class PerformanceMetricsEngine:
             limit: Optional limit on number of sessions
             
         Returns:
-            List of session performances
+            List of session performances (most recent first)
         """
         with self.lock:
-            sessions = [
-                s for s in self.session_performances.values()
-                if s.operator_id == operator_id
-            ]
-            
-            # Sort by start time (most recent first)
-            sessions.sort(key=lambda s: s.start_time, reverse=True)
+            index = self.session_index.get(operator_id)
+            if index is None:
+                return []
             
-            if limit:
-                sessions = sessions[:limit]
+            sessions = index.latest(limit) if limit else list(index.items)
+            sessions.reverse()
             
             return sessions
     
@@ -879,13 +1210,13 @@ class PerformanceMetricsEngine:
             return {'error': 'operator_not_found'}
         
         sessions = self.get_operator_sessions(operator_id)
-        metrics = self.get_operator_metrics(operator_id)
+        metrics_by_type = self.get_operator_metrics_by_type(operator_id)
         
         analysis = {
             'operator_id': operator_id,
             'profile': profile.to_dict(),
             'total_sessions': len(sessions),
-            'total_metrics': len(metrics),
+            'total_metrics': sum(len(metrics) for metrics in metrics_by_type.values()),
             'strengths': self.analyzer.identify_strengths(profile),
             'weaknesses': [
                 {'skill': s[0], 'proficiency': s[1].proficiency.value}
@@ -896,12 +1227,50 @@ class PerformanceMetricsEngine:
         }
         
         # Add trend analysis for each metric type
-        trends = {}
-        for metric_type in MetricType:
-            type_metrics = [m for m in metrics if m.metric_type == metric_type]
-            if type_metrics:
-                trends[metric_type.value] = self.analyzer.calculate_trend(type_metrics)
+        analysis['trends'] = self.analyzer.calculate_trends({
+            metric_type.value: metrics for metric_type, metrics in metrics_by_type.items()
+        })
+        
+        return analysis
+    
+    def analyze_team_performance(self, operator_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Learning velocity, plateau and trend analysis for many operators.
+        
+        All operators and metric types are analyzed in one batched pass
+        rather than one analysis per operator and metric type.
+        
+        Args:
+            operator_ids: Operator identifiers
+            
+        Returns:
+            Analysis per known operator
+        """
+        with self.lock:
+            known = [op for op in operator_ids if op in self.operator_profiles]
+            sessions = {op: self.get_operator_sessions(op) for op in known}
+            
+            metrics = {}
+            for op in known:
+                for metric_type, type_metrics in self.get_operator_metrics_by_type(op).items():
+                    metrics[(op, metric_type.value)] = type_metrics
+        
+        velocities = self.analyzer.calculate_learning_velocities(sessions)
+        plateaus = self.analyzer.detect_plateaus(sessions)
+        trends = self.analyzer.calculate_trends(metrics)
+        
+        analysis = {
+            op: {
+                'operator_id': op,
+                'total_sessions': len(sessions[op]),
+                'learning_velocity': velocities[op],
+                'plateau_detected': plateaus[op],
+                'trends': {}
+            }
+            for op in known
+        }
         
-        analysis['trends'] = trends
+        for (op, metric_type), trend in trends.items():
+            analysis[op]['trends'][metric_type] = trend
         
         return analysis
\ No newline at end of file
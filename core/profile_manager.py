@@ -19,10 +19,17 @@ from abc import ABC, abstractmethod
 import logging
 import hashlib
 import pickle
+from collections import OrderedDict
 from datetime import datetime, timezone
 
 from ..config.settings import FrameworkConfig
 from .logging import AuditLogger, AuditEventType, SecurityLevel
+from .content_loader import ContentLoader, ContentManifest, LoadResult
+
+
+class ProfileLoadError(Exception):
+    """Raised when a lazily registered profile cannot be loaded on first access."""
+    pass
 
 
 class ProfileType(Enum):
@@ -335,21 +342,53 @@ class ProfileValidator:
 
 
 class ProfileCache:
-    """Cache for agent profiles."""
+    """
+    LRU cache for agent profiles.
+    
+    Entries live in an ordered dict kept in recency order, so get, put and
+    eviction are O(1). A second ordered dict tracks insertion time for TTL
+    expiry: expired entries are swept from the oldest end on every get and
+    put (or via ``sweep_expired``). An optional byte budget bounds the cache
+    by serialized profile weight, since some profiles carry a large
+    knowledge base.
+    """
     
-    def __init__(self, max_size: int = 100, ttl: int = 3600):
+    def __init__(self, max_size: int = 100, ttl: int = 3600, max_bytes: Optional[int] = None):
         """
         Initialize the profile cache.
         
         Args:
             max_size: Maximum number of profiles to cache
             ttl: Time to live for cached profiles (seconds)
+            max_bytes: Optional bound on total serialized profile size
         """
         self.max_size = max_size
         self.ttl = ttl
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.access_times: Dict[str, float] = {}
+        self.max_bytes = max_bytes or None
+        
+        # profile_id -> entry, least recently used first
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # profile_id -> insertion timestamp, oldest first
+        self.insert_times: "OrderedDict[str, float]" = OrderedDict()
+        self.total_bytes = 0
         self.lock = threading.RLock()
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    @staticmethod
+    def _weigh(profile: AgentProfile) -> int:
+        """Estimate a profile's weight as the size of its JSON serialization."""
+        return len(json.dumps(profile.to_dict(), default=str).encode('utf-8'))
+    
+    def _remove(self, profile_id: str) -> None:
+        """Remove an entry from all structures."""
+        entry = self.cache.pop(profile_id)
+        self.insert_times.pop(profile_id, None)
+        self.total_bytes -= entry['size']
     
     def get(self, profile_id: str) -> Optional[AgentProfile]:
         """
@@ -362,20 +401,17 @@ class ProfileCache:
             Cached profile or None if not found/expired
         """
         with self.lock:
-            if profile_id not in self.cache:
-                return None
-            
-            cache_entry = self.cache[profile_id]
-            current_time = time.time()
+            # Sweeping removes this entry too if it has expired
+            self.sweep_expired()
             
-            # Check if expired
-            if current_time - cache_entry['timestamp'] > self.ttl:
-                del self.cache[profile_id]
-                del self.access_times[profile_id]
+            cache_entry = self.cache.get(profile_id)
+            if cache_entry is None:
+                self.misses += 1
                 return None
             
-            # Update access time
-            self.access_times[profile_id] = current_time
+            # Mark as most recently used
+            self.cache.move_to_end(profile_id)
+            self.hits += 1
             return cache_entry['profile']
     
     def put(self, profile: AgentProfile) -> None:
@@ -388,19 +424,55 @@ class ProfileCache:
         with self.lock:
             profile_id = profile.metadata.id
             current_time = time.time()
+            size = self._weigh(profile) if self.max_bytes else 0
             
-            # Remove oldest entry if cache is full
-            if len(self.cache) >= self.max_size and profile_id not in self.cache:
-                oldest_id = min(self.access_times.keys(), key=lambda k: self.access_times[k])
-                del self.cache[oldest_id]
-                del self.access_times[oldest_id]
+            if profile_id in self.cache:
+                self._remove(profile_id)
+            
+            self.sweep_expired(current_time)
             
             # Add to cache
             self.cache[profile_id] = {
                 'profile': profile,
-                'timestamp': current_time
+                'timestamp': current_time,
+                'size': size
             }
-            self.access_times[profile_id] = current_time
+            self.insert_times[profile_id] = current_time
+            self.total_bytes += size
+            
+            # Evict least recently used entries until within bounds,
+            # always keeping the entry just added
+            while len(self.cache) > 1 and (
+                len(self.cache) > self.max_size
+                or (self.max_bytes and self.total_bytes > self.max_bytes)
+            ):
+                oldest_id = next(iter(self.cache))
+                self._remove(oldest_id)
+                self.evictions += 1
+    
+    def sweep_expired(self, now: Optional[float] = None) -> int:
+        """
+        Drop expired entries, oldest first.
+        
+        Args:
+            now: Current time (defaults to time.time())
+            
+        Returns:
+            Number of entries removed
+        """
+        with self.lock:
+            cutoff = (now if now is not None else time.time()) - self.ttl
+            removed = 0
+            
+            while self.insert_times:
+                profile_id, inserted = next(iter(self.insert_times.items()))
+                if inserted >= cutoff:
+                    break
+                self._remove(profile_id)
+                removed += 1
+            
+            self.expirations += removed
+            return removed
     
     def invalidate(self, profile_id: str) -> None:
         """
@@ -410,14 +482,15 @@ class ProfileCache:
             profile_id: ID of the profile to invalidate
         """
         with self.lock:
-            self.cache.pop(profile_id, None)
-            self.access_times.pop(profile_id, None)
+            if profile_id in self.cache:
+                self._remove(profile_id)
     
     def clear(self) -> None:
         """Clear all cached profiles."""
         with self.lock:
             self.cache.clear()
-            self.access_times.clear()
+            self.insert_times.clear()
+            self.total_bytes = 0
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -427,11 +500,18 @@ class ProfileCache:
             Dictionary containing cache statistics
         """
         with self.lock:
+            lookups = self.hits + self.misses
             return {
                 'size': len(self.cache),
                 'max_size': self.max_size,
                 'ttl': self.ttl,
-                'hit_rate': getattr(self, '_hit_rate', 0.0)
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
             }
 
 
@@ -460,13 +540,31 @@ class ProfileManager:
         self.profiles: Dict[str, AgentProfile] = {}
         self.profile_metadata: Dict[str, ProfileMetadata] = {}
         
+        # Profiles registered from the manifest whose body is not loaded yet
+        self._pending_profiles: Dict[str, str] = {}  # profile_id -> file_path
+        
         # Components
         self.validator = ProfileValidator()
         self.cache = ProfileCache(
             max_size=self.config.cache_size,
-            ttl=3600  # 1 hour
+            ttl=3600,  # 1 hour
+            max_bytes=self.config.cache_max_bytes
         ) if self.config.cache_enabled else None
         
+        manifest_dir = self.config.resolve_data_path(self.config.manifest_dir)
+        manifest = ContentManifest(
+            manifest_dir / "profiles_manifest.json"
+        ) if manifest_dir else None
+        
+        self.loader = ContentLoader(
+            build=self._build_profile,
+            validate=self.validator.validate if self.config.validation_enabled else None,
+            checksum=lambda profile: profile.calculate_checksum(),
+            summarize=lambda profile: profile.metadata.to_dict(),
+            manifest=manifest,
+            max_workers=self.config.load_workers
+        )
+        
         # Thread safety
         self.lock = threading.RLock()
         
@@ -475,6 +573,9 @@ class ProfileManager:
             'profiles_loaded': 0,
             'profiles_validated': 0,
             'validation_errors': 0,
+            'validations_skipped': 0,
+            'profiles_deferred': 0,
+            'lazy_load_failures': 0,
             'cache_hits': 0,
             'cache_misses': 0
         }
@@ -486,6 +587,11 @@ class ProfileManager:
         """
         Load profiles from a directory.
         
+        Files are parsed and validated in the loader's worker pool. With
+        ``lazy_loading`` enabled, files unchanged since they were last
+        validated are registered from their manifest metadata only and
+        their body is loaded on first access.
+        
         Args:
             directory: Directory to load profiles from
         """
@@ -495,19 +601,38 @@ class ProfileManager:
             self.logger.warning(f"Profile directory does not exist: {directory}")
             return
         
-        # Look for profile files
-        for profile_file in profile_dir.glob("**/*.json"):
-            try:
-                self.load_profile_from_file(str(profile_file))
-            except Exception as e:
-                self.logger.error(f"Error loading profile from {profile_file}: {e}")
+        # Look for profile files (JSON first, then YAML)
+        profile_files = [str(path) for path in profile_dir.glob("**/*.json")]
+        profile_files.extend(str(path) for path in profile_dir.glob("**/*.yaml"))
+        
+        deferred = {}
+        if self.config.lazy_loading and self.loader.manifest:
+            for file_path in profile_files:
+                entry = self.loader.manifest.get_unchanged(file_path)
+                if (entry and entry['summary'] and
+                        (entry['validated'] or not self.config.validation_enabled)):
+                    deferred[file_path] = entry
         
-        # Also look for YAML files
-        for profile_file in profile_dir.glob("**/*.yaml"):
-            try:
-                self.load_profile_from_file(str(profile_file))
-            except Exception as e:
-                self.logger.error(f"Error loading profile from {profile_file}: {e}")
+        eager_files = [path for path in profile_files if path not in deferred]
+        results = dict(zip(eager_files, self.loader.load_files(eager_files)))
+        
+        # Register in file order so duplicate IDs resolve as before
+        for file_path in profile_files:
+            if file_path in deferred:
+                self._register_deferred(file_path, deferred[file_path])
+            else:
+                self._register_loaded(results[file_path])
+        
+        if self.loader.manifest:
+            self.loader.manifest.prune(profile_dir, profile_files)
+        self.loader.save_manifest()
+    
+    @staticmethod
+    def _build_profile(profile_data: Dict[str, Any], file_path: str) -> AgentProfile:
+        """Create a profile from parsed file data."""
+        profile = AgentProfile.from_dict(profile_data)
+        profile.metadata.file_path = file_path
+        return profile
     
     def load_profile_from_file(self, file_path: str) -> bool:
         """
@@ -519,76 +644,159 @@ class ProfileManager:
         Returns:
             True if profile loaded successfully, False otherwise
         """
+        profile_path = Path(file_path)
+        
+        if not profile_path.exists():
+            self.logger.error(f"Profile file not found: {file_path}")
+            return False
+        
+        if profile_path.suffix.lower() not in ['.json', '.yaml', '.yml']:
+            self.logger.error(f"Unsupported profile file format: {profile_path.suffix}")
+            return False
+        
+        loaded = self._register_loaded(self.loader.load_file(file_path))
+        self.loader.save_manifest()
+        return loaded
+    
+    def _register_loaded(self, result: LoadResult) -> bool:
+        """
+        Register the outcome of loading a profile file.
+        
+        Args:
+            result: Load result from the content loader
+            
+        Returns:
+            True if the profile was registered, False otherwise
+        """
+        file_path = result.file_path
+        
+        if result.error is not None:
+            self.logger.error(f"Error loading profile from {file_path}: {result.error}")
+            return False
+        
+        profile = result.item
+        profile.metadata.checksum = result.checksum
+        
+        if result.errors:
+            self.logger.error(f"Profile validation failed for {profile.metadata.id}: {result.errors}")
+            self.stats['validation_errors'] += 1
+            
+            if self.audit_logger:
+                self.audit_logger.audit(
+                    event_type=AuditEventType.SYSTEM_EVENT,
+                    action="profile_validation_failed",
+                    details={
+                        'profile_id': profile.metadata.id,
+                        'file_path': file_path,
+                        'errors': result.errors
+                    },
+                    security_level=SecurityLevel.MEDIUM
+                )
+            
+            return False
+        
+        if result.validated:
+            self.stats['profiles_validated'] += 1
+        elif result.cached:
+            self.stats['validations_skipped'] += 1
+        
+        # Register profile
+        self.register_profile(profile)
+        
+        self.stats['profiles_loaded'] += 1
+        
+        if self.audit_logger:
+            self.audit_logger.audit(
+                event_type=AuditEventType.SYSTEM_EVENT,
+                action="profile_loaded",
+                details={
+                    'profile_id': profile.metadata.id,
+                    'file_path': file_path,
+                    'profile_type': profile.metadata.profile_type.value
+                },
+                security_level=SecurityLevel.LOW
+            )
+        
+        self.logger.info(f"Loaded profile: {profile.metadata.id} from {file_path}")
+        return True
+    
+    def _register_deferred(self, file_path: str, entry: Dict[str, Any]) -> None:
+        """
+        Register a profile from its manifest metadata without loading the body.
+        
+        Args:
+            file_path: Path to the profile file
+            entry: Manifest entry for the file
+        """
         try:
-            profile_path = Path(file_path)
+            metadata = ProfileMetadata.from_dict(dict(entry['summary']))
+        except Exception as e:
+            self.logger.warning(f"Invalid manifest metadata for {file_path}, loading eagerly: {e}")
+            self._register_loaded(self.loader.load_file(file_path))
+            return
+        
+        metadata.file_path = file_path
+        metadata.checksum = entry['checksum']
+        
+        with self.lock:
+            self.profiles.pop(metadata.id, None)
+            self.profile_metadata[metadata.id] = metadata
+            self._pending_profiles[metadata.id] = file_path
             
-            if not profile_path.exists():
-                self.logger.error(f"Profile file not found: {file_path}")
-                return False
+            if self.cache:
+                self.cache.invalidate(metadata.id)
+        
+        self.stats['profiles_deferred'] += 1
+        self.logger.debug(f"Deferred profile: {metadata.id} from {file_path}")
+    
+    def _load_pending_profile(self, profile_id: str) -> Optional[AgentProfile]:
+        """
+        Load the body of a lazily registered profile.
+        
+        Args:
+            profile_id: ID of the pending profile
             
-            # Load profile data
-            with open(profile_path, 'r', encoding='utf-8') as f:
-                if profile_path.suffix.lower() == '.json':
-                    profile_data = json.load(f)
-                elif profile_path.suffix.lower() in ['.yaml', '.yml']:
-                    profile_data = yaml.safe_load(f)
-                else:
-                    self.logger.error(f"Unsupported profile file format: {profile_path.suffix}")
-                    return False
+        Returns:
+            Loaded profile
             
-            # Create profile
-            profile = AgentProfile.from_dict(profile_data)
+        Raises:
+            ProfileLoadError: If the file changed or became invalid since it
+                was deferred; the profile is unregistered
+        """
+        with self.lock:
+            file_path = self._pending_profiles.pop(profile_id)
             
-            # Set file path and calculate checksum
-            profile.metadata.file_path = file_path
-            profile.metadata.checksum = profile.calculate_checksum()
+            result = self.loader.load_file(file_path)
+            loaded = self._register_loaded(result)
+            self.loader.save_manifest()
             
-            # Validate profile
-            if self.config.validation_enabled:
-                errors = self.validator.validate(profile)
-                if errors:
-                    self.logger.error(f"Profile validation failed for {profile.metadata.id}: {errors}")
-                    self.stats['validation_errors'] += 1
-                    
-                    if self.audit_logger:
-                        self.audit_logger.audit(
-                            event_type=AuditEventType.SYSTEM_EVENT,
-                            action="profile_validation_failed",
-                            details={
-                                'profile_id': profile.metadata.id,
-                                'file_path': file_path,
-                                'errors': errors
-                            },
-                            security_level=SecurityLevel.MEDIUM
-                        )
-                    
-                    return False
-                else:
-                    self.stats['profiles_validated'] += 1
+            if loaded and profile_id in self.profiles:
+                return self.profiles[profile_id]
             
-            # Register profile
-            self.register_profile(profile)
+            self.profile_metadata.pop(profile_id, None)
+            if result.error is not None:
+                reason = result.error
+            elif result.errors:
+                reason = f"validation failed: {result.errors}"
+            else:
+                reason = f"file now defines profile {result.item.metadata.id}"
             
-            self.stats['profiles_loaded'] += 1
+            self.stats['lazy_load_failures'] += 1
+            self.logger.error(f"Deferred profile {profile_id} failed to load from {file_path}: {reason}")
             
             if self.audit_logger:
                 self.audit_logger.audit(
                     event_type=AuditEventType.SYSTEM_EVENT,
-                    action="profile_loaded",
+                    action="profile_lazy_load_failed",
                     details={
-                        'profile_id': profile.metadata.id,
+                        'profile_id': profile_id,
                         'file_path': file_path,
-                        'profile_type': profile.metadata.profile_type.value
+                        'reason': reason
                     },
-                    security_level=SecurityLevel.LOW
+                    security_level=SecurityLevel.MEDIUM
                 )
             
-            self.logger.info(f"Loaded profile: {profile.metadata.id} from {file_path}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error loading profile from {file_path}: {e}")
-            return False
+            raise ProfileLoadError(f"Profile {profile_id} could not be loaded from {file_path}: {reason}")
     
     def register_profile(self, profile: AgentProfile) -> None:
         """
@@ -600,6 +808,7 @@ class ProfileManager:
         with self.lock:
             self.profiles[profile.metadata.id] = profile
             self.profile_metadata[profile.metadata.id] = profile.metadata
+            self._pending_profiles.pop(profile.metadata.id, None)
             
             # Cache the profile if caching is enabled
             if self.cache:
@@ -616,10 +825,9 @@ class ProfileManager:
             True if profile was unregistered, False if not found
         """
         with self.lock:
-            if profile_id in self.profiles:
-                profile = self.profiles[profile_id]
-                
-                del self.profiles[profile_id]
+            if profile_id in self.profiles or profile_id in self._pending_profiles:
+                self.profiles.pop(profile_id, None)
+                self._pending_profiles.pop(profile_id, None)
                 del self.profile_metadata[profile_id]
                 
                 # Remove from cache
@@ -648,6 +856,9 @@ class ProfileManager:
             
         Returns:
             Profile instance or None if not found
+            
+        Raises:
+            ProfileLoadError: If a lazily registered profile fails to load
         """
         with self.lock:
             # Try cache first
@@ -659,7 +870,10 @@ class ProfileManager:
                 else:
                     self.stats['cache_misses'] += 1
             
-            # Get from storage
+            # Get from storage, loading lazily registered profiles on first access
+            if profile_id in self._pending_profiles:
+                return self._load_pending_profile(profile_id)
+            
             return self.profiles.get(profile_id)
     
     def get_profile_metadata(self, profile_id: str) -> Optional[ProfileMetadata]:
@@ -894,7 +1108,8 @@ class ProfileManager:
                 profiles_by_category[category] = profiles_by_category.get(category, 0) + 1
             
             stats = {
-                'total_profiles': len(self.profiles),
+                'total_profiles': len(self.profile_metadata),
+                'pending_profiles': len(self._pending_profiles),
                 'profiles_by_type': profiles_by_type,
                 'profiles_by_category': profiles_by_category,
                 **self.stats
@@ -916,6 +1131,9 @@ class ProfileManager:
             # Clear profiles
             self.profiles.clear()
             self.profile_metadata.clear()
+            self._pending_profiles.clear()
+            
+            self.loader.save_manifest()
             
             self.logger.info("Profile manager shutdown complete")
 
@@ -7,7 +7,8 @@ achievements, milestones, certifications, and structured learning paths.
 
 import logging
 import uuid
-from typing import Dict, Any, Optional, List, Set, Tuple
+from bisect import bisect_right
+from typing import Dict, Any, Optional, List, Set, Tuple, Iterable
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone, timedelta
 from enum import Enum
@@ -15,6 +16,18 @@ from enum import Enum
 from .performance_metrics import SkillLevel, OperatorProfile
 
 
+# Numeric rank for each proficiency string, avoiding enum reconstruction
+_SKILL_LEVEL_RANK = {level.value: level.to_numeric() for level in SkillLevel}
+
+
+def _skill_rank(proficiency: str) -> int:
+    """Get the numeric rank for a proficiency string."""
+    rank = _SKILL_LEVEL_RANK.get(proficiency)
+    if rank is None:
+        rank = SkillLevel(proficiency).to_numeric()
+    return rank
+
+
 class MilestoneType(Enum):
     """Types of milestones."""
     FIRST_SESSION = "first_session"
@@ -484,6 +497,169 @@ class EarnedCertification:
         return cls(**data)
 
 
+class MilestoneIndex:
+    """
+    Compiled milestone rules indexed by the operator attribute they depend on.
+    
+    Threshold milestones are kept in lists sorted by threshold, so the
+    completed prefix for any attribute value is found by bisection. A
+    per-operator cursor records how much of each list has already been
+    evaluated, so repeated checks only look at newly crossed thresholds.
+    Milestones whose check cannot be compiled (e.g. custom subclasses or
+    special events) fall back to ``Milestone.check_completion``.
+    """
+    
+    def __init__(self, milestones: Iterable[Milestone]):
+        """
+        Compile milestones into the index.
+        
+        Args:
+            milestones: Milestones in registration order
+        """
+        # Registration order, used to keep award order stable
+        self.order: Dict[str, int] = {}
+        
+        # attribute key -> ([thresholds], [milestone ids]) sorted by threshold
+        self.thresholds: Dict[str, Tuple[List[float], List[str]]] = {}
+        
+        # certification name -> milestone ids
+        self.certifications: Dict[str, List[str]] = {}
+        
+        # Milestones evaluated via check_completion on every update
+        self.fallback: List[Milestone] = []
+        
+        for position, milestone in enumerate(milestones):
+            self.order[milestone.id] = position
+            self._compile(milestone)
+    
+    @staticmethod
+    def skill_key(skill_name: str) -> str:
+        """Get the index key for a single skill."""
+        return f"skills.{skill_name}"
+    
+    def _add_threshold(self, key: str, threshold: float, milestone_id: str) -> None:
+        """Insert a threshold rule keeping the list sorted."""
+        values, ids = self.thresholds.setdefault(key, ([], []))
+        position = bisect_right(values, threshold)
+        values.insert(position, threshold)
+        ids.insert(position, milestone_id)
+    
+    def _compile(self, milestone: Milestone) -> None:
+        """Compile a single milestone into the index."""
+        if type(milestone).check_completion is not Milestone.check_completion:
+            self.fallback.append(milestone)
+            return
+        
+        milestone_type = milestone.milestone_type
+        requirements = milestone.requirements
+        
+        if milestone_type == MilestoneType.FIRST_SESSION:
+            self._add_threshold('total_sessions', 1, milestone.id)
+        
+        elif milestone_type == MilestoneType.SESSION_COUNT:
+            self._add_threshold('total_sessions', requirements.get('sessions', 0), milestone.id)
+        
+        elif milestone_type == MilestoneType.HOURS_TRAINED:
+            self._add_threshold('total_hours', requirements.get('hours', 0), milestone.id)
+        
+        elif milestone_type == MilestoneType.SKILL_MILESTONE:
+            skill_name = requirements.get('skill_name')
+            if skill_name:
+                required = _skill_rank(requirements.get('level', 'intermediate'))
+                self._add_threshold(self.skill_key(skill_name), required, milestone.id)
+        
+        elif milestone_type == MilestoneType.CERTIFICATION:
+            cert_name = requirements.get('certification_name')
+            self.certifications.setdefault(cert_name, []).append(milestone.id)
+        
+        elif milestone_type == MilestoneType.MASTERY:
+            self._add_threshold('mastery', requirements.get('skill_count', 1), milestone.id)
+        
+        else:
+            self.fallback.append(milestone)
+    
+    def _attribute_values(self,
+                          operator_data: Dict[str, Any],
+                          changed: Optional[Set[str]]) -> Dict[str, float]:
+        """
+        Resolve current values for the threshold keys affected by a change.
+        
+        Args:
+            operator_data: Current operator data
+            changed: Changed attribute names, or None for all
+            
+        Returns:
+            Mapping of index key to current value
+        """
+        values: Dict[str, float] = {}
+        
+        for attribute in ('total_sessions', 'total_hours'):
+            if (changed is None or attribute in changed) and attribute in self.thresholds:
+                values[attribute] = operator_data.get(attribute, 0)
+        
+        skills = operator_data.get('skills', {})
+        skills_changed = changed is None or 'skills' in changed
+        
+        for skill_name, skill in skills.items():
+            key = self.skill_key(skill_name)
+            if key not in self.thresholds:
+                continue
+            if not skills_changed and key not in changed:
+                continue
+            if skill:
+                values[key] = _skill_rank(skill.get('proficiency', 'novice'))
+        
+        if 'mastery' in self.thresholds and (
+            skills_changed or any(a.startswith('skills.') for a in changed)
+        ):
+            values['mastery'] = sum(
+                1 for skill in skills.values()
+                if skill.get('proficiency', 'novice') == SkillLevel.MASTER.value
+            )
+        
+        return values
+    
+    def evaluate(self,
+                 operator_data: Dict[str, Any],
+                 cursors: Dict[str, int],
+                 changed_attributes: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Find milestones newly completed by the given operator data.
+        
+        Args:
+            operator_data: Current operator data
+            cursors: Per-key count of already-evaluated thresholds (updated)
+            changed_attributes: Attributes that changed ('total_sessions',
+                'total_hours', 'certifications', 'skills' or 'skills.<name>'),
+                or None to evaluate everything
+            
+        Returns:
+            Candidate milestone ids in registration order
+        """
+        changed = None if changed_attributes is None else set(changed_attributes)
+        candidates: List[str] = []
+        
+        for key, value in self._attribute_values(operator_data, changed).items():
+            thresholds, ids = self.thresholds[key]
+            reached = bisect_right(thresholds, value)
+            start = cursors.get(key, 0)
+            
+            if reached > start:
+                candidates.extend(ids[start:reached])
+                cursors[key] = reached
+        
+        if self.certifications and (changed is None or 'certifications' in changed):
+            for cert_name in operator_data.get('certifications', []):
+                candidates.extend(self.certifications.get(cert_name, ()))
+        
+        for milestone in self.fallback:
+            if milestone.check_completion(operator_data):
+                candidates.append(milestone.id)
+        
+        candidates.sort(key=self.order.__getitem__)
+        return candidates
+
+
 class GoalTracker:
     """Track progress toward specific goals."""
     
@@ -765,6 +941,8 @@ class ProgressTracker:
         
         # Components
         self.milestones: Dict[str, Milestone] = {}
+        self._milestone_index: Optional[MilestoneIndex] = None
+        self._milestone_cursors: Dict[str, Dict[str, int]] = {}  # By operator_id
         self.achievements: Dict[str, List[Achievement]] = {}  # By operator_id
         self.progress_paths: Dict[str, ProgressPath] = {}
         self.goal_tracker = GoalTracker()
@@ -869,21 +1047,44 @@ class ProgressTracker:
             milestone: Milestone to register
         """
         self.milestones[milestone.id] = milestone
+        
+        # Recompile lazily on the next check
+        self._milestone_index = None
+        self._milestone_cursors.clear()
+        
         self.logger.info(f"Registered milestone: {milestone.name}")
     
+    def _get_milestone_index(self) -> MilestoneIndex:
+        """Get the compiled milestone index, building it if needed."""
+        if self._milestone_index is None:
+            self._milestone_index = MilestoneIndex(self.milestones.values())
+        return self._milestone_index
+    
     def check_and_award_milestones(self,
                                    operator_id: str,
-                                   operator_data: Dict[str, Any]) -> List[Achievement]:
+                                   operator_data: Dict[str, Any],
+                                   changed_attributes: Optional[Iterable[str]] = None) -> List[Achievement]:
         """
         Check and award any newly completed milestones.
         
         Args:
             operator_id: Operator identifier
             operator_data: Current operator data
+            changed_attributes: Optional attributes that changed since the
+                last check ('total_sessions', 'total_hours', 'certifications',
+                'skills' or 'skills.<name>'); only dependent milestones are
+                evaluated. None evaluates every milestone.
             
         Returns:
             List of newly awarded achievements
         """
+        index = self._get_milestone_index()
+        cursors = self._milestone_cursors.setdefault(operator_id, {})
+        
+        candidates = index.evaluate(operator_data, cursors, changed_attributes)
+        if not candidates:
+            return []
+        
         newly_awarded = []
         
         # Get existing achievements
@@ -892,41 +1093,71 @@ class ProgressTracker:
             for a in self.achievements.get(operator_id, [])
         )
         
-        # Check each milestone
-        for milestone in self.milestones.values():
-            if milestone.id in existing_milestone_ids:
+        for milestone_id in candidates:
+            if milestone_id in existing_milestone_ids:
                 continue  # Already awarded
             
-            if milestone.check_completion(operator_data):
-                # Award achievement
-                achievement = Achievement(
-                    id=str(uuid.uuid4()),
-                    operator_id=operator_id,
-                    milestone_id=milestone.id,
-                    name=milestone.name,
-                    description=milestone.description,
-                    category=AchievementCategory.SKILL_BASED,
-                    unlocked_at=datetime.now(timezone.utc),
-                    xp_earned=milestone.xp_reward
-                )
-                
-                if operator_id not in self.achievements:
-                    self.achievements[operator_id] = []
-                
-                self.achievements[operator_id].append(achievement)
-                newly_awarded.append(achievement)
-                
-                # Award XP
-                self.operator_xp[operator_id] = (
-                    self.operator_xp.get(operator_id, 0) + milestone.xp_reward
-                )
-                
-                self.logger.info(
-                    f"Awarded achievement {milestone.name} to operator {operator_id}"
-                )
+            milestone = self.milestones[milestone_id]
+            existing_milestone_ids.add(milestone_id)
+            
+            # Award achievement
+            achievement = Achievement(
+                id=str(uuid.uuid4()),
+                operator_id=operator_id,
+                milestone_id=milestone.id,
+                name=milestone.name,
+                description=milestone.description,
+                category=AchievementCategory.SKILL_BASED,
+                unlocked_at=datetime.now(timezone.utc),
+                xp_earned=milestone.xp_reward
+            )
+            
+            if operator_id not in self.achievements:
+                self.achievements[operator_id] = []
+            
+            self.achievements[operator_id].append(achievement)
+            newly_awarded.append(achievement)
+            
+            # Award XP
+            self.operator_xp[operator_id] = (
+                self.operator_xp.get(operator_id, 0) + milestone.xp_reward
+            )
+            
+            self.logger.info(
+                f"Awarded achievement {milestone.name} to operator {operator_id}"
+            )
         
         return newly_awarded
     
+    def check_and_award_milestones_batch(self,
+                                         operators_data: Dict[str, Dict[str, Any]]) -> Dict[str, List[Achievement]]:
+        """
+        Evaluate milestones for many operators at once (e.g. after a bulk import).
+        
+        Args:
+            operators_data: Mapping of operator ID to current operator data
+            
+        Returns:
+            Mapping of operator ID to newly awarded achievements (only
+            operators with new awards are included)
+        """
+        # Compile once up front for the whole batch
+        self._get_milestone_index()
+        
+        awarded: Dict[str, List[Achievement]] = {}
+        
+        for operator_id, operator_data in operators_data.items():
+            achievements = self.check_and_award_milestones(operator_id, operator_data)
+            if achievements:
+                awarded[operator_id] = achievements
+        
+        self.logger.info(
+            f"Batch milestone evaluation: {len(operators_data)} operators, "
+            f"{sum(len(a) for a in awarded.values())} achievements awarded"
+        )
+        
+        return awarded
+    
     def get_operator_achievements(self, operator_id: str) -> List[Achievement]:
         """Get all achievements for an operator."""
         return self.achievements.get(operator_id, [])
@@ -0,0 +1,284 @@
+"""
+ATS MAFIA Framework Streaming Quantile Sketches
+
+This module provides a mergeable t-digest for estimating percentile ranks and
+quantiles of score distributions without keeping every score. Memory is
+bounded by the compression parameter, ranks are exact while every centroid
+still holds a single value, and sketches from different cohorts or shards
+can be merged.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, Optional, List, Iterable
+
+
+class QuantileSketch:
+    """
+    Merging t-digest over a stream of values.
+
+    Values are buffered and periodically merged into at most roughly
+    ``compression`` centroids, which are kept small near the tails so extreme
+    percentiles stay accurate.
+    """
+
+    def __init__(self, compression: int = 100):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            compression: Accuracy/size trade-off (higher keeps more centroids)
+        """
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.buffer: List[float] = []
+        self.count = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+        # Cumulative weight before each centroid, rebuilt on compression
+        self._cumulative: List[float] = []
+
+    def __len__(self) -> int:
+        return int(self.count)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """
+        Add a value to the sketch.
+
+        Args:
+            value: Observed value
+            weight: Weight of the observation
+        """
+        if weight == 1.0:
+            self.buffer.append(value)
+        else:
+            self._merge_centroids([value], [weight])
+            return
+
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        if len(self.buffer) >= self.compression * 4:
+            self.compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Add several values."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            This sketch
+        """
+        other.compress()
+        self._merge_centroids(other.means, other.weights, other.min, other.max)
+        return self
+
+    @classmethod
+    def merged(cls, sketches: Iterable['QuantileSketch'], compression: Optional[int] = None) -> 'QuantileSketch':
+        """
+        Create a new sketch combining several sketches.
+
+        Args:
+            sketches: Sketches to combine
+            compression: Compression of the result (defaults to the largest input)
+
+        Returns:
+            Combined sketch
+        """
+        sketches = list(sketches)
+        result = cls(compression or max((s.compression for s in sketches), default=100))
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    def _merge_centroids(self,
+                         means: List[float],
+                         weights: List[float],
+                         min_value: Optional[float] = None,
+                         max_value: Optional[float] = None) -> None:
+        """
+        Fold weighted centroids into the sketch.
+
+        The exact extremes of the source are kept when given; centroid means
+        lie inside them and would shrink the range.
+        """
+        self.compress()
+
+        for mean, weight in zip(means, weights):
+            self.count += weight
+            self.min = mean if self.min is None else min(self.min, mean)
+            self.max = mean if self.max is None else max(self.max, mean)
+
+        if min_value is not None:
+            self.min = min(self.min, min_value)
+        if max_value is not None:
+            self.max = max(self.max, max_value)
+
+        self._rebuild(list(zip(self.means, self.weights)) + list(zip(means, weights)))
+
+    def compress(self) -> None:
+        """Merge buffered values into the centroids."""
+        if not self.buffer:
+            return
+
+        centroids = list(zip(self.means, self.weights))
+        centroids.extend((value, 1.0) for value in self.buffer)
+        self.buffer = []
+        self._rebuild(centroids)
+
+    def _k(self, q: float) -> float:
+        """t-digest k1 scale function."""
+        return self.compression / (2 * math.pi) * math.asin(2 * min(1.0, max(0.0, q)) - 1)
+
+    def _rebuild(self, centroids: List[tuple]) -> None:
+        """Re-cluster centroids so each spans at most one unit of the k scale."""
+        centroids.sort(key=lambda c: c[0])
+        total = sum(weight for _, weight in centroids)
+
+        means: List[float] = []
+        weights: List[float] = []
+        cumulative = 0.0
+        k_left = self._k(0.0)
+
+        for mean, weight in centroids:
+            if weights and self._k((cumulative + weight) / total) - k_left <= 1.0:
+                merged = weights[-1] + weight
+                means[-1] += (mean - means[-1]) * weight / merged
+                weights[-1] = merged
+            else:
+                if weights:
+                    k_left = self._k(cumulative / total)
+                means.append(mean)
+                weights.append(weight)
+            cumulative += weight
+
+        self.means = means
+        self.weights = weights
+
+        self._cumulative = []
+        running = 0.0
+        for weight in weights:
+            self._cumulative.append(running)
+            running += weight
+
+    def percentile_rank(self, value: float) -> float:
+        """
+        Estimate the percentage of values less than or equal to ``value``.
+
+        Args:
+            value: Value to rank
+
+        Returns:
+            Percentile rank (0-100); 50.0 for an empty sketch
+        """
+        self.compress()
+
+        if not self.count:
+            return 50.0
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 100.0
+
+        means, weights, cumulative = self.means, self.weights, self._cumulative
+
+        # Centroids with mean <= value
+        right = bisect_right(means, value)
+        below = cumulative[right - 1] + weights[right - 1] if right else 0.0
+
+        if right and means[right - 1] == value:
+            # Exact hits: singletons count fully, larger centroids by half
+            left = bisect_left(means, value)
+            tied = sum(w if w == 1.0 else w / 2 for w in weights[left:right])
+            return 100.0 * (cumulative[left] + tied) / self.count
+
+        # Interpolate between the neighbouring centroid centres
+        if right == 0:
+            left_x, left_cdf = self.min, 0.0
+        else:
+            w = weights[right - 1]
+            left_x = means[right - 1]
+            left_cdf = below if w == 1.0 else below - w / 2
+
+        if right == len(means):
+            right_x, right_cdf = self.max, self.count
+        else:
+            w = weights[right]
+            right_x = means[right]
+            right_cdf = below if w == 1.0 else below + w / 2
+
+        if right_x <= left_x:
+            return 100.0 * left_cdf / self.count
+
+        fraction = (value - left_x) / (right_x - left_x)
+        return 100.0 * (left_cdf + fraction * (right_cdf - left_cdf)) / self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the value at quantile ``q``.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None for an empty sketch
+        """
+        self.compress()
+
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        target = q * self.count
+        centres = [c + w / 2 for c, w in zip(self._cumulative, self.weights)]
+        index = bisect_left(centres, target)
+
+        if index == 0:
+            left_x, left_pos = self.min, 0.0
+            right_x, right_pos = self.means[0], centres[0]
+        elif index == len(centres):
+            left_x, left_pos = self.means[-1], centres[-1]
+            right_x, right_pos = self.max, self.count
+        else:
+            left_x, left_pos = self.means[index - 1], centres[index - 1]
+            right_x, right_pos = self.means[index], centres[index]
+
+        if right_pos <= left_pos:
+            return left_x
+
+        return left_x + (right_x - left_x) * (target - left_pos) / (right_pos - left_pos)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert sketch to dictionary."""
+        self.compress()
+        return {
+            'compression': self.compression,
+            'means': list(self.means),
+            'weights': list(self.weights),
+            'count': self.count,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        """Create sketch from dictionary."""
+        sketch = cls(data.get('compression', 100))
+        sketch._rebuild(list(zip(data.get('means', []), data.get('weights', []))))
+        sketch.count = data.get('count', sum(sketch.weights))
+        sketch.min = data.get('min')
+        sketch.max = data.get('max')
+        return sketch
@@ -8,8 +8,10 @@ operator progress, cost analysis, training effectiveness, and system health repo
 import logging
 import json
 import csv
+import html
 from io import StringIO
-from typing import Dict, Any, Optional, List
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator, Union
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone, timedelta
 from enum import Enum
@@ -20,6 +22,7 @@ from .training_effectiveness import TrainingEffectivenessTracker
 from .advanced_cost_analytics import AdvancedCostAnalytics
 from .progress_tracker import ProgressTracker
 from .cost_tracker import CostTracker
+from .export_streams import DEFAULT_CHUNK_SIZE, iter_chunks, write_chunks
 
 
 class ReportType(Enum):
@@ -41,6 +44,7 @@ class ReportFormat(Enum):
     HTML = "html"
     PDF = "pdf"
     MARKDOWN = "markdown"
+    JSONL = "jsonl"
 
 
 @dataclass
@@ -82,7 +86,30 @@ class Report:
     
     def to_json(self) -> str:
         """Export report as JSON."""
-        return json.dumps(self.to_dict(), indent=2)
+        return ''.join(self.iter_json())
+    
+    def iter_json(self) -> Iterator[str]:
+        """Stream report as JSON fragments."""
+        return json.JSONEncoder(indent=2).iterencode(self.to_dict())
+    
+    def iter_jsonl(self) -> Iterator[str]:
+        """
+        Stream report as JSON Lines.
+        
+        The first line holds the report metadata. Each top-level data
+        section follows as its own line, with list sections emitted one
+        line per item so large collections never build up in memory.
+        """
+        header = self.to_dict()
+        del header['data']
+        yield json.dumps(header) + "\n"
+        
+        for section, value in self.data.items():
+            if isinstance(value, list):
+                for item in value:
+                    yield json.dumps({'section': section, 'record': item}) + "\n"
+            else:
+                yield json.dumps({'section': section, 'record': value}) + "\n"
     
     def to_csv(self) -> str:
         """
@@ -91,20 +118,25 @@ class Report:
         Note: This is a simplified CSV export. Complex nested data
         may not be fully represented.
         """
-        output = StringIO()
-        
+        return ''.join(self.iter_csv())
+    
+    def iter_csv(self) -> Iterator[str]:
+        """Stream report as CSV, one row at a time."""
         # Extract flat data for CSV
         flat_data = self._flatten_data(self.data)
         
         if not flat_data:
-            return ""
+            return
         
-        # Write CSV
+        output = StringIO()
         writer = csv.DictWriter(output, fieldnames=flat_data[0].keys())
         writer.writeheader()
-        writer.writerows(flat_data)
         
-        return output.getvalue()
+        for row in flat_data:
+            writer.writerow(row)
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
     
     def _flatten_data(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Flatten nested data for CSV export."""
@@ -118,41 +150,48 @@ class Report:
     
     def to_markdown(self) -> str:
         """Export report as Markdown."""
-        md = []
-        
+        return ''.join(self.iter_markdown())
+    
+    def iter_markdown(self) -> Iterator[str]:
+        """Stream report as Markdown fragments."""
         # Header
-        md.append(f"# {self.title}\n")
-        md.append(f"{self.description}\n")
-        md.append(f"**Generated:** {self.generated_at.strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
-        md.append(f"**Report ID:** {self.id}\n")
-        md.append("---\n")
+        yield f"# {self.title}\n\n"
+        yield f"{self.description}\n\n"
+        yield f"**Generated:** {self.generated_at.strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
+        yield f"**Report ID:** {self.id}\n\n"
+        yield "---\n\n"
         
         # Data section
-        md.append("## Report Data\n")
-        md.append(self._dict_to_markdown(self.data))
-        
-        return "\n".join(md)
+        yield "## Report Data\n\n"
+        yield from self._iter_dict_markdown(self.data)
     
     def _dict_to_markdown(self, data: Dict[str, Any], level: int = 3) -> str:
         """Convert dictionary to markdown format."""
-        md = []
+        return ''.join(self._iter_dict_markdown(data, level))
+    
+    def _iter_dict_markdown(self, data: Dict[str, Any], level: int = 3) -> Iterator[str]:
+        """Stream dictionary as markdown, one newline between entries."""
+        separator = ""
         
         for key, value in data.items():
             heading = "#" * level
-            md.append(f"{heading} {key.replace('_', ' ').title()}\n")
+            yield separator
+            separator = "\n"
+            yield f"{heading} {key.replace('_', ' ').title()}\n"
             
             if isinstance(value, dict):
-                md.append(self._dict_to_markdown(value, level + 1))
+                yield "\n"
+                yield from self._iter_dict_markdown(value, level + 1)
             elif isinstance(value, list):
                 for item in value:
+                    yield "\n"
                     if isinstance(item, dict):
-                        md.append(self._dict_to_markdown(item, level + 1))
+                        yield from self._iter_dict_markdown(item, level + 1)
                     else:
-                        md.append(f"- {item}\n")
+                        yield f"- {item}\n"
             else:
-                md.append(f"{value}\n")
-        
-        return "\n".join(md)
+                yield "\n"
+                yield f"{value}\n"
 
 
 class ReportGenerator(ABC):
@@ -331,6 +370,7 @@ class TeamPerformanceReport(ReportGenerator):
         }
         
         operator_scores = []
+        team_analysis = self.performance_engine.analyze_team_performance(operator_ids)
         
         for operator_id in operator_ids:
             profile = self.performance_engine.get_operator_profile(operator_id)
@@ -350,7 +390,9 @@ class TeamPerformanceReport(ReportGenerator):
                 'hours': profile.total_hours,
                 'skill_level': profile.skill_level.value,
                 'achievements': achievements,
-                'certifications': len(profile.certifications)
+                'certifications': len(profile.certifications),
+                'learning_velocity': team_analysis[operator_id]['learning_velocity'],
+                'plateau_detected': team_analysis[operator_id]['plateau_detected']
             }
             
             team_data['operators'].append(operator_info)
@@ -506,10 +548,16 @@ class TrendAnalysisReport(ReportGenerator):
             
             title = f"Trend Analysis - Operator {operator_id}"
         else:
-            # System-wide trends
+            # System-wide trends, all operators in one batched pass
+            team_analysis = self.performance_engine.analyze_team_performance(
+                list(self.performance_engine.operator_profiles)
+            )
             report_data = {
                 'time_range_days': time_range.days,
-                'system_trends': {}
+                'system_trends': {
+                    operator_id: analysis['trends']
+                    for operator_id, analysis in team_analysis.items()
+                }
             }
             
             title = "System-Wide Trend Analysis"
@@ -720,23 +768,73 @@ class ReportingEngine:
         Returns:
             Exported report content
         """
+        return ''.join(self.stream_report(report_id, format))
+    
+    def stream_report(self,
+                      report_id: str,
+                      format: ReportFormat,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Stream a report in the specified format as bounded chunks.
+        
+        Suitable for chunked HTTP responses; the full document is never
+        materialized in memory.
+        
+        Args:
+            report_id: Report identifier
+            format: Export format
+            chunk_size: Target chunk size in characters
+            
+        Returns:
+            Iterator of report content chunks
+        """
         report = self.get_report(report_id)
         if not report:
             raise ValueError(f"Report not found: {report_id}")
         
         if format == ReportFormat.JSON:
-            return report.to_json()
+            pieces = report.iter_json()
+        elif format == ReportFormat.JSONL:
+            pieces = report.iter_jsonl()
         elif format == ReportFormat.CSV:
-            return report.to_csv()
+            pieces = report.iter_csv()
         elif format == ReportFormat.MARKDOWN:
-            return report.to_markdown()
+            pieces = report.iter_markdown()
         elif format == ReportFormat.HTML:
-            return self._export_html(report)
+            pieces = self._iter_html(report)
         elif format == ReportFormat.PDF:
             # PDF generation would require additional libraries
             raise NotImplementedError("PDF export not yet implemented")
         else:
             raise ValueError(f"Unsupported format: {format.value}")
+        
+        return iter_chunks(pieces, chunk_size)
+    
+    def export_report_to_file(self,
+                              report_id: str,
+                              format: ReportFormat,
+                              output_path: Union[str, Path],
+                              compress: bool = False) -> int:
+        """
+        Stream a report to a file.
+        
+        Args:
+            report_id: Report identifier
+            format: Export format
+            output_path: Destination file path
+            compress: Whether to gzip the output
+            
+        Returns:
+            Number of characters written (before compression)
+        """
+        written = write_chunks(
+            self.stream_report(report_id, format),
+            output_path,
+            compress=compress
+        )
+        
+        self.logger.info(f"Exported report {report_id} to {output_path}")
+        return written
     
     def _export_html(self, report: Report) -> str:
         """
@@ -748,11 +846,26 @@ class ReportingEngine:
         Returns:
             HTML content
         """
-        html = f"""
+        return ''.join(self._iter_html(report))
+    
+    def _iter_html(self, report: Report) -> Iterator[str]:
+        """
+        Stream report as HTML fragments.
+        
+        Args:
+            report: Report to export
+            
+        Yields:
+            HTML fragments
+        """
+        title = html.escape(report.title)
+        description = html.escape(report.description)
+        
+        yield f"""
 <!DOCTYPE html>
 <html>
 <head>
-    <title>{report.title}</title>
+    <title>{title}</title>
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; }}
         h1 {{ color: #333; }}
@@ -764,19 +877,23 @@ class ReportingEngine:
     </style>
 </head>
 <body>
-    <h1>{report.title}</h1>
-    <p>{report.description}</p>
+    <h1>{title}</h1>
+    <p>{description}</p>
     <p class="metadata">
         Generated: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S UTC')}<br>
-        Report ID: {report.id}
+        Report ID: {html.escape(report.id)}
     </p>
     <hr>
     <h2>Report Data</h2>
-    <pre>{json.dumps(report.data, indent=2)}</pre>
+    <pre>"""
+        
+        for fragment in json.JSONEncoder(indent=2).iterencode(report.data):
+            yield html.escape(fragment, quote=False)
+        
+        yield """</pre>
 </body>
 </html>
 """
-        return html
     
     def list_reports(self,
                     report_type: Optional[ReportType] = None) -> List[Dict[str, Any]]:
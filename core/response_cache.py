@@ -0,0 +1,516 @@
+"""
+ATS MAFIA Framework LLM Response Cache
+
+This module provides a two-tier (memory LRU + on-disk) cache for LLM
+responses keyed by model, normalized prompt and decoding parameters, so
+repeated system prompts, personas and scenario briefings are not billed
+again. It also keeps prefix-level reuse metadata for providers that support
+prompt caching.
+"""
+
+import os
+import re
+import asyncio
+import json
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+
+from .llm_gateway import LLMRequest, LLMResponse, CHARS_PER_TOKEN
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_prompt(text: Optional[str]) -> str:
+    """
+    Normalize prompt text for cache keys.
+
+    Runs of whitespace are collapsed and leading/trailing whitespace removed;
+    case and punctuation are preserved since they can change the completion.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Normalized text
+    """
+    return _WHITESPACE_RE.sub(' ', text or '').strip()
+
+
+class CacheScope(Enum):
+    """Sharing scope of cached responses."""
+    GLOBAL = "global"
+    PROFILE = "profile"
+    SESSION = "session"
+
+
+@dataclass
+class CachedResponse:
+    """
+    A cached LLM response.
+
+    Attributes:
+        key: Cache key
+        model: Model identifier (provider/name)
+        text: Completion text
+        input_tokens: Prompt tokens of the original request
+        output_tokens: Completion tokens of the original request
+        created_at: Unix time the entry was stored
+        expires_at: Unix time the entry expires (None for never)
+        hits: Number of times the entry was served
+    """
+    key: str
+    model: str
+    text: str
+    input_tokens: int
+    output_tokens: int
+    created_at: float
+    expires_at: Optional[float] = None
+    hits: int = 0
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check whether the entry has expired."""
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert entry to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CachedResponse':
+        """Create entry from dictionary."""
+        return cls(**data)
+
+    def to_response(self, request_id: str) -> LLMResponse:
+        """Build a response for a request served from the cache."""
+        return LLMResponse(
+            request_id=request_id,
+            model=self.model,
+            text=self.text,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            latency_ms=0.0,
+            cache_hit=True
+        )
+
+
+class ResponseCache:
+    """
+    Memory LRU + on-disk cache for LLM responses.
+
+    Keys combine the model, the scope identifier (nothing, the profile ID or
+    the session ID), the normalized system prompt and prompt, and the
+    decoding parameters. Only successful responses are cached. The lock only
+    guards the memory tier; disk I/O happens outside it.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 ttl: Optional[float] = 3600,
+                 scope: CacheScope = CacheScope.GLOBAL,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 min_prefix_chars: int = 512,
+                 max_prefixes: int = 1024):
+        """
+        Initialize the response cache.
+
+        Args:
+            max_entries: Maximum entries kept in memory
+            ttl: Default time-to-live in seconds (None for no expiry)
+            scope: Default sharing scope
+            cache_dir: Directory for the on-disk tier (None disables it)
+            min_prefix_chars: Minimum system prompt length tracked as a reusable prefix
+            max_prefixes: Maximum number of prefixes tracked
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.scope = scope
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.min_prefix_chars = min_prefix_chars
+        self.max_prefixes = max_prefixes
+
+        self.entries: OrderedDict = OrderedDict()
+        self.prefixes: OrderedDict = OrderedDict()
+        self.lock = threading.RLock()
+        self.logger = logging.getLogger("response_cache")
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _scope_id(self, request: LLMRequest, scope: CacheScope) -> str:
+        """Get the scope identifier for a request."""
+        if scope == CacheScope.PROFILE:
+            return f"profile:{request.profile_id}"
+        if scope == CacheScope.SESSION:
+            return f"session:{request.session_id}"
+        return "global"
+
+    def make_key(self, request: LLMRequest, scope: Optional[CacheScope] = None) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            request: LLM request
+            scope: Sharing scope (defaults to the cache scope)
+
+        Returns:
+            Hex digest cache key
+        """
+        key_data = [
+            request.model.get_full_name(),
+            self._scope_id(request, scope or self.scope),
+            normalize_prompt(request.system_prompt),
+            normalize_prompt(request.prompt),
+            request.temperature,
+            request.max_tokens
+        ]
+        return hashlib.sha256(json.dumps(key_data).encode()).hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        """Get the on-disk path for a key."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _store_memory(self, entry: CachedResponse) -> None:
+        """Insert an entry into the memory tier, evicting the least recently used."""
+        self.entries[entry.key] = entry
+        self.entries.move_to_end(entry.key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load_disk(self, key: str) -> Optional[CachedResponse]:
+        """Load an entry from the disk tier."""
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return CachedResponse.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove_disk(key)
+            return None
+
+    def _write_disk(self, entry: CachedResponse) -> None:
+        """Write an entry to the disk tier atomically."""
+        if not self.cache_dir:
+            return
+
+        path = self._disk_path(entry.key)
+        tmp_path = path.with_suffix('.tmp')
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to write cache entry {path}: {e}")
+
+    def _remove_disk(self, key: str) -> None:
+        """Remove an entry from the disk tier."""
+        if not self.cache_dir:
+            return
+
+        try:
+            self._disk_path(key).unlink()
+        except OSError:
+            pass
+
+    def _get_memory(self, key: str, now: float) -> Tuple[Optional[CachedResponse], bool]:
+        """
+        Look up the memory tier.
+
+        Returns:
+            Tuple of the entry (None on a memory miss) and whether the key
+            was found expired and dropped
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None, False
+
+            if entry.is_expired(now):
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None, True
+
+            entry.hits += 1
+            self.memory_hits += 1
+            self.entries.move_to_end(key)
+            return entry, False
+
+    def _admit_disk(self, key: str, entry: Optional[CachedResponse], now: float) -> Tuple[Optional[CachedResponse], bool]:
+        """
+        Account a disk tier lookup, promoting live entries into memory.
+
+        Returns:
+            Tuple of the entry (None on a miss) and whether it had expired
+        """
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            if entry.is_expired(now):
+                self.expirations += 1
+                self.misses += 1
+                return None, True
+
+            entry.hits += 1
+            self.disk_hits += 1
+            self._store_memory(entry)
+            return entry, False
+
+    def _make_entry(self,
+                    request: LLMRequest,
+                    response: LLMResponse,
+                    ttl: Optional[float],
+                    scope: Optional[CacheScope]) -> Optional[CachedResponse]:
+        """Build the entry for a response, or None if it is not cacheable."""
+        if not response.success or response.cache_hit:
+            return None
+
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+
+        return CachedResponse(
+            key=self.make_key(request, scope),
+            model=response.model,
+            text=response.text,
+            input_tokens=response.input_tokens,
+            output_tokens=response.output_tokens,
+            created_at=now,
+            expires_at=now + ttl if ttl is not None else None
+        )
+
+    def get(self, request: LLMRequest, scope: Optional[CacheScope] = None) -> Optional[CachedResponse]:
+        """
+        Look up a cached response.
+
+        Disk reads happen on the calling thread; use get_async on an event loop.
+
+        Args:
+            request: LLM request
+            scope: Sharing scope (defaults to the cache scope)
+
+        Returns:
+            Cached entry or None on a miss
+        """
+        key = self.make_key(request, scope)
+        now = time.time()
+
+        entry, expired = self._get_memory(key, now)
+        if entry is None and not expired:
+            entry, expired = self._admit_disk(key, self._load_disk(key), now)
+
+        if expired:
+            self._remove_disk(key)
+
+        return entry
+
+    async def get_async(self, request: LLMRequest, scope: Optional[CacheScope] = None) -> Optional[CachedResponse]:
+        """
+        Look up a cached response from a coroutine.
+
+        The memory tier is consulted on the event loop; disk reads run in the
+        loop's default executor.
+
+        Args:
+            request: LLM request
+            scope: Sharing scope (defaults to the cache scope)
+
+        Returns:
+            Cached entry or None on a miss
+        """
+        key = self.make_key(request, scope)
+        now = time.time()
+        loop = asyncio.get_running_loop()
+
+        entry, expired = self._get_memory(key, now)
+        if entry is None and not expired:
+            disk_entry = None
+            if self.cache_dir:
+                disk_entry = await loop.run_in_executor(None, self._load_disk, key)
+            entry, expired = self._admit_disk(key, disk_entry, now)
+
+        if expired and self.cache_dir:
+            await loop.run_in_executor(None, self._remove_disk, key)
+
+        return entry
+
+    def put(self,
+            request: LLMRequest,
+            response: LLMResponse,
+            ttl: Optional[float] = None,
+            scope: Optional[CacheScope] = None) -> Optional[CachedResponse]:
+        """
+        Cache a response.
+
+        Disk writes happen on the calling thread; use put_async on an event loop.
+
+        Args:
+            request: LLM request
+            response: Provider response
+            ttl: Time-to-live override in seconds
+            scope: Sharing scope (defaults to the cache scope)
+
+        Returns:
+            Stored entry, or None if the response is not cacheable
+        """
+        entry = self._make_entry(request, response, ttl, scope)
+        if entry is None:
+            return None
+
+        with self.lock:
+            self._store_memory(entry)
+
+        self._write_disk(entry)
+        return entry
+
+    async def put_async(self,
+                        request: LLMRequest,
+                        response: LLMResponse,
+                        ttl: Optional[float] = None,
+                        scope: Optional[CacheScope] = None) -> Optional[CachedResponse]:
+        """
+        Cache a response from a coroutine.
+
+        The entry is stored in memory on the event loop; the disk write runs
+        in the loop's default executor.
+
+        Args:
+            request: LLM request
+            response: Provider response
+            ttl: Time-to-live override in seconds
+            scope: Sharing scope (defaults to the cache scope)
+
+        Returns:
+            Stored entry, or None if the response is not cacheable
+        """
+        entry = self._make_entry(request, response, ttl, scope)
+        if entry is None:
+            return None
+
+        with self.lock:
+            self._store_memory(entry)
+
+        if self.cache_dir:
+            await asyncio.get_running_loop().run_in_executor(None, self._write_disk, entry)
+        return entry
+
+    def record_prefix(self, request: LLMRequest) -> Optional[Dict[str, Any]]:
+        """
+        Track reuse of a request's system prompt as a cacheable prefix.
+
+        Providers that support prompt caching can use the returned metadata
+        to mark the prefix for reuse once it has been seen more than once.
+
+        Args:
+            request: LLM request
+
+        Returns:
+            Prefix metadata, or None if the prefix is too short to track
+        """
+        prefix = normalize_prompt(request.system_prompt)
+        if len(prefix) < self.min_prefix_chars:
+            return None
+
+        prefix_hash = hashlib.sha256(
+            f"{request.model.get_full_name()}|{prefix}".encode()
+        ).hexdigest()
+
+        with self.lock:
+            info = self.prefixes.get(prefix_hash)
+            if info is None:
+                info = {
+                    'prefix_hash': prefix_hash,
+                    'model': request.model.get_full_name(),
+                    'estimated_tokens': len(prefix) // CHARS_PER_TOKEN,
+                    'uses': 0,
+                    'first_seen': time.time()
+                }
+                self.prefixes[prefix_hash] = info
+
+                while len(self.prefixes) > self.max_prefixes:
+                    self.prefixes.popitem(last=False)
+
+            info['uses'] += 1
+            info['last_used'] = time.time()
+            info['reusable'] = info['uses'] > 1
+            self.prefixes.move_to_end(prefix_hash)
+
+            return dict(info)
+
+    def invalidate(self, request: LLMRequest, scope: Optional[CacheScope] = None) -> None:
+        """
+        Remove a request's cached response from both tiers.
+
+        Args:
+            request: LLM request
+            scope: Sharing scope (defaults to the cache scope)
+        """
+        key = self.make_key(request, scope)
+
+        with self.lock:
+            self.entries.pop(key, None)
+
+        self._remove_disk(key)
+
+    def clear(self) -> None:
+        """Clear both tiers and prefix metadata."""
+        with self.lock:
+            self.entries.clear()
+            self.prefixes.clear()
+
+        if self.cache_dir:
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self.lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'scope': self.scope.value,
+                'disk_enabled': self.cache_dir is not None,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'tracked_prefixes': len(self.prefixes),
+                'reusable_prefixes': sum(1 for p in self.prefixes.values() if p['uses'] > 1)
+            }
@@ -0,0 +1,311 @@
+"""
+ATS MAFIA Framework Time-Bucketed Rollups
+
+This module provides rollup tables that keep running totals in minute, hour
+and day buckets per combination of dimension values (model, profile,
+operator, ...). Every write updates all three resolutions, fine-grained
+buckets are compacted away once they age out of their retention, and
+dashboard queries read the coarsest buckets that still answer the requested
+window instead of re-aggregating raw records.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timezone, timedelta
+from enum import Enum
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Sequence
+
+
+class Resolution(Enum):
+    """Rollup bucket sizes in seconds."""
+    MINUTE = 60
+    HOUR = 3600
+    DAY = 86400
+
+
+# Default retention per resolution (None keeps buckets forever)
+DEFAULT_RETENTION: Dict[Resolution, Optional[timedelta]] = {
+    Resolution.MINUTE: timedelta(hours=6),
+    Resolution.HOUR: timedelta(days=14),
+    Resolution.DAY: None
+}
+
+
+class RollupCell:
+    """Totals for one bucket and dimension combination."""
+
+    __slots__ = ('values', 'first', 'last')
+
+    def __init__(self):
+        """Initialize an empty cell."""
+        self.values: Dict[str, float] = {}
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+
+    def add(self, timestamp: float, values: Dict[str, float]) -> None:
+        """Add values observed at a Unix timestamp."""
+        for name, value in values.items():
+            self.values[name] = self.values.get(name, 0.0) + value
+
+        if self.first is None or timestamp < self.first:
+            self.first = timestamp
+        if self.last is None or timestamp > self.last:
+            self.last = timestamp
+
+    def merge(self, other: 'RollupCell') -> None:
+        """Add another cell's totals to this cell."""
+        for name, value in other.values.items():
+            self.values[name] = self.values.get(name, 0.0) + value
+
+        if other.first is not None and (self.first is None or other.first < self.first):
+            self.first = other.first
+        if other.last is not None and (self.last is None or other.last > self.last):
+            self.last = other.last
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert cell to dictionary."""
+        data = dict(self.values)
+        data['first_seen'] = (
+            datetime.fromtimestamp(self.first, timezone.utc).isoformat() if self.first is not None else None
+        )
+        data['last_seen'] = (
+            datetime.fromtimestamp(self.last, timezone.utc).isoformat() if self.last is not None else None
+        )
+        return data
+
+
+class RollupTable:
+    """
+    Minute/hour/day rollups of numeric values by a fixed set of dimensions.
+
+    Buckets are aligned to UTC, so day buckets match ``timestamp.date()`` of
+    UTC timestamps. Query windows are widened to the start of the bucket that
+    contains the window start.
+    """
+
+    def __init__(self,
+                 dimensions: Sequence[str],
+                 retention: Optional[Dict[Resolution, Optional[timedelta]]] = None):
+        """
+        Initialize the rollup table.
+
+        Args:
+            dimensions: Names of the dimensions every write is keyed by
+            retention: How long buckets are kept per resolution
+        """
+        self.dimensions = tuple(dimensions)
+        self.retention = dict(DEFAULT_RETENTION)
+        if retention:
+            self.retention.update(retention)
+
+        self.buckets: Dict[Resolution, Dict[int, Dict[tuple, RollupCell]]] = {
+            resolution: {} for resolution in Resolution
+        }
+        self.starts: Dict[Resolution, List[int]] = {resolution: [] for resolution in Resolution}
+        self.lock = threading.RLock()
+        self.compactions = 0
+
+    @staticmethod
+    def bucket_start(timestamp: float, resolution: Resolution) -> int:
+        """Get the start of the bucket containing a Unix timestamp."""
+        return int(timestamp // resolution.value) * resolution.value
+
+    def add(self,
+            timestamp: datetime,
+            dimensions: Dict[str, Any],
+            values: Dict[str, float]) -> None:
+        """
+        Add values to every resolution.
+
+        Negative values can be used to retract an earlier write.
+
+        Args:
+            timestamp: When the values were observed
+            dimensions: Value for each of the table's dimensions
+            values: Named values to add
+        """
+        ts = timestamp.timestamp()
+        key = tuple(dimensions.get(name) for name in self.dimensions)
+        new_minute = False
+
+        with self.lock:
+            for resolution in Resolution:
+                start = self.bucket_start(ts, resolution)
+                bucket = self.buckets[resolution].get(start)
+
+                if bucket is None:
+                    bucket = self.buckets[resolution][start] = {}
+                    insort(self.starts[resolution], start)
+                    new_minute = new_minute or resolution == Resolution.MINUTE
+
+                cell = bucket.get(key)
+                if cell is None:
+                    cell = bucket[key] = RollupCell()
+                cell.add(ts, values)
+
+            # Compact at most once per new minute bucket
+            if new_minute:
+                self.compact()
+
+    def compact(self, now: Optional[datetime] = None) -> int:
+        """
+        Drop buckets older than their resolution's retention.
+
+        Coarser resolutions already hold the same totals, so no data is lost
+        for windows longer than the fine retention.
+
+        Args:
+            now: Reference time (defaults to the current time)
+
+        Returns:
+            Number of buckets dropped
+        """
+        now_ts = (now or datetime.now(timezone.utc)).timestamp()
+        dropped = 0
+
+        with self.lock:
+            for resolution, retention in self.retention.items():
+                if retention is None:
+                    continue
+
+                cutoff = self.bucket_start(now_ts - retention.total_seconds(), resolution)
+                starts = self.starts[resolution]
+                stale = bisect_left(starts, cutoff)
+
+                for start in starts[:stale]:
+                    del self.buckets[resolution][start]
+                del starts[:stale]
+                dropped += stale
+
+            if dropped:
+                self.compactions += 1
+
+        return dropped
+
+    def clear(self) -> None:
+        """Remove all buckets."""
+        with self.lock:
+            for resolution in Resolution:
+                self.buckets[resolution].clear()
+                self.starts[resolution].clear()
+
+    def choose_resolution(self, window: Optional[timedelta]) -> Resolution:
+        """
+        Pick the finest resolution whose retention covers a window.
+
+        Args:
+            window: Query window (None for all time)
+
+        Returns:
+            Resolution to answer the window from
+        """
+        for resolution in Resolution:
+            retention = self.retention.get(resolution)
+            if retention is None or (window is not None and window <= retention):
+                return resolution
+
+        return Resolution.DAY
+
+    def _cells(self,
+               start: Optional[datetime],
+               resolution: Resolution,
+               filters: Optional[Dict[str, Any]]) -> Iterable[Tuple[int, tuple, RollupCell]]:
+        """Iterate (bucket start, key, cell) from a start time, applying filters."""
+        starts = self.starts[resolution]
+        first = 0
+        if start is not None:
+            first = bisect_left(starts, self.bucket_start(start.timestamp(), resolution))
+
+        checks = [
+            (self.dimensions.index(name), value) for name, value in (filters or {}).items()
+        ]
+
+        for bucket_start in starts[first:]:
+            for key, cell in self.buckets[resolution][bucket_start].items():
+                if all(key[index] == value for index, value in checks):
+                    yield bucket_start, key, cell
+
+    def query(self,
+              window: Optional[timedelta] = None,
+              group_by: Sequence[str] = (),
+              filters: Optional[Dict[str, Any]] = None,
+              resolution: Optional[Resolution] = None) -> Dict[tuple, RollupCell]:
+        """
+        Total values over a trailing window.
+
+        Args:
+            window: Trailing window (None for all time)
+            group_by: Dimensions to group by (empty for a single total)
+            filters: Required dimension values
+            resolution: Resolution override (chosen from the window by default)
+
+        Returns:
+            Totals keyed by the tuple of ``group_by`` values
+        """
+        resolution = resolution or self.choose_resolution(window)
+        start = datetime.now(timezone.utc) - window if window is not None else None
+        indexes = [self.dimensions.index(name) for name in group_by]
+
+        totals: Dict[tuple, RollupCell] = {}
+        with self.lock:
+            for _, key, cell in self._cells(start, resolution, filters):
+                group = tuple(key[index] for index in indexes)
+                total = totals.get(group)
+                if total is None:
+                    total = totals[group] = RollupCell()
+                total.merge(cell)
+
+        return totals
+
+    def series(self,
+               window: Optional[timedelta] = None,
+               filters: Optional[Dict[str, Any]] = None,
+               resolution: Optional[Resolution] = None,
+               step: Resolution = Resolution.DAY) -> List[Tuple[datetime, RollupCell]]:
+        """
+        Totals per time step over a trailing window.
+
+        Args:
+            window: Trailing window (None for all time)
+            filters: Required dimension values
+            resolution: Resolution read (chosen from the window by default)
+            step: Size of the returned steps (at least the read resolution)
+
+        Returns:
+            (step start, totals) pairs in time order
+        """
+        resolution = resolution or self.choose_resolution(window)
+        step_seconds = max(step.value, resolution.value)
+        start = datetime.now(timezone.utc) - window if window is not None else None
+
+        steps: Dict[int, RollupCell] = {}
+        with self.lock:
+            for bucket_start, _, cell in self._cells(start, resolution, filters):
+                step_start = bucket_start // step_seconds * step_seconds
+                total = steps.get(step_start)
+                if total is None:
+                    total = steps[step_start] = RollupCell()
+                total.merge(cell)
+
+        return [
+            (datetime.fromtimestamp(step_start, timezone.utc), steps[step_start])
+            for step_start in sorted(steps)
+        ]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get rollup table statistics.
+
+        Returns:
+            Dictionary with bucket counts per resolution
+        """
+        with self.lock:
+            return {
+                'dimensions': list(self.dimensions),
+                'buckets': {r.name.lower(): len(self.starts[r]) for r in Resolution},
+                'cells': {
+                    r.name.lower(): sum(len(b) for b in self.buckets[r].values())
+                    for r in Resolution
+                },
+                'compactions': self.compactions
+            }
@@ -20,6 +20,7 @@ import hashlib
 
 from ..config.settings import FrameworkConfig
 from .logging import AuditLogger, AuditEventType, SecurityLevel
+from .content_loader import ContentLoader, ContentManifest, LoadResult
 
 
 class DifficultyLevel(Enum):
@@ -636,6 +637,16 @@ class ScenarioLibrary:
         # Components
         self.validator = ScenarioValidator()
         
+        manifest_dir = config.resolve_data_path(config.manifest_dir) if config else None
+        self.loader = ContentLoader(
+            build=lambda scenario_data, file_path: Scenario.from_dict(scenario_data),
+            validate=self.validator.validate,
+            manifest=ContentManifest(
+                manifest_dir / "scenarios_manifest.json"
+            ) if manifest_dir else None,
+            max_workers=getattr(config, 'load_workers', 4) if config else 4
+        )
+        
         # Thread safety
         self.lock = threading.RLock()
         
@@ -643,6 +654,7 @@ class ScenarioLibrary:
         self.stats = {
             'scenarios_loaded': 0,
             'scenarios_validated': 0,
+            'validations_skipped': 0,
             'validation_errors': 0,
             'scenarios_by_type': {},
             'scenarios_by_difficulty': {}
@@ -660,6 +672,9 @@ class ScenarioLibrary:
         """
         Load scenarios from a directory.
         
+        Files are parsed and validated in the loader's worker pool; files
+        unchanged since they were last validated skip re-validation.
+        
         Args:
             directory: Directory to load scenarios from
         """
@@ -670,11 +685,14 @@ class ScenarioLibrary:
             return
         
         # Look for JSON scenario files
-        for scenario_file in scenario_dir.glob("**/*.json"):
-            try:
-                self.load_scenario_from_file(str(scenario_file))
-            except Exception as e:
-                self.logger.error(f"Error loading scenario from {scenario_file}: {e}")
+        scenario_files = [str(path) for path in scenario_dir.glob("**/*.json")]
+        
+        for result in self.loader.load_files(scenario_files):
+            self._register_loaded(result)
+        
+        if self.loader.manifest:
+            self.loader.manifest.prune(scenario_dir, scenario_files)
+        self.loader.save_manifest()
         
         self.logger.info(f"Loaded {len(self.scenarios)} scenarios from {directory}")
     
@@ -688,66 +706,75 @@ class ScenarioLibrary:
         Returns:
             True if loaded successfully, False otherwise
         """
-        try:
-            scenario_path = Path(file_path)
-            
-            if not scenario_path.exists():
-                self.logger.error(f"Scenario file not found: {file_path}")
-                return False
-            
-            # Load scenario data
-            with open(scenario_path, 'r', encoding='utf-8') as f:
-                scenario_data = json.load(f)
-            
-            # Create scenario
-            scenario = Scenario.from_dict(scenario_data)
-            
-            # Validate scenario
-            errors = self.validator.validate(scenario)
-            if errors:
-                self.logger.error(f"Scenario validation failed for {scenario.id}: {errors}")
-                self.stats['validation_errors'] += len(errors)
-                
-                if self.audit_logger:
-                    self.audit_logger.audit(
-                        event_type=AuditEventType.SYSTEM_EVENT,
-                        action="scenario_validation_failed",
-                        details={
-                            'scenario_id': scenario.id,
-                            'file_path': file_path,
-                            'errors': errors
-                        },
-                        security_level=SecurityLevel.MEDIUM
-                    )
-                
-                return False
-            
-            self.stats['scenarios_validated'] += 1
-            
-            # Register scenario
-            self.register_scenario(scenario, file_path)
+        if not Path(file_path).exists():
+            self.logger.error(f"Scenario file not found: {file_path}")
+            return False
+        
+        loaded = self._register_loaded(self.loader.load_file(file_path))
+        self.loader.save_manifest()
+        return loaded
+    
+    def _register_loaded(self, result: LoadResult) -> bool:
+        """
+        Register the outcome of loading a scenario file.
+        
+        Args:
+            result: Load result from the content loader
             
-            self.stats['scenarios_loaded'] += 1
+        Returns:
+            True if the scenario was registered, False otherwise
+        """
+        file_path = result.file_path
+        
+        if result.error is not None:
+            self.logger.error(f"Error loading scenario from {file_path}: {result.error}")
+            return False
+        
+        scenario = result.item
+        
+        if result.errors:
+            self.logger.error(f"Scenario validation failed for {scenario.id}: {result.errors}")
+            self.stats['validation_errors'] += len(result.errors)
             
             if self.audit_logger:
                 self.audit_logger.audit(
                     event_type=AuditEventType.SYSTEM_EVENT,
-                    action="scenario_loaded",
+                    action="scenario_validation_failed",
                     details={
                         'scenario_id': scenario.id,
                         'file_path': file_path,
-                        'type': scenario.type.value,
-                        'difficulty': scenario.difficulty.value
+                        'errors': result.errors
                     },
-                    security_level=SecurityLevel.LOW
+                    security_level=SecurityLevel.MEDIUM
                 )
             
-            self.logger.info(f"Loaded scenario: {scenario.id} from {file_path}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error loading scenario from {file_path}: {e}")
             return False
+        
+        if result.cached:
+            self.stats['validations_skipped'] += 1
+        else:
+            self.stats['scenarios_validated'] += 1
+        
+        # Register scenario
+        self.register_scenario(scenario, file_path)
+        
+        self.stats['scenarios_loaded'] += 1
+        
+        if self.audit_logger:
+            self.audit_logger.audit(
+                event_type=AuditEventType.SYSTEM_EVENT,
+                action="scenario_loaded",
+                details={
+                    'scenario_id': scenario.id,
+                    'file_path': file_path,
+                    'type': scenario.type.value,
+                    'difficulty': scenario.difficulty.value
+                },
+                security_level=SecurityLevel.LOW
+            )
+        
+        self.logger.info(f"Loaded scenario: {scenario.id} from {file_path}")
+        return True
     
     def register_scenario(self, scenario: Scenario, file_path: Optional[str] = None) -> None:
         """
@@ -6,12 +6,14 @@ AI-driven training recommendations for optimal operator development.
 """
 
 import logging
-import statistics
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 
+import numpy as np
+
+from . import analytics_kernel as kernel
 from .performance_metrics import (
     OperatorProfile, SessionPerformance, SkillLevel, SkillMetric
 )
@@ -35,6 +37,10 @@ class RecommendationType(Enum):
     CERTIFICATION_READY = "certification_ready"
 
 
+# Number of recent sessions used to fit a learning rate
+LEARNING_RATE_WINDOW = 10
+
+
 @dataclass
 class LearningCurve:
     """
@@ -77,26 +83,13 @@ class LearningCurve:
             self.learning_rate = 0.0
             return
         
-        # Simple linear regression on recent data
-        recent = self.data_points[-10:]  # Last 10 sessions
-        if len(recent) < 2:
-            recent = self.data_points
-        
-        # Convert to numeric x values (session index)
-        x_values = list(range(len(recent)))
-        y_values = [score for _, score in recent]
-        
-        n = len(recent)
-        x_mean = statistics.mean(x_values)
-        y_mean = statistics.mean(y_values)
-        
-        numerator = sum((x_values[i] - x_mean) * (y_values[i] - y_mean) for i in range(n))
-        denominator = sum((x_values[i] - x_mean) ** 2 for i in range(n))
-        
-        if denominator == 0:
-            self.learning_rate = 0.0
-        else:
-            self.learning_rate = numerator / denominator
+        # Linear regression on the last 10 sessions
+        values, lengths = kernel.pack_series([self.scores()], max_length=LEARNING_RATE_WINDOW)
+        self.learning_rate = float(kernel.slopes(values, lengths)[0])
+    
+    def scores(self) -> List[float]:
+        """Get scores in the order they were recorded."""
+        return [score for _, score in self.data_points]
     
     def predict_time_to_mastery(self, mastery_score: float = 0.9) -> Optional[int]:
         """
@@ -130,15 +123,9 @@ class LearningCurve:
         if len(self.data_points) < window_size:
             return False
         
-        recent = self.data_points[-window_size:]
-        scores = [score for _, score in recent]
-        
         # Check for low variance
-        if len(scores) < 2:
-            return False
-        
-        variance = statistics.variance(scores)
-        return variance < 0.01
+        values, lengths = kernel.pack_series([self.scores()], max_length=window_size)
+        return bool(kernel.plateau_mask(values, lengths, window_size)[0])
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -677,8 +664,9 @@ class TrainingEffectivenessTracker:
         
         # Check for plateau situations
         if operator_id in self.learning_curves:
+            curve_analysis = self.analyze_learning_curves([operator_id]).get(operator_id, {})
             for skill_name, curve in self.learning_curves[operator_id].items():
-                if curve.is_plateaued() and curve.current_score < 0.9:
+                if curve_analysis[skill_name]['plateaued'] and curve.current_score < 0.9:
                     rec = TrainingRecommendation(
                         id=f"rec_{operator_id}_plateau_{skill_name}_{int(datetime.now(timezone.utc).timestamp())}",
                         operator_id=operator_id,
@@ -735,6 +723,60 @@ class TrainingEffectivenessTracker:
         
         return recommendations
     
+    def analyze_learning_curves(self,
+                                operator_ids: Optional[List[str]] = None,
+                                mastery_score: float = 0.9,
+                                window_size: int = 5) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Analyze many learning curves in one batched pass.
+        
+        Computes learning rates, plateau flags and sessions to mastery for
+        every (operator, skill) curve at once, for team and organization
+        reports.
+        
+        Args:
+            operator_ids: Operators to analyze (None for all)
+            mastery_score: Score considered as mastery
+            window_size: Number of recent sessions checked for a plateau
+            
+        Returns:
+            Analysis keyed by operator and skill
+        """
+        if operator_ids is None:
+            operator_ids = list(self.learning_curves)
+        
+        keys = []
+        curves = []
+        for operator_id in operator_ids:
+            for skill_name, curve in self.learning_curves.get(operator_id, {}).items():
+                keys.append((operator_id, skill_name))
+                curves.append(curve)
+        
+        if not curves:
+            return {}
+        
+        series = [curve.scores() for curve in curves]
+        values, lengths = kernel.pack_series(series, max_length=LEARNING_RATE_WINDOW)
+        learning_rates = np.where(lengths >= 2, kernel.slopes(values, lengths), 0.0)
+        
+        values, lengths = kernel.pack_series(series, max_length=window_size)
+        plateaued = kernel.plateau_mask(values, lengths, window_size)
+        
+        current_scores = np.array([curve.current_score for curve in curves])
+        mastery = kernel.sessions_to_mastery(current_scores, learning_rates, mastery_score)
+        
+        analysis: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for i, (operator_id, skill_name) in enumerate(keys):
+            analysis.setdefault(operator_id, {})[skill_name] = {
+                'data_points': len(series[i]),
+                'current_score': float(current_scores[i]),
+                'learning_rate': float(learning_rates[i]),
+                'plateaued': bool(plateaued[i]),
+                'sessions_to_mastery': mastery[i]
+            }
+        
+        return analysis
+    
     def calculate_time_to_proficiency(self,
                                      operator_id: str,
                                      skill_name: str,
@@ -1,6 +1,9 @@
 """
 MITRE ATT&CK Framework Integration
 Provides access to ATT&CK tactics, techniques, and procedures for training scenarios
+
+Parsed data is kept in a compiled knowledge cache next to the STIX bundle, with
+a prebuilt tactic index and full-text search index (see attack_index).
 """
 
 import json
@@ -10,6 +13,14 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
+from .attack_index import (
+    ATTACKIndex,
+    is_active,
+    hash_file,
+    load_knowledge_cache,
+    save_knowledge_cache
+)
+
 
 class ATTACKFramework:
     """
@@ -21,18 +32,29 @@ class ATTACKFramework:
     Supports both local cached data and online fetching from MITRE CTI repository.
     """
     
-    def __init__(self, data_path: Optional[str] = None, use_online: bool = True):
+    def __init__(
+        self,
+        data_path: Optional[str] = None,
+        use_online: bool = True,
+        cache_path: Optional[str] = None,
+        use_cache: bool = True
+    ):
         """
         Initialize ATT&CK framework interface
         
         Args:
             data_path: Path to local ATT&CK data (JSON STIX format)
             use_online: Whether to fetch from online if local not found
+            cache_path: Path to the compiled knowledge cache (defaults to the
+                data path with an .index.pkl suffix)
+            use_cache: Whether to load and write the compiled knowledge cache
         """
         self.logger = logging.getLogger("attack_framework")
         self.data_path = data_path or "ats_mafia_framework/knowledge/attack/enterprise-attack.json"
         self.use_online = use_online
         self.base_url = "https://raw.githubusercontent.com/mitre/cti/master/enterprise-attack"
+        self.cache_path = cache_path or str(Path(self.data_path).with_suffix('.index.pkl'))
+        self.use_cache = use_cache
         
         # Storage for ATT&CK objects
         self.tactics: Dict[str, Dict] = {}
@@ -44,6 +66,11 @@ class ATTACKFramework:
         # Metadata
         self.version: Optional[str] = None
         self.last_updated: Optional[datetime] = None
+        self.loaded_from_cache = False
+        
+        # Lookup indexes over the parsed data
+        self.index = ATTACKIndex()
+        self._tree: Optional[Dict[str, List[Dict]]] = None
         
         # Load data
         self._load_attack_data()
@@ -53,17 +80,25 @@ class ATTACKFramework:
         try:
             # Try local file first
             if Path(self.data_path).exists():
-                self.logger.info(f"Loading ATT&CK data from {self.data_path}")
-                with open(self.data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                self._parse_attack_data(data)
+                if self._load_knowledge_cache():
+                    self.logger.info(
+                        f"Loaded {len(self.techniques)} techniques, "
+                        f"{len(self.tactics)} tactics from knowledge cache"
+                    )
+                else:
+                    self.logger.info(f"Loading ATT&CK data from {self.data_path}")
+                    with open(self.data_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    self._parse_attack_data(data)
+                    self.rebuild_index()
+                    self._save_knowledge_cache()
+                    self.logger.info(
+                        f"Loaded {len(self.techniques)} techniques, "
+                        f"{len(self.tactics)} tactics from local cache"
+                    )
                 self.last_updated = datetime.fromtimestamp(
                     Path(self.data_path).stat().st_mtime
                 )
-                self.logger.info(
-                    f"Loaded {len(self.techniques)} techniques, "
-                    f"{len(self.tactics)} tactics from local cache"
-                )
                 
             elif self.use_online:
                 # Fetch from MITRE CTI repository
@@ -73,12 +108,14 @@ class ATTACKFramework:
                 response.raise_for_status()
                 data = response.json()
                 self._parse_attack_data(data)
+                self.rebuild_index()
                 self.last_updated = datetime.now()
                 
                 # Cache locally for future use
                 Path(self.data_path).parent.mkdir(parents=True, exist_ok=True)
                 with open(self.data_path, 'w', encoding='utf-8') as f:
                     json.dump(data, f, indent=2)
+                self._save_knowledge_cache()
                 
                 self.logger.info(
                     f"Downloaded and cached ATT&CK data: "
@@ -93,6 +130,53 @@ class ATTACKFramework:
             self.logger.error(f"Error loading ATT&CK data: {e}")
             raise
     
+    def _load_knowledge_cache(self) -> bool:
+        """
+        Load parsed collections and indexes from the compiled knowledge cache
+        
+        Returns:
+            True if a cache matching the local bundle was loaded
+        """
+        if not self.use_cache:
+            return False
+        
+        payload = load_knowledge_cache(self.cache_path, self.data_path)
+        if payload is None:
+            return False
+        
+        self.version = payload['version']
+        self.tactics = payload['tactics']
+        self.techniques = payload['techniques']
+        self.subtechniques = payload['subtechniques']
+        self.groups = payload['groups']
+        self.software = payload['software']
+        self.index = ATTACKIndex.from_state(payload['index'])
+        self._tree = None
+        self.loaded_from_cache = True
+        return True
+    
+    def _save_knowledge_cache(self) -> None:
+        """Write parsed collections and indexes to the compiled knowledge cache"""
+        if not self.use_cache:
+            return
+        
+        payload = {
+            'version': self.version,
+            'tactics': self.tactics,
+            'techniques': self.techniques,
+            'subtechniques': self.subtechniques,
+            'groups': self.groups,
+            'software': self.software,
+            'index': self.index.to_state()
+        }
+        if save_knowledge_cache(self.cache_path, self.data_path, payload, hash_file(self.data_path)):
+            self.logger.info(f"Wrote ATT&CK knowledge cache to {self.cache_path}")
+    
+    def rebuild_index(self) -> None:
+        """Rebuild the tactic and search indexes after the collections change"""
+        self.index = ATTACKIndex.build(self.techniques, self.subtechniques)
+        self._tree = None
+    
     def _parse_attack_data(self, data: Dict) -> None:
         """
         Parse ATT&CK STIX data into usable format
@@ -236,41 +320,46 @@ class ATTACKFramework:
         Returns:
             List of technique data dictionaries
         """
-        results = []
-        tactic_lower = tactic_name.lower().replace('-', '_').replace(' ', '-')
-        
-        # Search both techniques and subtechniques
-        all_techniques = list(self.techniques.values()) + list(self.subtechniques.values())
-        
-        for technique in all_techniques:
-            # Skip deprecated/revoked
-            if technique.get('deprecated') or technique.get('revoked'):
-                continue
-            
-            # Check if tactic matches
-            technique_tactics = [
-                t.lower().replace('-', '_').replace(' ', '-') 
-                for t in technique.get('tactics', [])
-            ]
-            
-            if tactic_lower in technique_tactics:
-                results.append(technique)
-        
-        return results
+        return [
+            self.get_technique(technique_id)
+            for technique_id in self.index.techniques_for_tactic(tactic_name)
+        ]
     
-    def search_techniques(self, query: str, include_subtechniques: bool = True) -> List[Dict]:
+    def search_techniques(
+        self,
+        query: str,
+        include_subtechniques: bool = True,
+        tactic: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
         """
-        Search techniques by name or description
+        Search techniques by name, ID or description
+        
+        Results match every word of the query (as a whole word, word prefix
+        or inside a word) and are ranked by relevance, name matches first.
         
         Args:
             query: Search query string
             include_subtechniques: Include sub-techniques in results
+            tactic: Only return techniques of this tactic
+            limit: Maximum number of results
             
         Returns:
             List of matching technique data dictionaries
         """
+        ranked = self.index.search(
+            query,
+            include_subtechniques=include_subtechniques,
+            tactic=tactic,
+            limit=limit
+        )
+        if ranked is not None:
+            return [self.get_technique(technique_id) for technique_id in ranked]
+        
+        # Queries without words (e.g. punctuation only) fall back to a substring scan
         query_lower = query.lower()
         results = []
+        allowed = set(self.index.techniques_for_tactic(tactic)) if tactic else None
         
         # Determine which collections to search
         collections = [self.techniques]
@@ -283,12 +372,15 @@ class ATTACKFramework:
                 if technique.get('deprecated') or technique.get('revoked'):
                     continue
                 
+                if allowed is not None and technique['id'] not in allowed:
+                    continue
+                
                 # Search in name and description
                 if (query_lower in technique['name'].lower() or
                     query_lower in technique.get('description', '').lower()):
                     results.append(technique)
         
-        return results
+        return results[:limit] if limit is not None else results
     
     def get_technique_tree(self) -> Dict[str, List[Dict]]:
         """
@@ -297,13 +389,16 @@ class ATTACKFramework:
         Returns:
             Dictionary mapping tactic names to lists of techniques
         """
-        tree = {}
-        
-        for tactic_id, tactic in self.tactics.items():
-            tactic_name = tactic['shortname']
-            tree[tactic_name] = self.get_techniques_by_tactic(tactic_name)
+        if self._tree is None:
+            tree = {}
+            
+            for tactic_id, tactic in self.tactics.items():
+                tactic_name = tactic['shortname']
+                tree[tactic_name] = self.get_techniques_by_tactic(tactic_name)
+            
+            self._tree = tree
         
-        return tree
+        return dict(self._tree)
     
     def validate_technique_coverage(self, technique_ids: List[str]) -> Dict[str, Any]:
         """
@@ -318,7 +413,7 @@ class ATTACKFramework:
         # Filter to non-deprecated/revoked techniques
         active_techniques = {
             tid: t for tid, t in self.techniques.items()
-            if not t.get('deprecated') and not t.get('revoked')
+            if is_active(t)
         }
         
         total_techniques = len(active_techniques)
@@ -377,7 +472,9 @@ class ATTACKFramework:
             'total_groups': len(self.groups),
             'total_software': len(self.software),
             'tactics': list(self.tactics.keys()),
-            'data_source': 'local' if Path(self.data_path).exists() else 'online'
+            'data_source': 'local' if Path(self.data_path).exists() else 'online',
+            'loaded_from_cache': self.loaded_from_cache,
+            'index': self.index.get_statistics()
         }
     
     def export_technique_list(self, technique_ids: List[str]) -> List[Dict]:
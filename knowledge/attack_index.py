@@ -0,0 +1,362 @@
+"""
+ATT&CK Knowledge Index
+Prebuilt lookup structures over parsed ATT&CK techniques and a compiled
+knowledge cache.
+
+The index holds a tactic -> technique map and an inverted token index with
+field-weighted TF-IDF ranking, so tactic lookups and searches touch only
+matching techniques. Parsed collections and the index are stored together in
+a pickle cache keyed by the SHA-256 of the source STIX bundle, which loads in
+a fraction of the time needed to decode and parse the bundle itself.
+"""
+
+import os
+import re
+import math
+import pickle
+import hashlib
+import logging
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple, Union
+
+logger = logging.getLogger("attack_framework")
+
+# Bump when the cached layout changes
+CACHE_FORMAT = 1
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Weight of a name occurrence relative to a description occurrence
+NAME_WEIGHT = 3.0
+
+# Score factors for query tokens matching the start or middle of a term
+PREFIX_FACTOR = 0.6
+INFIX_FACTOR = 0.3
+
+# Shortest query token also matched inside terms
+MIN_INFIX_LENGTH = 3
+
+
+def normalize_tactic(tactic: str) -> str:
+    """Normalize a tactic name or shortname for lookups."""
+    return tactic.lower().replace('-', '_').replace(' ', '-')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def is_active(technique: Dict) -> bool:
+    """Check that a technique is neither deprecated nor revoked."""
+    return not technique.get('deprecated') and not technique.get('revoked')
+
+
+class ATTACKIndex:
+    """
+    Tactic and full-text index over active techniques and sub-techniques.
+
+    Built once from the parsed collections; the structures are plain
+    dictionaries and lists so they serialize compactly.
+    """
+
+    def __init__(self, query_cache_size: int = 1024):
+        """
+        Initialize an empty index.
+
+        Args:
+            query_cache_size: Number of search results cached per query
+        """
+        self.by_tactic: Dict[str, List[str]] = {}
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.terms: List[str] = []
+        self.document_count = 0
+
+        self.query_cache_size = query_cache_size
+        self._expansions: Dict[str, List[Tuple[str, float]]] = {}
+        self._queries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, *collections: Dict[str, Dict]) -> 'ATTACKIndex':
+        """
+        Index the active techniques of one or more collections.
+
+        Args:
+            *collections: Technique dictionaries keyed by ID, in lookup order
+
+        Returns:
+            Built index
+        """
+        index = cls()
+
+        for collection in collections:
+            for technique_id, technique in collection.items():
+                if not is_active(technique):
+                    continue
+
+                for tactic in technique.get('tactics', []):
+                    ids = index.by_tactic.setdefault(normalize_tactic(tactic), [])
+                    if technique_id not in ids:
+                        ids.append(technique_id)
+
+                frequencies: Dict[str, float] = {}
+                for token in tokenize(technique.get('name', '')) + tokenize(technique_id):
+                    frequencies[token] = frequencies.get(token, 0.0) + NAME_WEIGHT
+                for token in tokenize(technique.get('description', '')):
+                    frequencies[token] = frequencies.get(token, 0.0) + 1.0
+
+                # Dampened term frequency so long descriptions do not dominate
+                for token, frequency in frequencies.items():
+                    index.postings.setdefault(token, {})[technique_id] = 1.0 + math.log(frequency)
+
+                index.document_count += 1
+
+        index.terms = sorted(index.postings)
+        return index
+
+    def to_state(self) -> Dict[str, Any]:
+        """Get the index structures for serialization."""
+        return {
+            'by_tactic': self.by_tactic,
+            'postings': self.postings,
+            'terms': self.terms,
+            'document_count': self.document_count
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'ATTACKIndex':
+        """Restore an index from ``to_state`` output."""
+        index = cls()
+        index.by_tactic = state['by_tactic']
+        index.postings = state['postings']
+        index.terms = state['terms']
+        index.document_count = state['document_count']
+        return index
+
+    def techniques_for_tactic(self, tactic: str) -> List[str]:
+        """
+        Get the IDs of active techniques of a tactic.
+
+        Args:
+            tactic: Tactic name or shortname (case-insensitive)
+
+        Returns:
+            Technique IDs, techniques before sub-techniques
+        """
+        return self.by_tactic.get(normalize_tactic(tactic), [])
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Get the terms a query token matches, with score factors."""
+        expansions = self._expansions.get(token)
+        if expansions is not None:
+            return expansions
+
+        expansions = []
+        if token in self.postings:
+            expansions.append((token, 1.0))
+
+        # Terms starting with the token are contiguous in the sorted vocabulary
+        position = bisect_left(self.terms, token)
+        while position < len(self.terms) and self.terms[position].startswith(token):
+            if self.terms[position] != token:
+                expansions.append((self.terms[position], PREFIX_FACTOR))
+            position += 1
+
+        if len(token) >= MIN_INFIX_LENGTH:
+            expansions.extend(
+                (term, INFIX_FACTOR) for term in self.terms
+                if token in term and not term.startswith(token)
+            )
+
+        if len(self._expansions) >= self.query_cache_size:
+            self._expansions.clear()
+        self._expansions[token] = expansions
+        return expansions
+
+    def _rank(self, tokens: Iterable[str]) -> List[Tuple[str, float]]:
+        """Rank techniques matching every token."""
+        totals: Optional[Dict[str, float]] = None
+
+        for token in tokens:
+            scores: Dict[str, float] = {}
+            for term, factor in self._expand(token):
+                postings = self.postings[term]
+                idf = math.log(1.0 + self.document_count / len(postings))
+                for technique_id, weight in postings.items():
+                    score = factor * idf * weight
+                    if score > scores.get(technique_id, 0.0):
+                        scores[technique_id] = score
+
+            if totals is None:
+                totals = scores
+            else:
+                totals = {
+                    technique_id: total + scores[technique_id]
+                    for technique_id, total in totals.items()
+                    if technique_id in scores
+                }
+            if not totals:
+                return []
+
+        return sorted((totals or {}).items(), key=lambda item: (-item[1], item[0]))
+
+    def search(self,
+               query: str,
+               include_subtechniques: bool = True,
+               tactic: Optional[str] = None,
+               limit: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Rank techniques whose name, ID or description matches every query token.
+
+        Tokens match whole terms, term prefixes and (from three characters)
+        term infixes, in decreasing weight.
+
+        Args:
+            query: Search query
+            include_subtechniques: Include sub-techniques in results
+            tactic: Only techniques of this tactic
+            limit: Maximum results
+
+        Returns:
+            Technique IDs by descending relevance, or None if the query has
+            no searchable tokens
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return None
+
+        key = (tuple(tokens), include_subtechniques, normalize_tactic(tactic) if tactic else None)
+        with self._lock:
+            ranked = self._queries.get(key)
+            if ranked is not None:
+                self._queries.move_to_end(key)
+
+        if ranked is None:
+            allowed = set(self.techniques_for_tactic(tactic)) if tactic else None
+            ranked = [
+                technique_id for technique_id, _ in self._rank(tokens)
+                if (include_subtechniques or '.' not in technique_id)
+                and (allowed is None or technique_id in allowed)
+            ]
+            with self._lock:
+                self._queries[key] = ranked
+                while len(self._queries) > self.query_cache_size:
+                    self._queries.popitem(last=False)
+
+        return ranked[:limit] if limit is not None else list(ranked)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with index sizes
+        """
+        return {
+            'indexed_techniques': self.document_count,
+            'indexed_tactics': len(self.by_tactic),
+            'terms': len(self.terms),
+            'cached_queries': len(self._queries)
+        }
+
+
+def hash_file(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """Get the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_signature(source: Path) -> Dict[str, int]:
+    """Get the size and modification time of a source file."""
+    stat = source.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_knowledge_cache(cache_path: Union[str, Path], source: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Load the compiled knowledge cache of a STIX bundle.
+
+    The cache header is checked before the payload is read. An unchanged
+    size and modification time are trusted; otherwise the bundle is hashed
+    and compared with the hash the cache was built from.
+
+    Args:
+        cache_path: Path of the cache file
+        source: Path of the STIX bundle
+
+    Returns:
+        Cached payload, or None if the cache is missing, stale or unreadable
+    """
+    cache_path, source = Path(cache_path), Path(source)
+    if not cache_path.exists():
+        return None
+
+    try:
+        with open(cache_path, 'rb') as f:
+            header = pickle.load(f)
+            if not isinstance(header, dict) or header.get('format') != CACHE_FORMAT:
+                return None
+
+            signature = _source_signature(source)
+            if any(header.get(key) != value for key, value in signature.items()):
+                if header.get('sha256') != hash_file(source):
+                    return None
+
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable knowledge cache {cache_path}: {e}")
+        return None
+
+
+def save_knowledge_cache(cache_path: Union[str, Path],
+                         source: Union[str, Path],
+                         payload: Dict[str, Any],
+                         sha256: Optional[str] = None) -> bool:
+    """
+    Write the compiled knowledge cache of a STIX bundle atomically.
+
+    Args:
+        cache_path: Path of the cache file
+        source: Path of the STIX bundle the payload was parsed from
+        payload: Parsed collections and index state
+        sha256: Hash of the bundle, computed when not given
+
+    Returns:
+        True if the cache was written
+    """
+    cache_path, source = Path(cache_path), Path(source)
+    header = dict(_source_signature(source), format=CACHE_FORMAT, sha256=sha256 or hash_file(source))
+    temp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to write knowledge cache {cache_path}: {e}")
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+__all__ = [
+    'ATTACKIndex',
+    'normalize_tactic',
+    'tokenize',
+    'is_active',
+    'hash_file',
+    'load_knowledge_cache',
+    'save_knowledge_cache'
+]
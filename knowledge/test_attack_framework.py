@@ -4,6 +4,7 @@ Run this to validate the framework is working correctly
 """
 
 import sys
+import time
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -133,6 +134,29 @@ def test_statistics(attack):
     print(f"\nTactics: {', '.join(stats['tactics'][:5])}...")
 
 
+def test_knowledge_cache(attack):
+    """Test reloading from the compiled knowledge cache"""
+    print("\n" + "=" * 80)
+    print("TEST 7: Knowledge Cache")
+    print("=" * 80)
+    
+    start = time.perf_counter()
+    cached = ATTACKFramework(data_path=attack.data_path, use_online=False)
+    elapsed = time.perf_counter() - start
+    
+    print(f"Loaded from cache: {cached.loaded_from_cache} in {elapsed * 1000:.1f} ms")
+    print(f"Cache file: {cached.cache_path}")
+    assert cached.loaded_from_cache, "Knowledge cache was not used"
+    
+    # The cached index must rank exactly like the freshly built one
+    for query in ['phishing', 'powershell', 'injection']:
+        fresh = [t['id'] for t in attack.search_techniques(query, limit=10)]
+        reloaded = [t['id'] for t in cached.search_techniques(query, limit=10)]
+        status = "✅" if fresh == reloaded else "❌"
+        print(f"{status} Query '{query}': {len(reloaded)} top results match")
+        assert fresh == reloaded, f"Cached ranking differs for '{query}'"
+
+
 def main():
     """Run all tests"""
     print("\n" + "=" * 80)
@@ -163,6 +187,9 @@ def main():
     # Test 6: Statistics
     test_statistics(attack)
     
+    # Test 7: Knowledge cache
+    test_knowledge_cache(attack)
+    
     print("\n" + "=" * 80)
     print("✅ ALL TESTS COMPLETED SUCCESSFULLY")
     print("=" * 80)
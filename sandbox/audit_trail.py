@@ -0,0 +1,396 @@
+"""
+Audit Trail
+Bounded in-memory audit events backed by an append-only segment store.
+
+Recent events are kept in a ring buffer with per-user and per-container
+indexes, and report counters are updated as events arrive, so queries and
+security reports cost the same regardless of how much history exists. Every
+event is also appended to JSON-lines segment files that rotate at a size
+limit and are pruned beyond a retention count; on startup the retained
+segments are replayed to restore the buffers and counters. A segment
+directory belongs to one trail at a time, so trails cannot prune each
+other's segments.
+"""
+
+import os
+import json
+import threading
+import logging
+from collections import Counter, OrderedDict, deque
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Threat types listed as critical in security reports
+CRITICAL_THREATS = ('BREAKOUT_ATTEMPT', 'CRITICAL')
+
+# Number of most recent events searched for critical events in reports
+CRITICAL_WINDOW = 100
+
+
+class AuditTrail:
+    """
+    Ring-buffered audit events with an append-only on-disk segment store.
+
+    Events are dictionaries; ``user_id`` and ``container_id`` fields are
+    indexed and the ``threat`` field is counted. Memory use is bounded by
+    ``memory_size`` events plus ``index_size`` events for each of at most
+    ``max_index_keys`` users and containers.
+    """
+
+    SEGMENT_PREFIX = 'audit-'
+    SEGMENT_SUFFIX = '.jsonl'
+    LOCK_FILE = '.lock'
+
+    def __init__(self,
+                 directory: Optional[Union[str, Path]] = None,
+                 memory_size: int = 10000,
+                 index_size: int = 1000,
+                 max_index_keys: int = 10000,
+                 segment_bytes: int = 4 * 1024 * 1024,
+                 max_segments: Optional[int] = 16,
+                 fsync: bool = False):
+        """
+        Initialize the audit trail.
+
+        Args:
+            directory: Directory for segment files (None keeps events in memory only)
+            memory_size: Most recent events kept in memory
+            index_size: Most recent events kept per user and per container
+            max_index_keys: Users and containers indexed before the least
+                recently active are dropped
+            segment_bytes: Size at which the active segment is rotated
+            max_segments: Segments retained on disk (None keeps all)
+            fsync: Force every event to disk before returning
+
+        Raises:
+            RuntimeError: If another audit trail holds the directory
+        """
+        self.directory = Path(directory) if directory else None
+        self.memory_size = memory_size
+        self.index_size = index_size
+        self.max_index_keys = max_index_keys
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.fsync = fsync
+
+        self.events: deque = deque(maxlen=memory_size)
+        self.by_user: OrderedDict = OrderedDict()
+        self.by_container: OrderedDict = OrderedDict()
+        self.critical: deque = deque(maxlen=CRITICAL_WINDOW)
+
+        # Report counters over retained history, with per-segment counts so
+        # pruned segments can be subtracted
+        self.sequence = 0
+        self.total_events = 0
+        self.threat_counts: Counter = Counter()
+        self.segment_counts: 'OrderedDict[Optional[str], Counter]' = OrderedDict()
+
+        self.segments: List[Path] = []
+        self._file = None
+        self._file_size = 0
+        self._lock_file = None
+        self.lock = threading.RLock()
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._lock_directory()
+            self._replay()
+
+    def __len__(self) -> int:
+        return self.total_events
+
+    # Segment store
+
+    def _lock_directory(self) -> None:
+        """Take an exclusive lock on the segment directory."""
+        self._lock_file = open(self.directory / self.LOCK_FILE, 'a')
+        if fcntl is None:
+            return
+
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            raise RuntimeError(f"Audit directory is in use by another audit trail: {self.directory}")
+
+    def _segment_path(self, number: int) -> Path:
+        """Get the path of a segment by number."""
+        return self.directory / f"{self.SEGMENT_PREFIX}{number:06d}{self.SEGMENT_SUFFIX}"
+
+    def _segment_number(self, path: Path) -> int:
+        """Get the number of a segment path."""
+        return int(path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)])
+
+    def _list_segments(self) -> List[Path]:
+        """List segment files in order."""
+        paths = []
+        for path in self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"):
+            try:
+                self._segment_number(path)
+            except ValueError:
+                continue
+            paths.append(path)
+        return sorted(paths, key=self._segment_number)
+
+    @staticmethod
+    def _read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+        """Read events from a segment, skipping unreadable lines."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping unreadable audit entry in {path}")
+        except OSError as e:
+            logger.error(f"Failed to read audit segment {path}: {e}")
+
+    def _replay(self) -> None:
+        """Restore buffers and counters from the retained segments."""
+        self.segments = self._list_segments()
+        self._prune()
+
+        for path in self.segments:
+            for event in self._read_segment(path):
+                self._record(event, path.name)
+
+        if self.segments:
+            logger.info(f"Restored {self.total_events} audit events from {len(self.segments)} segments")
+
+    def _open_segment(self) -> None:
+        """Open the active segment, rotating when it is full."""
+        if self._file is not None and self._file_size < self.segment_bytes:
+            return
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        if self.segments and self.segments[-1].exists():
+            size = self.segments[-1].stat().st_size
+            if size < self.segment_bytes:
+                self._file = open(self.segments[-1], 'a', encoding='utf-8')
+                self._file_size = size
+                return
+
+        number = self._segment_number(self.segments[-1]) + 1 if self.segments else 1
+        path = self._segment_path(number)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._file_size = 0
+        self.segments.append(path)
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete segments beyond the retention count and subtract their counts."""
+        if self.max_segments is None:
+            return
+
+        while len(self.segments) > self.max_segments:
+            path = self.segments.pop(0)
+            counts = self.segment_counts.pop(path.name, None)
+            if counts:
+                self.total_events -= sum(counts.values())
+                self.threat_counts.subtract(counts)
+                for threat in counts:
+                    if self.threat_counts[threat] <= 0:
+                        del self.threat_counts[threat]
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.error(f"Failed to delete audit segment {path}: {e}")
+
+    def _write(self, event: Dict[str, Any]) -> Optional[str]:
+        """Append an event to the active segment and return its name."""
+        try:
+            self._open_segment()
+            line = json.dumps(event, default=str) + '\n'
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._file_size += len(line.encode('utf-8'))
+            return self.segments[-1].name
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to write audit log: {e}")
+            return None
+
+    # In-memory tier
+
+    def _index(self, index: OrderedDict, key: Any, event: Dict[str, Any]) -> None:
+        """Add an event to a bounded per-key index."""
+        events = index.get(key)
+        if events is None:
+            events = index[key] = deque(maxlen=self.index_size)
+            while len(index) > self.max_index_keys:
+                index.popitem(last=False)
+        else:
+            index.move_to_end(key)
+        events.append(event)
+
+    def _record(self, event: Dict[str, Any], segment: Optional[str]) -> None:
+        """Add an event to the buffers, indexes and counters."""
+        self.events.append(event)
+
+        if event.get('user_id') is not None:
+            self._index(self.by_user, event['user_id'], event)
+        if event.get('container_id') is not None:
+            self._index(self.by_container, event['container_id'], event)
+
+        threat = event.get('threat', 'NONE')
+        self.sequence += 1
+        self.total_events += 1
+        self.threat_counts[threat] += 1
+        self.segment_counts.setdefault(segment, Counter())[threat] += 1
+
+        if threat in CRITICAL_THREATS:
+            self.critical.append((self.sequence, event))
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """
+        Record an audit event.
+
+        Args:
+            event: Event details
+        """
+        with self.lock:
+            segment = self._write(event) if self.directory else None
+            self._record(event, segment)
+
+    # Queries
+
+    def recent(self,
+               limit: int = 100,
+               user_id: Optional[str] = None,
+               container_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent events, oldest first.
+
+        Args:
+            limit: Maximum events to return
+            user_id: Only events of this user
+            container_id: Only events of this container
+
+        Returns:
+            List of events
+        """
+        with self.lock:
+            if user_id is not None:
+                source = self.by_user.get(user_id, ())
+            elif container_id is not None:
+                source = self.by_container.get(container_id, ())
+            else:
+                source = self.events
+
+            events = []
+            for event in reversed(source):
+                if container_id is not None and event.get('container_id') != container_id:
+                    continue
+                events.append(event)
+                if len(events) >= limit:
+                    break
+
+            events.reverse()
+            return events
+
+    def recent_critical(self) -> List[Dict[str, Any]]:
+        """Get critical events among the most recent ``CRITICAL_WINDOW`` events."""
+        with self.lock:
+            first = self.sequence - CRITICAL_WINDOW
+            return [event for number, event in self.critical if number > first]
+
+    def get_counters(self) -> Dict[str, Any]:
+        """
+        Get report counters.
+
+        Returns:
+            Dictionary with the total event count and counts by threat type
+        """
+        with self.lock:
+            return {
+                'total_events': self.total_events,
+                'threats_by_type': dict(self.threat_counts)
+            }
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate all retained events, oldest first.
+
+        Events are streamed from the segment files when a directory is
+        configured, otherwise from the in-memory buffer.
+        """
+        if not self.directory:
+            with self.lock:
+                events = list(self.events)
+            yield from events
+            return
+
+        with self.lock:
+            if self._file is not None:
+                self._file.flush()
+            segments = list(self.segments)
+
+        for path in segments:
+            yield from self._read_segment(path)
+
+    def export(self, filepath: Union[str, Path]) -> int:
+        """
+        Export retained events to a JSON array file without loading them all.
+
+        Args:
+            filepath: Path to export file
+
+        Returns:
+            Number of events exported
+        """
+        count = 0
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for event in self.iter_events():
+                f.write(',\n' if count else '\n')
+                f.write(json.dumps(event, indent=2, default=str))
+                count += 1
+            f.write('\n]' if count else ']')
+        return count
+
+    def close(self) -> None:
+        """Close the active segment and release the directory."""
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get audit trail statistics.
+
+        Returns:
+            Dictionary with buffer and segment statistics
+        """
+        with self.lock:
+            return {
+                'total_events': self.total_events,
+                'buffered_events': len(self.events),
+                'memory_size': self.memory_size,
+                'indexed_users': len(self.by_user),
+                'indexed_containers': len(self.by_container),
+                'persistent': self.directory is not None,
+                'segments': len(self.segments),
+                'max_segments': self.max_segments
+            }
+
+
+__all__ = ['AuditTrail', 'CRITICAL_THREATS', 'CRITICAL_WINDOW']
@@ -0,0 +1,314 @@
+"""
+Compiled Command Policy
+Single-pass matching of sandbox commands against categorized policy rules.
+
+Case-insensitive literal rules are matched with an Aho-Corasick automaton over
+the lowercased command, which reports every occurrence, overlapping ones
+included, in one walk. All other rules are compiled into one regex
+alternation with a marker group per rule, wrapped in a lookahead so every
+position where any rule matches is visited once; rules that match at the same
+position as an earlier alternative are picked up by continuing the
+alternation from the next rule. A scan therefore reports every matching rule
+with its category. Scan results are cached per command string.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class PolicyHit:
+    """A policy rule that matched a command."""
+    category: str
+    pattern: str
+    position: int
+
+
+class PolicyScan:
+    """Result of scanning one command against a policy."""
+
+    __slots__ = ('command', 'hits', '_by_category')
+
+    def __init__(self, command: str, hits: Tuple[PolicyHit, ...]):
+        """
+        Initialize the scan result.
+
+        Args:
+            command: Scanned command
+            hits: Matching rules in rule order
+        """
+        self.command = command
+        self.hits = hits
+        self._by_category: Dict[str, List[PolicyHit]] = {}
+        for hit in hits:
+            self._by_category.setdefault(hit.category, []).append(hit)
+
+    def __bool__(self) -> bool:
+        return bool(self.hits)
+
+    def has(self, category: str) -> bool:
+        """Check whether any rule of a category matched."""
+        return category in self._by_category
+
+    def first(self, category: str) -> Optional[PolicyHit]:
+        """Get the first matching rule of a category in rule order."""
+        hits = self._by_category.get(category)
+        return hits[0] if hits else None
+
+    def patterns(self, category: str) -> List[str]:
+        """Get the matching patterns of a category in rule order."""
+        return [hit.pattern for hit in self._by_category.get(category, [])]
+
+    def categories(self) -> List[str]:
+        """Get the categories with at least one match."""
+        return list(self._by_category)
+
+
+class LiteralMatcher:
+    """Aho-Corasick automaton over a set of literal strings."""
+
+    def __init__(self, literals: Sequence[Tuple[int, str]]):
+        """
+        Build the automaton.
+
+        Failure links are folded into the transition table, so matching
+        takes a single dictionary lookup per character.
+
+        Args:
+            literals: (rule index, literal) pairs
+        """
+        goto: List[Dict[str, int]] = [{}]
+        fail: List[int] = [0]
+        self.output: List[List[Tuple[int, int]]] = [[]]
+
+        for index, literal in literals:
+            if not literal:
+                continue
+            state = 0
+            for char in literal:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append((index, len(literal)))
+
+        # Breadth-first: each state inherits the transitions and outputs of
+        # its failure state, which is shallower and therefore complete
+        self.transitions: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = list(goto[0].values())
+        for state in queue:
+            transitions = dict(self.transitions[fail[state]])
+            transitions.update(goto[state])
+            self.transitions[state] = transitions
+
+            for char, next_state in goto[state].items():
+                fail[next_state] = self.transitions[fail[state]].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[fail[next_state]]
+                queue.append(next_state)
+
+    def find(self, text: str, found: Dict[int, int]) -> None:
+        """
+        Record the first position of every literal occurring in ``text``.
+
+        Args:
+            text: Text to search
+            found: Mapping of rule index to match position, updated in place
+        """
+        transitions, output = self.transitions, self.output
+        state = 0
+
+        for position, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if output[state]:
+                for index, length in output[state]:
+                    if index not in found:
+                        found[index] = position - length + 1
+
+
+class CommandPolicy:
+    """
+    Categorized command rules compiled into a single matcher.
+
+    Categories are registered with ``add_category`` and compiled lazily on
+    the first scan; registering more rules invalidates the compiled matcher
+    and the result cache.
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize an empty policy.
+
+        Args:
+            cache_size: Number of scanned commands whose results are cached
+        """
+        self.cache_size = cache_size
+        self.rules: List[Tuple[str, str, Optional[str], bool]] = []
+
+        self._compiled = False
+        self._literals: Optional[LiteralMatcher] = None
+        self._combined: Optional[re.Pattern] = None
+        self._continuations: Dict[int, re.Pattern] = {}
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Statistics
+        self.scans = 0
+        self.cache_hits = 0
+
+    def add_category(self,
+                     category: str,
+                     patterns: Sequence[str],
+                     ignore_case: bool = False,
+                     literal: bool = False) -> 'CommandPolicy':
+        """
+        Register the rules of a category.
+
+        Args:
+            category: Category reported for matches of these rules
+            patterns: Regular expressions (or literal substrings)
+            ignore_case: Match the rules case-insensitively
+            literal: Treat the patterns as literal substrings
+
+        Returns:
+            This policy
+        """
+        with self._lock:
+            for pattern in patterns:
+                if literal and ignore_case:
+                    # Matched by the automaton against the lowercased command
+                    expression = None
+                elif literal:
+                    expression = re.escape(pattern)
+                else:
+                    re.compile(pattern)  # Fail early on invalid rules
+                    expression = f'(?i:{pattern})' if ignore_case else pattern
+
+                self.rules.append((category, pattern, expression, ignore_case))
+
+            self._compiled = False
+            self._cache.clear()
+
+        return self
+
+    def _alternation(self, start: int) -> Optional[re.Pattern]:
+        """Compile regex rules ``start..`` into one lookahead alternation."""
+        # Markers go after each rule so the engine can still skip
+        # alternatives on their leading literal
+        alternatives = [
+            f'(?:{expression})(?P<r{index}>)'
+            for index, (_, _, expression, _) in enumerate(self.rules)
+            if index >= start and expression is not None
+        ]
+        if not alternatives:
+            return None
+        return re.compile(f'(?=(?:{"|".join(alternatives)}))')
+
+    def _continuation(self, start: int) -> Optional[re.Pattern]:
+        """Get the alternation of regex rules ``start..``."""
+        if start not in self._continuations:
+            self._continuations[start] = self._alternation(start)
+        return self._continuations[start]
+
+    def compile(self) -> None:
+        """Compile the literal automata and the combined regex."""
+        with self._lock:
+            if self._compiled:
+                return
+
+            literals = [
+                (index, pattern.lower())
+                for index, (_, pattern, expression, _) in enumerate(self.rules)
+                if expression is None
+            ]
+            self._literals = LiteralMatcher(literals) if literals else None
+
+            self._continuations = {}
+            self._combined = self._continuation(0)
+            self._compiled = True
+
+    def _scan(self, command: str) -> PolicyScan:
+        """Scan a command without the cache."""
+        if not self._compiled:
+            self.compile()
+        found: Dict[int, int] = {}
+
+        if self._literals is not None:
+            self._literals.find(command.lower(), found)
+
+        if self._combined is not None:
+            for match in self._combined.finditer(command):
+                position = match.start()
+                index = int(match.lastgroup[1:])
+
+                # Continue the alternation after the winning rule to find
+                # further rules matching at the same position
+                while True:
+                    found.setdefault(index, position)
+                    continuation = self._continuation(index + 1)
+                    match = continuation.match(command, position) if continuation else None
+                    if match is None:
+                        break
+                    index = int(match.lastgroup[1:])
+
+        hits = tuple(
+            PolicyHit(self.rules[index][0], self.rules[index][1], found[index])
+            for index in sorted(found)
+        )
+        return PolicyScan(command, hits)
+
+    def scan(self, command: str) -> PolicyScan:
+        """
+        Scan a command against every rule in one pass.
+
+        Args:
+            command: Command to scan
+
+        Returns:
+            Scan result with every matching rule and its category
+        """
+        with self._lock:
+            self.scans += 1
+            cached = self._cache.get(command)
+            if cached is not None:
+                self.cache_hits += 1
+                self._cache.move_to_end(command)
+                return cached
+
+            result = self._scan(command)
+
+            self._cache[command] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+            return result
+
+    def clear_cache(self) -> None:
+        """Clear cached scan results."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Get policy statistics.
+
+        Returns:
+            Dictionary with rule and cache statistics
+        """
+        with self._lock:
+            return {
+                'rules': len(self.rules),
+                'categories': len({rule[0] for rule in self.rules}),
+                'scans': self.scans,
+                'cache_hits': self.cache_hits,
+                'cached_commands': len(self._cache)
+            }
+
+
+__all__ = ['PolicyHit', 'PolicyScan', 'LiteralMatcher', 'CommandPolicy']
@@ -5,10 +5,12 @@ Routes agent tasks to specialized containers based on task requirements.
 
 import docker
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Callable, Iterable
 from enum import Enum
 import re
 
+from .metrics_collector import MetricsCollector
+
 logger = logging.getLogger(__name__)
 
 
@@ -106,8 +108,14 @@ class ContainerManager:
         ],
     }
     
-    def __init__(self):
-        """Initialize container manager."""
+    def __init__(self, metrics_interval: float = 10.0, metrics_history: int = 60):
+        """
+        Initialize container manager.
+        
+        Args:
+            metrics_interval: Seconds between background metrics samples
+            metrics_history: Metrics samples kept per container
+        """
         try:
             self.docker_client = docker.from_env()
             self.docker_client.ping()
@@ -115,6 +123,14 @@ class ContainerManager:
         except Exception as e:
             logger.error(f"Failed to initialize ContainerManager: {e}")
             raise RuntimeError(f"Docker not available: {e}")
+        
+        # Specialized containers are sampled unless a name set is given
+        self.metrics = MetricsCollector(
+            self.docker_client,
+            filters={'label': 'ats.mafia.category'},
+            interval=metrics_interval,
+            history_size=metrics_history
+        )
     
     def route_task(
         self,
@@ -349,8 +365,66 @@ class ContainerManager:
         
         return result
     
+    def start_metrics_collection(self, names: Optional[Callable[[], Iterable[str]]] = None) -> None:
+        """
+        Start sampling container metrics in the background.
+        
+        Args:
+            names: Callable returning the container names to sample instead of
+                the labelled specialized containers
+        """
+        if names is not None:
+            self.metrics.filters = None
+            self.metrics.names = names
+        self.metrics.start()
+    
+    def stop_metrics_collection(self) -> None:
+        """Stop background metrics sampling."""
+        self.metrics.stop()
+    
+    def get_container_metrics(self, container_name: str) -> Optional[Dict]:
+        """Get the latest sampled metrics of a container, if fresh."""
+        return self.metrics.latest(container_name)
+    
+    def get_container_history(
+        self,
+        container_name: str,
+        metric: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Optional[List]:
+        """
+        Get recent sampled metrics of a container, oldest first.
+        
+        Args:
+            container_name: Name of container
+            metric: Return only this metric's values (e.g. 'cpu_percent')
+            limit: Maximum samples to return
+        
+        Returns:
+            Metric values or sample dicts, or None if the container is not sampled
+        """
+        return self.metrics.history(container_name, metric=metric, limit=limit)
+    
     def get_container_health(self, container_name: str) -> Dict:
         """Get health and resource usage of container."""
+        # Serve the latest background sample when it is fresh
+        cached = self.metrics.latest(container_name)
+        if cached is not None and not cached['available']:
+            return {
+                'healthy': False,
+                'status': cached['status'],
+                'message': cached['message']
+            }
+        if cached is not None:
+            return {
+                'healthy': cached['status'] == 'running',
+                'status': cached['status'],
+                'cpu_percent': cached['cpu_percent'],
+                'memory_usage_mb': cached['memory_usage_mb'],
+                'memory_limit_mb': cached['memory_limit_mb'],
+                'memory_percent': cached['memory_percent']
+            }
+        
         try:
             container = self.docker_client.containers.get(container_name)
             
@@ -457,6 +531,8 @@ class ContainerManager:
     
     def close(self):
         """Close Docker client connection."""
+        self.metrics.stop()
+        
         if self.docker_client:
             self.docker_client.close()
             logger.info("ContainerManager connection closed")
@@ -5,8 +5,13 @@ Secure connection and command execution in Kali sandbox container.
 
 import docker
 import time
+import codecs
+import asyncio
+import threading
 import logging
-from typing import Dict, List, Optional, Tuple
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any, AsyncIterator
 from datetime import datetime
 import json
 
@@ -35,23 +40,148 @@ class CommandExecutionError(KaliConnectorError):
     pass
 
 
+# Container status reported by Docker container events
+EVENT_STATUS = {
+    'start': 'running',
+    'restart': 'running',
+    'unpause': 'running',
+    'pause': 'paused',
+    'die': 'exited',
+    'stop': 'exited',
+    'kill': 'exited',
+    'destroy': 'removed',
+}
+
+# Kills every process in the session of each process whose command line
+# matches $1, i.e. a streamed command and everything it spawned
+KILL_EXEC_SCRIPT = (
+    'for pid in $(pgrep -f "$1"); do '
+    'pkill -KILL -s "$pid"; kill -KILL "$pid"; '
+    'done 2>/dev/null; true'
+)
+
+
+class _OutputBuffer:
+    """
+    Hand-off of exec output chunks from a worker thread to an event loop.
+    
+    The worker blocks while more than ``max_bytes`` are waiting to be
+    consumed, so a slow reader throttles the exec stream instead of growing
+    memory.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, max_bytes: int):
+        """
+        Initialize the buffer.
+        
+        Args:
+            loop: Event loop of the consumer
+            queue: Queue the consumer reads (kind, data) chunks from
+            max_bytes: Maximum bytes queued but not yet consumed
+        """
+        self.loop = loop
+        self.queue = queue
+        self.max_bytes = max_bytes
+        self.buffered = 0
+        self.cancelled = threading.Event()
+        self.stream = None
+        self.marker: Optional[str] = None
+        self.killed = False
+        self.condition = threading.Condition()
+    
+    def put(self, kind: str, data: bytes) -> bool:
+        """Queue a chunk, waiting for room; returns False once cancelled."""
+        with self.condition:
+            # A single oversized chunk is let through once the buffer is empty
+            while (self.buffered and self.buffered + len(data) > self.max_bytes
+                   and not self.cancelled.is_set()):
+                self.condition.wait(0.1)
+            if self.cancelled.is_set():
+                return False
+            self.buffered += len(data)
+        
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, (kind, data))
+        return True
+    
+    def release(self, size: int) -> None:
+        """Mark bytes as consumed."""
+        with self.condition:
+            self.buffered -= size
+            self.condition.notify_all()
+    
+    def claim_kill(self) -> Optional[str]:
+        """Return the exec marker to kill, once, after the stream was cancelled."""
+        with self.condition:
+            if not self.cancelled.is_set() or self.marker is None or self.killed:
+                return None
+            self.killed = True
+            return self.marker
+    
+    def cancel(self) -> None:
+        """Stop the worker and close the exec stream."""
+        self.cancelled.set()
+        with self.condition:
+            self.condition.notify_all()
+        
+        close = getattr(self.stream, 'close', None)
+        if close:
+            try:
+                close()
+            except Exception:
+                pass
+
+
 class KaliConnector:
     """
     Secure connector to Kali Linux sandbox container.
     Handles command execution, output capture, and resource management.
+    
+    At most ``max_concurrent_execs`` commands run in the container at once,
+    shared between the synchronous and async APIs. Container status is
+    cached for ``status_ttl`` seconds and refreshed by Docker events.
     """
     
-    def __init__(self, container_name: str = 'ats_kali_sandbox'):
+    def __init__(
+        self,
+        container_name: str = 'ats_kali_sandbox',
+        max_concurrent_execs: int = 4,
+        status_ttl: float = 5.0,
+        max_buffer_bytes: int = 1024 * 1024,
+        max_output_bytes: int = 10 * 1024 * 1024,
+        watch_events: bool = True
+    ):
         """
         Initialize Kali connector.
         
         Args:
             container_name: Name of the Kali Docker container
+            max_concurrent_execs: Maximum commands executing concurrently
+            status_ttl: Seconds a cached container status is trusted
+            max_buffer_bytes: Maximum streamed output waiting to be consumed
+            max_output_bytes: Maximum output kept per stream by execute_command_async
+            watch_events: Refresh the cached status from Docker events
         """
         self.container_name = container_name
         self.docker_client = None
         self.container = None
+        self.max_concurrent_execs = max_concurrent_execs
+        self.status_ttl = status_ttl
+        self.max_buffer_bytes = max_buffer_bytes
+        self.max_output_bytes = max_output_bytes
+        
+        self._exec_slots = threading.BoundedSemaphore(max_concurrent_execs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_execs,
+            thread_name_prefix='kali-exec'
+        )
+        self._status_lock = threading.Lock()
+        self._status: Optional[str] = None
+        self._status_checked = 0.0
+        self._events = None
         self._connect()
+        
+        if watch_events:
+            threading.Thread(target=self._watch_events, name='kali-events', daemon=True).start()
     
     def _connect(self):
         """Establish connection to Docker and Kali container."""
@@ -76,6 +206,61 @@ class KaliConnector:
             logger.error(f"Failed to get container: {e}")
             raise KaliConnectorError(f"Container access failed: {e}")
     
+    def _watch_events(self) -> None:
+        """Update the cached container status from Docker events."""
+        try:
+            self._events = self.docker_client.events(
+                decode=True,
+                filters={'type': 'container', 'container': self.container_name}
+            )
+            for event in self._events:
+                status = EVENT_STATUS.get(event.get('Action') or event.get('status'))
+                if status:
+                    self._set_status(status)
+        except Exception as e:
+            logger.debug(f"Container event watch stopped: {e}")
+    
+    def _set_status(self, status: str) -> None:
+        """Cache the container status."""
+        with self._status_lock:
+            self._status = status
+            self._status_checked = time.time()
+    
+    def get_cached_status(self, refresh: bool = False) -> str:
+        """
+        Get the container status, reloading it only when the cache is stale.
+        
+        Args:
+            refresh: Force a reload from Docker
+            
+        Returns:
+            Container status (e.g. 'running')
+        """
+        with self._status_lock:
+            fresh = (self._status is not None
+                     and time.time() - self._status_checked < self.status_ttl)
+            if fresh and not refresh:
+                return self._status
+        
+        self.container.reload()
+        self._set_status(self.container.status)
+        return self.container.status
+    
+    def _ensure_running(self) -> None:
+        """Raise if the container is not running."""
+        status = self.get_cached_status()
+        if status != 'running':
+            raise KaliConnectorError(
+                f"Container is not running (status: {status})"
+            )
+    
+    def _validate(self, command: str) -> None:
+        """Raise if a command fails validation."""
+        is_valid, reason = validate_command(command)
+        if not is_valid:
+            logger.warning(f"Command validation failed: {reason}")
+            raise CommandValidationError(f"Command rejected: {reason}")
+    
     def execute_command(
         self,
         command: str,
@@ -103,17 +288,10 @@ class KaliConnector:
                 - timestamp: str
         """
         # Validate command
-        is_valid, reason = validate_command(command)
-        if not is_valid:
-            logger.warning(f"Command validation failed: {reason}")
-            raise CommandValidationError(f"Command rejected: {reason}")
+        self._validate(command)
         
         # Check container status
-        self.container.reload()
-        if self.container.status != 'running':
-            raise KaliConnectorError(
-                f"Container is not running (status: {self.container.status})"
-            )
+        self._ensure_running()
         
         logger.info(f"Executing command: {command}")
         start_time = time.time()
@@ -123,18 +301,19 @@ class KaliConnector:
             env = environment or {}
             
             # Execute command
-            exec_result = self.container.exec_run(
-                cmd=['bash', '-c', command],
-                workdir=working_dir,
-                environment=env,
-                demux=True,
-                stdout=True,
-                stderr=True,
-                stdin=False,
-                tty=False,
-                privileged=False,
-                user='root'
-            )
+            with self._exec_slots:
+                exec_result = self.container.exec_run(
+                    cmd=['bash', '-c', command],
+                    workdir=working_dir,
+                    environment=env,
+                    demux=True,
+                    stdout=True,
+                    stderr=True,
+                    stdin=False,
+                    tty=False,
+                    privileged=False,
+                    user='root'
+                )
             
             execution_time = time.time() - start_time
             
@@ -168,6 +347,243 @@ class KaliConnector:
             logger.error(f"Unexpected error during execution: {e}")
             raise CommandExecutionError(f"Execution failed: {e}")
     
+    def _run_exec(
+        self,
+        command: str,
+        working_dir: str,
+        environment: Optional[Dict[str, str]],
+        buffer: _OutputBuffer
+    ) -> Optional[int]:
+        """
+        Run a command and feed its output to a buffer (worker thread).
+        
+        Returns:
+            Exit code, or None if the stream was cancelled
+        """
+        with self._exec_slots:
+            if buffer.cancelled.is_set():
+                return None
+            self._ensure_running()
+            
+            try:
+                api = self.docker_client.api
+                marker = f'kali-exec-{uuid.uuid4().hex[:16]}'
+                exec_id = api.exec_create(
+                    self.container.id,
+                    # The command runs in its own session and carries the
+                    # marker as $0 so a cancelled exec can be found and killed
+                    cmd=['setsid', '-w', 'bash', '-c', command, marker],
+                    stdout=True,
+                    stderr=True,
+                    stdin=False,
+                    tty=False,
+                    privileged=False,
+                    user='root',
+                    environment=environment or {},
+                    workdir=working_dir
+                )['Id']
+                
+                buffer.marker = marker
+                buffer.stream = api.exec_start(exec_id, stream=True, demux=True)
+                if buffer.cancelled.is_set():
+                    return None
+                for stdout_chunk, stderr_chunk in buffer.stream:
+                    if stdout_chunk and not buffer.put('stdout', stdout_chunk):
+                        return None
+                    if stderr_chunk and not buffer.put('stderr', stderr_chunk):
+                        return None
+                
+                if buffer.cancelled.is_set():
+                    return None
+                return api.exec_inspect(exec_id).get('ExitCode')
+                
+            except docker.errors.APIError as e:
+                if buffer.cancelled.is_set():
+                    return None
+                logger.error(f"Docker API error during execution: {e}")
+                raise CommandExecutionError(f"Docker API error: {e}")
+            except Exception as e:
+                if buffer.cancelled.is_set():
+                    return None
+                logger.error(f"Unexpected error during execution: {e}")
+                raise CommandExecutionError(f"Execution failed: {e}")
+            finally:
+                self._kill_exec(buffer)
+    
+    def _kill_exec(self, buffer: _OutputBuffer) -> None:
+        """
+        Kill a cancelled exec and its child processes inside the container.
+        
+        Closing the exec stream only stops reading; the command keeps
+        running until it is killed. Safe to call from the worker and the
+        consumer: only the first call after cancellation kills.
+        
+        Args:
+            buffer: Output buffer of the exec
+        """
+        marker = buffer.claim_kill()
+        if marker is None:
+            return
+        
+        # "[k]ali-exec-..." matches the marker but not this script's arguments
+        pattern = f'[{marker[0]}]{marker[1:]}'
+        try:
+            self.container.exec_run(
+                cmd=['sh', '-c', KILL_EXEC_SCRIPT, 'sh', pattern],
+                stdin=False,
+                tty=False,
+                privileged=False,
+                user='root'
+            )
+            logger.info(f"Killed cancelled command {marker}")
+        except Exception as e:
+            logger.warning(f"Failed to kill cancelled command {marker}: {e}")
+    
+    async def stream_command(
+        self,
+        command: str,
+        timeout: int = 300,
+        working_dir: str = '/root/workspace',
+        environment: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a command and stream its output as it is produced.
+        
+        Output waiting to be consumed is capped at ``max_buffer_bytes``; the
+        exec stream is paused while the consumer is behind. Closing the
+        iterator early or hitting the timeout kills the command and its
+        child processes in the container.
+        
+        Args:
+            command: Command to execute
+            timeout: Maximum execution time in seconds (default: 300)
+            working_dir: Working directory for command execution
+            environment: Additional environment variables
+            
+        Yields:
+            Dicts with ``type`` 'stdout' or 'stderr' and decoded ``data``,
+            then a final 'exit' dict with exit_code, success, timed_out and
+            execution_time
+        """
+        self._validate(command)
+        logger.info(f"Streaming command: {command}")
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        buffer = _OutputBuffer(loop, queue, self.max_buffer_bytes)
+        decoders = {
+            'stdout': codecs.getincrementaldecoder('utf-8')(errors='replace'),
+            'stderr': codecs.getincrementaldecoder('utf-8')(errors='replace')
+        }
+        
+        start_time = time.time()
+        deadline = start_time + timeout
+        future = loop.run_in_executor(
+            self._executor, self._run_exec, command, working_dir, environment, buffer
+        )
+        future.add_done_callback(lambda _: queue.put_nowait(None))
+        
+        timed_out = False
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(deadline - time.time(), 0))
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    break
+                
+                if item is None:
+                    break
+                
+                kind, data = item
+                buffer.release(len(data))
+                text = decoders[kind].decode(data)
+                if text:
+                    yield {'type': kind, 'data': text}
+        finally:
+            if timed_out or not future.done():
+                buffer.cancel()
+                # The exec slots may all be busy; kill on the default executor
+                loop.run_in_executor(None, self._kill_exec, buffer)
+        
+        if timed_out:
+            logger.warning(f"Command timed out after {timeout}s: {command}")
+            exit_code = None
+        else:
+            exit_code = await future
+        
+        for kind, decoder in decoders.items():
+            text = decoder.decode(b'', final=True)
+            if text:
+                yield {'type': kind, 'data': text}
+        
+        yield {
+            'type': 'exit',
+            'exit_code': exit_code,
+            'success': exit_code == 0,
+            'timed_out': timed_out,
+            'execution_time': round(time.time() - start_time, 2)
+        }
+    
+    async def execute_command_async(
+        self,
+        command: str,
+        timeout: int = 300,
+        working_dir: str = '/root/workspace',
+        environment: Optional[Dict[str, str]] = None
+    ) -> Dict[str, any]:
+        """
+        Execute a command without blocking the event loop.
+        
+        Returns the same fields as ``execute_command``; stdout and stderr
+        are each capped at ``max_output_bytes`` characters.
+        
+        Args:
+            command: Command to execute
+            timeout: Maximum execution time in seconds (default: 300)
+            working_dir: Working directory for command execution
+            environment: Additional environment variables
+            
+        Returns:
+            Dict with execute_command's keys plus truncated and timed_out
+        """
+        output = {'stdout': [], 'stderr': []}
+        sizes = {'stdout': 0, 'stderr': 0}
+        truncated = False
+        final: Dict[str, Any] = {}
+        
+        async for event in self.stream_command(command, timeout, working_dir, environment):
+            kind = event['type']
+            if kind == 'exit':
+                final = event
+                continue
+            
+            room = self.max_output_bytes - sizes[kind]
+            if len(event['data']) > room:
+                truncated = True
+            if room > 0:
+                output[kind].append(event['data'][:room])
+                sizes[kind] += min(len(event['data']), room)
+        
+        exit_code = final.get('exit_code')
+        if exit_code == 0:
+            logger.info(f"Command executed successfully in {final.get('execution_time', 0):.2f}s")
+        else:
+            logger.warning(f"Command failed with exit code {exit_code}")
+        
+        return {
+            'success': exit_code == 0,
+            'stdout': ''.join(output['stdout']),
+            'stderr': ''.join(output['stderr']),
+            'exit_code': exit_code,
+            'execution_time': final.get('execution_time', 0.0),
+            'command': command,
+            'timestamp': datetime.utcnow().isoformat(),
+            'container': self.container_name,
+            'truncated': truncated,
+            'timed_out': final.get('timed_out', False)
+        }
+    
     def install_tool(self, tool_name: str) -> bool:
         """
         Install specific Kali tool if not present.
@@ -379,6 +795,14 @@ class KaliConnector:
     
     def close(self):
         """Close connection to Docker client."""
+        close_events = getattr(self._events, 'close', None)
+        if close_events:
+            try:
+                close_events()
+            except Exception:
+                pass
+        self._executor.shutdown(wait=False)
+        
         if self.docker_client:
             self.docker_client.close()
             logger.info("Docker client connection closed")
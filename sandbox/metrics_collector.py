@@ -0,0 +1,423 @@
+"""
+Container Metrics Collector
+Background sampling of Docker stats for many containers at once.
+
+Each round requests stats for every tracked container concurrently using
+one-shot reads, so a round costs about one Docker round trip instead of one
+sampling interval per container; CPU usage is derived from the counters of
+consecutive samples. The latest sample and a short history per container are
+kept in memory, so list, metrics and sparkline queries never call Docker.
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Iterable
+
+import docker
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Sample fields that can be read as a history series
+SERIES_METRICS = (
+    'cpu_percent',
+    'memory_usage_mb',
+    'memory_percent',
+    'network_rx_mb',
+    'network_tx_mb',
+    'pids'
+)
+
+
+def parse_docker_time(value: Optional[str]) -> Optional[float]:
+    """Convert a Docker RFC 3339 timestamp (nanosecond precision) to Unix time."""
+    if not value or value.startswith('0001-'):
+        return None
+    value = value.replace('Z', '+00:00')
+    if '.' in value:
+        # datetime accepts at most microseconds
+        head, rest = value.split('.', 1)
+        digits = len(rest) - len(rest.lstrip('0123456789'))
+        value = f"{head}.{rest[:min(digits, 6)]}{rest[digits:]}"
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+@dataclass
+class ContainerSample:
+    """Resource usage of a container at one point in time."""
+    timestamp: float
+    cpu_percent: float
+    memory_usage_mb: float
+    memory_limit_mb: float
+    memory_percent: float
+    network_rx_mb: float
+    network_tx_mb: float
+    pids: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert sample to dictionary."""
+        data = asdict(self)
+        data['timestamp'] = datetime.utcfromtimestamp(self.timestamp).isoformat()
+        return data
+
+
+class ContainerSeries:
+    """Recent samples of one container."""
+
+    __slots__ = ('container_id', 'name', 'status', 'started_at', 'seen_at', 'samples',
+                 'cpu_total', 'system_total', 'errors')
+
+    def __init__(self, container_id: str, name: str, history_size: int):
+        """
+        Initialize an empty series.
+
+        Args:
+            container_id: Full container ID
+            name: Container name
+            history_size: Number of samples kept
+        """
+        self.container_id = container_id
+        self.name = name
+        self.status: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.seen_at: Optional[float] = None
+        self.samples: deque = deque(maxlen=history_size)
+
+        # Raw CPU counters of the previous sample
+        self.cpu_total: Optional[int] = None
+        self.system_total: Optional[int] = None
+        self.errors = 0
+
+    def add(self, stats: Dict[str, Any], timestamp: float) -> ContainerSample:
+        """Derive a sample from a Docker stats payload and append it."""
+        cpu_stats = stats.get('cpu_stats') or {}
+        total = (cpu_stats.get('cpu_usage') or {}).get('total_usage')
+        system = cpu_stats.get('system_cpu_usage')
+
+        # One-shot reads carry no previous counters; use our own
+        precpu = stats.get('precpu_stats') or {}
+        pre_total = (precpu.get('cpu_usage') or {}).get('total_usage')
+        pre_system = precpu.get('system_cpu_usage')
+        if not pre_system:
+            pre_total, pre_system = self.cpu_total, self.system_total
+
+        cpu_percent = 0.0
+        if None not in (total, system, pre_total, pre_system) and system > pre_system:
+            cpu_percent = max(0.0, (total - pre_total) / (system - pre_system) * 100.0)
+        self.cpu_total, self.system_total = total, system
+
+        memory_stats = stats.get('memory_stats') or {}
+        memory_usage = memory_stats.get('usage', 0)
+        memory_limit = memory_stats.get('limit', 0)
+
+        network_rx = 0
+        network_tx = 0
+        for net_data in (stats.get('networks') or {}).values():
+            network_rx += net_data.get('rx_bytes', 0)
+            network_tx += net_data.get('tx_bytes', 0)
+
+        sample = ContainerSample(
+            timestamp=timestamp,
+            cpu_percent=round(cpu_percent, 2),
+            memory_usage_mb=round(memory_usage / MB, 2),
+            memory_limit_mb=round(memory_limit / MB, 2),
+            memory_percent=round(memory_usage / memory_limit * 100.0, 2) if memory_limit else 0.0,
+            network_rx_mb=round(network_rx / MB, 2),
+            network_tx_mb=round(network_tx / MB, 2),
+            pids=(stats.get('pids_stats') or {}).get('current', 0)
+        )
+        self.samples.append(sample)
+        return sample
+
+
+class MetricsCollector:
+    """
+    Periodically sample Docker stats of a set of containers concurrently.
+
+    Tracked containers are the running containers matching ``filters``,
+    optionally restricted to the names returned by ``names``. Names and status
+    are refreshed every round, so renamed containers stay reachable by their
+    current name; paused containers are tracked but not sampled. Containers
+    that stop or disappear are dropped from the cache on the next round.
+    """
+
+    def __init__(self,
+                 docker_client,
+                 filters: Optional[Dict[str, Any]] = None,
+                 names: Optional[Callable[[], Iterable[str]]] = None,
+                 interval: float = 10.0,
+                 history_size: int = 60,
+                 max_workers: int = 8):
+        """
+        Initialize the collector.
+
+        Args:
+            docker_client: Docker client
+            filters: Docker container list filters selecting tracked containers
+            names: Callable returning the container names to track
+            interval: Seconds between sampling rounds
+            history_size: Samples kept per container
+            max_workers: Concurrent stats requests
+        """
+        self.docker_client = docker_client
+        self.filters = filters
+        self.names = names
+        self.interval = interval
+        self.history_size = history_size
+        self.max_workers = max_workers
+
+        self.series: Dict[str, ContainerSeries] = {}
+        self.aliases: Dict[str, str] = {}
+        self.lock = threading.RLock()
+
+        self._one_shot = True
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        # Statistics
+        self.rounds = 0
+        self.last_round_seconds = 0.0
+        self.last_round_at: Optional[float] = None
+
+    def _targets(self) -> List[Any]:
+        """List the running containers to sample."""
+        containers = self.docker_client.containers.list(filters=self.filters or {})
+        if self.names is not None:
+            wanted = set(self.names())
+            containers = [c for c in containers if c.name in wanted]
+        return containers
+
+    def _read_stats(self, container) -> Dict[str, Any]:
+        """Read one stats payload without waiting for a sampling interval."""
+        if self._one_shot:
+            try:
+                return container.stats(stream=False, one_shot=True)
+            except (TypeError, docker.errors.InvalidVersion):
+                # Docker SDK or daemon without one-shot support
+                self._one_shot = False
+        return container.stats(stream=False)
+
+    def _sample(self, container) -> None:
+        """Sample one container into its series."""
+        with self.lock:
+            series = self.series.get(container.id)
+            if series is None:
+                series = self.series[container.id] = ContainerSeries(
+                    container.id, container.name, self.history_size
+                )
+                self.aliases[container.id[:12]] = container.id
+
+            # Pooled sandboxes are renamed and unpaused when handed out
+            if series.name != container.name:
+                if self.aliases.get(series.name) == container.id:
+                    del self.aliases[series.name]
+                series.name = container.name
+            self.aliases[container.name] = container.id
+            series.status = container.status
+            series.started_at = parse_docker_time((container.attrs.get('State') or {}).get('StartedAt'))
+            series.seen_at = time.time()
+
+        # Paused containers report no usage; skip the stats request
+        if container.status != 'running':
+            return
+
+        try:
+            stats = self._read_stats(container)
+        except Exception as e:
+            series.errors += 1
+            logger.debug(f"Failed to sample {container.name}: {e}")
+            return
+
+        with self.lock:
+            series.add(stats, time.time())
+
+    def collect(self) -> int:
+        """
+        Sample every tracked container once, concurrently.
+
+        Returns:
+            Number of containers sampled
+        """
+        start = time.time()
+        containers = self._targets()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='metrics'
+            )
+        for future in [self._executor.submit(self._sample, c) for c in containers]:
+            future.result()
+
+        # Forget containers that stopped or were removed
+        seen = {c.id for c in containers}
+        with self.lock:
+            for container_id in [cid for cid in self.series if cid not in seen]:
+                series = self.series.pop(container_id)
+                if self.aliases.get(series.name) == container_id:
+                    del self.aliases[series.name]
+                self.aliases.pop(container_id[:12], None)
+
+            self.rounds += 1
+            self.last_round_at = time.time()
+            self.last_round_seconds = self.last_round_at - start
+
+        return len(containers)
+
+    def _run(self) -> None:
+        """Sample on a schedule until stopped."""
+        while not self._stop.is_set():
+            try:
+                self.collect()
+            except Exception as e:
+                logger.error(f"Metrics collection failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """Start background sampling."""
+        with self.lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='metrics-collector', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop background sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @property
+    def running(self) -> bool:
+        """Whether background sampling is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _get_series(self, container: str) -> Optional[ContainerSeries]:
+        """Find a series by container ID, short ID or name."""
+        series = self.series.get(container)
+        if series is None:
+            container_id = self.aliases.get(container)
+            series = self.series.get(container_id) if container_id else None
+        return series
+
+    def latest(self, container: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent metrics of a container.
+
+        Args:
+            container: Container ID, short ID or name
+            max_age: Maximum sample age in seconds (defaults to two intervals)
+
+        Returns:
+            Metrics dictionary (``available`` is False for containers that are
+            not running, e.g. paused), or None when no fresh sample exists
+        """
+        max_age = max_age if max_age is not None else self.interval * 2
+        now = time.time()
+
+        with self.lock:
+            series = self._get_series(container)
+            if series is not None and series.status not in (None, 'running'):
+                if now - series.seen_at > max_age:
+                    return None
+                return {
+                    'available': False,
+                    'container_id': series.container_id[:12],
+                    'name': series.name,
+                    'status': series.status,
+                    'message': 'Container not running'
+                }
+            if series is None or not series.samples:
+                return None
+            sample = series.samples[-1]
+            if now - sample.timestamp > max_age:
+                return None
+
+            metrics = {
+                'available': True,
+                'container_id': series.container_id[:12],
+                'name': series.name,
+                'status': series.status
+            }
+            metrics.update(sample.to_dict())
+            metrics['sampled_at'] = metrics.pop('timestamp')
+            metrics['uptime_seconds'] = now - series.started_at if series.started_at else None
+            return metrics
+
+    def history(self,
+                container: str,
+                metric: Optional[str] = None,
+                limit: Optional[int] = None) -> Optional[List[Any]]:
+        """
+        Get the recent history of a container, oldest first.
+
+        Args:
+            container: Container ID, short ID or name
+            metric: Return only this metric's values (see ``SERIES_METRICS``)
+            limit: Maximum samples to return
+
+        Returns:
+            Metric values, or sample dictionaries without a metric; None for
+            unknown containers
+        """
+        if metric is not None and metric not in SERIES_METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        with self.lock:
+            series = self._get_series(container)
+            if series is None:
+                return None
+            samples = list(series.samples)
+
+        if limit is not None:
+            samples = samples[-limit:] if limit > 0 else []
+        if metric is not None:
+            return [getattr(sample, metric) for sample in samples]
+        return [sample.to_dict() for sample in samples]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get the latest metrics of every tracked container by name."""
+        with self.lock:
+            snapshot = {}
+            for series in self.series.values():
+                metrics = self.latest(series.container_id)
+                if metrics is not None:
+                    snapshot[series.name] = metrics
+            return snapshot
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get collector statistics.
+
+        Returns:
+            Dictionary with round and cache statistics
+        """
+        with self.lock:
+            return {
+                'running': self.running,
+                'interval': self.interval,
+                'tracked_containers': len(self.series),
+                'history_size': self.history_size,
+                'rounds': self.rounds,
+                'last_round_seconds': round(self.last_round_seconds, 3),
+                'sample_errors': sum(series.errors for series in self.series.values()),
+                'one_shot': self._one_shot
+            }
+
+
+__all__ = ['MetricsCollector', 'ContainerSample', 'ContainerSeries', 'SERIES_METRICS']
@@ -1,23 +1,104 @@
 """
 Sandbox Manager
 Manage Kali sandbox container lifecycle - creation, destruction, snapshots.
+
+Sessions can also be provisioned from templates: snapshot images with a pool
+of pre-created, paused sandboxes that are unpaused and handed out on session
+creation. Pool sizes follow a demand forecast (recent acquisition rate plus
+scheduled sessions) and are refilled by a background maintenance thread.
+
+Resource metrics of all sandboxes are sampled together in the background and
+served from memory, with a short per-sandbox history.
 """
 
 import docker
+import math
+import os
 import time
+import uuid
+import threading
 import logging
-from typing import Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
+from pathlib import Path
 import json
 
+from .metrics_collector import MetricsCollector
+
 logger = logging.getLogger(__name__)
 
+# Repository of sandbox snapshot images
+SNAPSHOT_REPOSITORY = 'ats-mafia/kali-snapshot'
+
+# Name prefixes of session and idle pooled sandboxes
+SESSION_PREFIX = 'ats_kali_session_'
+POOL_PREFIX = 'ats_kali_pool_'
+
+
+@dataclass
+class SandboxTemplate:
+    """A snapshot image with a pool of paused sandboxes created from it."""
+    name: str
+    image: str
+    cpu_limit: str = '2.0'
+    memory_limit: str = '4g'
+    min_size: int = 0
+    max_size: int = 30
+    target_size: int = 0
+    idle: deque = field(default_factory=deque)
+    
+    # Demand forecast: smoothed acquisitions per second and scheduled
+    # (timestamp, count) sessions
+    demand_rate: float = 0.0
+    acquisitions: int = 0
+    scheduled: List[Tuple[float, int]] = field(default_factory=list)
+    
+    # Statistics
+    warm_starts: int = 0
+    cold_starts: int = 0
+    
+    def to_dict(self) -> Dict[str, any]:
+        """Convert template to dictionary."""
+        return {
+            'name': self.name,
+            'image': self.image,
+            'cpu_limit': self.cpu_limit,
+            'memory_limit': self.memory_limit,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            'target_size': self.target_size,
+            'idle': len(self.idle),
+            'demand_per_hour': round(self.demand_rate * 3600, 2),
+            'scheduled': sum(count for _, count in self.scheduled),
+            'warm_starts': self.warm_starts,
+            'cold_starts': self.cold_starts
+        }
+
 
 class SandboxManager:
     """Manage Kali sandbox containers for training sessions."""
     
-    def __init__(self):
-        """Initialize sandbox manager."""
+    def __init__(
+        self,
+        forecast_horizon: float = 600.0,
+        forecast_smoothing: float = 0.3,
+        metrics_interval: float = 10.0,
+        metrics_history: int = 60,
+        state_file: Optional[str] = None
+    ):
+        """
+        Initialize sandbox manager.
+        
+        Args:
+            forecast_horizon: Seconds of forecast demand kept ready in each pool
+            forecast_smoothing: Weight of the latest interval in the demand rate
+            metrics_interval: Seconds between background metrics samples
+            metrics_history: Metrics samples kept per sandbox
+            state_file: JSON file persisting pooled sandbox assignments across
+                restarts (None keeps them in memory only)
+        """
         try:
             self.docker_client = docker.from_env()
             self.docker_client.ping()
@@ -27,63 +108,193 @@ class SandboxManager:
         except Exception as e:
             logger.error(f"Failed to initialize SandboxManager: {e}")
             raise RuntimeError(f"Docker not available: {e}")
+            
+        self.forecast_horizon = forecast_horizon
+        self.forecast_smoothing = forecast_smoothing
+        self.templates: Dict[str, SandboxTemplate] = {}
+        
+        # Pooled containers handed out: container ID -> (session ID, assigned at).
+        # Labels and environment are fixed at creation, so assignments are
+        # persisted separately from the container.
+        self.state_file = Path(state_file) if state_file else None
+        self.assignments: Dict[str, Tuple[str, float]] = self._load_assignments()
+        self._retired: List[str] = []
+        # Pooled containers taken off a pool but not yet assigned
+        self._acquiring: Set[str] = set()
+        
+        self.lock = threading.RLock()
+        self._refill_lock = threading.Lock()
+        self._last_forecast = time.time()
+        self._maintenance: Optional[threading.Thread] = None
+        self._maintenance_wakeup = threading.Event()
+        self._maintenance_stop = threading.Event()
+        
+        self.metrics = MetricsCollector(
+            self.docker_client,
+            filters={'label': 'ats.mafia.type'},
+            interval=metrics_interval,
+            history_size=metrics_history
+        )
+    
+    def _load_assignments(self) -> Dict[str, Tuple[str, float]]:
+        """Load persisted pooled sandbox assignments."""
+        if not self.state_file or not self.state_file.exists():
+            return {}
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {
+                container_id: (entry['session_id'], float(entry['assigned_at']))
+                for container_id, entry in data.get('assignments', {}).items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable sandbox state {self.state_file}: {e}")
+            return {}
+    
+    def _save_assignments(self) -> None:
+        """Persist pooled sandbox assignments (called with the lock held)."""
+        if not self.state_file:
+            return
+        
+        data = {
+            'assignments': {
+                container_id: {'session_id': session_id, 'assigned_at': assigned_at}
+                for container_id, (session_id, assigned_at) in self.assignments.items()
+            }
+        }
+        tmp_path = self.state_file.with_name(self.state_file.name + '.tmp')
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.warning(f"Failed to save sandbox state {self.state_file}: {e}")
+    
+    def get_session_id(self, container) -> Optional[str]:
+        """
+        Get the session a sandbox belongs to.
+        
+        Pooled sandboxes carry no session label; their session comes from
+        the assignment record or the session container name.
+        
+        Args:
+            container: Docker container
+            
+        Returns:
+            Session ID, or None for idle or unknown sandboxes
+        """
+        session_id = container.labels.get('ats.mafia.session')
+        if session_id is None and container.labels.get('ats.mafia.type') == 'pooled_sandbox':
+            with self.lock:
+                assignment = self.assignments.get(container.id)
+            if assignment:
+                session_id = assignment[0]
+            elif container.name.startswith(SESSION_PREFIX):
+                session_id = container.name[len(SESSION_PREFIX):]
+        return session_id
+    
+    def _create_container(
+        self,
+        image: str,
+        name: str,
+        session_id: str,
+        cpu_limit: str,
+        memory_limit: str,
+        labels: Dict[str, str]
+    ):
+        """Create a sandbox container with the standard isolation settings."""
+        return self.docker_client.containers.create(
+            image=image,
+            name=name,
+            command='/bin/bash -c "tail -f /dev/null"',
+            detach=True,
+            network='ats-training-network',
+            volumes={
+                '/tmp': {'bind': '/root/workspace', 'mode': 'rw'}
+            },
+            environment={
+                'SESSION_ID': session_id,
+                'CREATED_AT': datetime.utcnow().isoformat()
+            },
+            cpu_period=100000,
+            cpu_quota=int(float(cpu_limit) * 100000),
+            mem_limit=memory_limit,
+            security_opt=['no-new-privileges:true'],
+            cap_drop=['ALL'],
+            cap_add=['NET_ADMIN', 'NET_RAW', 'NET_BIND_SERVICE'],
+            labels=dict(labels, **{'ats.mafia.created': datetime.utcnow().isoformat()})
+        )
+    
+    def _remove_existing(self, container_name: str) -> None:
+        """Remove a container left over under a session container name."""
+        try:
+            existing = self.docker_client.containers.get(container_name)
+            logger.warning(f"Container {container_name} already exists, removing it")
+            existing.remove(force=True)
+            self._forget(existing.id)
+        except docker.errors.NotFound:
+            pass
     
     def create_ephemeral_sandbox(
         self,
         session_id: str,
         cpu_limit: str = '2.0',
-        memory_limit: str = '4g'
+        memory_limit: str = '4g',
+        template: Optional[str] = None
     ) -> str:
         """
         Create isolated sandbox container for specific session.
         
+        With a template, an idle sandbox is taken from the template's pool
+        when one is available, otherwise one is created from the template
+        snapshot; the template's resource limits apply in both cases.
+        
         Args:
             session_id: Unique session identifier
             cpu_limit: CPU limit (e.g., '2.0' for 2 cores)
             memory_limit: Memory limit (e.g., '4g')
+            template: Name of a registered template to provision from
             
         Returns:
             Container ID of created sandbox
         """
-        container_name = f"ats_kali_session_{session_id}"
+        container_name = f"{SESSION_PREFIX}{session_id}"
         
+        if template is not None:
+            with self.lock:
+                pool = self.templates.get(template)
+            if pool is None:
+                raise RuntimeError(f"Sandbox creation failed: unknown template '{template}'")
+            
         try:
             # Check if container already exists
-            try:
-                existing = self.docker_client.containers.get(container_name)
-                logger.warning(f"Container {container_name} already exists, removing it")
-                existing.remove(force=True)
-            except docker.errors.NotFound:
-                pass
+            self._remove_existing(container_name)
+            
+            if template is not None:
+                container_id = self._acquire_pooled(pool, session_id, container_name)
+                if container_id:
+                    return container_id
             
             # Create new container
             logger.info(f"Creating ephemeral sandbox: {container_name}")
             
-            container = self.docker_client.containers.create(
-                image=self.base_image,
-                name=container_name,
-                command='/bin/bash -c "tail -f /dev/null"',
-                detach=True,
-                network='ats-training-network',
-                volumes={
-                    '/tmp': {'bind': '/root/workspace', 'mode': 'rw'}
-                },
-                environment={
-                    'SESSION_ID': session_id,
-                    'CREATED_AT': datetime.utcnow().isoformat()
-                },
-                cpu_period=100000,
-                cpu_quota=int(float(cpu_limit) * 100000),
-                mem_limit=memory_limit,
-                security_opt=['no-new-privileges:true'],
-                cap_drop=['ALL'],
-                cap_add=['NET_ADMIN', 'NET_RAW', 'NET_BIND_SERVICE'],
-                labels={
-                    'ats.mafia.session': session_id,
-                    'ats.mafia.type': 'ephemeral_sandbox',
-                    'ats.mafia.created': datetime.utcnow().isoformat()
-                }
-            )
+            labels = {
+                'ats.mafia.session': session_id,
+                'ats.mafia.type': 'ephemeral_sandbox'
+            }
+            if template is not None:
+                labels['ats.mafia.template'] = template
+                container = self._create_container(
+                    pool.image, container_name, session_id,
+                    pool.cpu_limit, pool.memory_limit, labels
+                )
+            else:
+                container = self._create_container(
+                    self.base_image, container_name, session_id,
+                    cpu_limit, memory_limit, labels
+                )
             
             # Start container
             container.start()
@@ -96,6 +307,58 @@ class SandboxManager:
             logger.error(f"Failed to create ephemeral sandbox: {e}")
             raise RuntimeError(f"Sandbox creation failed: {e}")
     
+    def _acquire_pooled(self, pool: SandboxTemplate, session_id: str, container_name: str) -> Optional[str]:
+        """
+        Hand out an idle pooled sandbox to a session.
+        
+        Returns:
+            Container ID, or None when the pool is empty
+        """
+        with self.lock:
+            pool.acquisitions += 1
+            
+        while True:
+            with self.lock:
+                if not pool.idle:
+                    pool.cold_starts += 1
+                    break
+                container_id = pool.idle.popleft()
+                self._acquiring.add(container_id)
+            
+            try:
+                container = self.docker_client.containers.get(container_id)
+                container.unpause()
+                container.rename(container_name)
+            except Exception as e:
+                logger.warning(f"Discarding unusable pooled sandbox {container_id[:12]}: {e}")
+                with self.lock:
+                    self._acquiring.discard(container_id)
+                self.destroy_sandbox(container_id)
+                continue
+            
+            with self.lock:
+                self._acquiring.discard(container_id)
+                pool.warm_starts += 1
+                self.assignments[container_id] = (session_id, time.time())
+                self._save_assignments()
+            
+            logger.info(f"Pooled sandbox {container_id[:12]} assigned to session {session_id}")
+            self._maintenance_wakeup.set()
+            return container_id
+            
+        # Refill in the background for the next session
+        self._maintenance_wakeup.set()
+        return None
+    
+    def _forget(self, container_id: str) -> None:
+        """Drop a container from the pools and assignments."""
+        with self.lock:
+            if self.assignments.pop(container_id, None) is not None:
+                self._save_assignments()
+            for pool in self.templates.values():
+                if container_id in pool.idle:
+                    pool.idle.remove(container_id)
+    
     def destroy_sandbox(self, container_id: str, force: bool = True) -> bool:
         """
         Destroy sandbox container.
@@ -109,6 +372,7 @@ class SandboxManager:
         """
         try:
             container = self.docker_client.containers.get(container_id)
+            self._forget(container.id)
             
             # Stop if running
             if container.status == 'running':
@@ -123,22 +387,36 @@ class SandboxManager:
             return True
             
         except docker.errors.NotFound:
+            self._forget(container_id)
             logger.warning(f"Container not found: {container_id}")
             return False
         except Exception as e:
             logger.error(f"Failed to destroy sandbox: {e}")
             return False
     
-    def get_sandbox_metrics(self, container_id: str) -> Dict[str, any]:
+    def start_metrics_collection(self) -> None:
+        """Start sampling the metrics of all sandboxes in the background."""
+        self.metrics.start()
+    
+    def get_sandbox_metrics(self, container_id: str, use_cache: bool = True) -> Dict[str, any]:
         """
         Get resource usage metrics for sandbox.
         
+        The latest background sample is returned when it is fresh; otherwise
+        the stats are read from Docker.
+        
         Args:
             container_id: Container ID or name
+            use_cache: Serve the latest background sample when available
             
         Returns:
             Dict with resource metrics
         """
+        if use_cache:
+            cached = self.metrics.latest(container_id)
+            if cached is not None:
+                return cached
+            
         try:
             container = self.docker_client.containers.get(container_id)
             
@@ -200,13 +478,38 @@ class SandboxManager:
                 'error': str(e)
             }
     
-    def snapshot_sandbox(self, container_id: str, snapshot_name: Optional[str] = None) -> str:
+    def get_sandbox_history(
+        self,
+        container_id: str,
+        metric: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Optional[List[any]]:
+        """
+        Get recent sampled metrics of a sandbox, oldest first.
+        
+        Args:
+            container_id: Container ID or name
+            metric: Return only this metric's values (e.g. 'cpu_percent')
+            limit: Maximum samples to return
+            
+        Returns:
+            Metric values or sample dicts, or None if the sandbox is not sampled
+        """
+        return self.metrics.history(container_id, metric=metric, limit=limit)
+    
+    def snapshot_sandbox(
+        self,
+        container_id: str,
+        snapshot_name: Optional[str] = None,
+        labels: Optional[Dict[str, str]] = None
+    ) -> str:
         """
         Create snapshot/checkpoint of sandbox state.
         
         Args:
             container_id: Container ID or name
             snapshot_name: Optional name for snapshot
+            labels: Optional image labels
             
         Returns:
             Image ID of snapshot
@@ -221,9 +524,10 @@ class SandboxManager:
             
             # Commit container to image
             image = container.commit(
-                repository='ats-mafia/kali-snapshot',
+                repository=SNAPSHOT_REPOSITORY,
                 tag=snapshot_name,
-                message=f"Snapshot of {container.name}"
+                message=f"Snapshot of {container.name}",
+                changes=[f'LABEL {key}={value}' for key, value in (labels or {}).items()] or None
             )
             
             logger.info(f"Snapshot created: {image.id[:12]}")
@@ -248,7 +552,7 @@ class SandboxManager:
         Returns:
             Container ID of restored sandbox
         """
-        container_name = f"ats_kali_session_{session_id}_restored"
+        container_name = f"{SESSION_PREFIX}{session_id}_restored"
         
         try:
             logger.info(f"Restoring sandbox from snapshot: {snapshot_id[:12]}")
@@ -277,10 +581,306 @@ class SandboxManager:
             logger.error(f"Failed to restore sandbox: {e}")
             raise RuntimeError(f"Sandbox restoration failed: {e}")
     
+    # Template pools
+    
+    def create_template(self, name: str, container_id: str, **pool_options) -> SandboxTemplate:
+        """
+        Snapshot a prepared sandbox and register it as a template.
+        
+        Args:
+            name: Template name
+            container_id: Container holding the starting environment
+            **pool_options: Options passed to ``register_template``
+            
+        Returns:
+            Registered template
+        """
+        image_id = self.snapshot_sandbox(
+            container_id,
+            snapshot_name=f"template_{name}_{int(time.time())}",
+            labels={
+                'ats.mafia.template': name,
+                'ats.mafia.created': datetime.utcnow().isoformat()
+            }
+        )
+        return self.register_template(name, image_id, **pool_options)
+    
+    def register_template(
+        self,
+        name: str,
+        image: str,
+        cpu_limit: str = '2.0',
+        memory_limit: str = '4g',
+        min_size: int = 0,
+        max_size: int = 30
+    ) -> SandboxTemplate:
+        """
+        Register a snapshot image as a sandbox template.
+        
+        Paused pooled sandboxes of the same snapshot left by a previous run
+        are adopted into the pool. Re-registering a template with a new
+        snapshot retires its idle sandboxes, which are removed on the next
+        refill.
+        
+        Args:
+            name: Template name
+            image: Snapshot image ID or tag
+            cpu_limit: CPU limit of the template's sandboxes
+            memory_limit: Memory limit of the template's sandboxes
+            min_size: Idle sandboxes kept regardless of demand
+            max_size: Upper bound on idle sandboxes
+            
+        Returns:
+            Registered template
+        """
+        with self.lock:
+            pool = self.templates.get(name)
+            if pool is None:
+                pool = self.templates[name] = SandboxTemplate(name=name, image=image)
+            elif pool.image != image:
+                # Idle sandboxes of the previous snapshot are removed on refill
+                self._retired.extend(pool.idle)
+                pool.idle.clear()
+            pool.image = image
+            pool.cpu_limit = cpu_limit
+            pool.memory_limit = memory_limit
+            pool.min_size = min_size
+            pool.max_size = max(max_size, min_size)
+            pool.target_size = max(pool.target_size, min_size)
+            
+        try:
+            filters = {'label': [f'ats.mafia.template={name}', 'ats.mafia.type=pooled_sandbox']}
+            for container in self.docker_client.containers.list(all=True, filters=filters):
+                if (container.status == 'paused'
+                        and container.name.startswith(POOL_PREFIX)
+                        and container.labels.get('ats.mafia.snapshot') == image):
+                    with self.lock:
+                        if container.id not in pool.idle:
+                            pool.idle.append(container.id)
+        except Exception as e:
+            logger.warning(f"Failed to adopt pooled sandboxes for template {name}: {e}")
+            
+        logger.info(f"Registered sandbox template {name} ({len(pool.idle)} idle)")
+        self._maintenance_wakeup.set()
+        return pool
+    
+    def schedule_demand(self, template: str, count: int, at: Optional[float] = None) -> None:
+        """
+        Announce sessions expected to start from a template.
+        
+        The pool is grown to cover them once they fall within the forecast
+        horizon.
+        
+        Args:
+            template: Template name
+            count: Number of sessions
+            at: Unix timestamp the sessions start (defaults to now)
+        """
+        with self.lock:
+            if template not in self.templates:
+                raise ValueError(f"Unknown sandbox template: {template}")
+            self.templates[template].scheduled.append((at if at is not None else time.time(), count))
+            
+        self.update_forecasts()
+        self._maintenance_wakeup.set()
+    
+    def update_forecasts(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Update each template's demand rate and target pool size.
+        
+        The target covers the smoothed acquisition rate over the forecast
+        horizon plus sessions scheduled within it, clamped to the template's
+        pool bounds.
+        
+        Args:
+            now: Reference time (defaults to the current time)
+            
+        Returns:
+            Target pool size per template
+        """
+        now = now if now is not None else time.time()
+        
+        with self.lock:
+            elapsed = now - self._last_forecast
+            if elapsed > 0:
+                self._last_forecast = now
+            
+            targets = {}
+            for pool in self.templates.values():
+                if elapsed > 0:
+                    rate = pool.acquisitions / elapsed
+                    pool.demand_rate += self.forecast_smoothing * (rate - pool.demand_rate)
+                    pool.acquisitions = 0
+                
+                pool.scheduled = [(at, count) for at, count in pool.scheduled if at >= now]
+                upcoming = sum(
+                    count for at, count in pool.scheduled if at <= now + self.forecast_horizon
+                )
+                
+                expected = math.ceil(pool.demand_rate * self.forecast_horizon - 1e-9)
+                pool.target_size = min(pool.max_size, max(pool.min_size, expected + upcoming))
+                targets[pool.name] = pool.target_size
+            
+            return targets
+    
+    def _create_pooled(self, pool: SandboxTemplate) -> Optional[str]:
+        """Create a paused sandbox for a template's pool."""
+        name = f"{POOL_PREFIX}{pool.name}_{uuid.uuid4().hex[:8]}"
+        try:
+            container = self._create_container(
+                pool.image, name, '', pool.cpu_limit, pool.memory_limit,
+                {
+                    'ats.mafia.type': 'pooled_sandbox',
+                    'ats.mafia.template': pool.name,
+                    'ats.mafia.snapshot': pool.image
+                }
+            )
+            container.start()
+            container.pause()
+            return container.id
+        except Exception as e:
+            logger.error(f"Failed to create pooled sandbox for template {pool.name}: {e}")
+            return None
+    
+    def refill_pools(self) -> Dict[str, int]:
+        """
+        Bring every pool to its target size.
+        
+        Retired sandboxes and idle sandboxes beyond the target are removed.
+        
+        Returns:
+            Number of sandboxes created per template
+        """
+        created = {}
+        
+        with self._refill_lock:
+            with self.lock:
+                pools = list(self.templates.values())
+                retired, self._retired = self._retired, []
+            
+            for container_id in retired:
+                self.destroy_sandbox(container_id)
+            
+            for pool in pools:
+                # Excess sandboxes leave the pool before they are destroyed,
+                # so a concurrent acquisition cannot be handed one of them
+                with self.lock:
+                    image = pool.image
+                    excess = []
+                    while len(pool.idle) > pool.target_size:
+                        excess.append(pool.idle.pop())
+                
+                for container_id in excess:
+                    self.destroy_sandbox(container_id)
+                
+                created[pool.name] = 0
+                while True:
+                    with self.lock:
+                        if len(pool.idle) >= pool.target_size or pool.image != image:
+                            break
+                    
+                    container_id = self._create_pooled(pool)
+                    if container_id is None:
+                        break
+                    
+                    with self.lock:
+                        pool.idle.append(container_id)
+                    created[pool.name] += 1
+                
+                if created[pool.name]:
+                    logger.info(f"Added {created[pool.name]} sandboxes to pool {pool.name}")
+            
+        return created
+    
+    def run_pool_maintenance(self) -> Dict[str, int]:
+        """
+        Update forecasts and refill the pools.
+        
+        Returns:
+            Number of sandboxes created per template
+        """
+        self.update_forecasts()
+        return self.refill_pools()
+    
+    def _maintenance_loop(self, interval: float, cleanup_interval: float, max_age_hours: int) -> None:
+        """Background pool maintenance."""
+        last_cleanup = time.time()
+        
+        while not self._maintenance_stop.is_set():
+            self._maintenance_wakeup.wait(interval)
+            self._maintenance_wakeup.clear()
+            if self._maintenance_stop.is_set():
+                break
+            
+            try:
+                self.run_pool_maintenance()
+                if time.time() - last_cleanup >= cleanup_interval:
+                    self.cleanup_old_sandboxes(max_age_hours=max_age_hours)
+                    last_cleanup = time.time()
+            except Exception as e:
+                logger.error(f"Sandbox pool maintenance failed: {e}")
+    
+    def start_pool_maintenance(
+        self,
+        interval: float = 30.0,
+        cleanup_interval: float = 3600.0,
+        max_age_hours: int = 24
+    ) -> None:
+        """
+        Start refilling pools in the background.
+        
+        Maintenance runs every ``interval`` seconds and immediately after a
+        pooled sandbox is handed out or demand is scheduled.
+        
+        Args:
+            interval: Seconds between maintenance runs
+            cleanup_interval: Seconds between ``cleanup_old_sandboxes`` runs
+            max_age_hours: Maximum sandbox and snapshot age for cleanup
+        """
+        with self.lock:
+            if self._maintenance is not None and self._maintenance.is_alive():
+                return
+            
+            self._maintenance_stop.clear()
+            self._maintenance_wakeup.set()
+            self._maintenance = threading.Thread(
+                target=self._maintenance_loop,
+                args=(interval, cleanup_interval, max_age_hours),
+                name='sandbox-pool',
+                daemon=True
+            )
+            self._maintenance.start()
+    
+    def stop_pool_maintenance(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop background pool maintenance."""
+        self._maintenance_stop.set()
+        self._maintenance_wakeup.set()
+        if self._maintenance is not None:
+            self._maintenance.join(timeout)
+            self._maintenance = None
+    
+    def get_pool_status(self) -> Dict[str, any]:
+        """
+        Get template pool status.
+        
+        Returns:
+            Dict with per-template pool sizes, forecasts and hit counts
+        """
+        with self.lock:
+            return {
+                'templates': {name: pool.to_dict() for name, pool in self.templates.items()},
+                'assigned': len(self.assignments),
+                'maintenance_running': self._maintenance is not None and self._maintenance.is_alive(),
+                'forecast_horizon': self.forecast_horizon
+            }
+    
     def list_sandboxes(self) -> List[Dict[str, any]]:
         """
         List all ATS MAFIA sandbox containers.
         
+        Metrics come from the latest background sample (None when the
+        sandbox has not been sampled recently).
+        
         Returns:
             List of sandbox container info
         """
@@ -290,14 +890,17 @@ class SandboxManager:
             
             sandboxes = []
             for container in containers:
+                session_id = self.get_session_id(container)
+                
                 sandboxes.append({
                     'id': container.id[:12],
                     'name': container.name,
                     'status': container.status,
                     'image': container.image.tags[0] if container.image.tags else 'unknown',
                     'created': container.attrs['Created'],
-                    'session_id': container.labels.get('ats.mafia.session', 'unknown'),
-                    'type': container.labels.get('ats.mafia.type', 'unknown')
+                    'session_id': session_id or 'unknown',
+                    'type': container.labels.get('ats.mafia.type', 'unknown'),
+                    'metrics': self.metrics.latest(container.id)
                 })
             
             return sandboxes
@@ -310,6 +913,12 @@ class SandboxManager:
         """
         Clean up old ephemeral sandboxes.
         
+        Pooled sandboxes are removed once assigned for longer than the
+        maximum age, or while idle when older than it or left over from a
+        replaced snapshot. Snapshots of a registered template that the
+        template has moved on from are removed once older than the maximum
+        age and unused by any container.
+        
         Args:
             max_age_hours: Maximum age in hours before cleanup
             
@@ -332,6 +941,9 @@ class SandboxManager:
                         self.destroy_sandbox(container.id)
                         cleanup_count += 1
             
+            cleanup_count += self._cleanup_pooled(cutoff_time)
+            self._cleanup_snapshots(cutoff_time)
+            
             logger.info(f"Cleaned up {cleanup_count} old sandboxes")
             return cleanup_count
             
@@ -339,6 +951,107 @@ class SandboxManager:
             logger.error(f"Failed to cleanup sandboxes: {e}")
             return 0
     
+    def _cleanup_pooled(self, cutoff_time: float) -> int:
+        """Remove old and orphaned pooled sandboxes."""
+        filters = {'label': 'ats.mafia.type=pooled_sandbox'}
+        listed_at = time.time()
+        containers = self.docker_client.containers.list(all=True, filters=filters)
+        
+        with self.lock:
+            # Records of containers that no longer exist are dropped
+            live = {container.id for container in containers}
+            gone = [
+                cid for cid, (_, assigned_at) in self.assignments.items()
+                if cid not in live and assigned_at < listed_at
+            ]
+            for container_id in gone:
+                del self.assignments[container_id]
+            if gone:
+                self._save_assignments()
+        
+        cleanup_count = 0
+        for container in containers:
+            created_str = container.labels.get('ats.mafia.created')
+            created_time = datetime.fromisoformat(created_str).timestamp() if created_str else None
+            
+            with self.lock:
+                assignment = self.assignments.get(container.id)
+                pool = self.templates.get(container.labels.get('ats.mafia.template'))
+                idle = any(container.id in p.idle for p in self.templates.values())
+                
+                # The listing predates the lock: a sandbox listed under its
+                # pool name may have been handed out since
+                if container.id in self._acquiring:
+                    continue
+                
+                if assignment is None and container.name.startswith(POOL_PREFIX):
+                    stale = (
+                        pool is None
+                        or container.labels.get('ats.mafia.snapshot') != pool.image
+                        or (created_time is not None and created_time < cutoff_time)
+                    )
+                    # Stale idle sandboxes leave the pool before they are destroyed
+                    if stale and idle:
+                        self._forget(container.id)
+                else:
+                    assigned_time = assignment[1] if assignment else created_time
+                    stale = assigned_time is not None and assigned_time < cutoff_time
+            
+            if stale:
+                logger.info(f"Cleaning up old pooled sandbox: {container.name}")
+                self.destroy_sandbox(container.id)
+                cleanup_count += 1
+            
+        return cleanup_count
+    
+    def _cleanup_snapshots(self, cutoff_time: float) -> int:
+        """
+        Remove superseded template snapshots no longer in use.
+        
+        Only snapshots of templates registered with this manager under a
+        different image are candidates: a snapshot of an unregistered
+        template may still be wanted by another manager or a later restart.
+        """
+        try:
+            images = self.docker_client.images.list(filters={'label': 'ats.mafia.template'})
+        except Exception as e:
+            logger.error(f"Failed to list template snapshots: {e}")
+            return 0
+            
+        with self.lock:
+            current = {name: pool.image for name, pool in self.templates.items()}
+        in_use = set(current.values())
+            
+        try:
+            containers = self.docker_client.containers.list(all=True, filters={'label': 'ats.mafia.type'})
+            in_use.update(container.labels.get('ats.mafia.snapshot') for container in containers)
+            in_use.update(container.image.id for container in containers if container.image)
+        except Exception as e:
+            logger.error(f"Failed to list sandboxes using snapshots: {e}")
+            return 0
+            
+        removed = 0
+        for image in images:
+            if image.id in in_use or in_use.intersection(image.tags):
+                continue
+            
+            # Superseded: its template is registered with another snapshot
+            if (image.labels or {}).get('ats.mafia.template') not in current:
+                continue
+            
+            created_str = (image.labels or {}).get('ats.mafia.created')
+            if not created_str or datetime.fromisoformat(created_str).timestamp() >= cutoff_time:
+                continue
+            
+            try:
+                self.docker_client.images.remove(image.id)
+                removed += 1
+                logger.info(f"Removed stale template snapshot: {image.id[:12]}")
+            except Exception as e:
+                logger.warning(f"Failed to remove snapshot {image.id[:12]}: {e}")
+            
+        return removed
+    
     def get_base_container_status(self) -> Dict[str, any]:
         """
         Get status of base Kali container.
@@ -370,9 +1083,12 @@ class SandboxManager:
     
     def close(self):
         """Close Docker client connection."""
+        self.stop_pool_maintenance()
+        self.metrics.stop()
+        
         if self.docker_client:
             self.docker_client.close()
             logger.info("SandboxManager connection closed")
 
 
-__all__ = ['SandboxManager']
\ No newline at end of file
+__all__ = ['SandboxManager', 'SandboxTemplate']
\ No newline at end of file
@@ -3,11 +3,12 @@ Security Monitor
 Monitor sandbox for suspicious activity and prevent malicious actions.
 """
 
-import re
 import logging
 from typing import Dict, List, Optional, Set
 from datetime import datetime, timedelta
-import json
+
+from .audit_trail import AuditTrail
+from .command_policy import CommandPolicy, PolicyScan
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +16,68 @@ logger = logging.getLogger(__name__)
 class SecurityMonitor:
     """Monitor sandbox containers for security threats and suspicious activity."""
     
-    def __init__(self):
-        """Initialize security monitor."""
-        self.audit_log = []
+    # Container escape/breakout indicators
+    BREAKOUT_INDICATORS: List[str] = [
+        r'docker\.sock',  # Docker socket access
+        r'/var/run/docker',  # Docker runtime access
+        r'nsenter',  # Namespace entry
+        r'unshare',  # Namespace manipulation
+        r'mount.*--bind',  # Bind mounts
+        r'chroot.*/',  # Root directory change
+        r'/proc/1/',  # Init process access
+        r'cgroup.*release_agent',  # Cgroup escape
+        r'find.*-perm.*4000',  # SUID binary search
+        r'chmod.*\+s',  # SUID bit setting
+        r'/dev/mem',  # Memory device access
+        r'/dev/kmem',  # Kernel memory access
+        r'iptables.*DOCKER',  # Docker iptables manipulation
+    ]
+    
+    def __init__(
+        self,
+        audit_dir: Optional[str] = None,
+        audit_memory_size: int = 10000
+    ):
+        """
+        Initialize security monitor.
+        
+        Args:
+            audit_dir: Directory for persistent audit segments, owned by
+                this monitor (None keeps the audit trail in memory only)
+            audit_memory_size: Most recent audit events kept in memory
+        """
+        self.audit_trail = AuditTrail(audit_dir, memory_size=audit_memory_size)
         self.rate_limits = {}
         self.blocked_users = set()
         self.suspicious_patterns = self._initialize_suspicious_patterns()
+        self.policy = self._compile_policy()
         logger.info("SecurityMonitor initialized")
     
+    def _compile_policy(self) -> CommandPolicy:
+        """Compile breakout indicators and suspicious patterns into one matcher."""
+        self._compiled_patterns = list(self.suspicious_patterns)
+        policy = CommandPolicy()
+        policy.add_category('breakout', self.BREAKOUT_INDICATORS, ignore_case=True)
+        policy.add_category('suspicious', self.suspicious_patterns, ignore_case=True)
+        policy.compile()
+        return policy
+    
+    def scan_command(self, command: str) -> PolicyScan:
+        """
+        Scan a command for breakout indicators and suspicious patterns in one pass.
+        
+        The policy is recompiled if ``suspicious_patterns`` has been changed.
+        
+        Args:
+            command: Command to scan
+            
+        Returns:
+            Scan result with the matching patterns by category
+        """
+        if self.suspicious_patterns != self._compiled_patterns:
+            self.policy = self._compile_policy()
+        return self.policy.scan(command)
+    
     def _initialize_suspicious_patterns(self) -> List[str]:
         """Initialize patterns that indicate suspicious activity."""
         return [
@@ -82,8 +137,10 @@ class SecurityMonitor:
                 'threat_level': 'MEDIUM'
             }
         
+        scan = self.scan_command(command)
+        
         # Detect breakout attempts
-        if self.detect_breakout_attempt(command):
+        if self._report_breakout(scan):
             logger.critical(f"Container breakout attempt detected: {command}")
             self.audit_log_event({
                 'timestamp': timestamp.isoformat(),
@@ -102,10 +159,7 @@ class SecurityMonitor:
             }
         
         # Check for suspicious patterns
-        suspicious_findings = []
-        for pattern in self.suspicious_patterns:
-            if re.search(pattern, command, re.IGNORECASE):
-                suspicious_findings.append(pattern)
+        suspicious_findings = scan.patterns('suspicious')
         
         if suspicious_findings:
             logger.warning(f"Suspicious command patterns detected: {suspicious_findings}")
@@ -144,26 +198,14 @@ class SecurityMonitor:
         Returns:
             True if breakout attempt detected
         """
-        breakout_indicators = [
-            r'docker\.sock',  # Docker socket access
-            r'/var/run/docker',  # Docker runtime access
-            r'nsenter',  # Namespace entry
-            r'unshare',  # Namespace manipulation
-            r'mount.*--bind',  # Bind mounts
-            r'chroot.*/',  # Root directory change
-            r'/proc/1/',  # Init process access
-            r'cgroup.*release_agent',  # Cgroup escape
-            r'find.*-perm.*4000',  # SUID binary search
-            r'chmod.*\+s',  # SUID bit setting
-            r'/dev/mem',  # Memory device access
-            r'/dev/kmem',  # Kernel memory access
-            r'iptables.*DOCKER',  # Docker iptables manipulation
-        ]
-        
-        for indicator in breakout_indicators:
-            if re.search(indicator, command, re.IGNORECASE):
-                logger.critical(f"Breakout indicator detected: {indicator}")
-                return True
+        return self._report_breakout(self.scan_command(command))
+    
+    def _report_breakout(self, scan: PolicyScan) -> bool:
+        """Log the first breakout indicator of a scan, if any."""
+        hit = scan.first('breakout')
+        if hit:
+            logger.critical(f"Breakout indicator detected: {hit.pattern}")
+            return True
         
         return False
     
@@ -220,36 +262,31 @@ class SecurityMonitor:
         Args:
             event: Event details to log
         """
-        self.audit_log.append(event)
-        
-        # Write to persistent log file
-        try:
-            with open('/tmp/ats_sandbox_audit.log', 'a') as f:
-                f.write(json.dumps(event) + '\n')
-        except Exception as e:
-            logger.error(f"Failed to write audit log: {e}")
+        self.audit_trail.append(event)
+    
+    @property
+    def audit_log(self) -> List[Dict[str, any]]:
+        """Most recent audit events held in memory, oldest first."""
+        return list(self.audit_trail.events)
     
     def get_audit_log(
         self,
         user_id: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        container_id: Optional[str] = None
     ) -> List[Dict[str, any]]:
         """
-        Retrieve audit log entries.
+        Retrieve the most recent audit log entries.
         
         Args:
             user_id: Optional filter by user
             limit: Maximum entries to return
+            container_id: Optional filter by container
             
         Returns:
             List of audit log entries
         """
-        logs = self.audit_log
-        
-        if user_id:
-            logs = [log for log in logs if log.get('user_id') == user_id]
-        
-        return logs[-limit:]
+        return self.audit_trail.recent(limit, user_id=user_id or None, container_id=container_id or None)
     
     def get_security_report(self) -> Dict[str, any]:
         """
@@ -258,26 +295,17 @@ class SecurityMonitor:
         Returns:
             Dict with security statistics
         """
-        total_events = len(self.audit_log)
-        
-        # Count by threat type
-        threats = {}
-        for event in self.audit_log:
-            threat = event.get('threat', 'NONE')
-            threats[threat] = threats.get(threat, 0) + 1
+        counters = self.audit_trail.get_counters()
         
         # Count blocked users
         blocked_count = len(self.blocked_users)
         
         # Get recent critical events
-        recent_critical = [
-            event for event in self.audit_log[-100:]
-            if event.get('threat') in ['BREAKOUT_ATTEMPT', 'CRITICAL']
-        ]
+        recent_critical = self.audit_trail.recent_critical()
         
         return {
-            'total_events': total_events,
-            'threats_by_type': threats,
+            'total_events': counters['total_events'],
+            'threats_by_type': counters['threats_by_type'],
             'blocked_users_count': blocked_count,
             'blocked_users': list(self.blocked_users),
             'recent_critical_events': recent_critical,
@@ -322,7 +350,9 @@ class SecurityMonitor:
     
     def export_audit_log(self, filepath: str) -> bool:
         """
-        Export audit log to file.
+        Export the retained audit log to a JSON file.
+        
+        Events are streamed from the audit segments rather than held in memory.
         
         Args:
             filepath: Path to export file
@@ -331,13 +361,16 @@ class SecurityMonitor:
             True if export successful
         """
         try:
-            with open(filepath, 'w') as f:
-                json.dump(self.audit_log, f, indent=2)
-            logger.info(f"Audit log exported to {filepath}")
+            count = self.audit_trail.export(filepath)
+            logger.info(f"Audit log exported to {filepath} ({count} events)")
             return True
         except Exception as e:
             logger.error(f"Failed to export audit log: {e}")
             return False
+    
+    def close(self) -> None:
+        """Close the audit trail and release its directory."""
+        self.audit_trail.close()
 
 
 __all__ = ['SecurityMonitor']
\ No newline at end of file
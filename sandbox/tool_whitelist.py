@@ -7,6 +7,8 @@ import re
 from typing import Dict, List, Tuple, Set
 import logging
 
+from .command_policy import CommandPolicy, PolicyScan
+
 logger = logging.getLogger(__name__)
 
 # Approved security tools by category
@@ -108,6 +110,67 @@ SAFE_PARAMETERS: Dict[str, List[str]] = {
     ]
 }
 
+# Command chaining/injection sequences
+INJECTION_SEQUENCES: List[str] = ['&&', '||', ';', '`', '$(']
+
+# File redirection outside /tmp
+REDIRECTION_PATTERNS: List[str] = [r'>>\s*(?!/tmp/)', r'>\s*(?!/tmp/)']
+
+# Tool-specific checks
+_PAYLOAD_RE = re.compile(r'(reverse_tcp|reverse_https|meterpreter)', re.IGNORECASE)
+_INTERNAL_LHOST_RE = re.compile(r'LHOST\s*=\s*172\.(20|25)\.')
+_DD_TMP_RE = re.compile(r'if=.*of=/tmp/')
+
+
+def build_command_policy() -> CommandPolicy:
+    """
+    Compile the command rule tables into a single policy matcher.
+    
+    Dangerous commands are ordered longest first so the reported match is
+    the most specific one (e.g. '&&' rather than '&').
+    
+    Returns:
+        Compiled command policy
+    """
+    policy = CommandPolicy()
+    policy.add_category(
+        'dangerous_command',
+        sorted(DANGEROUS_COMMANDS, key=lambda cmd: (-len(cmd), cmd)),
+        ignore_case=True,
+        literal=True
+    )
+    policy.add_category('dangerous_pattern', DANGEROUS_PATTERNS, ignore_case=True)
+    policy.add_category('injection', INJECTION_SEQUENCES, literal=True)
+    policy.add_category('redirection', REDIRECTION_PATTERNS)
+    for tool, patterns in SAFE_PARAMETERS.items():
+        policy.add_category(f'safe_parameter:{tool}', patterns)
+    policy.compile()
+    return policy
+
+
+# Shared compiled policy; call refresh_command_policy() after changing the tables
+COMMAND_POLICY = build_command_policy()
+
+
+def refresh_command_policy() -> CommandPolicy:
+    """Recompile the shared command policy from the rule tables."""
+    global COMMAND_POLICY
+    COMMAND_POLICY = build_command_policy()
+    return COMMAND_POLICY
+
+
+def scan_command(command: str) -> PolicyScan:
+    """
+    Scan a command against all whitelist rules in a single pass.
+    
+    Args:
+        command: The command string to scan
+        
+    Returns:
+        Scan result with every matching rule and its category
+    """
+    return COMMAND_POLICY.scan(command)
+
 
 def get_all_approved_tools() -> List[str]:
     """Get flattened list of all approved tools."""
@@ -127,8 +190,8 @@ def is_tool_approved(tool: str) -> bool:
     Returns:
         True if tool is approved, False otherwise
     """
-    all_tools = get_all_approved_tools()
-    return tool.lower() in [t.lower() for t in all_tools]
+    tool = tool.lower()
+    return any(t.lower() == tool for tools in APPROVED_TOOLS.values() for t in tools)
 
 
 def get_tool_category(tool: str) -> str:
@@ -169,47 +232,42 @@ def validate_command(command: str) -> Tuple[bool, str]:
     if not is_tool_approved(tool_name):
         return False, f"Tool '{tool_name}' is not in approved whitelist"
     
+    scan = scan_command(command)
+    
     # Check for dangerous commands
-    command_lower = command.lower()
-    for dangerous_cmd in DANGEROUS_COMMANDS:
-        if dangerous_cmd in command_lower:
-            return False, f"Dangerous command pattern detected: '{dangerous_cmd}'"
+    hit = scan.first('dangerous_command')
+    if hit:
+        return False, f"Dangerous command pattern detected: '{hit.pattern}'"
     
     # Check for dangerous patterns
-    for pattern in DANGEROUS_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            return False, f"Dangerous pattern detected: {pattern}"
+    hit = scan.first('dangerous_pattern')
+    if hit:
+        return False, f"Dangerous pattern detected: {hit.pattern}"
     
     # Check for command chaining/injection attempts
-    if any(char in command for char in ['&&', '||', ';', '`', '$(']):
+    if scan.has('injection'):
         return False, "Command chaining/injection detected"
     
     # Check for file redirection (except to /tmp)
-    if re.search(r'>>\s*(?!/tmp/)', command) or re.search(r'>\s*(?!/tmp/)', command):
+    if scan.has('redirection'):
         return False, "File redirection to non-tmp directory not allowed"
     
     # Validate specific tool parameters if available
     if tool_name in SAFE_PARAMETERS:
         # At least one safe parameter should be present
-        has_safe_param = False
-        for safe_pattern in SAFE_PARAMETERS[tool_name]:
-            if re.search(safe_pattern, command):
-                has_safe_param = True
-                break
-        
-        if not has_safe_param:
+        if not scan.has(f'safe_parameter:{tool_name}'):
             logger.warning(f"No recognized safe parameters found for {tool_name}")
     
     # Additional checks for high-risk tools
     if tool_name in ['msfconsole', 'msfvenom', 'metasploit']:
         # Ensure no reverse shell creation
-        if re.search(r'(reverse_tcp|reverse_https|meterpreter)', command, re.IGNORECASE):
-            if not re.search(r'LHOST\s*=\s*172\.(20|25)\.', command):
+        if _PAYLOAD_RE.search(command):
+            if not _INTERNAL_LHOST_RE.search(command):
                 return False, "Metasploit payloads must target internal training network only"
     
     if tool_name == 'dd':
         # dd is dangerous but sometimes needed for forensics
-        if not re.search(r'if=.*of=/tmp/', command):
+        if not _DD_TMP_RE.search(command):
             return False, "dd command must read from file and write to /tmp only"
     
     return True, "Command validated successfully"
@@ -284,6 +342,10 @@ def build_safe_command(tool: str, target: str, options: Dict[str, str] = None) -
 # Export public API
 __all__ = [
     'APPROVED_TOOLS',
+    'COMMAND_POLICY',
+    'build_command_policy',
+    'refresh_command_policy',
+    'scan_command',
     'get_all_approved_tools',
     'is_tool_approved',
     'get_tool_category',
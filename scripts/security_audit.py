@@ -32,7 +32,7 @@ class SecurityAudit:
         # Configuration Controls
         'sandbox_enabled': {
             'file': 'ats_mafia_framework/config/settings.py',
-            'line': 60,
+            'line': 65,
             'pattern': r'sandbox_enabled:\s*bool\s*=\s*True',
             'expected': 'sandbox_enabled: bool = True',
             'severity': 'CRITICAL',
@@ -40,7 +40,7 @@ class SecurityAudit:
         },
         'audit_logging': {
             'file': 'ats_mafia_framework/config/settings.py',
-            'line': 45,
+            'line': 46,
             'pattern': r'audit_enabled:\s*bool\s*=\s*True',
             'expected': 'audit_enabled: bool = True',
             'severity': 'CRITICAL',
@@ -48,7 +48,7 @@ class SecurityAudit:
         },
         'encryption_enabled': {
             'file': 'ats_mafia_framework/config/settings.py',
-            'line': 102,
+            'line': 107,
             'pattern': r'encryption_enabled:\s*bool\s*=\s*True',
             'expected': 'encryption_enabled: bool = True',
             'severity': 'CRITICAL',
@@ -56,7 +56,7 @@ class SecurityAudit:
         },
         'session_encryption': {
             'file': 'ats_mafia_framework/config/settings.py',
-            'line': 104,
+            'line': 109,
             'pattern': r'session_encryption:\s*bool\s*=\s*True',
             'expected': 'session_encryption: bool = True',
             'severity': 'CRITICAL',
@@ -76,7 +76,7 @@ class SecurityAudit:
         # Command Whitelist
         'dangerous_commands_blocklist': {
             'file': 'ats_mafia_framework/sandbox/tool_whitelist.py',
-            'line': 59,
+            'line': 61,
             'pattern': r"DANGEROUS_COMMANDS:\s*Set\[str\]\s*=\s*\{",
             'expected': 'DANGEROUS_COMMANDS: Set[str] = {',
             'severity': 'CRITICAL',
@@ -86,7 +86,7 @@ class SecurityAudit:
         # Security Monitor
         'security_monitor_breakout_detection': {
             'file': 'ats_mafia_framework/sandbox/security_monitor.py',
-            'line': 137,
+            'line': 191,
             'pattern': r'def\s+detect_breakout_attempt',
             'expected': 'def detect_breakout_attempt',
             'severity': 'CRITICAL',
@@ -98,7 +98,7 @@ class SecurityAudit:
     HIGH_CONTROLS = {
         'rate_limiting': {
             'file': 'ats_mafia_framework/config/settings.py',
-            'line': 97,
+            'line': 102,
             'pattern': r'rate_limit:\s*int\s*=\s*\d+',
             'expected': 'rate_limit: int = 100',
             'severity': 'HIGH',
@@ -106,7 +106,7 @@ class SecurityAudit:
         },
         'encryption_key_rotation': {
             'file': 'ats_mafia_framework/config/settings.py',
-            'line': 103,
+            'line': 108,
             'pattern': r'encryption_key_rotation:\s*bool\s*=\s*True',
             'expected': 'encryption_key_rotation: bool = True',
             'severity': 'HIGH',
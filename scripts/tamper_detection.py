@@ -6,26 +6,44 @@ CONFIDENTIAL - INTERNAL USE ONLY
 This script uses SHA-256 hashes to detect unauthorized modifications to 
 security-critical files. It creates a baseline and verifies against it.
 
+Files are hashed in parallel. Verification reuses the hash recorded by the
+previous run for files whose size, modification time, inode and change time
+are all unchanged, so routine checks only read files that were touched.
+
 Usage:
     python tamper_detection.py --create-baseline    # Create initial baseline
     python tamper_detection.py                      # Verify against baseline
     python tamper_detection.py --json               # JSON output
     python tamper_detection.py --update-baseline    # Update baseline
+    python tamper_detection.py --full               # Re-hash every file
+    python tamper_detection.py --watch              # Re-verify continuously
 """
 
+import os
 import sys
 import json
+import mmap
+import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, Set, Optional, Any, Iterable
 from datetime import datetime
 import argparse
 
 
+# Read size for hashing; files from MMAP_THRESHOLD up are memory-mapped
+CHUNK_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 16 * CHUNK_SIZE
+
+GLOB_CHARS = set('*?[')
+
+
 class TamperDetection:
     """File integrity monitoring for ATS MAFIA Framework security-critical files."""
     
-    # Security-critical files that must be monitored
+    # Security-critical files that must be monitored; entries may be globs
+    # relative to the base path ('**' matches nested directories)
     SECURITY_CRITICAL_FILES = [
         # Configuration
         'ats_mafia_framework/config/settings.py',
@@ -36,13 +54,16 @@ class TamperDetection:
         # Core Security
         'ats_mafia_framework/core/tool_system.py',
         'ats_mafia_framework/core/logging.py',
+        'ats_mafia_framework/core/**/*.py',
         
         # Sandbox Security
         'ats_mafia_framework/sandbox/tool_whitelist.py',
+        'ats_mafia_framework/sandbox/command_policy.py',
         'ats_mafia_framework/sandbox/security_monitor.py',
         'ats_mafia_framework/sandbox/sandbox_manager.py',
         'ats_mafia_framework/sandbox/network_isolation.py',
         'ats_mafia_framework/sandbox/kali_connector.py',
+        'ats_mafia_framework/sandbox/**/*.py',
         
         # Docker Configuration
         'docker-compose.yml',
@@ -55,18 +76,36 @@ class TamperDetection:
         'ATS_MAFIA_SECURITY_CONTROL_MATRIX.md',
     ]
     
-    def __init__(self, baseline_file: str = 'security_baseline.json', base_path: Optional[str] = None):
+    def __init__(self,
+                 baseline_file: str = 'security_baseline.json',
+                 base_path: Optional[str] = None,
+                 patterns: Optional[Iterable[str]] = None,
+                 workers: Optional[int] = None,
+                 use_cache: bool = True):
         """
         Initialize tamper detection.
         
         Args:
             baseline_file: Path to baseline file
             base_path: Base directory path for the framework
+            patterns: Files and globs to monitor (defaults to SECURITY_CRITICAL_FILES)
+            workers: Number of files hashed concurrently
+            use_cache: Reuse hashes of files whose stat signature is unchanged
         """
         self.baseline_file = baseline_file
         self.base_path = Path(base_path) if base_path else Path.cwd()
+        self.patterns = list(patterns) if patterns else list(self.SECURITY_CRITICAL_FILES)
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        self.use_cache = use_cache
         self.baseline = {}
         self.current_hashes = {}
+        
+        # Hashes of the last run keyed by path, valid while the stat
+        # signature matches
+        self.cache_file = f"{baseline_file}.cache"
+        self.stat_cache: Dict[str, Dict[str, Any]] = {}
+        self.cache_hits = 0
+        self.files_hashed = 0
     
     def calculate_file_hash(self, file_path: Path) -> Optional[str]:
         """
@@ -84,10 +123,23 @@ class TamperDetection:
         try:
             sha256_hash = hashlib.sha256()
             
-            with open(file_path, 'rb') as f:
-                # Read file in chunks for memory efficiency
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
+            with open(file_path, 'rb', buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                
+                if size >= MMAP_THRESHOLD:
+                    # Hash large files straight from the page cache
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        sha256_hash.update(mapped)
+                else:
+                    # Read into one reusable buffer; hashlib releases the GIL
+                    # on large updates, so worker threads hash in parallel
+                    buffer = bytearray(min(max(size, 1), CHUNK_SIZE))
+                    view = memoryview(buffer)
+                    while True:
+                        count = f.readinto(buffer)
+                        if not count:
+                            break
+                        sha256_hash.update(view[:count])
             
             return sha256_hash.hexdigest()
             
@@ -95,6 +147,136 @@ class TamperDetection:
             print(f"Error calculating hash for {file_path}: {e}", file=sys.stderr)
             return None
     
+    def resolve_files(self) -> List[str]:
+        """
+        Expand the monitored patterns into file paths.
+        
+        Plain entries are kept even when missing so they are reported;
+        glob entries match existing files only.
+        
+        Returns:
+            Sorted relative file paths
+        """
+        files: Set[str] = set()
+        
+        for pattern in self.patterns:
+            if not GLOB_CHARS.intersection(pattern):
+                files.add(pattern)
+                continue
+            
+            for file_path in self.base_path.glob(pattern):
+                if file_path.is_file() and '__pycache__' not in file_path.parts:
+                    files.add(file_path.relative_to(self.base_path).as_posix())
+        
+        return sorted(files)
+    
+    @staticmethod
+    def file_signature(stat_result: os.stat_result) -> List[int]:
+        """
+        Get the stat signature used to detect changed files.
+        
+        The change time is included because, unlike the modification time,
+        it cannot be set back from user space.
+        
+        Args:
+            stat_result: Result of os.stat
+            
+        Returns:
+            List of size, modification time, inode and change time
+        """
+        return [stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino, stat_result.st_ctime_ns]
+    
+    def load_cache(self) -> None:
+        """Load hashes recorded by the previous run for the current baseline."""
+        self.stat_cache = {}
+        cache_path = self.base_path / self.cache_file
+        
+        try:
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        # Hashes only carry over while the baseline they were verified against is in use
+        if cache.get('baseline_created') == self.baseline.get('created'):
+            self.stat_cache = cache.get('files', {})
+    
+    def save_cache(self) -> None:
+        """Write the hash cache atomically."""
+        cache_path = self.base_path / self.cache_file
+        temp_path = cache_path.with_name(f".{cache_path.name}.tmp")
+        
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({
+                    'baseline_created': self.baseline.get('created'),
+                    'files': self.stat_cache
+                }, f)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"Error saving hash cache: {e}", file=sys.stderr)
+    
+    def _scan_file(self, file_path_str: str, use_cache: bool) -> Optional[Dict[str, Any]]:
+        """Stat and, unless cached, hash one file."""
+        file_path = self.base_path / file_path_str
+        
+        try:
+            stat_result = file_path.stat()
+        except OSError:
+            return None
+        
+        signature = self.file_signature(stat_result)
+        cached = self.stat_cache.get(file_path_str) if use_cache else None
+        
+        if cached and cached.get('signature') == signature:
+            file_hash = cached['hash']
+            hashed = False
+        else:
+            file_hash = self.calculate_file_hash(file_path)
+            if file_hash is None:
+                return None
+            hashed = True
+        
+        return {
+            'hash': file_hash,
+            'size': stat_result.st_size,
+            'modified': datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+            'signature': signature,
+            'hashed': hashed
+        }
+    
+    def scan(self, files: Iterable[str], use_cache: Optional[bool] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Hash files in parallel, reusing cached hashes of unchanged files.
+        
+        Args:
+            files: Relative file paths
+            use_cache: Override the instance cache setting
+            
+        Returns:
+            Dictionary mapping each path to its hash, size, modification
+            time and stat signature, or None if the file is missing
+        """
+        use_cache = self.use_cache if use_cache is None else use_cache
+        files = list(files)
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            scanned = dict(zip(files, executor.map(lambda f: self._scan_file(f, use_cache), files)))
+        
+        for file_path_str, info in scanned.items():
+            if info is None:
+                self.stat_cache.pop(file_path_str, None)
+                continue
+            
+            if info['hashed']:
+                self.files_hashed += 1
+            else:
+                self.cache_hits += 1
+            self.stat_cache[file_path_str] = {'signature': info['signature'], 'hash': info['hash']}
+            self.current_hashes[file_path_str] = info['hash']
+        
+        return scanned
+    
     def create_baseline(self) -> Dict[str, Any]:
         """
         Create security baseline with file hashes.
@@ -111,18 +293,17 @@ class TamperDetection:
             'missing_files': []
         }
         
-        for file_path_str in self.SECURITY_CRITICAL_FILES:
-            file_path = self.base_path / file_path_str
-            
+        # The baseline is the trust anchor, so every file is hashed
+        scanned = self.scan(self.resolve_files(), use_cache=False)
+        
+        for file_path_str, info in scanned.items():
             print(f"  Hashing: {file_path_str}...", end='')
             
-            file_hash = self.calculate_file_hash(file_path)
-            
-            if file_hash:
+            if info:
                 baseline['files'][file_path_str] = {
-                    'hash': file_hash,
-                    'size': file_path.stat().st_size,
-                    'modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+                    'hash': info['hash'],
+                    'size': info['size'],
+                    'modified': info['modified']
                 }
                 baseline['total_files'] += 1
                 print(" ✅")
@@ -135,6 +316,9 @@ class TamperDetection:
         with open(baseline_path, 'w') as f:
             json.dump(baseline, f, indent=2)
         
+        self.baseline = baseline
+        self.save_cache()
+        
         print(f"\n✅ Baseline created: {baseline_path}")
         print(f"   Files monitored: {baseline['total_files']}")
         if baseline['missing_files']:
@@ -164,23 +348,30 @@ class TamperDetection:
             print(f"   Created: {self.baseline.get('created', 'Unknown')}")
             print(f"   Files: {self.baseline.get('total_files', 0)}")
             
+            self.load_cache()
             return True
             
         except Exception as e:
             print(f"❌ Error loading baseline: {e}", file=sys.stderr)
             return False
     
-    def verify_integrity(self) -> Dict[str, Any]:
+    def verify_integrity(self, verbose: bool = True) -> Dict[str, Any]:
         """
         Verify file integrity against baseline.
         
+        Args:
+            verbose: Print progress for every file
+            
         Returns:
             Dictionary containing verification results
         """
         if not self.baseline:
             raise ValueError("No baseline loaded. Load baseline first.")
         
-        print("\n🔍 Verifying file integrity...")
+        if verbose:
+            print("\n🔍 Verifying file integrity...")
+        
+        hashed_before, hits_before = self.files_hashed, self.cache_hits
         
         results = {
             'timestamp': datetime.utcnow().isoformat(),
@@ -194,64 +385,67 @@ class TamperDetection:
         }
         
         baseline_files = set(self.baseline.get('files', {}).keys())
-        current_files = set()
+        monitored_files = self.resolve_files()
+        
+        # Hash baseline files and newly matched files in one parallel pass
+        scanned = self.scan(sorted(baseline_files.union(monitored_files)))
         
         # Check each file in baseline
         for file_path_str, baseline_info in self.baseline.get('files', {}).items():
-            file_path = self.base_path / file_path_str
-            current_files.add(file_path_str)
+            info = scanned.get(file_path_str)
             results['total_files'] += 1
             
-            print(f"  Checking: {file_path_str}...", end='')
+            if verbose:
+                print(f"  Checking: {file_path_str}...", end='')
             
-            if not file_path.exists():
+            if info is None:
                 results['missing_files'].append({
                     'file': file_path_str,
                     'baseline_hash': baseline_info['hash']
                 })
                 results['status'] = 'TAMPERED'
-                print(" ❌ MISSING")
+                if verbose:
+                    print(" ❌ MISSING")
                 continue
             
-            current_hash = self.calculate_file_hash(file_path)
-            
-            if current_hash != baseline_info['hash']:
-                current_size = file_path.stat().st_size
-                current_modified = datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-                
+            if info['hash'] != baseline_info['hash']:
                 results['modified_files'].append({
                     'file': file_path_str,
                     'baseline_hash': baseline_info['hash'],
-                    'current_hash': current_hash,
+                    'current_hash': info['hash'],
                     'baseline_size': baseline_info.get('size'),
-                    'current_size': current_size,
+                    'current_size': info['size'],
                     'baseline_modified': baseline_info.get('modified'),
-                    'current_modified': current_modified
+                    'current_modified': info['modified']
                 })
                 results['status'] = 'TAMPERED'
-                print(" ⚠️  MODIFIED")
-            else:
+                if verbose:
+                    print(" ⚠️  MODIFIED")
+            elif verbose:
                 print(" ✅")
         
         # Check for new critical files not in baseline
-        for file_path_str in self.SECURITY_CRITICAL_FILES:
+        for file_path_str in monitored_files:
             if file_path_str not in baseline_files:
-                file_path = self.base_path / file_path_str
-                if file_path.exists():
-                    current_hash = self.calculate_file_hash(file_path)
+                info = scanned.get(file_path_str)
+                if info is not None:
                     results['new_files'].append({
                         'file': file_path_str,
-                        'current_hash': current_hash,
-                        'size': file_path.stat().st_size
+                        'current_hash': info['hash'],
+                        'size': info['size']
                     })
         
+        self.save_cache()
+        
         # Generate summary
         results['summary'] = {
             'total_checked': results['total_files'],
             'modified_count': len(results['modified_files']),
             'missing_count': len(results['missing_files']),
             'new_count': len(results['new_files']),
-            'integrity_intact': results['status'] == 'CLEAN'
+            'integrity_intact': results['status'] == 'CLEAN',
+            'hashed_count': self.files_hashed - hashed_before,
+            'cached_count': self.cache_hits - hits_before
         }
         
         return results
@@ -276,6 +470,8 @@ class TamperDetection:
         print(f"  Modified Files: {summary['modified_count']}")
         print(f"  Missing Files: {summary['missing_count']}")
         print(f"  New Files: {summary['new_count']}")
+        if 'hashed_count' in summary:
+            print(f"  Files Hashed: {summary['hashed_count']} ({summary['cached_count']} unchanged, skipped)")
         
         if results['modified_files']:
             print(f"\n⚠️  MODIFIED FILES ({len(results['modified_files'])}):")
@@ -345,6 +541,61 @@ class TamperDetection:
         self.create_baseline()
         print("✅ Baseline updated successfully")
         return True
+    
+    def watch(self,
+              interval: float = 5.0,
+              max_cycles: Optional[int] = None,
+              json_output: bool = False,
+              detailed: bool = False) -> Dict[str, Any]:
+        """
+        Re-verify integrity continuously.
+        
+        Each cycle stats every monitored file and hashes only files whose
+        stat signature changed. A report is printed on the first cycle and
+        whenever the set of findings changes.
+        
+        Args:
+            interval: Seconds between cycles
+            max_cycles: Stop after this many cycles (None runs until interrupted)
+            json_output: Print reports as JSON
+            detailed: Include detailed information in reports
+            
+        Returns:
+            Results of the last cycle
+        """
+        if not self.baseline:
+            raise ValueError("No baseline loaded. Load baseline first.")
+        
+        print(f"👀 Watching {len(self.resolve_files())} files every {interval}s (Ctrl+C to stop)")
+        
+        results: Dict[str, Any] = {}
+        last_findings = None
+        cycles = 0
+        
+        try:
+            while max_cycles is None or cycles < max_cycles:
+                results = self.verify_integrity(verbose=False)
+                cycles += 1
+                
+                findings = (
+                    tuple((f['file'], f['current_hash']) for f in results['modified_files']),
+                    tuple(f['file'] for f in results['missing_files']),
+                    tuple((f['file'], f['current_hash']) for f in results['new_files'])
+                )
+                if findings != last_findings:
+                    if json_output:
+                        print(json.dumps(results, indent=2))
+                    else:
+                        self.print_report(results, detailed=detailed)
+                    last_findings = findings
+                
+                if max_cycles is None or cycles < max_cycles:
+                    time.sleep(interval)
+        
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        
+        return results
 
 
 def main():
@@ -358,6 +609,9 @@ Examples:
   python tamper_detection.py                      # Verify integrity
   python tamper_detection.py --json               # JSON output
   python tamper_detection.py --update-baseline    # Update baseline
+  python tamper_detection.py --full               # Re-hash every file
+  python tamper_detection.py --watch --interval 10
+  python tamper_detection.py --include 'ats_mafia_framework/api/**/*.py'
         """
     )
     
@@ -399,12 +653,49 @@ Examples:
         help='Base directory path for the framework'
     )
     
+    parser.add_argument(
+        '--include',
+        action='append',
+        default=[],
+        metavar='PATTERN',
+        help='Additional file or glob to monitor (repeatable)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of files hashed concurrently'
+    )
+    
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Re-hash every file instead of skipping unchanged ones'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Re-verify continuously, hashing only changed files'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=5.0,
+        help='Seconds between watch cycles'
+    )
+    
     args = parser.parse_args()
     
     # Initialize tamper detection
     detector = TamperDetection(
         baseline_file=args.baseline_file,
-        base_path=args.base_path
+        base_path=args.base_path,
+        patterns=TamperDetection.SECURITY_CRITICAL_FILES + args.include,
+        workers=args.workers,
+        use_cache=not args.full
     )
     
     try:
@@ -427,7 +718,15 @@ Examples:
             if not detector.load_baseline():
                 sys.exit(1)
             
-            results = detector.verify_integrity()
+            if args.watch:
+                results = detector.watch(
+                    interval=args.interval,
+                    json_output=args.json,
+                    detailed=args.detailed
+                )
+                sys.exit(0 if results.get('status', 'CLEAN') == 'CLEAN' else 1)
+            
+            results = detector.verify_integrity(verbose=not args.json)
             
             if args.json:
                 print(json.dumps(results, indent=2))
@@ -0,0 +1,227 @@
+"""
+ATT&CK Knowledge Index Tests
+Tests search ranking and filtering of the ATT&CK index and invalidation of
+the compiled knowledge cache.
+"""
+
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from ..knowledge import attack_index
+from ..knowledge.attack_framework import ATTACKFramework
+from ..knowledge.attack_index import (
+    ATTACKIndex, CACHE_FORMAT, load_knowledge_cache, save_knowledge_cache
+)
+
+
+def technique(technique_id, name, description='', tactics=(), **extra):
+    """Build a parsed technique record."""
+    return dict(id=technique_id, name=name, description=description,
+                tactics=list(tactics), **extra)
+
+
+TECHNIQUES = {
+    'T1566': technique('T1566', 'Phishing', 'Adversaries send messages to gain access.',
+                       ['initial-access']),
+    'T1598': technique('T1598', 'Gather Victim Information',
+                       'Adversaries may use phishing to elicit information.',
+                       ['reconnaissance']),
+    'T1204': technique('T1204', 'User Execution', 'Relies on antiphishing gaps.',
+                       ['execution']),
+    'T1059': technique('T1059', 'Command and Scripting Interpreter',
+                       'Adversaries may abuse interpreters to execute commands.',
+                       ['execution']),
+    'T1000': technique('T1000', 'Legacy Phishing', 'Old phishing entry.',
+                       ['initial-access'], deprecated=True),
+}
+
+SUBTECHNIQUES = {
+    'T1566.001': technique('T1566.001', 'Phishing Attachment',
+                           'Adversaries send phishing messages with malicious attachments.',
+                           ['initial-access']),
+    'T1059.001': technique('T1059.001', 'PowerShell',
+                           'Adversaries may abuse PowerShell commands.',
+                           ['execution']),
+}
+
+
+class TestATTACKIndexSearch(unittest.TestCase):
+    """Test ranking, tactic filtering and sub-technique handling."""
+
+    def setUp(self):
+        self.index = ATTACKIndex.build(TECHNIQUES, SUBTECHNIQUES)
+
+    def test_match_kinds_rank_in_order(self):
+        """Name matches outrank description matches, which outrank infix matches."""
+        self.assertEqual(
+            self.index.search('phishing', include_subtechniques=False),
+            ['T1566', 'T1598', 'T1204']
+        )
+        self.assertEqual(
+            self.index.search('phish', include_subtechniques=False),
+            ['T1566', 'T1598', 'T1204']
+        )
+        # A term in both name and description outranks a name-only match
+        self.assertEqual(self.index.search('phishing')[:2], ['T1566.001', 'T1566'])
+        # "ishing" only matches inside terms
+        self.assertEqual(
+            set(self.index.search('ishing')),
+            {'T1566', 'T1566.001', 'T1598', 'T1204'}
+        )
+
+    def test_exact_beats_prefix_and_infix(self):
+        """An exact term scores above a prefix match, which scores above an infix match."""
+        index = ATTACKIndex.build({
+            'T0001': technique('T0001', 'Shell'),
+            'T0002': technique('T0002', 'Shellcode'),
+            'T0003': technique('T0003', 'Powershell'),
+        })
+        self.assertEqual(index.search('shell'), ['T0001', 'T0002', 'T0003'])
+        # Infix matching needs at least MIN_INFIX_LENGTH characters
+        self.assertEqual(index.search('sh'), ['T0001', 'T0002'])
+
+    def test_every_token_must_match(self):
+        """Multi-token queries return only techniques matching all tokens."""
+        self.assertEqual(self.index.search('phishing attachments'), ['T1566.001'])
+        self.assertEqual(self.index.search('phishing powershell'), [])
+        self.assertIsNone(self.index.search('  --  '))
+
+    def test_ids_are_searchable(self):
+        """Technique IDs are indexed as name tokens."""
+        self.assertEqual(self.index.search('t1059')[0], 'T1059')
+
+    def test_tactic_filter(self):
+        """The tactic filter matches shortnames case-insensitively."""
+        self.assertEqual(self.index.search('phishing', tactic='initial-access'), ['T1566.001', 'T1566'])
+        self.assertEqual(self.index.search('phishing', tactic='Initial-Access'), ['T1566.001', 'T1566'])
+        self.assertEqual(self.index.search('phishing', tactic='execution'), ['T1204'])
+        self.assertEqual(self.index.search('phishing', tactic='impact'), [])
+
+    def test_include_subtechniques(self):
+        """Sub-techniques are included by default and can be excluded."""
+        self.assertIn('T1059.001', self.index.search('abuse'))
+        self.assertEqual(self.index.search('abuse', include_subtechniques=False), ['T1059'])
+        self.assertEqual(self.index.techniques_for_tactic('execution'), ['T1204', 'T1059', 'T1059.001'])
+
+    def test_inactive_techniques_not_indexed(self):
+        """Deprecated and revoked techniques are left out of the index."""
+        self.assertNotIn('T1000', self.index.search('legacy') or [])
+        self.assertNotIn('T1000', self.index.techniques_for_tactic('initial-access'))
+
+    def test_limit_and_query_cache(self):
+        """Limits slice cached rankings without changing them."""
+        full = self.index.search('adversaries')
+        self.assertEqual(self.index.search('adversaries', limit=2), full[:2])
+        self.assertEqual(self.index.search('Adversaries'), full)
+        self.assertEqual(self.index.get_statistics()['cached_queries'], 1)
+
+    def test_state_round_trip(self):
+        """An index restored from its state ranks exactly like the original."""
+        restored = ATTACKIndex.from_state(pickle.loads(pickle.dumps(self.index.to_state())))
+        for query in ('phishing', 'abuse', 'ishing', 'shell'):
+            self.assertEqual(restored.search(query), self.index.search(query))
+
+
+class TestKnowledgeCache(unittest.TestCase):
+    """Test that the compiled knowledge cache is invalidated when it must be."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source = self.temp_dir / 'enterprise-attack.json'
+        self.cache = self.temp_dir / 'enterprise-attack.index.pkl'
+        self.source.write_text('{"objects": []}')
+        self.payload = {'version': '1', 'techniques': {'T1566': {'id': 'T1566'}}}
+        self.assertTrue(save_knowledge_cache(self.cache, self.source, self.payload))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _rewrite_header(self, **changes):
+        with open(self.cache, 'rb') as f:
+            header = pickle.load(f)
+            payload = pickle.load(f)
+        header.update(changes)
+        with open(self.cache, 'wb') as f:
+            pickle.dump(header, f)
+            pickle.dump(payload, f)
+
+    def _touch(self, offset_ns=10 ** 9):
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset_ns))
+
+    def test_unchanged_source_skips_hashing(self):
+        """An unchanged size and mtime are trusted without hashing the bundle."""
+        with patch.object(attack_index, 'hash_file', side_effect=AssertionError('hashed')):
+            self.assertEqual(load_knowledge_cache(self.cache, self.source), self.payload)
+
+    def test_missing_or_foreign_header(self):
+        """Missing caches, other formats and non-dict headers are ignored."""
+        self.assertIsNone(load_knowledge_cache(self.temp_dir / 'missing.pkl', self.source))
+
+        self._rewrite_header(format=CACHE_FORMAT + 1)
+        self.assertIsNone(load_knowledge_cache(self.cache, self.source))
+
+        with open(self.cache, 'wb') as f:
+            pickle.dump(['not', 'a', 'header'], f)
+        self.assertIsNone(load_knowledge_cache(self.cache, self.source))
+
+        self.cache.write_bytes(b'garbage')
+        self.assertIsNone(load_knowledge_cache(self.cache, self.source))
+
+    def test_size_change_invalidates(self):
+        """A bundle with a different size and content is re-parsed."""
+        self.source.write_text('{"objects": [{"type": "x-mitre-tactic"}]}')
+        self.assertIsNone(load_knowledge_cache(self.cache, self.source))
+
+    def test_mtime_change_with_same_content_is_kept(self):
+        """A touched but unchanged bundle is confirmed by its hash."""
+        self._touch()
+        self.assertEqual(load_knowledge_cache(self.cache, self.source), self.payload)
+
+    def test_sha_change_invalidates(self):
+        """Same size, new mtime and different content fails the hash check."""
+        self.source.write_text('{"objects": {}}')
+        self._touch()
+        self.assertIsNone(load_knowledge_cache(self.cache, self.source))
+
+        # A recorded hash that no longer matches is rejected as well
+        save_knowledge_cache(self.cache, self.source, self.payload)
+        self._rewrite_header(sha256='0' * 64, mtime_ns=0)
+        self.assertIsNone(load_knowledge_cache(self.cache, self.source))
+
+    def test_framework_reloads_from_cache(self):
+        """ATTACKFramework reuses its cache and ranks like a fresh parse."""
+        bundle = {'objects': [
+            {'type': 'x-mitre-collection', 'x_mitre_version': '15.1'},
+            {'type': 'attack-pattern', 'name': 'Phishing',
+             'description': 'Adversaries send phishing messages.',
+             'external_references': [{'external_id': 'T1566'}],
+             'kill_chain_phases': [{'kill_chain_name': 'mitre-attack', 'phase_name': 'initial-access'}]},
+            {'type': 'attack-pattern', 'name': 'Spearphishing Attachment',
+             'external_references': [{'external_id': 'T1566.001'}],
+             'kill_chain_phases': [{'kill_chain_name': 'mitre-attack', 'phase_name': 'initial-access'}]},
+        ]}
+        self.source.write_text(json.dumps(bundle))
+
+        fresh = ATTACKFramework(data_path=str(self.source), use_online=False)
+        self.assertFalse(fresh.loaded_from_cache)
+        cached = ATTACKFramework(data_path=str(self.source), use_online=False)
+        self.assertTrue(cached.loaded_from_cache)
+        self.assertEqual(cached.version, '15.1')
+        self.assertEqual(
+            [t['id'] for t in cached.search_techniques('phish')],
+            [t['id'] for t in fresh.search_techniques('phish')]
+        )
+
+        uncached = ATTACKFramework(data_path=str(self.source), use_online=False, use_cache=False)
+        self.assertFalse(uncached.loaded_from_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Configuration Settings Tests
+Tests data directory resolution and the profile loading settings.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from ..config.settings import FrameworkConfig
+from ..config.validator import ConfigValidator
+
+
+class TestDataPaths(unittest.TestCase):
+    """Test FrameworkConfig.resolve_data_path and the settings it serves."""
+
+    def test_defaults_resolve_under_data_dir(self):
+        """The default manifest directory lives under the data directory."""
+        config = FrameworkConfig()
+        self.assertEqual(config.data_dir, "data/")
+        self.assertEqual(config.resolve_data_path(config.manifest_dir), Path("data/cache"))
+
+    def test_absolute_and_empty_paths(self):
+        """Absolute paths are kept as-is and an empty path disables the feature."""
+        config = FrameworkConfig(data_dir="/srv/ats")
+        self.assertEqual(config.resolve_data_path("manifests"), Path("/srv/ats/manifests"))
+        self.assertEqual(config.resolve_data_path("/var/cache/ats"), Path("/var/cache/ats"))
+        self.assertIsNone(config.resolve_data_path(""))
+
+    def test_profile_settings_from_file(self):
+        """data_dir and the profile loading settings load from YAML and round-trip."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = Path(temp_dir) / "config.yaml"
+            config_path.write_text(yaml.safe_dump({
+                'core': {'data_dir': '/srv/ats'},
+                'profiles': {
+                    'lazy_loading': True,
+                    'load_workers': 8,
+                    'manifest_dir': 'manifests/'
+                }
+            }))
+            config = FrameworkConfig.from_file(config_path)
+
+        self.assertTrue(config.lazy_loading)
+        self.assertEqual(config.load_workers, 8)
+        self.assertEqual(config.resolve_data_path(config.manifest_dir), Path("/srv/ats/manifests"))
+
+        data = config._to_dict()
+        self.assertEqual(data['core']['data_dir'], '/srv/ats')
+        self.assertEqual(data['profiles']['manifest_dir'], 'manifests/')
+
+    def test_validator_checks_profile_settings(self):
+        """The validator rejects an empty data_dir and bad profile loading values."""
+        data = FrameworkConfig()._to_dict()
+        validator = ConfigValidator()
+        self.assertTrue(validator.validate(data))
+
+        data['core']['data_dir'] = ''
+        data['profiles']['load_workers'] = 0
+        data['profiles']['manifest_dir'] = None
+        self.assertFalse(validator.validate(data))
+        fields = {error.field for error in validator.get_errors()}
+        self.assertTrue({'core.data_dir', 'profiles.load_workers', 'profiles.manifest_dir'} <= fields)
+
+
+if __name__ == '__main__':
+    unittest.main()
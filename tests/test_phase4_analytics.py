@@ -7,29 +7,47 @@ training effectiveness, cost analytics, progress tracking, and reporting.
 
 import unittest
 import uuid
+import gc
+import asyncio
+import gzip
+import json
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
 from datetime import datetime, timezone, timedelta
 
 from ..core.performance_metrics import (
     PerformanceMetricsEngine, MetricType, SkillLevel, SessionPerformance,
-    PerformanceMetric
+    PerformanceMetric, BenchmarkEngine
 )
 from ..core.training_effectiveness import (
     TrainingEffectivenessTracker, LearningCurve, RecommendationType
 )
 from ..core.advanced_cost_analytics import (
-    AdvancedCostAnalytics, CostCategory, OptimizationType
+    AdvancedCostAnalytics, CostAnomalyDetector, CostCategory, OptimizationType
 )
 from ..core.progress_tracker import (
     ProgressTracker, Milestone, MilestoneType, Goal
 )
 from ..core.reporting_engine import (
-    ReportingEngine, ReportType, ReportFormat
+    Report, ReportingEngine, ReportType, ReportFormat
 )
 from ..core.analytics_aggregator import (
-    AnalyticsAggregator, AlertType, AlertPriority
+    AnalyticsAggregator, AlertManager, AlertType, AlertPriority
 )
 from ..core.cost_tracker import CostTracker
-from ..core.llm_models import ModelRegistry
+from ..core.llm_gateway import LLMGateway, LLMRequest, MockProvider, ProviderLimits
+from ..core.response_cache import ResponseCache, CacheScope
+from ..core.rollups import Resolution
+from ..core.llm_models import (
+    ModelRegistry, ModelSelector, ModelLoadBalancer, CircuitState,
+    LLMModel, ModelTier, ModelCapability
+)
+from ..analytics.technique_tracker import TechniqueTracker
+from ..analytics.attack_navigator import ATTACKNavigatorExporter
 
 
 class TestPerformanceMetrics(unittest.TestCase):
@@ -121,6 +139,144 @@ class TestPerformanceMetrics(unittest.TestCase):
         self.assertIn('strengths', analysis)
         self.assertIn('weaknesses', analysis)
         self.assertGreater(analysis['learning_velocity'], 0)
+    
+    def test_operator_indexes(self):
+        """Test indexed metric and session queries."""
+        self.engine.create_operator_profile(self.operator_id, "Test Operator")
+        self.engine.create_operator_profile("other_operator", "Other Operator")
+        
+        # Backdate a metric, moving it within the index
+        old = self.engine.record_metric(self.operator_id, "session_001", MetricType.SUCCESS_RATE, 0.4)
+        index = self.engine.metric_index[self.operator_id][MetricType.SUCCESS_RATE]
+        self.assertTrue(index.remove(old.timestamp, old))
+        old.timestamp = datetime.now(timezone.utc) - timedelta(days=3)
+        index.insert(old.timestamp, old)
+        
+        recent = self.engine.record_metric(self.operator_id, "session_002", MetricType.SUCCESS_RATE, 0.8)
+        accuracy = self.engine.record_metric(self.operator_id, "session_002", MetricType.STEALTH_RATING, 0.9)
+        self.engine.record_metric("other_operator", "session_003", MetricType.SUCCESS_RATE, 0.1)
+        
+        self.assertEqual(
+            self.engine.get_operator_metrics(self.operator_id),
+            [old, recent, accuracy]
+        )
+        self.assertEqual(
+            self.engine.get_operator_metrics(self.operator_id, MetricType.SUCCESS_RATE, timedelta(days=1)),
+            [recent]
+        )
+        self.assertEqual(
+            set(self.engine.get_operator_metrics_by_type(self.operator_id)),
+            {MetricType.SUCCESS_RATE, MetricType.STEALTH_RATING}
+        )
+        
+        def session(session_id, days_ago, score):
+            start = datetime.now(timezone.utc) - timedelta(days=days_ago)
+            return SessionPerformance(
+                session_id=session_id, operator_id=self.operator_id, scenario_id="scenario_001",
+                start_time=start, end_time=start + timedelta(hours=1), duration_seconds=3600,
+                success=True, score=score, cost=1.0
+            )
+        
+        for i in range(4):
+            self.engine.record_session_performance(session(f"session_{i}", i, 0.5))
+        
+        # Re-recording a session replaces its index entry
+        self.engine.record_session_performance(session("session_3", 0.5, 0.9))
+        
+        sessions = self.engine.get_operator_sessions(self.operator_id)
+        self.assertEqual([s.session_id for s in sessions],
+                         ["session_0", "session_3", "session_1", "session_2"])
+        self.assertEqual([s.session_id for s in self.engine.get_operator_sessions(self.operator_id, limit=2)],
+                         ["session_0", "session_3"])
+    
+    def test_benchmark_percentile_sketches(self):
+        """Test percentile ranks come from streaming sketches."""
+        scores = [0.2, 0.4, 0.4, 0.6, 0.8, 0.9]
+        self.engine.create_operator_profile(self.operator_id, "Test Operator", metadata={'cohort': 'red'})
+        
+        for i, score in enumerate(scores):
+            start = datetime.now(timezone.utc) - timedelta(hours=i)
+            self.engine.record_session_performance(SessionPerformance(
+                session_id=f"session_{i}", operator_id=self.operator_id, scenario_id="scenario_001",
+                start_time=start, end_time=start, duration_seconds=600, success=True,
+                score=score, cost=0.1, skills_practiced=["reconnaissance"]
+            ))
+        
+        benchmarks = self.engine.benchmark_engine
+        for value in [0.1, 0.4, 0.5, 0.9]:
+            expected = benchmarks.calculate_percentile_rank(value, scores)
+            self.assertAlmostEqual(benchmarks.get_percentile_rank(value), expected)
+            self.assertAlmostEqual(benchmarks.get_percentile_rank(value, 'cohort', 'red'), expected)
+            self.assertAlmostEqual(benchmarks.get_percentile_rank(value, 'skill', 'reconnaissance'), expected)
+        
+        # Sketches from separate shards merge into one distribution
+        shard = BenchmarkEngine()
+        shard.record_score(0.1, cohorts=["blue"])
+        benchmarks.merge_from(shard)
+        merged = benchmarks.merge_sketches([('cohort', 'red'), ('cohort', 'blue')])
+        self.assertEqual(len(merged), len(scores) + 1)
+        self.assertAlmostEqual(merged.percentile_rank(0.1), 100 / 7)
+        
+        
+        # Merging keeps the exact extremes of compressed shards
+        wide = BenchmarkEngine(compression=10)
+        for i in range(1000):
+            wide.record_score(i / 1000, cohorts=["green"])
+        benchmarks.merge_from(wide)
+        self.assertEqual(benchmarks.get_sketch('cohort', 'green').min, 0.0)
+        self.assertEqual(benchmarks.get_sketch('global').max, 0.999)
+        
+        # Metrics rank against their own type's distribution, not session scores
+        benchmarks.set_benchmark("recon", MetricType.SUCCESS_RATE, 0.5, context={'cohort': 'red'})
+        for i, value in enumerate([0.5, 0.7, 0.9]):
+            self.engine.record_metric(self.operator_id, f"session_{i}", MetricType.SUCCESS_RATE, value)
+        metric = self.engine.record_metric(self.operator_id, "session_0", MetricType.SUCCESS_RATE, 0.85)
+        comparison = benchmarks.compare_to_benchmark(metric, "recon")
+        self.assertEqual(comparison['comparison'], 'above_benchmark')
+        self.assertAlmostEqual(comparison['percentile_rank'], 75.0)
+        self.assertAlmostEqual(benchmarks.get_percentile_rank(0.85, 'cohort', 'red'), 100 * 5 / 6)
+        
+        benchmarks.set_benchmark("stealth", MetricType.STEALTH_RATING, 0.5, context={'cohort': 'red'})
+        metric = PerformanceMetric(
+            id="unsketched", timestamp=datetime.now(timezone.utc), metric_type=MetricType.STEALTH_RATING,
+            value=0.85, operator_id=self.operator_id, session_id="session_0"
+        )
+        self.assertNotIn('percentile_rank', benchmarks.compare_to_benchmark(metric, "stealth"))
+    
+    def test_analyze_team_performance(self):
+        """Test batched team analysis matches per-operator analysis."""
+        operator_ids = [f"team_operator_{n}" for n in range(4)]
+        
+        for n, operator_id in enumerate(operator_ids):
+            self.engine.create_operator_profile(operator_id, f"Operator {n}")
+            for i in range(3 + n):
+                start = datetime.now(timezone.utc) - timedelta(days=i)
+                self.engine.record_session_performance(SessionPerformance(
+                    session_id=f"{operator_id}_session_{i}",
+                    operator_id=operator_id,
+                    scenario_id="scenario_001",
+                    start_time=start,
+                    end_time=start + timedelta(hours=1),
+                    duration_seconds=3600,
+                    success=True,
+                    score=0.6 + ((i * n) % 4) * 0.05,
+                    cost=1.0
+                ))
+                self.engine.record_metric(
+                    operator_id, f"{operator_id}_session_{i}",
+                    MetricType.SUCCESS_RATE, 0.5 + i * 0.1 * n
+                )
+        
+        team = self.engine.analyze_team_performance(operator_ids + ["unknown_operator"])
+        
+        self.assertEqual(set(team), set(operator_ids))
+        for operator_id in operator_ids:
+            single = self.engine.analyze_operator_performance(operator_id)
+            self.assertAlmostEqual(team[operator_id]['learning_velocity'], single['learning_velocity'])
+            self.assertEqual(team[operator_id]['plateau_detected'], single['plateau_detected'])
+            self.assertEqual(team[operator_id]['trends'].keys(), single['trends'].keys())
+            for metric_type, trend in single['trends'].items():
+                self.assertEqual(team[operator_id]['trends'][metric_type]['direction'], trend['direction'])
 
 
 class TestTrainingEffectiveness(unittest.TestCase):
@@ -195,6 +351,10 @@ class TestTrainingEffectiveness(unittest.TestCase):
         
         curve = self.tracker.learning_curves[self.operator_id][skill]
         self.assertTrue(curve.is_plateaued())
+        
+        analysis = self.tracker.analyze_learning_curves([self.operator_id])
+        self.assertTrue(analysis[self.operator_id][skill]['plateaued'])
+        self.assertIsNone(analysis[self.operator_id][skill]['sessions_to_mastery'])
 
 
 class TestAdvancedCostAnalytics(unittest.TestCase):
@@ -267,6 +427,89 @@ class TestAdvancedCostAnalytics(unittest.TestCase):
         self.assertEqual(roi.skill_gains, 2)
         self.assertGreater(roi.cost_per_skill_level, 0)
         self.assertEqual(roi.certifications_earned, 1)
+    
+    def test_stream_usage_data(self):
+        """Test streaming usage export in CSV and JSON Lines."""
+        for i in range(3):
+            self.cost_tracker.record_usage(
+                usage_id=f"usage_{i}",
+                model="openai/gpt-4",
+                profile_id="profile_001",
+                session_id="session_001",
+                task_type="reconnaissance",
+                input_tokens=100,
+                output_tokens=50,
+                latency_ms=100,
+                success=False,
+                error_message="timeout, retrying"
+            )
+        
+        csv_export = ''.join(self.cost_tracker.stream_usage_data(format='csv', chunk_size=16))
+        self.assertEqual(len(csv_export.splitlines()), 4)
+        self.assertIn('"timeout, retrying"', csv_export)
+        
+        lines = ''.join(self.cost_tracker.stream_usage_data(format='jsonl')).splitlines()
+        self.assertEqual([json.loads(l)['id'] for l in lines], ["usage_0", "usage_1", "usage_2"])
+        
+        with self.assertRaises(ValueError):
+            self.cost_tracker.stream_usage_data(format='xml')
+    
+    def test_streaming_anomaly_detection(self):
+        """Test anomalies are raised as usage is recorded."""
+        alert_manager = AlertManager()
+        self.analytics.anomaly_detector.attach_alert_manager(alert_manager)
+        model = list(self.registry.models.values())[0].get_full_name()
+        
+        def record(usage_id, output_tokens, success=True):
+            self.cost_tracker.record_usage(
+                usage_id=usage_id,
+                model=model,
+                profile_id="profile_001",
+                session_id="session_001",
+                task_type="reconnaissance",
+                input_tokens=100,
+                output_tokens=output_tokens,
+                latency_ms=100,
+                success=success
+            )
+        
+        for i in range(12):
+            record(f"usage_{i}", 50 + i % 3)
+        self.assertEqual(self.analytics.anomaly_detector.get_current_anomalies(), ())
+        
+        record("usage_expensive", 5000)
+        anomalies = {a['type']: a for a in self.analytics.anomaly_detector.detect_anomalies()}
+        self.assertEqual(anomalies['expensive_requests']['examples'][0]['id'], "usage_expensive")
+        self.assertIn('model_cost_deviation', anomalies)
+        
+        for i in range(3):
+            record(f"usage_failed_{i}", 50, success=False)
+        anomalies = {a['type']: a for a in self.analytics.anomaly_detector.detect_anomalies()}
+        self.assertGreater(anomalies['high_error_rate']['error_rate'], 0.1)
+        
+        # Each anomaly alerts once when opened, not on every matching record
+        alert_types = [a.details['type'] for a in alert_manager.get_active_alerts()]
+        self.assertEqual(sorted(alert_types), sorted(set(alert_types)))
+        self.assertIn('high_error_rate', alert_types)
+        self.assertTrue(all(a.alert_type == AlertType.ANOMALY_DETECTED
+                            for a in alert_manager.get_active_alerts()))
+    
+    def test_anomaly_detector_unsubscribes(self):
+        """Test detectors stop following the tracker when closed or discarded."""
+        listeners = len(self.cost_tracker.usage_listeners)
+        
+        for _ in range(3):
+            AdvancedCostAnalytics(self.cost_tracker)
+        gc.collect()
+        self.assertEqual(len(self.cost_tracker.usage_listeners), listeners)
+        
+        with CostAnomalyDetector(self.cost_tracker) as detector:
+            self.assertEqual(len(self.cost_tracker.usage_listeners), listeners + 1)
+        self.assertEqual(len(self.cost_tracker.usage_listeners), listeners)
+        detector.close()
+        
+        self.analytics.close()
+        self.assertEqual(self.cost_tracker.usage_listeners, [])
 
 
 class TestProgressTracker(unittest.TestCase):
@@ -297,6 +540,52 @@ class TestProgressTracker(unittest.TestCase):
         self.assertGreater(len(achievements), 0)
         self.assertEqual(achievements[0].milestone_id, "milestone_first_session")
     
+    def test_milestone_changed_attributes(self):
+        """Test only milestones depending on changed attributes are evaluated."""
+        self.tracker.register_milestone(Milestone(
+            id="milestone_recon_advanced",
+            name="Recon Specialist",
+            description="Reach advanced reconnaissance",
+            milestone_type=MilestoneType.SKILL_MILESTONE,
+            requirements={'skill_name': 'reconnaissance', 'level': 'advanced'},
+            xp_reward=50
+        ))
+        
+        operator_data = {
+            'total_sessions': 12,
+            'total_hours': 0,
+            'skills': {'reconnaissance': {'proficiency': 'expert'}},
+            'certifications': []
+        }
+        
+        achievements = self.tracker.check_and_award_milestones(
+            self.operator_id, operator_data, changed_attributes=['skills.reconnaissance']
+        )
+        self.assertEqual([a.milestone_id for a in achievements], ["milestone_recon_advanced"])
+        
+        achievements = self.tracker.check_and_award_milestones(
+            self.operator_id, operator_data, changed_attributes=['total_sessions']
+        )
+        self.assertEqual(
+            [a.milestone_id for a in achievements],
+            ["milestone_first_session", "milestone_10_sessions"]
+        )
+        
+        # Nothing new once thresholds have been passed
+        self.assertEqual(self.tracker.check_and_award_milestones(self.operator_id, operator_data), [])
+    
+    def test_batch_milestone_evaluation(self):
+        """Test milestone evaluation across many operators."""
+        awarded = self.tracker.check_and_award_milestones_batch({
+            'op_a': {'total_sessions': 30},
+            'op_b': {'total_hours': 60},
+            'op_c': {'total_sessions': 0}
+        })
+        
+        self.assertEqual(len(awarded['op_a']), 3)
+        self.assertEqual(len(awarded['op_b']), 2)
+        self.assertNotIn('op_c', awarded)
+    
     def test_goal_tracking(self):
         """Test goal creation and tracking."""
         goal = self.tracker.goal_tracker.create_goal(
@@ -427,6 +716,522 @@ class TestReportingEngine(unittest.TestCase):
         
         self.assertIsInstance(md_export, str)
         self.assertIn('#', md_export)  # Should have markdown headers
+    
+    def test_stream_report_matches_fixed_output(self):
+        """Test streamed and exported reports match the fixed serializer output."""
+        report = Report(
+            id="report_fixture",
+            report_type=ReportType.OPERATOR_PROGRESS,
+            title="Fixture Report",
+            description="Fixed data for serializer tests",
+            generated_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            generated_by="tests",
+            data={
+                'operator_id': 'op_1',
+                'summary': {'level': 3, 'skills': {}},
+                'recent_sessions': [{'session_id': 's1', 'score': 0.5}, 'retake'],
+                'certifications': []
+            }
+        )
+        self.reporting.reports[report.id] = report
+        
+        # Output of the serializers before streaming was introduced
+        expected = {
+            ReportFormat.JSON: json.dumps(report.to_dict(), indent=2),
+            ReportFormat.CSV: (
+                'operator_id,summary,recent_sessions,certifications\r\n'
+                'op_1,"{\'level\': 3, \'skills\': {}}",'
+                '"[{\'session_id\': \'s1\', \'score\': 0.5}, \'retake\']",[]\r\n'
+            ),
+            ReportFormat.MARKDOWN: (
+                '# Fixture Report\n\n'
+                'Fixed data for serializer tests\n\n'
+                '**Generated:** 2026-01-02 03:04:05 UTC\n\n'
+                '**Report ID:** report_fixture\n\n'
+                '---\n\n'
+                '## Report Data\n\n'
+                '### Operator Id\n\nop_1\n\n'
+                '### Summary\n\n#### Level\n\n3\n\n#### Skills\n\n\n'
+                '### Recent Sessions\n\n#### Session Id\n\ns1\n\n#### Score\n\n0.5\n\n- retake\n\n'
+                '### Certifications\n'
+            )
+        }
+        
+        for fmt, output in expected.items():
+            chunks = list(self.reporting.stream_report(report.id, fmt, chunk_size=16))
+            self.assertEqual(''.join(chunks), output)
+            self.assertEqual(self.reporting.export_report(report.id, fmt), output)
+        
+        self.assertGreater(len(list(self.reporting.stream_report(report.id, ReportFormat.JSON, chunk_size=16))), 1)
+        
+        html_export = ''.join(self.reporting.stream_report(report.id, ReportFormat.HTML, chunk_size=16))
+        self.assertTrue(html_export.startswith('\n<!DOCTYPE html>\n<html>\n<head>\n    <title>Fixture Report</title>'))
+        self.assertIn(
+            '<pre>' + json.dumps(report.data, indent=2).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            + '</pre>\n</body>\n</html>\n',
+            html_export
+        )
+        
+        self.assertEqual(
+            self.reporting.export_report(report.id, ReportFormat.JSONL).splitlines(),
+            [
+                json.dumps({k: v for k, v in report.to_dict().items() if k != 'data'}),
+                '{"section": "operator_id", "record": "op_1"}',
+                '{"section": "summary", "record": {"level": 3, "skills": {}}}',
+                '{"section": "recent_sessions", "record": {"session_id": "s1", "score": 0.5}}',
+                '{"section": "recent_sessions", "record": "retake"}'
+            ]
+        )
+    
+    def test_export_report_to_gzip_file(self):
+        """Test streaming a report to a gzip-compressed file."""
+        self.perf_engine.create_operator_profile(self.operator_id, "Test Operator")
+        report = self.reporting.generate_report(
+            ReportType.OPERATOR_PROGRESS,
+            operator_id=self.operator_id
+        )
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = Path(tmp_dir) / "report.json.gz"
+            self.reporting.export_report_to_file(
+                report.id, ReportFormat.JSON, output_path, compress=True
+            )
+            
+            with gzip.open(output_path, 'rt', encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['id'], report.id)
+
+
+class TestModelSelection(unittest.TestCase):
+    """Test model selection, memoization and load balancing."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.registry = ModelRegistry()
+        self.selector = ModelSelector(self.registry)
+    
+    def _make_model(self, name: str, reasoning_score: float) -> LLMModel:
+        """Create a premium exploitation model."""
+        return LLMModel(
+            name=name,
+            provider="test",
+            display_name=name,
+            tier=ModelTier.PREMIUM,
+            capabilities=[ModelCapability.REASONING],
+            cost_per_1k_input_tokens=0.001,
+            cost_per_1k_output_tokens=0.002,
+            context_window=8192,
+            reasoning_score=reasoning_score,
+            speed_score=0.5,
+            recommended_for=["exploitation"]
+        )
+    
+    def test_recommended_models_sorted_and_filtered(self):
+        """Test recommended models come from the candidate tables."""
+        models = self.registry.get_recommended_models(
+            "exploitation", max_cost_per_request=0.05
+        )
+        
+        scores = [m.reasoning_score for m in models]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        for model in models:
+            self.assertIn("exploitation", model.recommended_for)
+            self.assertLessEqual(model.calculate_cost(2000, 500), 0.05)
+    
+    def test_selection_memo_invalidated_by_catalog_change(self):
+        """Test memoized selections are dropped when the catalog changes."""
+        first = self.selector.select_model("exploitation")
+        self.assertIs(self.selector.select_model("exploitation"), first)
+        self.assertEqual(self.selector.get_statistics()['memo_hits'], 1)
+        
+        best = self._make_model("best", 1.0)
+        self.registry.register_model(best)
+        self.assertIs(self.selector.select_model("exploitation"), best)
+        
+        self.registry.unregister_model("test", "best")
+        self.assertIs(self.selector.select_model("exploitation"), first)
+    
+    def test_circuit_breaker_ejects_and_recovers(self):
+        """Test failing models are ejected and recover through half-open."""
+        models = list(self.registry.models.values())[:2]
+        failing = models[0].get_full_name()
+        balancer = ModelLoadBalancer(models, min_requests=3, open_timeout=60.0)
+        
+        for _ in range(3):
+            balancer.record_result(failing, latency_ms=100, success=False)
+        
+        health = balancer.get_statistics()['model_health'][failing]
+        self.assertEqual(health['circuit_state'], CircuitState.OPEN.value)
+        for _ in range(4):
+            self.assertIsNot(balancer.select_next_model(), models[0])
+        
+        # After the timeout a single probe is allowed; success closes the circuit
+        balancer.open_timeout = 0.0
+        probes = [balancer.select_next_model() for _ in range(2)]
+        self.assertEqual(probes.count(models[0]), 1)
+        balancer.record_result(failing, latency_ms=50, success=True)
+        self.assertEqual(balancer.health[failing].circuit_state, CircuitState.CLOSED)
+    
+    def test_half_open_waits_for_probe(self):
+        """Test only the probe's completion settles a half-open circuit."""
+        models = list(self.registry.models.values())[:1]
+        name = models[0].get_full_name()
+        balancer = ModelLoadBalancer(models, min_requests=3, open_timeout=0.0)
+        
+        # Requests dispatched before the circuit opened
+        for i in range(5):
+            self.assertIs(balancer.select_next_model(request_id=f"stale_{i}"), models[0])
+        for i in range(3):
+            balancer.record_result(name, latency_ms=100, success=False, request_id=f"stale_{i}")
+        self.assertEqual(balancer.health[name].circuit_state, CircuitState.OPEN)
+        
+        self.assertIs(balancer.select_next_model(request_id="probe"), models[0])
+        self.assertIsNone(balancer.select_next_model(request_id="other"))
+        
+        # Stale completions neither close nor reopen the circuit, nor free the probe slot
+        balancer.record_result(name, latency_ms=100, success=True, request_id="stale_3")
+        balancer.release(name, request_id="stale_4")
+        health = balancer.health[name]
+        self.assertEqual(health.circuit_state, CircuitState.HALF_OPEN)
+        self.assertTrue(health.probe_in_flight)
+        self.assertEqual(health.in_flight, 1)
+        
+        # Releasing the probe lets a new one through; its failure reopens
+        balancer.release(name, request_id="probe")
+        self.assertIs(balancer.select_next_model(request_id="probe_2"), models[0])
+        balancer.record_result(name, latency_ms=100, success=False, request_id="probe_2")
+        self.assertEqual(health.circuit_state, CircuitState.OPEN)
+        self.assertEqual(health.trips, 2)
+        
+        # A probe reported through the CostTracker feed is matched by usage ID
+        cost_tracker = CostTracker(self.registry)
+        balancer.attach_cost_tracker(cost_tracker)
+        self.assertIs(balancer.select_next_model(request_id="usage_probe"), models[0])
+        cost_tracker.record_usage(
+            usage_id="usage_probe", model=name, profile_id="profile_001",
+            session_id="session_001", task_type="reconnaissance",
+            input_tokens=100, output_tokens=50, latency_ms=80, success=True
+        )
+        self.assertEqual(health.circuit_state, CircuitState.CLOSED)
+        balancer.detach_cost_tracker()
+    
+    def test_balancer_consumes_cost_tracker_feed(self):
+        """Test the balancer tracks latency and in-flight from CostTracker."""
+        models = list(self.registry.models.values())[:2]
+        cost_tracker = CostTracker(self.registry)
+        balancer = ModelLoadBalancer(models, strategy="ewma_latency")
+        balancer.attach_cost_tracker(cost_tracker)
+        
+        for i in range(10):
+            model = balancer.select_next_model()
+            cost_tracker.record_usage(
+                usage_id=f"usage_{i}",
+                model=model.get_full_name(),
+                profile_id="profile_001",
+                session_id="session_001",
+                task_type="reconnaissance",
+                input_tokens=100,
+                output_tokens=50,
+                latency_ms=200,
+                success=True
+            )
+        
+        stats = balancer.get_statistics()
+        self.assertEqual(stats['total_requests'], 10)
+        for health in stats['model_health'].values():
+            self.assertEqual(health['in_flight'], 0)
+        self.assertTrue(any(
+            health['ewma_latency_ms'] == 200 for health in stats['model_health'].values()
+        ))
+        
+        # Cache hits free the slot but do not feed latency or the circuit breaker
+        model = balancer.select_next_model()
+        name = model.get_full_name()
+        before = stats['model_health'][name]['ewma_latency_ms']
+        outcomes = len(balancer.health[name].outcomes)
+        cost_tracker.record_usage(
+            usage_id="usage_cached", model=name, profile_id="profile_001",
+            session_id="session_001", task_type="reconnaissance",
+            input_tokens=100, output_tokens=50, latency_ms=0.0, cache_hit=True
+        )
+        health = balancer.get_statistics()['model_health'][name]
+        self.assertEqual(health['in_flight'], 0)
+        self.assertEqual(health['ewma_latency_ms'], before)
+        self.assertEqual(len(balancer.health[name].outcomes), outcomes)
+        
+        balancer.detach_cost_tracker()
+        self.assertEqual(cost_tracker.usage_listeners, [])
+
+
+class TestLLMGateway(unittest.TestCase):
+    """Test the LLM request gateway with the mock provider."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.registry = ModelRegistry()
+        self.cost_tracker = CostTracker(self.registry)
+        self.model = list(self.registry.models.values())[0]
+    
+    def _run(self, limits: ProviderLimits, count: int):
+        """Send ``count`` requests through a fresh gateway."""
+        gateway = LLMGateway(self.cost_tracker)
+        gateway.register_provider(
+            MockProvider(latency_distribution="uniform", time_scale=0.0, seed=7),
+            limits,
+            model_providers=["*"]
+        )
+        requests = [
+            LLMRequest(model=self.model, prompt=f"briefing {i}", session_id="session_001")
+            for i in range(count)
+        ]
+        
+        async def send():
+            responses = await gateway.submit_many(requests)
+            await gateway.close()
+            return responses
+        
+        return gateway, asyncio.run(send())
+    
+    def test_micro_batching_records_usage(self):
+        """Test batched requests are deterministic and recorded as usage."""
+        _, single = self._run(ProviderLimits(max_batch_size=1), 20)
+        gateway, batched = self._run(ProviderLimits(max_batch_size=8, batch_window_ms=1), 20)
+        
+        self.assertEqual(
+            [r.output_tokens for r in single],
+            [r.output_tokens for r in batched]
+        )
+        stats = gateway.get_statistics()['providers']['mock']
+        self.assertEqual(stats['requests'], 20)
+        self.assertLess(stats['calls'], 20)
+        self.assertEqual(len(self.cost_tracker.usage_records), 40)
+        self.assertGreater(self.cost_tracker.get_session_cost("session_001"), 0)
+    
+    def test_concurrency_cap(self):
+        """Test the provider never sees more concurrent calls than allowed."""
+        provider = MockProvider(latency_distribution="constant", time_scale=0.0)
+        peak = {'current': 0, 'max': 0}
+        original = provider.complete
+        
+        async def tracked(request):
+            peak['current'] += 1
+            peak['max'] = max(peak['max'], peak['current'])
+            await asyncio.sleep(0.001)
+            try:
+                return await original(request)
+            finally:
+                peak['current'] -= 1
+        
+        provider.complete = tracked
+        gateway = LLMGateway()
+        gateway.register_provider(provider, ProviderLimits(max_concurrency=3), model_providers=["*"])
+        
+        requests = [LLMRequest(model=self.model, prompt=str(i)) for i in range(15)]
+        responses = asyncio.run(gateway.submit_many(requests))
+        
+        self.assertEqual(len(responses), 15)
+        self.assertTrue(all(r.success for r in responses))
+        self.assertEqual(peak['max'], 3)
+    
+    def test_response_cache_records_savings(self):
+        """Test cache hits skip the provider and are recorded as savings."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ResponseCache(cache_dir=cache_dir, scope=CacheScope.PROFILE)
+            gateway = LLMGateway(self.cost_tracker, response_cache=cache)
+            provider = MockProvider(time_scale=0.0)
+            gateway.register_provider(provider, model_providers=["*"])
+            
+            def request(prompt, profile_id="profile_001"):
+                return LLMRequest(model=self.model, prompt=prompt,
+                                  profile_id=profile_id, session_id="session_001")
+            
+            first = asyncio.run(gateway.submit(request("Scenario  briefing")))
+            second = asyncio.run(gateway.submit(request(" Scenario briefing\n")))
+            other_profile = asyncio.run(gateway.submit(request("Scenario briefing", "profile_002")))
+            
+            self.assertFalse(first.cache_hit)
+            self.assertTrue(second.cache_hit)
+            self.assertEqual(second.text, first.text)
+            self.assertFalse(other_profile.cache_hit)
+            self.assertEqual(provider.calls, 2)
+            
+            hit_record = self.cost_tracker.usage_records[1]
+            self.assertEqual(hit_record.cost, 0.0)
+            self.assertGreater(hit_record.saved_cost, 0.0)
+            
+            analytics = AdvancedCostAnalytics(self.cost_tracker)
+            savings = analytics.get_cache_savings()
+            self.assertEqual(savings['cache_hits'], 1)
+            self.assertEqual(savings['total_requests'], 3)
+            self.assertAlmostEqual(savings['saved_cost'], hit_record.saved_cost)
+            self.assertEqual(savings['saved_tokens'], hit_record.input_tokens + hit_record.output_tokens)
+            self.assertEqual(analytics.get_cache_savings(session_id="session_002")['total_requests'], 0)
+            
+            # Served from the rollups without taking the tracker lock
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                with self.cost_tracker.lock:
+                    summary = executor.submit(analytics.get_cache_savings, "session_001").result(timeout=5)
+            self.assertEqual(summary, savings)
+            
+            # A fresh cache over the same directory is served from disk
+            reloaded = ResponseCache(cache_dir=cache_dir, scope=CacheScope.PROFILE)
+            self.assertIsNotNone(reloaded.get(request("Scenario briefing")))
+            self.assertIsNotNone(asyncio.run(reloaded.get_async(request("Scenario briefing", "profile_002"))))
+            self.assertEqual(reloaded.get_statistics()['disk_hits'], 2)
+    
+    def test_budget_admission_control(self):
+        """Test concurrent reservations never overshoot a budget."""
+        model_name = self.model.get_full_name()
+        
+        # The predictor learns completion lengths from history
+        for i in range(10):
+            self.cost_tracker.record_usage(
+                usage_id=f"hist_{i}", model=model_name, profile_id="profile_001",
+                session_id="history", task_type="general",
+                input_tokens=100, output_tokens=200, latency_ms=10.0
+            )
+        self.assertEqual(self.cost_tracker.output_predictor.predict(model_name, "general"), 200)
+        
+        estimate = self.cost_tracker.estimate_request_cost(model_name, 1000, "general")
+        self.cost_tracker.set_session_budget("session_001", estimate * 5.5)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            reservations = list(executor.map(
+                lambda _: self.cost_tracker.reserve_budget(
+                    model_name, "session_001", "profile_001", 1000, "general"
+                ),
+                range(20)
+            ))
+        
+        granted = [r for r in reservations if r is not None]
+        self.assertEqual(len(granted), 5)
+        self.assertFalse(self.cost_tracker.reserve_budget(
+            model_name, "session_001", "profile_001", 1000, "general"
+        ))
+        
+        for i, reservation in enumerate(granted):
+            self.cost_tracker.settle_reservation(
+                reservation.id, f"settled_{i}", input_tokens=1000,
+                output_tokens=100, latency_ms=10.0
+            )
+        
+        self.assertEqual(self.cost_tracker.reservations, {})
+        self.assertLessEqual(self.cost_tracker.get_session_cost("session_001"), estimate * 5.5)
+        self.assertEqual(self.cost_tracker.stats['admissions_denied'], 16)
+        
+        # The gateway fails denied requests without a provider call
+        provider = MockProvider(time_scale=0.0)
+        gateway = LLMGateway(self.cost_tracker, enforce_budgets=True)
+        gateway.register_provider(provider, model_providers=["*"])
+        self.cost_tracker.set_session_budget("session_002", 0.0)
+        response = asyncio.run(gateway.submit(
+            LLMRequest(model=self.model, prompt="briefing", session_id="session_002")
+        ))
+        
+        self.assertFalse(response.success)
+        self.assertEqual(provider.calls, 0)
+        self.assertEqual(gateway.get_statistics()['budget_denials'], 1)
+    
+    def test_settle_reservation_outside_lock(self):
+        """Test settling notifies listeners without holding the tracker lock."""
+        model_name = self.model.get_full_name()
+        reservation = self.cost_tracker.reserve_budget(
+            model_name, "session_001", "profile_001", 1000, "general"
+        )
+        
+        # Admission checks do not create empty reservation entries
+        self.cost_tracker.release_reservation(reservation.id)
+        self.assertEqual(dict(self.cost_tracker.session_reserved), {})
+        self.assertEqual(dict(self.cost_tracker.profile_reserved), {})
+        
+        lock_free = []
+        
+        def try_lock():
+            acquired = self.cost_tracker.lock.acquire(timeout=1.0)
+            if acquired:
+                self.cost_tracker.lock.release()
+            return acquired
+        
+        def listener(metrics):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                lock_free.append(executor.submit(try_lock).result())
+        
+        self.cost_tracker.add_usage_listener(listener)
+        reservation = self.cost_tracker.reserve_budget(
+            model_name, "session_001", "profile_001", 1000, "general"
+        )
+        cost = self.cost_tracker.settle_reservation(
+            reservation.id, "settled", input_tokens=1000, output_tokens=100, latency_ms=10.0
+        )
+        
+        self.assertGreater(cost, 0.0)
+        self.assertEqual(lock_free, [True])
+        self.assertEqual(self.cost_tracker.reservations, {})
+    
+    def test_settle_reservation_is_atomic(self):
+        """Test an admission racing a settlement sees the hold or the spend."""
+        model_name = self.model.get_full_name()
+        estimate = self.cost_tracker.estimate_request_cost(model_name, 1000, "general")
+        self.cost_tracker.set_session_budget("session_001", estimate * 1.5)
+        reservation = self.cost_tracker.reserve_budget(
+            model_name, "session_001", "profile_001", 1000, "general"
+        )
+        
+        admitted, threads = [], []
+        original = self.cost_tracker.release_reservation
+        
+        def release_then_race(reservation_id):
+            released = original(reservation_id)
+            thread = threading.Thread(target=lambda: admitted.append(self.cost_tracker.reserve_budget(
+                model_name, "session_001", "profile_001", 1000, "general"
+            )))
+            thread.start()
+            # Give the racing admission the chance to run inside the settle window
+            thread.join(0.2)
+            threads.append(thread)
+            return released
+        
+        with patch.object(self.cost_tracker, 'release_reservation', side_effect=release_then_race):
+            self.cost_tracker.settle_reservation(
+                reservation.id, "settled", input_tokens=1000,
+                output_tokens=reservation.estimated_output_tokens, latency_ms=10.0
+            )
+        
+        threads[0].join(5)
+        self.assertEqual(admitted, [None])
+        self.assertLessEqual(self.cost_tracker.get_session_cost("session_001"), estimate * 1.5)
+        self.assertEqual(self.cost_tracker.reservations, {})
+    
+    def test_failed_execution_releases_reservations(self):
+        """Test reservations are released when execution raises before usage is recorded."""
+        self.cost_tracker.set_session_budget("session_001", 100.0)
+        
+        for limits in (ProviderLimits(max_batch_size=1), ProviderLimits(max_batch_size=4, batch_window_ms=1)):
+            gateway = LLMGateway(self.cost_tracker, enforce_budgets=True)
+            gateway.register_provider(MockProvider(time_scale=0.0), limits, model_providers=["*"])
+            
+            async def fail(slot, requests):
+                raise RuntimeError("provider connection lost")
+            
+            gateway._execute = fail
+            requests = [
+                LLMRequest(model=self.model, prompt=f"briefing {i}", session_id="session_001")
+                for i in range(3)
+            ]
+            
+            async def send():
+                try:
+                    return await asyncio.gather(
+                        *(gateway.submit(r) for r in requests), return_exceptions=True
+                    )
+                finally:
+                    await gateway.close()
+            
+            results = asyncio.run(send())
+            
+            self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+            self.assertEqual(self.cost_tracker.reservations, {})
+            self.assertEqual(gateway.get_statistics()['outstanding_reservations'], 0)
+            self.assertEqual(self.cost_tracker.get_session_cost("session_001"), 0.0)
 
 
 class TestAnalyticsAggregator(unittest.TestCase):
@@ -455,6 +1260,44 @@ class TestAnalyticsAggregator(unittest.TestCase):
         self.assertIn('xp_leaderboard', dashboard)
         self.assertIn('active_alerts', dashboard)
     
+    def test_rollup_trends(self):
+        """Test trends answered from rollups match the raw sessions."""
+        now = datetime.now(timezone.utc)
+        
+        def record(session_id, operator_id, days_ago, score):
+            start = now - timedelta(days=days_ago, minutes=1)
+            self.perf_engine.record_session_performance(SessionPerformance(
+                session_id=session_id, operator_id=operator_id, scenario_id="scenario_001",
+                start_time=start, end_time=start + timedelta(minutes=30), duration_seconds=1800,
+                success=score >= 0.5, score=score, cost=0.5
+            ))
+        
+        for i in range(9):
+            record(f"session_{i}", f"operator_{i % 2}", i % 3, 0.3 + i * 0.05)
+        
+        # Replacing a session retracts its old totals
+        record("session_0", "operator_0", 0, 0.9)
+        
+        expected = defaultdict(list)
+        for session in self.perf_engine.session_performances.values():
+            if session.operator_id == "operator_0":
+                expected[session.start_time.date().isoformat()].append(session.score)
+        
+        trend = self.aggregator.trend_calculator.calculate_performance_trend("operator_0")
+        self.assertEqual(
+            [(dp['date'], dp['average_score'], dp['session_count']) for dp in trend['data_points']],
+            [(date, round(sum(scores) / len(scores), 3), len(scores))
+             for date, scores in sorted(expected.items())]
+        )
+        
+        # Fine buckets are compacted once they age out; coarse buckets keep the totals
+        rollups = self.perf_engine.session_rollups
+        self.assertEqual(rollups.choose_resolution(timedelta(days=30)), Resolution.DAY)
+        rollups.compact(now + timedelta(days=1))
+        self.assertEqual(rollups.get_statistics()['buckets']['minute'], 0)
+        total = rollups.query(timedelta(days=30)).get(())
+        self.assertEqual(total.values['sessions'], 9)
+    
     def test_metric_caching(self):
         """Test metric caching."""
         # Get a metric (should calculate and cache)
@@ -485,6 +1328,191 @@ class TestAnalyticsAggregator(unittest.TestCase):
         self.assertTrue(alert.acknowledged)
 
 
+class _StubATTACK:
+    """Minimal ATT&CK lookup for technique tracking tests."""
+    
+    TECHNIQUES = {
+        'T1059': {'id': 'T1059', 'name': 'Command and Scripting Interpreter', 'tactics': ['execution']},
+        'T1566': {'id': 'T1566', 'name': 'Phishing', 'tactics': ['initial-access']},
+    }
+    
+    def __init__(self):
+        self.coverage_calls = 0
+    
+    def get_technique(self, technique_id):
+        return self.TECHNIQUES.get(technique_id)
+    
+    def validate_technique_coverage(self, technique_ids):
+        self.coverage_calls += 1
+        return {'covered_techniques': sorted(technique_ids)}
+
+
+class TestTechniqueTracker(unittest.TestCase):
+    """Test journaled technique tracking and aggregates."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage_path = str(Path(self.temp_dir.name) / 'executions.json')
+        self.attack = _StubATTACK()
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _tracker(self, **kwargs):
+        return TechniqueTracker(self.attack, storage_path=self.storage_path, **kwargs)
+    
+    def test_aggregates_and_journal_replay(self):
+        """Aggregates match the history and survive a restart from the journal."""
+        tracker = self._tracker(snapshot_interval=100)
+        tracker.record_technique('T1059', 'agent_a', 'session_1', True, False, 2.0)
+        tracker.record_technique('T1059', 'agent_b', 'session_1', False, True, 4.0)
+        tracker.record_technique('T1566', 'agent_a', 'session_2', True, True, 6.0)
+        tracker.record_technique('T9999', 'agent_a', 'session_2', True, False, 1.0)
+        
+        stats = tracker.get_technique_statistics('T1059')
+        self.assertEqual(stats['total_executions'], 2)
+        self.assertEqual(stats['success_rate'], 0.5)
+        self.assertEqual(stats['detection_count'], 1)
+        self.assertEqual(stats['average_execution_time'], 3.0)
+        self.assertEqual(stats['unique_agents'], 2)
+        
+        coverage = tracker.get_agent_coverage('agent_a')
+        self.assertEqual(coverage['total_executions'], 2)
+        self.assertEqual(coverage['covered_techniques'], ['T1059', 'T1566'])
+        
+        # Coverage is recomputed only when the technique set grows
+        tracker.get_session_coverage('session_1')
+        tracker.get_session_coverage('session_1')
+        self.assertEqual(self.attack.coverage_calls, 2)
+        
+        # Nothing was snapshotted yet; everything lives in the journal
+        self.assertFalse(Path(self.storage_path).exists())
+        before = tracker.get_all_statistics()
+        tracker._journal.close()
+        
+        restored = self._tracker()
+        self.assertEqual(restored.get_all_statistics(), before)
+        self.assertEqual(before['total_executions'], 3)
+        self.assertEqual(before['unique_sessions'], 2)
+        self.assertEqual(len(restored.get_session_timeline('session_1')), 2)
+        restored.close()
+    
+    def test_snapshot_compacts_journal(self):
+        """Snapshots truncate the journal and replay skips compacted entries."""
+        tracker = self._tracker(snapshot_interval=2)
+        tracker.record_technique('T1059', 'agent_a', 'session_1', True, False, 1.0)
+        tracker.record_technique('T1566', 'agent_a', 'session_1', True, False, 1.0)
+        self.assertTrue(Path(self.storage_path).exists())
+        self.assertEqual(Path(tracker.journal_path).stat().st_size, 0)
+        
+        tracker.record_technique('T1566', 'agent_b', 'session_2', False, False, 1.0)
+        journal = Path(tracker.journal_path).read_text()
+        tracker.close()
+        
+        # A compaction interrupted before truncating leaves stale entries behind
+        with open(tracker.journal_path, 'a') as f:
+            f.write(journal)
+        
+        restored = self._tracker()
+        self.assertEqual(restored.get_all_statistics()['total_executions'], 3)
+        self.assertEqual(restored.sequence, 3)
+        restored.close()
+    
+    def test_execution_layer_from_aggregates(self):
+        """Navigator execution layers are scored from aggregates."""
+        tracker = self._tracker()
+        tracker.record_technique('T1059', 'agent_a', 'session_1', True, False, 1.0)
+        tracker.record_technique('T1059', 'agent_a', 'session_1', False, False, 1.0)
+        tracker.record_technique('T1566', 'agent_b', 'session_2', True, False, 1.0)
+        
+        layer = ATTACKNavigatorExporter(self.attack).create_execution_layer(tracker, session_id='session_1')
+        self.assertEqual(
+            [(t['techniqueID'], t['score']) for t in layer['techniques']],
+            [('T1059', 50.0)]
+        )
+        tracker.close()
+    
+    def test_cached_source_layers(self):
+        """Source layers are cached per source version and handed out as copies."""
+        exporter = ATTACKNavigatorExporter(self.attack)
+        profile = {
+            'metadata': {'id': 'operator', 'name': 'Operator'},
+            'attack_knowledge': {'mastered_techniques': [{'id': 'T1059', 'proficiency': 'expert'}]}
+        }
+        
+        first = exporter.create_profile_layer(profile, version='1')
+        first['techniques'].clear()
+        cached = exporter.create_profile_layer(profile, version='1')
+        self.assertEqual(cached['techniques'][0]['score'], 90)
+        
+        # Mutating a returned layer leaves the cache intact
+        cached['techniques'][0]['score'] = 0
+        self.assertEqual(exporter.create_profile_layer(profile, version='1')['techniques'][0]['score'], 90)
+        
+        profile['attack_knowledge']['mastered_techniques'][0]['proficiency'] = 'novice'
+        self.assertEqual(exporter.create_profile_layer(profile, version='2')['techniques'][0]['score'], 20)
+        # Without a version the layer is always rebuilt
+        self.assertEqual(exporter.create_profile_layer(profile)['techniques'][0]['score'], 20)
+        
+        stats = exporter.get_cache_statistics()
+        self.assertEqual((stats['hits'], stats['misses'], stats['cached_layers']), (2, 2, 2))
+    
+    def test_live_layer_diffs(self):
+        """Live layers follow the tracker and report diffs between versions."""
+        tracker = self._tracker()
+        tracker.record_technique('T1059', 'agent_a', 'session_1', True, False, 1.0)
+        
+        exporter = ATTACKNavigatorExporter(self.attack)
+        exporter.track(tracker)
+        live = exporter.get_live_layer(session_id='session_1')
+        pushed = []
+        live.add_listener(pushed.append)
+        version, layer = live.snapshot()
+        self.assertEqual((version, len(layer['techniques'])), (0, 1))
+        
+        tracker.record_technique('T1566', 'agent_a', 'session_1', False, False, 1.0)
+        tracker.record_technique('T1059', 'agent_a', 'session_1', False, False, 1.0)
+        tracker.record_technique('T1059', 'agent_b', 'session_2', True, False, 1.0)
+        
+        self.assertEqual(live.version, 2)
+        self.assertEqual([d['base_version'] for d in pushed], [0, 1])
+        diff = live.diff(0)
+        self.assertEqual([t['techniqueID'] for t in diff['techniques']], ['T1566', 'T1059'])
+        self.assertEqual(diff['techniques'][1]['score'], 50.0)
+        self.assertEqual(live.diff(2)['techniques'], [])
+        self.assertIsNone(live.diff(3))
+        
+        # Incremental updates match a layer rebuilt from the aggregates
+        rebuilt = exporter.create_execution_layer(tracker, session_id='session_1')
+        self.assertEqual(live.snapshot()[1]['techniques'], rebuilt['techniques'])
+        tracker.close()
+    
+    def test_live_layers_bounded(self):
+        """Idle and excess live layers are released unless streamed."""
+        tracker = self._tracker()
+        exporter = ATTACKNavigatorExporter(self.attack, max_live_layers=2, live_layer_ttl=60.0)
+        exporter.track(tracker)
+        
+        streamed = exporter.get_live_layer(session_id='streamed')
+        streamed.add_listener(lambda diff: None)
+        for i in range(3):
+            exporter.get_live_layer(session_id=f'session_{i}')
+        
+        # The streamed layer is kept; the least recently read ones are released
+        self.assertEqual(list(exporter._live), ['session:streamed', 'session:session_2'])
+        self.assertEqual(exporter.get_cache_statistics()['live_layers_expired'], 2)
+        
+        exporter.live_layer_ttl = 0.0
+        exporter._live['session:session_2'].last_used -= 1.0
+        exporter.get_live_layer(agent_id='agent_a')
+        self.assertEqual(list(exporter._live), ['session:streamed', 'agent:agent_a'])
+        
+        self.assertTrue(exporter.release_live_layer('agent:agent_a'))
+        self.assertFalse(exporter.release_live_layer('agent:agent_a'))
+        tracker.close()
+
+
 class TestIntegration(unittest.TestCase):
     """Test integration of all Phase 4 components."""
     
@@ -667,9 +1695,12 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestPerformanceMetrics))
     suite.addTests(loader.loadTestsFromTestCase(TestTrainingEffectiveness))
     suite.addTests(loader.loadTestsFromTestCase(TestAdvancedCostAnalytics))
+    suite.addTests(loader.loadTestsFromTestCase(TestModelSelection))
+    suite.addTests(loader.loadTestsFromTestCase(TestLLMGateway))
     suite.addTests(loader.loadTestsFromTestCase(TestProgressTracker))
     suite.addTests(loader.loadTestsFromTestCase(TestReportingEngine))
     suite.addTests(loader.loadTestsFromTestCase(TestAnalyticsAggregator))
+    suite.addTests(loader.loadTestsFromTestCase(TestTechniqueTracker))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
     
     # Run tests
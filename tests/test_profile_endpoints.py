@@ -0,0 +1,70 @@
+"""
+Profile Endpoint Tests
+Tests the FileProfileStorage catalog and its indexed substring search.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..api.profile_endpoints import FileProfileStorage, ProfileCreate, ProfileUpdate
+
+
+class TestProfileSearch(unittest.TestCase):
+    """Test that indexed search keeps plain substring semantics."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = FileProfileStorage(Path(self.temp_dir))
+        self.recon = self.storage.create_profile(ProfileCreate(
+            name="Recon Specialist",
+            type="red_team",
+            description="Passive Reconnaissance and OSINT",
+            skill_level="advanced",
+            specialization="network-mapping"
+        ))
+        self.defender = self.storage.create_profile(ProfileCreate(
+            name="SOC Analyst",
+            type="blue_team",
+            description="Log triage and incident response",
+            skill_level="intermediate",
+            specialization="detection"
+        ))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _search_ids(self, query):
+        return [p["id"] for p in self.storage.search(query)]
+
+    def test_prefix_query(self):
+        """A query starting at a word boundary matches."""
+        self.assertEqual(self._search_ids("recon"), [self.recon["id"]])
+        self.assertEqual(self._search_ids("INCIDENT"), [self.defender["id"]])
+
+    def test_infix_query(self):
+        """A query starting inside a word matches, as a substring scan would."""
+        self.assertEqual(self._search_ids("connaissance"), [self.recon["id"]])
+        self.assertEqual(self._search_ids("ident"), [self.defender["id"]])
+
+    def test_query_spanning_words(self):
+        """Multi-word and punctuated queries must match contiguously."""
+        self.assertEqual(self._search_ids("naissance and os"), [self.recon["id"]])
+        self.assertEqual(self._search_ids("work-map"), [self.recon["id"]])
+        self.assertEqual(self._search_ids("osint and"), [])
+        self.assertEqual(self._search_ids("-"), [self.recon["id"]])
+        self.assertEqual(self._search_ids("missing"), [])
+
+    def test_search_follows_updates(self):
+        """Updated and deleted profiles are reflected in search results."""
+        self.storage.update_profile(self.defender["id"], ProfileUpdate(description="Threat hunting"))
+        self.assertEqual(self._search_ids("incident"), [])
+        self.assertEqual(self._search_ids("hunt"), [self.defender["id"]])
+
+        self.storage.delete_profile(self.recon["id"])
+        self.assertEqual(self._search_ids("connaissance"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
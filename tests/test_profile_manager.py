@@ -0,0 +1,186 @@
+"""
+Profile Manager Tests
+Tests the ProfileCache TTL expiry, LRU eviction and invalidation, and
+lazy loading of profiles from the validation manifest.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from ..config.settings import FrameworkConfig
+from ..core.profile_manager import (
+    AgentProfile, ProfileCache, ProfileLoadError, ProfileManager,
+    ProfileMetadata, ProfileType
+)
+
+
+def make_profile(profile_id: str, knowledge_size: int = 0) -> AgentProfile:
+    """Build a minimal profile, optionally padded with knowledge."""
+    return AgentProfile(
+        metadata=ProfileMetadata(
+            id=profile_id,
+            name=profile_id,
+            description="Test profile",
+            version="1.0.0",
+            author="tests",
+            profile_type=ProfileType.RED_TEAM,
+            category="test"
+        ),
+        knowledge_base={"notes": "x" * knowledge_size}
+    )
+
+
+class TestProfileCache(unittest.TestCase):
+    """Test ProfileCache bounds, expiry and counters."""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = patch('time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ttl_expiry_on_get(self):
+        """Expired entries miss and are swept by get, not only by put."""
+        cache = ProfileCache(max_size=10, ttl=60)
+        cache.put(make_profile("old"))
+        self.now += 30
+        cache.put(make_profile("new"))
+
+        self.now += 45
+        self.assertIsNotNone(cache.get("new"))
+        # The lookup for "new" swept the expired "old" entry
+        self.assertNotIn("old", cache.cache)
+        self.assertNotIn("old", cache.insert_times)
+        self.assertIsNone(cache.get("old"))
+
+        stats = cache.get_statistics()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['expirations'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when the cache is full."""
+        cache = ProfileCache(max_size=2, ttl=60)
+        cache.put(make_profile("a"))
+        cache.put(make_profile("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+        cache.put(make_profile("c"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.get_statistics()['evictions'], 1)
+
+    def test_byte_budget_eviction(self):
+        """The byte budget evicts old entries but always keeps the newest."""
+        small = ProfileCache._weigh(make_profile("a"))
+        cache = ProfileCache(max_size=10, ttl=60, max_bytes=small * 2 + 10)
+        cache.put(make_profile("a"))
+        cache.put(make_profile("b"))
+        self.assertEqual(len(cache.cache), 2)
+
+        cache.put(make_profile("big", knowledge_size=small * 4))
+        self.assertEqual(list(cache.cache), ["big"])
+        self.assertEqual(cache.total_bytes, ProfileCache._weigh(make_profile("big", small * 4)))
+
+    def test_invalidate_and_clear(self):
+        """Invalidation removes one entry and its byte weight; clear resets all."""
+        cache = ProfileCache(max_size=10, ttl=60, max_bytes=10 ** 6)
+        cache.put(make_profile("a"))
+        cache.put(make_profile("b"))
+
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        self.assertIsNone(cache.get("a"))
+        self.assertNotIn("a", cache.insert_times)
+        self.assertEqual(cache.total_bytes, ProfileCache._weigh(make_profile("b")))
+
+        cache.clear()
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.total_bytes, 0)
+        self.assertEqual(len(cache.insert_times), 0)
+
+    def test_reput_refreshes_ttl(self):
+        """Re-caching a profile restarts its TTL."""
+        cache = ProfileCache(max_size=10, ttl=60)
+        cache.put(make_profile("a"))
+        self.now += 50
+        cache.put(make_profile("a"))
+        self.now += 50
+        self.assertIsNotNone(cache.get("a"))
+
+
+class TestLazyProfileLoading(unittest.TestCase):
+    """Test manifest placement and deferred profile loading."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.profile_dir = self.temp_dir / "profiles"
+        self.profile_dir.mkdir()
+        self.profile_path = self.profile_dir / "recon.json"
+        self._write_profile("recon")
+        self.config = FrameworkConfig(
+            data_dir=str(self.temp_dir / "data"),
+            default_profile_path=str(self.profile_dir),
+            lazy_loading=True,
+            cache_enabled=False,
+            load_workers=2
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_profile(self, profile_id):
+        self.profile_path.write_text(json.dumps(make_profile(profile_id).to_dict()))
+
+    def test_manifest_written_under_data_dir(self):
+        """The default manifest directory resolves under data_dir, not the CWD."""
+        ProfileManager(self.config).shutdown()
+        self.assertTrue((self.temp_dir / "data" / "cache" / "profiles_manifest.json").exists())
+
+    def test_unchanged_profile_is_deferred(self):
+        """A validated, unchanged file is registered from the manifest and loaded on access."""
+        ProfileManager(self.config).shutdown()
+
+        manager = ProfileManager(self.config)
+        stats = manager.get_statistics()
+        self.assertEqual(stats['profiles_deferred'], 1)
+        self.assertEqual(stats['pending_profiles'], 1)
+        self.assertEqual(manager.get_profile_metadata("recon").name, "recon")
+
+        profile = manager.get_profile("recon")
+        self.assertEqual(profile.metadata.id, "recon")
+        self.assertEqual(manager.get_statistics()['pending_profiles'], 0)
+
+    def test_failed_lazy_load_raises(self):
+        """A deferred profile whose file broke is logged, counted and raised, then dropped."""
+        ProfileManager(self.config).shutdown()
+        manager = ProfileManager(self.config)
+        self.profile_path.write_text("{not json")
+
+        with self.assertLogs("profile_manager", level="ERROR") as logs:
+            with self.assertRaises(ProfileLoadError):
+                manager.get_profile("recon")
+        self.assertTrue(any("recon" in line for line in logs.output))
+        self.assertEqual(manager.get_statistics()['lazy_load_failures'], 1)
+        self.assertIsNone(manager.get_profile_metadata("recon"))
+        self.assertIsNone(manager.get_profile("recon"))
+
+    def test_lazy_load_of_replaced_profile_raises(self):
+        """A deferred file that now defines another profile fails for the old id."""
+        ProfileManager(self.config).shutdown()
+        manager = ProfileManager(self.config)
+        self._write_profile("renamed")
+
+        with self.assertRaisesRegex(ProfileLoadError, "renamed"):
+            manager.get_profile("recon")
+        self.assertEqual(manager.get_profile("renamed").metadata.id, "renamed")
+
+
+if __name__ == '__main__':
+    unittest.main()
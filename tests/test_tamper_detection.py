@@ -0,0 +1,176 @@
+"""
+Tamper Detection Tests
+Tests pattern resolution, stat-signature hash reuse, cache invalidation and
+watch mode of the file integrity monitor.
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_spec = importlib.util.spec_from_file_location(
+    'tamper_detection', Path(__file__).resolve().parent.parent / 'scripts' / 'tamper_detection.py'
+)
+tamper_detection = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tamper_detection)
+TamperDetection = tamper_detection.TamperDetection
+
+PATTERNS = ['pkg/core/**/*.py', 'pkg/settings.py', 'missing.md']
+
+
+class TestTamperDetection(unittest.TestCase):
+    """Test file resolution, hashing and the hash cache."""
+
+    def setUp(self):
+        self.base = Path(tempfile.mkdtemp())
+        self._write('pkg/settings.py', 'DEBUG = False\n')
+        self._write('pkg/core/engine.py', 'def run(): pass\n')
+        self._write('pkg/core/nested/policy.py', 'ALLOW = []\n')
+        self._write('pkg/core/__pycache__/engine.cpython-311.py', 'compiled')
+        self._write('pkg/core/notes.txt', 'not python')
+
+    def tearDown(self):
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def _write(self, relative, content):
+        path = self.base / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def _detector(self, **kwargs):
+        return TamperDetection(base_path=str(self.base), patterns=PATTERNS, workers=2, **kwargs)
+
+    def _quietly(self, function, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()) as out, \
+                contextlib.redirect_stderr(io.StringIO()):
+            result = function(*args, **kwargs)
+        return result, out.getvalue()
+
+    def _verify(self, **kwargs):
+        detector = self._detector(**kwargs)
+        self._quietly(detector.load_baseline)
+        return self._quietly(detector.verify_integrity)[0]
+
+    def test_glob_resolution(self):
+        """Globs match nested files outside __pycache__; plain entries are kept even if missing."""
+        self.assertEqual(self._detector().resolve_files(), [
+            'missing.md',
+            'pkg/core/engine.py',
+            'pkg/core/nested/policy.py',
+            'pkg/settings.py'
+        ])
+
+    def test_unchanged_files_are_not_rehashed(self):
+        """Files whose stat signature is unchanged reuse the cached hash."""
+        baseline, _ = self._quietly(self._detector().create_baseline)
+        self.assertEqual(baseline['total_files'], 3)
+        self.assertEqual(baseline['missing_files'], ['missing.md'])
+
+        with patch.object(TamperDetection, 'calculate_file_hash',
+                          side_effect=AssertionError('hashed an unchanged file')):
+            results = self._verify()
+        self.assertEqual(results['status'], 'CLEAN')
+        self.assertEqual(results['summary']['hashed_count'], 0)
+        self.assertEqual(results['summary']['cached_count'], 3)
+
+    def test_changed_file_is_rehashed_even_with_restored_mtime(self):
+        """A rewrite with the same size and a restored mtime is still detected."""
+        self._quietly(self._detector().create_baseline)
+        # Let the (coarse) change-time clock move past the baseline writes
+        time.sleep(0.05)
+        path = self.base / 'pkg/settings.py'
+        stat = path.stat()
+        path.write_text('DEBUG = True!\n'[:stat.st_size])
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        results = self._verify()
+        self.assertEqual(results['status'], 'TAMPERED')
+        self.assertEqual([f['file'] for f in results['modified_files']], ['pkg/settings.py'])
+        self.assertEqual(results['summary']['hashed_count'], 1)
+        self.assertEqual(results['summary']['cached_count'], 2)
+
+    def test_full_scan_bypasses_cache(self):
+        """use_cache=False (--full) re-hashes every file."""
+        self._quietly(self._detector().create_baseline)
+
+        results = self._verify(use_cache=False)
+        self.assertEqual(results['summary']['hashed_count'], 3)
+        self.assertEqual(results['summary']['cached_count'], 0)
+
+    def _main(self, *args):
+        argv = ['tamper_detection.py', '--base-path', str(self.base)] + list(args)
+        with patch.object(sys, 'argv', argv), \
+                patch.object(TamperDetection, 'SECURITY_CRITICAL_FILES', PATTERNS):
+            with self.assertRaises(SystemExit) as exit_info:
+                self._quietly(tamper_detection.main)
+        return exit_info.exception.code
+
+    def test_full_flag_from_command_line(self):
+        """The --full flag reaches the detector through main()."""
+        self.assertEqual(self._main('--create-baseline'), 0)
+
+        scans = []
+        original = TamperDetection.scan
+
+        def record(detector, files, use_cache=None):
+            scanned = original(detector, files, use_cache)
+            scans.append((detector.use_cache, detector.files_hashed, detector.cache_hits))
+            return scanned
+
+        with patch.object(TamperDetection, 'scan', record):
+            self.assertEqual(self._main('--json'), 0)
+            self.assertEqual(self._main('--json', '--full'), 0)
+        self.assertEqual(scans, [(True, 0, 3), (False, 3, 0)])
+
+    def test_cache_invalidated_when_baseline_changes(self):
+        """Cached hashes are dropped once a different baseline is in use."""
+        self._quietly(self._detector().create_baseline)
+
+        baseline_path = self.base / 'security_baseline.json'
+        baseline = json.loads(baseline_path.read_text())
+        baseline['created'] = '2000-01-01T00:00:00'
+        baseline_path.write_text(json.dumps(baseline))
+
+        detector = self._detector()
+        self._quietly(detector.load_baseline)
+        self.assertEqual(detector.stat_cache, {})
+        results = self._quietly(detector.verify_integrity)[0]
+        self.assertEqual(results['summary']['hashed_count'], 3)
+
+        # The rewritten cache belongs to the new baseline
+        self.assertEqual(self._verify()['summary']['cached_count'], 3)
+
+    def test_watch_reports_only_changes(self):
+        """Watch re-verifies each cycle and reports when the findings change."""
+        self._quietly(self._detector().create_baseline)
+        detector = self._detector()
+        self._quietly(detector.load_baseline)
+
+        sleeps = []
+
+        def tamper(interval):
+            sleeps.append(interval)
+            if len(sleeps) == 2:
+                self._write('pkg/core/engine.py', 'def run(): exfiltrate()\n')
+
+        with patch.object(tamper_detection.time, 'sleep', side_effect=tamper):
+            results, output = self._quietly(detector.watch, interval=0.5, max_cycles=3)
+
+        self.assertEqual(sleeps, [0.5, 0.5])
+        self.assertEqual(output.count('FILE INTEGRITY VERIFICATION REPORT'), 2)
+        self.assertEqual(results['status'], 'TAMPERED')
+        self.assertEqual([f['file'] for f in results['modified_files']], ['pkg/core/engine.py'])
+        self.assertEqual(results['summary']['hashed_count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
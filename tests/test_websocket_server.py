@@ -0,0 +1,158 @@
+"""
+WebSocket Server Tests
+Tests ConnectionManager delivery policies, slow-client handling and
+subscription index cleanup.
+"""
+
+import asyncio
+import json
+import unittest
+
+from fastapi.websockets import WebSocketState
+
+from ..api.websocket_server import (
+    ConnectionManager, DELIVERY_DROP, DELIVERY_MERGE
+)
+
+
+class FakeWebSocket:
+    """In-memory WebSocket recording sent messages."""
+
+    def __init__(self, blocked: bool = False):
+        self.client_state = WebSocketState.CONNECTED
+        self.sent = []
+        self.closed_code = None
+        self.unblock = asyncio.Event()
+        if not blocked:
+            self.unblock.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.unblock.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed_code = code
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+class TestConnectionManager(unittest.TestCase):
+    """Test per-client queues and the subscription reverse index."""
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    async def _settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    def test_queued_messages_delivered_in_order(self):
+        """Queued messages reach every subscriber in order, serialized once."""
+        async def scenario():
+            manager = ConnectionManager()
+            sockets = [FakeWebSocket(), FakeWebSocket()]
+            for i, websocket in enumerate(sockets):
+                await manager.connect(websocket, f"client_{i}")
+                manager.subscribe_to_session(f"client_{i}", "session_1")
+
+            for i in range(5):
+                await manager.broadcast_to_session("session_1", {"seq": i})
+            await self._settle()
+            return sockets
+
+        for websocket in self.run_async(scenario()):
+            self.assertEqual(websocket.sent[0]["type"], "connected")
+            self.assertEqual([m["seq"] for m in websocket.sent[1:]], list(range(5)))
+
+    def test_merge_and_drop_policies(self):
+        """A backlogged client keeps the latest merged message and drops droppable ones."""
+        async def scenario():
+            manager = ConnectionManager(max_queue=8, topic_policies={
+                "status": DELIVERY_MERGE,
+                "tools": DELIVERY_DROP
+            })
+            websocket = FakeWebSocket(blocked=True)
+            await manager.connect(websocket, "slow")
+            manager.subscribe("slow", "status")
+            manager.subscribe("slow", "tools")
+            await self._settle()
+
+            for i in range(10):
+                await manager.broadcast_to_topic("status", {"status": i})
+            for i in range(10):
+                await manager.broadcast_to_topic("tools", {"tool": i})
+
+            websocket.unblock.set()
+            await self._settle()
+            return manager, websocket
+
+        manager, websocket = self.run_async(scenario())
+        statuses = [m["status"] for m in websocket.sent if "status" in m]
+        tools = [m["tool"] for m in websocket.sent if "tool" in m]
+
+        # The welcome message was in flight; all statuses merged into one
+        self.assertEqual(statuses, [9])
+        self.assertLess(len(tools), 10)
+        stats = manager.get_statistics()
+        self.assertEqual(stats["merged_messages"], 9)
+        self.assertEqual(stats["dropped_messages"], 10 - len(tools))
+
+    def test_stalled_client_is_closed(self):
+        """A client whose queue overflows is disconnected, closed and cannot resubscribe."""
+        async def scenario():
+            manager = ConnectionManager(max_queue=4)
+            slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+            await manager.connect(slow, "slow")
+            await manager.connect(fast, "fast")
+            for client_id in ("slow", "fast"):
+                manager.subscribe_to_session(client_id, "session_1")
+            await self._settle()
+
+            for i in range(6):
+                await manager.broadcast_to_session("session_1", {"seq": i})
+            await self._settle()
+
+            # A message arriving on the still-open receive loop must not resubscribe
+            manager.subscribe("slow", "tools")
+            manager.subscribe_to_session("slow", "session_2")
+            return manager, slow, fast
+
+        manager, slow, fast = self.run_async(scenario())
+        self.assertEqual(slow.closed_code, 1013)
+        self.assertNotIn("slow", manager.channels)
+        self.assertNotIn("slow", manager.client_topics)
+        self.assertNotIn("slow", manager.client_sessions)
+        self.assertNotIn("tools", manager.subscriptions)
+        self.assertEqual(manager.session_subscribers, {"session_1": {"fast"}})
+        self.assertEqual(manager.get_statistics()["stalled_disconnects"], 1)
+        self.assertEqual([m["seq"] for m in fast.sent[1:]], list(range(6)))
+
+    def test_disconnect_cleans_reverse_index(self):
+        """Disconnect removes only the client's own subscriptions and empty entries."""
+        async def scenario():
+            manager = ConnectionManager()
+            first, second = FakeWebSocket(), FakeWebSocket()
+            await manager.connect(first, "a")
+            await manager.connect(second, "b")
+            manager.subscribe("a", "voice")
+            manager.subscribe("a", "tools")
+            manager.subscribe("b", "tools")
+            manager.subscribe_to_session("a", "session_1")
+
+            # A stale handler for an old connection does not drop the current one
+            manager.disconnect("a", FakeWebSocket())
+            self.assertIn("a", manager.channels)
+
+            manager.disconnect("a", first)
+            return manager
+
+        manager = self.run_async(scenario())
+        self.assertEqual(manager.subscriptions, {"tools": {"b"}})
+        self.assertEqual(manager.session_subscribers, {})
+        self.assertEqual(manager.client_topics, {"b": {"tools"}})
+
+
+if __name__ == '__main__':
+    unittest.main()